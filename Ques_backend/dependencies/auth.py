@@ -5,20 +5,101 @@ Handles JWT token verification and user authentication
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from dependencies.db import get_db
+from dependencies.db import get_async_db, get_db
 from services.auth_service import AuthService
+from services.token_cache import TokenPrincipal
 from models.users import User
 
 security = HTTPBearer()
 auth_service = AuthService()
 
+
+class CurrentUser:
+    """
+    Authenticated user returned by get_current_user
+    
+    id, user_id, user_status, is_active and is_verified come from the cached token
+    principal without touching the database; any other attribute (profile,
+    membership, ...) loads the User row from the request's session on first use.
+    Attribute writes (current_user.membership = ...) go to that row as well.
+    Also supports current_user["id"] / current_user.get("id").
+    
+    From get_current_user_async there is no sync session to load the row from;
+    async routers read the principal fields only and query anything else
+    through their AsyncSession.
+    """
+    
+    def __init__(self, principal: TokenPrincipal, db: Optional[Session]):
+        self._principal = principal
+        self._db = db
+        self._user: Optional[User] = None
+    
+    @property
+    def id(self) -> int:
+        return self._principal.user_id
+    
+    @property
+    def user_id(self) -> int:
+        return self._principal.user_id
+    
+    @property
+    def user_status(self) -> str:
+        return self._principal.user_status
+    
+    @property
+    def is_active(self) -> bool:
+        return self._principal.is_active
+    
+    @property
+    def is_verified(self) -> bool:
+        return self._principal.is_verified
+    
+    @property
+    def user(self) -> User:
+        """Full User row (loaded once per request)"""
+        if self._user is None:
+            if self._db is None:
+                raise RuntimeError("User row is not available on an async request; query it through the AsyncSession")
+            self._user = self._db.get(User, self._principal.user_id)
+            if self._user is None:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User no longer exists")
+        return self._user
+    
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.user, name)
+    
+    def __setattr__(self, name, value):
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.user, name, value)
+    
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+    
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def __repr__(self):
+        return f"<CurrentUser(id={self.id}, status={self.user_status})>"
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
+) -> CurrentUser:
     """
     Dependency to get current authenticated user from JWT token
     """
@@ -30,19 +111,47 @@ async def get_current_user(
     
     try:
         token = credentials.credentials
-        user = auth_service.get_current_user(db, token)
+        principal = auth_service.resolve_principal(db, token)
         
-        if user is None:
+        if principal is None:
             raise credentials_exception
             
-        return user
+        return CurrentUser(principal, db)
+        
+    except Exception:
+        raise credentials_exception
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> CurrentUser:
+    """
+    Dependency to get current authenticated user for routers on get_async_db
+    
+    Token-cache misses are resolved on the request's AsyncSession (shared with
+    the endpoint), so async routers never check out a sync pool connection.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    try:
+        token = credentials.credentials
+        principal = await db.run_sync(auth_service.resolve_principal, token)
+        
+        if principal is None:
+            raise credentials_exception
+            
+        return CurrentUser(principal, None)
         
     except Exception:
         raise credentials_exception
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: CurrentUser = Depends(get_current_user)
+) -> CurrentUser:
     """
     Dependency to get current active user (not disabled)
     """
@@ -54,8 +163,8 @@ async def get_current_active_user(
     return current_user
 
 async def get_current_verified_user(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+    current_user: CurrentUser = Depends(get_current_active_user)
+) -> CurrentUser:
     """
     Dependency to get current verified user (email verified)
     """
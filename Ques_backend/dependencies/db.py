@@ -3,28 +3,45 @@ Database dependency and connection management
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.declarative import declarative_base
-from typing import Generator
-import os
-from dotenv import load_dotenv
+from typing import AsyncGenerator, Generator
 
-load_dotenv()
+from config.database import db_config
 
-# Database URL
-DATABASE_URL = f"postgresql://{os.getenv('PG_USER')}:{os.getenv('PG_PASSWORD')}@{os.getenv('PG_HOST')}:{os.getenv('PG_PORT')}/{os.getenv('PG_DATABASE')}"
+# Database URLs (DATABASE_URL overrides the PG_* settings, as in migrations/env.py)
+DATABASE_URL = db_config.database_url
+ASYNC_DATABASE_URL = db_config.async_database_url
 
 # Create SQLAlchemy engine
 engine = create_engine(
     DATABASE_URL,
+    pool_size=db_config.DB_POOL_SIZE,
+    max_overflow=db_config.DB_MAX_OVERFLOW,
+    pool_timeout=db_config.DB_POOL_TIMEOUT,
     pool_pre_ping=True,
-    pool_recycle=300,
+    pool_recycle=db_config.DB_POOL_RECYCLE,
     echo=False  # Set to True for SQL debugging
 )
 
+# Create async engine (asyncpg) for async routers; same pool settings as the sync engine
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=db_config.DB_POOL_SIZE,
+    max_overflow=db_config.DB_MAX_OVERFLOW,
+    pool_timeout=db_config.DB_POOL_TIMEOUT,
+    pool_pre_ping=True,
+    pool_recycle=db_config.DB_POOL_RECYCLE,
+    echo=False
+)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create AsyncSessionLocal class (objects stay usable after commit, no implicit lazy IO)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 # Create Base class
 Base = declarative_base()
 
@@ -38,6 +55,24 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get an async database session
+
+    Queries are awaited on the event loop instead of blocking it. Code that needs a
+    sync Session (e.g. seen_set_service, profile_card_cache) can run on the same
+    connection and transaction via `await db.run_sync(lambda session: ...)`.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def dispose_engines():
+    """
+    Close all pooled connections (application shutdown)
+    """
+    await async_engine.dispose()
+    engine.dispose()
+
 def get_db_connection():
     """
     Get a database connection for direct use
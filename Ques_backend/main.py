@@ -73,6 +73,16 @@ async def lifespan(app: FastAPI):
     # Setup monitoring
     setup_monitoring()
     
+    # Preload embedding models once per process (otherwise loaded on first use)
+    if os.getenv("PRELOAD_MODELS", "false").lower() == "true":
+        try:
+            import asyncio
+            from services.model_registry import model_registry
+            await asyncio.to_thread(model_registry.warm_up)
+            logger.info("✅ Embedding models preloaded")
+        except Exception as e:
+            logger.error(f"❌ Failed to preload embedding models: {e}")
+    
     # Start background tasks
     try:
         from services.task_scheduler import start_background_tasks
@@ -96,6 +106,22 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ Error stopping background tasks: {e}")
 
+    # Close shared GLM-4 async connection pool
+    try:
+        from services.glm4_client import close_async_http_client
+        await close_async_http_client()
+        logger.info("✅ GLM-4 connection pool closed")
+    except Exception as e:
+        logger.error(f"❌ Error closing GLM-4 connection pool: {e}")
+
+    # Close database connection pools
+    try:
+        from dependencies.db import dispose_engines
+        await dispose_engines()
+        logger.info("✅ Database connection pools closed")
+    except Exception as e:
+        logger.error(f"❌ Error closing database connection pools: {e}")
+
 # Create FastAPI app with environment-aware configuration
 app = FastAPI(
     title=settings.api_title,
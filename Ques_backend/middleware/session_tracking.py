@@ -1,24 +1,19 @@
 """
 Session tracking middleware for monitoring online users
+Activity is recorded in the write-behind buffer (services.session_activity) and
+persisted by a background task, so requests never wait on the database
 """
 
-import os
 import logging
-from datetime import datetime, timedelta
-from fastapi import Request, Response
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from fastapi import Request
 from typing import Optional
-from jose import JWTError, jwt
-from models.user_auth import UserSession
-from models.users import User
-from dependencies.db import SessionLocal
+from services.auth_service import AuthService
+from services.session_activity import session_activity_buffer
+from services.token_cache import verified_token_cache
 
 logger = logging.getLogger(__name__)
 
-# JWT configuration
-SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
-ALGORITHM = "HS256"
+auth_service = AuthService()
 
 class SessionTrackingMiddleware:
     """Middleware to track user sessions and update last_activity"""
@@ -39,67 +34,43 @@ class SessionTrackingMiddleware:
             auth_header = request.headers.get("authorization")
             if auth_header and auth_header.startswith("Bearer "):
                 token = auth_header.split(" ")[1]
-                await self.update_user_activity(token, request)
+                self.update_user_activity(token, request)
         
         return await self.app(scope, receive, send)
     
-    async def update_user_activity(self, token: str, request: Request):
-        """Update user's last activity in the database"""
+    def update_user_activity(self, token: str, request: Request):
+        """Record user's last activity (flushed to the database in the background)"""
         try:
-            db = SessionLocal()
-            
-            # Get current user from token (simplified version)
-            current_user = await self.get_user_from_token(db, token)
-            if not current_user:
+            user_id = self.get_user_id_from_token(token)
+            if user_id is None:
                 return
             
-            # Update or create session
-            ip_address = self.get_client_ip(request)
-            user_agent = request.headers.get("user-agent", "Unknown")
-            
-            # Find existing active session
-            existing_session = db.query(UserSession).filter(
-                UserSession.user_id == current_user.user_id,
-                UserSession.session_token == token,
-                UserSession.is_active == True
-            ).first()
-            
-            if existing_session:
-                # Update existing session
-                existing_session.last_activity = datetime.utcnow()
-                existing_session.ip_address = ip_address
-                existing_session.user_agent = user_agent
-            else:
-                # Create new session if none exists
-                new_session = UserSession(
-                    user_id=current_user.user_id,
-                    session_token=token,
-                    ip_address=ip_address,
-                    user_agent=user_agent,
-                    last_activity=datetime.utcnow(),
-                    expires_at=datetime.utcnow() + timedelta(hours=24),
-                    is_active=True
-                )
-                db.add(new_session)
-            
-            db.commit()
+            session_activity_buffer.record(
+                user_id=user_id,
+                token=token,
+                ip_address=self.get_client_ip(request),
+                user_agent=request.headers.get("user-agent", "Unknown")
+            )
             
         except Exception as e:
             logger.error(f"Error updating user activity: {e}")
-        finally:
-            if 'db' in locals():
-                db.close()
     
-    async def get_user_from_token(self, db: Session, token: str) -> Optional[User]:
-        """Get user from JWT token"""
+    def get_user_id_from_token(self, token: str) -> Optional[int]:
+        """Get user ID from JWT token (verified-token cache first, no database access)"""
+        principal = verified_token_cache.get(token)
+        if principal is not None:
+            return principal.user_id
+        if verified_token_cache.is_revoked(token):
+            return None
+        
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            user_id = payload.get("sub")
+            payload = auth_service.verify_token(token)
+            user_id = payload.get("sub") if payload else None
             
             if user_id:
-                return db.query(User).filter(User.user_id == int(user_id)).first()
-        except Exception as e:
-            logger.error(f"Error decoding token: {e}")
+                return int(user_id)
+        except ValueError as e:
+            logger.debug(f"Error decoding token: {e}")
         return None
     
     def get_client_ip(self, request: Request) -> str:
@@ -0,0 +1,29 @@
+"""Store optimized_query embeddings on casual_requests
+
+Revision ID: casual_requests_embedding_001
+Revises: user_profiles_search_001
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'casual_requests_embedding_001'
+down_revision = 'user_profiles_search_001'
+branch_labels = None
+depends_on = 'casual_requests_002'
+
+
+def upgrade() -> None:
+    """Add query_embedding (float32 bytes, backfilled by the casual matching index)"""
+    op.add_column(
+        'casual_requests',
+        sa.Column('query_embedding', sa.LargeBinary(), nullable=True,
+                  comment='float32 embedding of optimized_query (filled by the matching index)')
+    )
+
+
+def downgrade() -> None:
+    """Drop query_embedding"""
+    op.drop_column('casual_requests', 'query_embedding')
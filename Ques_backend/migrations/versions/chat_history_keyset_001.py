@@ -0,0 +1,36 @@
+"""Add composite index for keyset pagination of chat history
+
+Revision ID: chat_history_keyset_001
+Revises: user_seen_sets_001
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'chat_history_keyset_001'
+down_revision = 'user_seen_sets_001'
+branch_labels = None
+depends_on = None
+
+
+def _message_time_column() -> str:
+    """Timestamp column of chat_messages (created_at in the model, timestamp in older schemas)"""
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('chat_messages')}
+    return 'created_at' if 'created_at' in columns else 'timestamp'
+
+
+def upgrade() -> None:
+    """Index (session_id, created_at, id) so history pages are index range scans"""
+    op.create_index(
+        'ix_chat_messages_session_created_id',
+        'chat_messages',
+        ['session_id', _message_time_column(), 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Drop chat history keyset index"""
+    op.drop_index('ix_chat_messages_session_created_id', table_name='chat_messages')
@@ -0,0 +1,48 @@
+"""Add trigram and JSONB GIN indexes for profile search filters
+
+Revision ID: user_profiles_search_001
+Revises: user_swipes_mutual_001
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'user_profiles_search_001'
+down_revision = 'user_swipes_mutual_001'
+branch_labels = None
+depends_on = None
+
+# (index name, column) pairs searched with ILIKE '%term%'
+TRIGRAM_INDEXES = (
+    ('ix_user_profiles_name_trgm', 'name'),
+    ('ix_user_profiles_intro_trgm', 'one_sentence_intro'),
+    ('ix_user_profiles_location_trgm', 'location'),
+    ('ix_user_profiles_university_trgm', 'current_university'),
+)
+SKILLS_INDEX = 'ix_user_profiles_skills_gin'
+
+
+def upgrade() -> None:
+    """Enable pg_trgm and index profile text columns and the skills array"""
+    if not sa.inspect(op.get_bind()).has_table('user_profiles'):
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for index_name, column in TRIGRAM_INDEXES:
+        op.create_index(
+            index_name,
+            'user_profiles',
+            [column],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'}
+        )
+    op.create_index(SKILLS_INDEX, 'user_profiles', ['skills'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Drop profile search indexes (the pg_trgm extension is left installed)"""
+    for index_name, _ in TRIGRAM_INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {index_name}')
+    op.execute(f'DROP INDEX IF EXISTS {SKILLS_INDEX}')
@@ -0,0 +1,34 @@
+"""Add user_seen_sets table
+
+Revision ID: user_seen_sets_001
+Revises: chat_system_only
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'user_seen_sets_001'
+down_revision = 'chat_system_only'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create per-user seen/swiped bitmap table"""
+    op.create_table('user_seen_sets',
+        sa.Column('user_id', sa.BigInteger(), nullable=False),
+        sa.Column('seen_bitmap', sa.LargeBinary(), nullable=True),
+        sa.Column('swiped_bitmap', sa.LargeBinary(), nullable=True),
+        sa.Column('seen_overflow', sa.JSON(), nullable=True),
+        sa.Column('swiped_overflow', sa.JSON(), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Drop per-user seen/swiped bitmap table"""
+    op.drop_table('user_seen_sets')
@@ -0,0 +1,44 @@
+"""Add covering index for mutual-like detection on user_swipes
+
+Revision ID: user_swipes_mutual_001
+Revises: chat_history_keyset_001
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'user_swipes_mutual_001'
+down_revision = 'chat_history_keyset_001'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'ix_user_swipes_swiper_swiped_direction'
+
+
+def _swipe_columns():
+    """(target, direction) column names of user_swipes, or None if the table does not exist"""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('user_swipes'):
+        return None
+    columns = {column['name'] for column in inspector.get_columns('user_swipes')}
+    target = 'swiped_user_id' if 'swiped_user_id' in columns else 'target_id'
+    direction = 'swipe_direction' if 'swipe_direction' in columns else 'direction'
+    return target, direction
+
+
+def upgrade() -> None:
+    """Index (swiper_id, target, direction) so liked/mutual checks are index-only lookups"""
+    columns = _swipe_columns()
+    if columns is None:
+        return
+    target, direction = columns
+    op.create_index(INDEX_NAME, 'user_swipes', ['swiper_id', target, direction], unique=False)
+
+
+def downgrade() -> None:
+    """Drop mutual-like index"""
+    if _swipe_columns() is None:
+        return
+    op.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
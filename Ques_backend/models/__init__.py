@@ -13,6 +13,7 @@ from .user_projects import UserProject  # user_projects table
 from .user_quotas import UserQuota  # user_quotas table
 from .user_swipes import UserSwipe, SwipeDirection  # user_swipes table
 from .swipes import SwipeRecord, SwipeAction, SearchMode  # swipe_records table (new)
+from .user_seen_sets import UserSeenSet  # user_seen_sets table (new)
 from .user_settings import UserSettings  # user_settings table (new)
 from .casual_requests import CasualRequest  # casual_requests table (new)
 from .chat import ChatSession, ChatMessage, MessageRecommendation, SuggestedQuery  # chat system tables (new)
@@ -44,6 +45,7 @@ __all__ = [
     "SwipeRecord",   # swipe_records table (new)
     "SwipeAction",   # swipe action enum (new)
     "SearchMode",    # search mode enum (new)
+    "UserSeenSet",   # user_seen_sets table (new)
     "UserSettings",  # user_settings table (new)
     "CasualRequest", # casual_requests table (new)
     # Chat system models (new)
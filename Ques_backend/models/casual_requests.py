@@ -4,7 +4,7 @@ Stores casual social activity requests from users
 Only one active request per user is maintained
 """
 
-from sqlalchemy import Column, String, Text, Boolean, DateTime, Integer, UniqueConstraint, Index, ForeignKey
+from sqlalchemy import Column, String, Text, Boolean, DateTime, Integer, UniqueConstraint, Index, ForeignKey, LargeBinary
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Session, relationship
 from sqlalchemy.sql import func
@@ -41,6 +41,7 @@ class CasualRequest(Base):
     # Request content
     query = Column(Text, nullable=False, comment="Original request text")
     optimized_query = Column(Text, nullable=False, comment="AI-optimized request text for better matching")
+    query_embedding = Column(LargeBinary, nullable=True, comment="float32 embedding of optimized_query (filled by the matching index)")
     
     # Status and metadata
     is_active = Column(Boolean, default=True, nullable=False, index=True)
@@ -121,7 +122,9 @@ class CasualRequest(Base):
         existing = db.query(cls).filter(cls.user_id == user_id).first()
         
         if existing:
-            # Update existing request
+            # Update existing request (a changed text is re-embedded by the matching index)
+            if existing.optimized_query != optimized_query:
+                existing.query_embedding = None
             existing.query = query
             existing.optimized_query = optimized_query
             existing.province_id = province_id
@@ -282,15 +285,9 @@ class CasualRequest(Base):
         their_timing = other_preferences.get('timing')
         
         if my_timing and their_timing:
-            # Simple compatibility check - can be enhanced
-            compatible_timings = {
-                'weekend': ['weekend', 'flexible'],
-                'weekday': ['weekday', 'flexible'],
-                'evening': ['evening', 'flexible'],
-                'flexible': ['weekend', 'weekday', 'evening', 'flexible']
-            }
+            from services.casual_matching import TIMING_COMPATIBILITY
             
-            if their_timing in compatible_timings.get(my_timing, []):
+            if their_timing in TIMING_COMPATIBILITY.get(my_timing, []):
                 return True
         
         return False
@@ -299,32 +296,15 @@ class CasualRequest(Base):
         """
         Calculate similarity score with another casual request
         
+        Uses the same scoring as /casual-requests/matches: embedding similarity of
+        optimized_query plus location and preference boosts.
+        
         Args:
             other: Another CasualRequest to compare with
             
         Returns:
             float: Similarity score between 0.0 and 1.0
         """
-        score = 0.0
-        
-        # Location similarity (40% weight)
-        if self.location and other.location:
-            if self.location.lower() in other.location.lower() or \
-               other.location.lower() in self.location.lower():
-                score += 0.4
-        
-        # Preferences matching (30% weight)
-        if self.preferences and other.preferences:
-            if self.matches_preferences(other.preferences):
-                score += 0.3
-        
-        # Query text similarity (30% weight) - simple keyword matching
-        my_words = set(self.query.lower().split())
-        their_words = set(other.query.lower().split())
-        common_words = my_words.intersection(their_words)
-        
-        if my_words and their_words:
-            text_similarity = len(common_words) / len(my_words.union(their_words))
-            score += text_similarity * 0.3
+        from services.casual_matching import casual_match_engine
         
-        return min(1.0, score)  # Cap at 1.0
\ No newline at end of file
+        return float(casual_match_engine.score_requests(self, [other])[0])
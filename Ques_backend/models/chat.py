@@ -3,7 +3,7 @@ Chat system models for AI-powered user discovery conversations
 Simplified design based on frontend API requirements
 """
 
-from sqlalchemy import Column, String, Text, Boolean, Integer, TIMESTAMP, ForeignKey, ARRAY, UUID, Numeric
+from sqlalchemy import Column, String, Text, Boolean, Integer, TIMESTAMP, ForeignKey, ARRAY, UUID, Numeric, Index
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -63,6 +63,11 @@ class ChatMessage(Base):
     recommendations = relationship("MessageRecommendation", back_populates="message", cascade="all, delete-orphan", uselist=False)  # One batch per message
     suggested_queries = relationship("SuggestedQuery", back_populates="message", cascade="all, delete-orphan")
     
+    # Keyset pagination of a session's history
+    __table_args__ = (
+        Index('ix_chat_messages_session_created_id', 'session_id', 'created_at', 'id'),
+    )
+    
     def __repr__(self):
         return f"<ChatMessage {self.id}: {self.message_type} - {self.message_text[:50]}...>"
 
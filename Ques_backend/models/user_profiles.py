@@ -3,7 +3,7 @@ User Profile Model
 Represents the user_profiles table in the database
 """
 
-from sqlalchemy import Column, BigInteger, Integer, String, Boolean, JSON, Date, DateTime, ForeignKey, Text
+from sqlalchemy import Column, BigInteger, Integer, String, Boolean, JSON, Date, DateTime, ForeignKey, Text, Index, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import JSONB
@@ -16,6 +16,17 @@ class UserProfile(Base):
     User Profile model matching user_profiles table schema
     """
     __tablename__ = "user_profiles"
+    __table_args__ = (
+        # Search filters: trigram indexes serve ILIKE '%term%', the JSONB index serves skills ?| / ?&
+        Index('ix_user_profiles_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_user_profiles_intro_trgm', 'one_sentence_intro', postgresql_using='gin',
+              postgresql_ops={'one_sentence_intro': 'gin_trgm_ops'}),
+        Index('ix_user_profiles_location_trgm', 'location', postgresql_using='gin',
+              postgresql_ops={'location': 'gin_trgm_ops'}),
+        Index('ix_user_profiles_university_trgm', 'current_university', postgresql_using='gin',
+              postgresql_ops={'current_university': 'gin_trgm_ops'}),
+        Index('ix_user_profiles_skills_gin', 'skills', postgresql_using='gin'),
+    )
     
     # Primary key
     id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
@@ -115,3 +126,11 @@ class UserProfile(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
+
+
+# gin_trgm_ops comes from pg_trgm: install it before create_all (main.py startup) creates the trigram indexes
+event.listen(
+    UserProfile.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
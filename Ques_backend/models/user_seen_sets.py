@@ -0,0 +1,31 @@
+"""
+User seen-set model
+Per-user compressed bitmaps of profiles already seen or swiped
+"""
+
+from sqlalchemy import Column, BigInteger, LargeBinary, TIMESTAMP, ForeignKey, JSON
+from datetime import datetime
+from .base import Base
+
+
+class UserSeenSet(Base):
+    """
+    User seen sets - one row per user
+
+    seen_bitmap / swiped_bitmap hold serialized CompactBitmap sets of target user IDs
+    (see services.compact_bitmap). Target IDs that are not unsigned 32-bit integers are
+    kept in the JSON overflow lists.
+    """
+    __tablename__ = "user_seen_sets"
+
+    user_id = Column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    seen_bitmap = Column(LargeBinary, nullable=True)    # Shown or swiped
+    swiped_bitmap = Column(LargeBinary, nullable=True)  # Swiped (any action)
+    seen_overflow = Column(JSON, nullable=True)         # Non-integer seen IDs
+    swiped_overflow = Column(JSON, nullable=True)       # Non-integer swiped IDs
+
+    updated_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<UserSeenSet(user_id={self.user_id})>"
@@ -2,7 +2,7 @@
 User swipes model matching database schema
 """
 
-from sqlalchemy import Column, Integer, String, TIMESTAMP, Boolean, ForeignKey, DECIMAL
+from sqlalchemy import Column, Integer, String, TIMESTAMP, Boolean, ForeignKey, DECIMAL, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from enum import Enum
@@ -14,6 +14,9 @@ class SwipeDirection(str, Enum):
     RIGHT = "right" # like 
     SUPER = "super" # super like
 
+# Directions that count as a like (for mutual-like / match detection)
+POSITIVE_SWIPE_DIRECTIONS = (SwipeDirection.RIGHT.value, SwipeDirection.SUPER.value)
+
 class UserSwipe(Base):
     """
     User swipes table - matches existing database schema
@@ -31,4 +34,9 @@ class UserSwipe(Base):
 
     # Relationships (removed back_populates since User model doesn't have these relationships)
     swiper = relationship("User", foreign_keys=[swiper_id])
-    swiped_user = relationship("User", foreign_keys=[swiped_user_id])
\ No newline at end of file
+    swiped_user = relationship("User", foreign_keys=[swiped_user_id])
+
+    # Covers "did A swipe B" and the reverse mutual-like probe (index-only lookups)
+    __table_args__ = (
+        Index('ix_user_swipes_swiper_swiped_direction', 'swiper_id', 'swiped_user_id', 'swipe_direction'),
+    )
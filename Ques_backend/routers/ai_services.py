@@ -12,9 +12,8 @@ from datetime import datetime
 import json
 
 from dependencies.db import get_db
-from dependencies.auth import get_current_user
+from dependencies.auth import CurrentUser, get_current_user
 from models.user_profiles import UserProfile
-from models.users import User
 
 router = APIRouter()
 
@@ -255,7 +254,7 @@ def analyze_profile_completion(profile: UserProfile) -> Dict:
 async def analyze_user_profile(
     request: ProfileAnalysisRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Analyze user profile completeness and provide AI-powered suggestions for improvement.
@@ -304,7 +303,7 @@ async def analyze_user_profile(
 @router.get("/profile-analysis", response_model=ProfileAnalysisResponse)
 async def get_current_user_profile_analysis(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get AI analysis for the current user's profile (convenience endpoint).
@@ -322,7 +321,7 @@ async def get_current_user_profile_analysis(
 @router.get("/profile-suggestions", response_model=List[ProfileCompletionSuggestion])
 async def get_profile_suggestions(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get only the improvement suggestions for the current user's profile.
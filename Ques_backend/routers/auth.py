@@ -4,14 +4,13 @@ Handles user registration, login, verification, and token management
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from fastapi.security import HTTPBearer
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from typing import Optional
 import logging
 
 from dependencies.db import get_db
-from dependencies.auth import get_current_user, get_current_active_user
-from models.users import User
+from dependencies.auth import CurrentUser, get_current_user, get_current_active_user
 from models.user_auth import UserAuth, VerificationCode, RefreshToken, ProviderType
 from services.auth_service import AuthService
 from services.email_service import EmailService
@@ -241,13 +240,15 @@ async def refresh_token(
 @router.post("/logout")
 async def logout(
     refresh_data: RefreshTokenRequest,
-    current_user: User = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Logout user by revoking refresh token
+    Logout user by revoking refresh token and the current access token
     """
     try:
+        auth_service.revoke_access_token(credentials.credentials)
         success = auth_service.revoke_refresh_token(db, refresh_data.refresh_token)
         
         if success:
@@ -264,7 +265,7 @@ async def logout(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_active_user)
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """
     Get current user information
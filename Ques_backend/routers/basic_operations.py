@@ -15,7 +15,7 @@ from pydantic import BaseModel, Field, EmailStr, validator
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy import and_, or_, desc, exists, func
 import logging
 
 from dependencies.db import get_db
@@ -23,8 +23,11 @@ from dependencies.auth import get_current_user
 from models.users import User
 from models.user_profiles import UserProfile
 from models.whispers import Whisper
-from models.user_swipes import UserSwipe, SwipeDirection
+from models.user_swipes import UserSwipe, SwipeDirection, POSITIVE_SWIPE_DIRECTIONS
 from services.auth_service import AuthService
+from services.seen_set_service import seen_set_service
+from services.profile_card_cache import profile_card_cache
+from services.candidate_feed import candidate_feed_service
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -376,14 +379,6 @@ async def swipe_user(
         user_id = current_user["id"]
         logger.info(f"User {user_id} swiping {request.direction} on user {request.target_user_id}")
         
-        # Check if target user exists
-        target_user = db.query(User).filter(User.id == request.target_user_id).first()
-        if not target_user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Target user not found"
-            )
-        
         # Check if user is trying to swipe themselves
         if user_id == request.target_user_id:
             raise HTTPException(
@@ -391,35 +386,49 @@ async def swipe_user(
                 detail="Cannot swipe on yourself"
             )
         
-        # Check if swipe already exists
-        existing_swipe = db.query(UserSwipe).filter(
-            and_(
-                UserSwipe.user_id == user_id,
-                UserSwipe.swiped_user_id == request.target_user_id
+        # Target existence, previous swipe and reverse like in one query
+        # (both EXISTS probes use the swiper/swiped/direction index)
+        target = db.query(
+            User.id,
+            exists().where(
+                UserSwipe.swiper_id == user_id,
+                UserSwipe.swiped_user_id == User.id
+            ).label("already_swiped"),
+            exists().where(
+                UserSwipe.swiper_id == User.id,
+                UserSwipe.swiped_user_id == user_id,
+                UserSwipe.swipe_direction.in_(POSITIVE_SWIPE_DIRECTIONS)
+            ).label("liked_back")
+        ).filter(User.id == request.target_user_id).first()
+        
+        if not target:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Target user not found"
             )
-        ).first()
         
-        if existing_swipe:
+        if target.already_swiped:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="You have already swiped on this user"
             )
         
-        # Map direction to enum
+        # Map direction to stored swipe direction
         direction_map = {
-            'like': SwipeDirection.LIKE,
-            'dislike': SwipeDirection.DISLIKE,
-            'superlike': SwipeDirection.SUPERLIKE
+            'like': SwipeDirection.RIGHT,
+            'dislike': SwipeDirection.LEFT,
+            'superlike': SwipeDirection.SUPER
         }
         
         # Create swipe
         swipe = UserSwipe(
-            user_id=user_id,
+            swiper_id=user_id,
             swiped_user_id=request.target_user_id,
-            direction=direction_map[request.direction]
+            swipe_direction=direction_map[request.direction].value
         )
         
         db.add(swipe)
+        seen_set_service.record_swipes(db, user_id, [request.target_user_id])
         db.commit()
         db.refresh(swipe)
         
@@ -429,16 +438,8 @@ async def swipe_user(
         message = f"You {request.direction}d this user"
         
         if request.direction in ['like', 'superlike']:
-            # Check if target user also liked current user
-            reverse_swipe = db.query(UserSwipe).filter(
-                and_(
-                    UserSwipe.user_id == request.target_user_id,
-                    UserSwipe.swiped_user_id == user_id,
-                    UserSwipe.direction.in_([SwipeDirection.LIKE, SwipeDirection.SUPERLIKE])
-                )
-            ).first()
-            
-            if reverse_swipe:
+            # Target user also liked current user
+            if target.liked_back:
                 is_match = True
                 # TODO: Create match record in matches table
                 message = "🎉 It's a match! You can now send messages."
@@ -483,9 +484,10 @@ async def get_top_profiles(
     - `exclude_seen`: Exclude already swiped users (default: true)
     
     **Algorithm:**
+    - Served from the user's precomputed candidate feed (ranked by profile
+      similarity, recency and activity; refilled in the background when low)
     - Filters out users already swiped
     - Returns active users with complete profiles
-    - Ordered by relevance (can be enhanced with ML)
     """
     try:
         user_id = current_user["id"]
@@ -497,40 +499,44 @@ async def get_top_profiles(
         if limit < 1:
             limit = 10
         
-        # Build base query
-        query = db.query(User).join(UserProfile).filter(
-            User.id != user_id,
-            User.user_status == 'active',
-            UserProfile.name.isnot(None)
-        )
-        
-        # Exclude seen users if requested
+        # Pop ranked candidates from the feed, skipping users swiped since it was built
+        ranked = []
         if exclude_seen:
-            seen_user_ids = db.query(UserSwipe.swiped_user_id).filter(
-                UserSwipe.user_id == user_id
-            ).all()
-            seen_ids = [swipe[0] for swipe in seen_user_ids]
-            
-            if seen_ids:
-                query = query.filter(User.id.notin_(seen_ids))
+            seen_set = seen_set_service.get(db, user_id)
+            ranked = await candidate_feed_service.pop(user_id, limit, is_excluded=seen_set.is_swiped)
+        
+        # Fallback: newest active users (feed disabled, empty or unavailable)
+        if not ranked:
+            query = db.query(User.id).join(UserProfile).filter(
+                User.id != user_id,
+                User.user_status == 'active',
+                UserProfile.name.isnot(None)
+            )
+            if exclude_seen:
+                query = query.filter(seen_set_service.sql_exclusion(db, user_id, User.id))
+            ranked = [(row.id, None) for row in query.order_by(User.created_at.desc()).limit(limit).all()]
+            if exclude_seen:
+                candidate_feed_service.mark_served(user_id, [profile_user_id for profile_user_id, _ in ranked])
         
-        # Get users (ordered by created_at for now, can add ML ranking later)
-        users = query.order_by(User.created_at.desc()).limit(limit).all()
+        scores = dict(ranked)
+        user_ids = [profile_user_id for profile_user_id, _ in ranked]
+        cards = profile_card_cache.get_many(db, user_ids)
         
         # Build profile summaries
         profiles = []
-        for user in users:
-            if user.profile:
+        for profile_user_id in user_ids:
+            card = cards.get(profile_user_id)
+            if card:
                 profiles.append(ProfileSummary(
-                    user_id=user.id,
-                    name=user.profile.name or "Unknown",
-                    role=user.profile.role,
-                    location=user.profile.location,
-                    bio=user.profile.bio,
-                    skills=user.profile.skills or [],
-                    interests=user.profile.interests or [],
-                    avatar_url=user.profile.avatar_url,
-                    match_score=None  # Can add ML-based scoring later
+                    user_id=profile_user_id,
+                    name=card.get("name") or "Unknown",
+                    role=card.get("role"),
+                    location=card.get("location"),
+                    bio=card.get("bio"),
+                    skills=card.get("skills") or [],
+                    interests=card.get("interests") or [],
+                    avatar_url=card.get("avatar_url"),
+                    match_score=scores.get(profile_user_id)
                 ))
         
         logger.info(f"✅ Returned {len(profiles)} profiles")
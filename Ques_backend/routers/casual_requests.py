@@ -4,14 +4,16 @@ Handles social activity requests and matching
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 import logging
 from datetime import datetime, timedelta
 
-from dependencies.db import get_db
-from dependencies.auth import get_current_user
+from dependencies.db import get_async_db
+from dependencies.auth import CurrentUser, get_current_user_async
 from models.casual_requests import CasualRequest
+from services.casual_matching import casual_match_engine
 from schemas.casual_requests import (
     CasualRequestCreate,
     CasualRequestUpdate,
@@ -28,15 +30,15 @@ logger = logging.getLogger(__name__)
 @router.post("/", response_model=CasualRequestResponse, status_code=status.HTTP_201_CREATED)
 async def create_or_update_casual_request(
     request_data: CasualRequestCreate,
-    db: Session = Depends(get_db),
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user_async)
 ):
     """
     Create or update a casual request for the current user
     Only one active request per user is maintained
     """
     try:
-        user_id = str(current_user["id"])
+        user_id = str(current_user.id)
         
         # Simple AI optimization (in production, use proper AI service)
         optimized_query = f"Seeking: {request_data.query}"
@@ -47,8 +49,8 @@ async def create_or_update_casual_request(
             if "activity_type" in request_data.preferences:
                 optimized_query += f" - {request_data.preferences['activity_type']} activity"
         
-        casual_request = CasualRequest.upsert_request(
-            db=db,
+        casual_request = await db.run_sync(
+            CasualRequest.upsert_request,
             user_id=user_id,
             query=request_data.query,
             optimized_query=optimized_query,
@@ -69,17 +71,17 @@ async def create_or_update_casual_request(
 
 @router.get("/my-request", response_model=Optional[CasualRequestResponse])
 async def get_my_casual_request(
-    db: Session = Depends(get_db),
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user_async)
 ):
     """Get the current user's active casual request"""
     try:
-        user_id = str(current_user["id"])
-        request = CasualRequest.get_active_by_user(db, user_id)
+        user_id = str(current_user.id)
+        request = await db.run_sync(CasualRequest.get_active_by_user, user_id)
         
         if request:
             # Update last activity
-            request.update_activity(db)
+            await db.run_sync(request.update_activity)
         
         return request
         
@@ -93,13 +95,13 @@ async def get_my_casual_request(
 @router.put("/my-request", response_model=CasualRequestResponse)
 async def update_my_casual_request(
     updates: CasualRequestUpdate,
-    db: Session = Depends(get_db),
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user_async)
 ):
     """Update the current user's casual request"""
     try:
-        user_id = str(current_user["id"])
-        request = CasualRequest.get_active_by_user(db, user_id)
+        user_id = str(current_user.id)
+        request = await db.run_sync(CasualRequest.get_active_by_user, user_id)
         
         if not request:
             raise HTTPException(
@@ -114,6 +116,7 @@ async def update_my_casual_request(
             request.optimized_query = f"Seeking: {updates.query}"
             if request.province_id and request.city_id:
                 request.optimized_query += f" in province {request.province_id}, city {request.city_id}"
+            request.query_embedding = None  # Re-embedded by the matching index
         
         if updates.province_id is not None:
             request.province_id = updates.province_id
@@ -130,8 +133,8 @@ async def update_my_casual_request(
         request.updated_at = datetime.utcnow()
         request.last_activity_at = datetime.utcnow()
         
-        db.commit()
-        db.refresh(request)
+        await db.commit()
+        await db.refresh(request)
         
         logger.info(f"Casual request updated for user {user_id}")
         return request
@@ -147,13 +150,13 @@ async def update_my_casual_request(
 
 @router.delete("/my-request", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_my_casual_request(
-    db: Session = Depends(get_db),
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user_async)
 ):
     """Delete/deactivate the current user's casual request"""
     try:
-        user_id = str(current_user["id"])
-        request = CasualRequest.get_active_by_user(db, user_id)
+        user_id = str(current_user.id)
+        request = await db.run_sync(CasualRequest.get_active_by_user, user_id)
         
         if not request:
             raise HTTPException(
@@ -161,7 +164,7 @@ async def delete_my_casual_request(
                 detail="No active casual request found"
             )
         
-        request.deactivate(db)
+        await db.run_sync(request.deactivate)
         logger.info(f"Casual request deactivated for user {user_id}")
         
     except HTTPException:
@@ -178,17 +181,17 @@ async def search_casual_requests(
     province_id: Optional[int] = Query(None, description="Filter by province ID"),
     city_id: Optional[int] = Query(None, description="Filter by city ID"),
     limit: int = Query(20, ge=1, le=100, description="Number of results"),
-    db: Session = Depends(get_db),
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user_async)
 ):
     """Search for casual requests by location"""
     try:
-        user_id = str(current_user["id"])
+        user_id = str(current_user.id)
         
         if province_id or city_id:
-            requests = CasualRequest.search_by_location(db, province_id, city_id, limit)
+            requests = await db.run_sync(CasualRequest.search_by_location, province_id, city_id, limit)
         else:
-            requests = CasualRequest.get_active_requests(db, limit)
+            requests = await db.run_sync(CasualRequest.get_active_requests, limit)
         
         # Exclude current user's own request
         filtered_requests = [r for r in requests if r.user_id != user_id]
@@ -205,13 +208,13 @@ async def search_casual_requests(
 @router.get("/matches", response_model=List[CasualRequestMatch])
 async def get_potential_matches(
     limit: int = Query(10, ge=1, le=50, description="Number of matches to return"),
-    db: Session = Depends(get_db),
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user_async)
 ):
     """Get potential matches for the current user's request"""
     try:
-        user_id = str(current_user["id"])
-        my_request = CasualRequest.get_active_by_user(db, user_id)
+        user_id = str(current_user.id)
+        my_request = await db.run_sync(CasualRequest.get_active_by_user, user_id)
         
         if not my_request:
             raise HTTPException(
@@ -219,50 +222,31 @@ async def get_potential_matches(
                 detail="No active casual request found. Create one first."
             )
         
-        # Get other active requests
-        all_requests = CasualRequest.get_active_requests(db, 100)
-        other_requests = [r for r in all_requests if r.user_id != user_id]
-        
-        matches = []
-        for request in other_requests[:limit]:
-            # Simple matching algorithm (in production, use AI/ML)
-            similarity_score = 0.0
-            match_reasons = []
-            
-            # Location matching
-            if my_request.province_id and request.province_id:
-                if my_request.province_id == request.province_id:
-                    similarity_score += 0.4
-                    match_reasons.append(f"Same province")
-                    
-                    # Additional score for same city
-                    if my_request.city_id and request.city_id and my_request.city_id == request.city_id:
-                        similarity_score += 0.2
-                        match_reasons.append(f"Same city")
-            
-            # Preferences matching
-            if my_request.preferences and request.preferences:
-                if my_request.preferences.get("activity_type") == request.preferences.get("activity_type"):
-                    similarity_score += 0.3
-                    match_reasons.append("Similar activity type")
-            
-            # Query similarity (simple keyword matching)
-            my_words = set(my_request.query.lower().split())
-            their_words = set(request.query.lower().split())
-            common_words = my_words.intersection(their_words)
-            if common_words:
-                similarity_score += min(0.3, len(common_words) * 0.1)
-                match_reasons.append("Similar interests")
-            
-            if similarity_score > 0.2:  # Minimum threshold
-                matches.append(CasualRequestMatch(
-                    request=request,
-                    similarity_score=similarity_score,
-                    match_reasons=match_reasons
-                ))
+        # Score every active request in the region in one pass, keep the true top-k
+        ranked = await casual_match_engine.find_matches(my_request, limit * 2)
+        if not ranked:
+            return []
+        
+        # Load the winners (twice the limit: requests deactivated since the last index sync drop out here)
+        requests = {
+            request.id: request
+            for request in (await db.scalars(
+                select(CasualRequest).where(
+                    CasualRequest.id.in_([request_id for request_id, _, _ in ranked]),
+                    CasualRequest.is_active == True
+                )
+            )).all()
+        }
         
-        # Sort by similarity score
-        matches.sort(key=lambda x: x.similarity_score, reverse=True)
+        matches = [
+            CasualRequestMatch(
+                request=requests[request_id],
+                similarity_score=score,
+                match_reasons=reasons
+            )
+            for request_id, score, reasons in ranked
+            if request_id in requests
+        ]
         
         return matches[:limit]
         
@@ -277,20 +261,24 @@ async def get_potential_matches(
 
 @router.get("/stats", response_model=CasualRequestStats)
 async def get_casual_requests_stats(
-    db: Session = Depends(get_db),
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user_async)
 ):
     """Get statistics about casual requests"""
     try:
         # Total active requests
-        total_active = db.query(CasualRequest).filter(CasualRequest.is_active == True).count()
+        total_active = await db.scalar(
+            select(func.count(CasualRequest.id)).where(CasualRequest.is_active == True)
+        )
         
         # Requests by province
         location_stats = {}
-        province_data = db.query(CasualRequest.province_id, db.func.count(CasualRequest.id)).filter(
-            CasualRequest.is_active == True,
-            CasualRequest.province_id.isnot(None)
-        ).group_by(CasualRequest.province_id).all()
+        province_data = (await db.execute(
+            select(CasualRequest.province_id, func.count(CasualRequest.id)).where(
+                CasualRequest.is_active == True,
+                CasualRequest.province_id.isnot(None)
+            ).group_by(CasualRequest.province_id)
+        )).all()
         
         for province_id, count in province_data:
             if province_id:
@@ -298,15 +286,15 @@ async def get_casual_requests_stats(
         
         # Recent activity (last 24 hours)
         yesterday = datetime.utcnow() - timedelta(days=1)
-        recent_activity = db.query(CasualRequest).filter(
-            CasualRequest.last_activity_at >= yesterday
-        ).count()
+        recent_activity = await db.scalar(
+            select(func.count(CasualRequest.id)).where(CasualRequest.last_activity_at >= yesterday)
+        )
         
         # Average requests per day (last 7 days)
         week_ago = datetime.utcnow() - timedelta(days=7)
-        week_requests = db.query(CasualRequest).filter(
-            CasualRequest.created_at >= week_ago
-        ).count()
+        week_requests = await db.scalar(
+            select(func.count(CasualRequest.id)).where(CasualRequest.created_at >= week_ago)
+        )
         avg_per_day = week_requests / 7.0
         
         return CasualRequestStats(
@@ -326,13 +314,13 @@ async def get_casual_requests_stats(
 @router.post("/cleanup", status_code=status.HTTP_200_OK)
 async def cleanup_expired_requests(
     days: int = Query(7, ge=1, le=30, description="Delete requests older than this many days"),
-    db: Session = Depends(get_db),
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user_async)
 ):
     """Admin endpoint to clean up expired requests"""
     try:
         # In production, add admin role check here
-        deleted_count = CasualRequest.cleanup_expired(db, days)
+        deleted_count = await db.run_sync(CasualRequest.cleanup_expired, days)
         
         logger.info(f"Cleaned up {deleted_count} expired casual requests (older than {days} days)")
         
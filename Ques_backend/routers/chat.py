@@ -8,17 +8,22 @@ based on AI conversation context.
 Endpoints align with frontend API documentation section 7.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy import desc, func, select, tuple_
 from typing import List, Optional, Dict, Any
+import base64
+import json
 import uuid
 from datetime import datetime
 
-from dependencies.db import get_db
-from dependencies.auth import get_current_user
+from dependencies.db import get_async_db
+from dependencies.auth import CurrentUser, get_current_user_async
 from models.users import User
+from models.user_profiles import UserProfile
 from models.chat import ChatSession, ChatMessage, MessageRecommendation, SuggestedQuery
+from schemas import chat as chat_schemas
 from schemas.chat import (
     SendMessageRequest,
     SendMessageResponse,
@@ -26,13 +31,12 @@ from schemas.chat import (
     CreateSessionRequest,
     CreateSessionResponse,
     GetSessionResponse,
-    ChatSession,
-    ChatMessage,
-    ChatHistoryResponse,
+    ChatHistoryPageResponse,
     SessionDetailsResponse,
     ChatMessageWithRecommendations
 )
 from services.intelligent_user_search import get_search_service
+from services.profile_card_cache import profile_card_cache
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
@@ -40,8 +44,8 @@ router = APIRouter(prefix="/chat", tags=["chat"])
 @router.post("/message", response_model=SendMessageResponse)
 async def send_message(
     request: SendMessageRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Send a message to AI and receive response with user recommendations.
@@ -56,13 +60,22 @@ async def send_message(
         - Suggested follow-up queries
     """
     try:
+        now = datetime.utcnow()
+        
         # Get or create chat session
         session = None
-        if request.session_id:
-            session = db.query(ChatSession).filter(
-                ChatSession.id == request.session_id,
+        if request.sessionId:
+            try:
+                session_id = uuid.UUID(request.sessionId)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid session ID"
+                )
+            session = await db.scalar(select(ChatSession).where(
+                ChatSession.id == session_id,
                 ChatSession.user_id == current_user.id
-            ).first()
+            ))
             
             if not session:
                 raise HTTPException(
@@ -74,30 +87,36 @@ async def send_message(
             session = ChatSession(
                 user_id=current_user.id,
                 title=request.message[:50] + "..." if len(request.message) > 50 else request.message,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
+                created_at=now,
+                message_count=0
             )
             db.add(session)
-            db.flush()  # Get the ID
+            await db.flush()  # Get the ID
 
         # Save user message
         user_message = ChatMessage(
             session_id=session.id,
-            content=request.message,
-            is_ai_response=False,
-            timestamp=datetime.utcnow()
+            message_text=request.message,
+            message_type="user",
+            search_mode=request.searchMode,
+            quoted_contacts=request.quotedContacts or None,
+            created_at=now
         )
         db.add(user_message)
-        db.flush()
+        await db.flush()
 
         # AI-powered user search and response generation
         search_service = await get_search_service()
         
-        # Get current user context for personalized search
+        # Get current user context for personalized search (awaited profile load, no lazy User access)
+        profile = (await db.execute(
+            select(UserProfile.name, UserProfile.skills, UserProfile.one_sentence_intro)
+            .where(UserProfile.user_id == current_user.id)
+        )).first()
         current_user_context = {
-            "name": current_user.name or f"User {current_user.id}",
-            "skills": [],  # TODO: Get from user profile
-            "bio": current_user.bio if hasattr(current_user, 'bio') else ""
+            "name": (profile.name if profile else None) or f"User {current_user.id}",
+            "skills": (profile.skills or []) if profile else [],
+            "bio": (profile.one_sentence_intro or "") if profile else ""
         }
         
         # Perform intelligent user search
@@ -121,12 +140,14 @@ async def send_message(
         # Save AI response message
         ai_message = ChatMessage(
             session_id=session.id,
-            content=ai_response_text,
-            is_ai_response=True,
-            timestamp=datetime.utcnow()
+            message_text=ai_response_text,
+            message_type="ai",
+            search_query=request.message,
+            search_mode=request.searchMode,
+            created_at=datetime.utcnow()
         )
         db.add(ai_message)
-        db.flush()
+        await db.flush()
 
         # Get recommended user IDs and create recommendation batch
         recommended_user_ids = search_results.get("user_ids", [])
@@ -165,20 +186,31 @@ async def send_message(
             )
             db.add(suggested_query)
 
-        # Update session timestamp
-        session.updated_at = datetime.utcnow()
+        # Update session activity
+        session.last_message_at = ai_message.created_at
+        session.message_count = (session.message_count or 0) + 2
         
-        db.commit()
+        await db.commit()
 
         return SendMessageResponse(
-            message=ai_response_text,
+            message=chat_schemas.ChatMessage(
+                id=str(ai_message.id),
+                session_id=str(session.id),
+                message_text=ai_message.message_text,
+                message_type=ai_message.message_type,
+                search_query=ai_message.search_query,
+                search_mode=ai_message.search_mode,
+                created_at=ai_message.created_at
+            ),
             recommendations=user_recommendations,
             suggestedQueries=suggested_queries,
-            sessionId=session.id
+            sessionId=str(session.id)
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing message: {str(e)}"
@@ -188,8 +220,8 @@ async def send_message(
 @router.post("/session", response_model=CreateSessionResponse)
 async def create_session(
     request: CreateSessionRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new chat session.
@@ -205,21 +237,21 @@ async def create_session(
             user_id=current_user.id,
             title=request.title or "New Chat",
             created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            message_count=0
         )
         
         db.add(session)
-        db.commit()
-        db.refresh(session)
+        await db.commit()
+        await db.refresh(session)
         
         return CreateSessionResponse(
-            sessionId=session.id,
+            sessionId=str(session.id),
             title=session.title,
             createdAt=session.created_at
         )
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating session: {str(e)}"
@@ -228,9 +260,9 @@ async def create_session(
 
 @router.get("/session/{session_id}", response_model=GetSessionResponse)
 async def get_session_details(
-    session_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    session_id: uuid.UUID,
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get detailed information about a specific chat session.
@@ -241,10 +273,10 @@ async def get_session_details(
     Returns:
         Session details with message count and latest activity
     """
-    session = db.query(ChatSession).filter(
+    session = await db.scalar(select(ChatSession).where(
         ChatSession.id == session_id,
         ChatSession.user_id == current_user.id
-    ).first()
+    ))
     
     if not session:
         raise HTTPException(
@@ -253,43 +285,50 @@ async def get_session_details(
         )
     
     # Get message count
-    message_count = db.query(ChatMessage).filter(
-        ChatMessage.session_id == session_id
-    ).count()
+    message_count = await db.scalar(
+        select(func.count()).select_from(ChatMessage).where(ChatMessage.session_id == session_id)
+    )
     
     return GetSessionResponse(
-        sessionId=session.id,
+        sessionId=str(session.id),
         title=session.title,
         messageCount=message_count,
         createdAt=session.created_at,
-        lastActivity=session.updated_at
+        lastActivity=session.last_message_at or session.created_at
     )
 
 
-@router.get("/session/{session_id}/history", response_model=ChatHistoryResponse)
+@router.get("/session/{session_id}/history", response_model=ChatHistoryPageResponse)
 async def get_chat_history(
-    session_id: int,
-    limit: Optional[int] = 50,
-    offset: Optional[int] = 0,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    session_id: uuid.UUID,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's nextCursor"),
+    include_recommendations: bool = True,
+    include_suggested_queries: bool = False,
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get chat history for a session with pagination.
+    Get chat history for a session with keyset pagination.
+    
+    Messages are ordered by (created_at, id); each page reads limit + 1 rows from the
+    (session_id, created_at, id) index to determine hasMore, so no COUNT is needed.
     
     Args:
         session_id: ID of the session
         limit: Maximum number of messages to return (default: 50)
-        offset: Number of messages to skip for pagination (default: 0)
+        cursor: nextCursor from the previous page (omit for the first page)
+        include_recommendations: Eager-load recommendation batches and build user cards
+        include_suggested_queries: Eager-load suggested follow-up queries
         
     Returns:
-        List of messages with recommendations and metadata
+        Page of messages with recommendations, nextCursor and hasMore
     """
     # Verify session ownership
-    session = db.query(ChatSession).filter(
+    session = await db.scalar(select(ChatSession).where(
         ChatSession.id == session_id,
         ChatSession.user_id == current_user.id
-    ).first()
+    ))
     
     if not session:
         raise HTTPException(
@@ -297,50 +336,74 @@ async def get_chat_history(
             detail="Chat session not found"
         )
     
-    # Get messages with pagination
-    messages = db.query(ChatMessage).filter(
-        ChatMessage.session_id == session_id
-    ).order_by(ChatMessage.timestamp).offset(offset).limit(limit).all()
+    query = select(ChatMessage).where(ChatMessage.session_id == session_id)
+    
+    if include_recommendations:
+        query = query.options(selectinload(ChatMessage.recommendations))
+    if include_suggested_queries:
+        query = query.options(selectinload(ChatMessage.suggested_queries))
+    
+    # Continue after the last message of the previous page
+    if cursor:
+        after_created_at, after_id = _decode_history_cursor(cursor)
+        query = query.where(
+            tuple_(ChatMessage.created_at, ChatMessage.id) > tuple_(after_created_at, after_id)
+        )
+    
+    rows = (await db.scalars(query.order_by(ChatMessage.created_at, ChatMessage.id).limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    messages = rows[:limit]
+    
+    # Load the cards of every recommended user on the page at once
+    cards = {}
+    if include_recommendations:
+        page_user_ids = [
+            user_id
+            for message in messages
+            if message.message_type == "ai" and message.recommendations
+            for user_id in (message.recommendations.recommended_user_ids or [])
+        ]
+        cards = await db.run_sync(profile_card_cache.get_many, page_user_ids)
     
     # Build response with recommendations
     message_list = []
     for message in messages:
         message_data = ChatMessageWithRecommendations(
             id=message.id,
-            content=message.content,
-            isAiResponse=message.is_ai_response,
-            timestamp=message.timestamp,
+            content=message.message_text,
+            isAiResponse=message.message_type == "ai",
+            timestamp=message.created_at,
             recommendations=[]
         )
         
         # Add recommendations for AI messages
-        if message.is_ai_response and message.recommendations:
+        if include_recommendations and message.message_type == "ai" and message.recommendations:
             user_recommendations = await build_user_recommendation_cards(
                 user_ids=message.recommendations.recommended_user_ids,
                 context_user_id=current_user.id,
-                db=db
+                db=db,
+                cards=cards
             )
             message_data.recommendations = user_recommendations
         
+        if include_suggested_queries:
+            message_data.suggestedQueries = [suggestion.query_text for suggestion in message.suggested_queries]
+        
         message_list.append(message_data)
     
-    total_messages = db.query(ChatMessage).filter(
-        ChatMessage.session_id == session_id
-    ).count()
-    
-    return ChatHistoryResponse(
+    return ChatHistoryPageResponse(
         sessionId=session_id,
         messages=message_list,
-        totalMessages=total_messages,
-        hasMore=offset + limit < total_messages
+        nextCursor=_encode_history_cursor(messages[-1]) if has_more else None,
+        hasMore=has_more
     )
 
 
 @router.delete("/session/{session_id}")
 async def delete_session(
-    session_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    session_id: uuid.UUID,
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a chat session and all associated messages.
@@ -351,10 +414,10 @@ async def delete_session(
     Returns:
         Success confirmation
     """
-    session = db.query(ChatSession).filter(
+    session = await db.scalar(select(ChatSession).where(
         ChatSession.id == session_id,
         ChatSession.user_id == current_user.id
-    ).first()
+    ))
     
     if not session:
         raise HTTPException(
@@ -363,13 +426,13 @@ async def delete_session(
         )
     
     try:
-        db.delete(session)
-        db.commit()
+        await db.delete(session)
+        await db.commit()
         
         return {"message": "Chat session deleted successfully"}
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error deleting session: {str(e)}"
@@ -378,10 +441,79 @@ async def delete_session(
 
 # Helper functions
 
+def _encode_history_cursor(message: ChatMessage) -> str:
+    """
+    Encode the keyset position of a message as an opaque cursor.
+    
+    Args:
+        message: Last message of the current page
+        
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps({"t": message.created_at.isoformat(), "id": str(message.id)})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_history_cursor(cursor: str) -> tuple:
+    """
+    Decode a cursor produced by _encode_history_cursor.
+    
+    Args:
+        cursor: Cursor string from the client
+        
+    Returns:
+        (created_at, message_id) keyset position
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), uuid.UUID(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor: {str(e)}"
+        )
+
+
+def _recommendation_from_card(
+    card: Dict[str, Any],
+    match_score: float,
+    why_match: str,
+    name: Optional[str] = None,
+    bio: Optional[str] = None
+) -> UserRecommendation:
+    """
+    Build a UserRecommendation from a cached profile card.
+    
+    Args:
+        card: Profile card from the profile card cache
+        match_score: Match score (clamped to 0-1)
+        why_match: Match explanation
+        name: Name override (e.g. from search results)
+        bio: Bio override (e.g. from search results)
+        
+    Returns:
+        UserRecommendation object
+    """
+    return UserRecommendation(
+        id=int(card["id"]),
+        name=name or card.get("name") or f"User {card['id']}",
+        avatar=card.get("avatar_url"),
+        location=card.get("location"),
+        skills=[skill for skill in (card.get("skills") or []) if isinstance(skill, str)],
+        bio=bio or card.get("bio") or "",
+        matchScore=min(max(match_score, 0.0), 1.0),  # Ensure 0-1 range
+        whyMatch=why_match,
+        isOnline=False,  # TODO: Implement real-time online status
+        mutualConnections=0  # TODO: Calculate actual mutual connections
+    )
+
+
 async def build_user_recommendation_cards_from_search(
     search_recommendations: List[Dict[str, Any]],
     context_user_id: int,
-    db: Session
+    db: AsyncSession
 ) -> List[UserRecommendation]:
     """
     Build UserRecommendation cards from intelligent search results.
@@ -397,33 +529,33 @@ async def build_user_recommendation_cards_from_search(
     if not search_recommendations:
         return []
     
+    # Load all users and profiles at once instead of one query per recommendation
+    user_ids = [
+        int(rec['user_id']) for rec in search_recommendations
+        if str(rec.get('user_id') or '').isdigit()
+    ]
+    cards = await db.run_sync(profile_card_cache.get_many, user_ids)
+    
     recommendations = []
     
     for rec in search_recommendations:
         user_id = rec.get('user_id')
-        if not user_id:
+        if not str(user_id or '').isdigit():
             continue
-            
-        # Get additional user data from database if needed
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
+        
+        card = cards.get(int(user_id))
+        if not card:
             continue
         
         # TODO: Calculate actual online status, mutual connections, response rate
-        # For now using search data + basic database info
-        
-        recommendation = UserRecommendation(
-            userId=user_id,
-            name=rec.get('name') or user.name or f"User {user_id}",
-            age=user.age if hasattr(user, 'age') else None,
-            bio=rec.get('bio') or (user.bio if hasattr(user, 'bio') else ""),
-            profilePicture=user.profile_picture_url if hasattr(user, 'profile_picture_url') else None,
-            matchScore=min(max(rec.get('match_score', 0.5), 0.0), 1.0),  # Ensure 0-1 range
-            whyMatch=rec.get('why_match', 'AI-powered match based on your interests'),
-            isOnline=False,  # TODO: Implement real-time online status
-            mutualConnections=0  # TODO: Calculate actual mutual connections
-        )
-        recommendations.append(recommendation)
+        # For now using search data + cached profile card
+        recommendations.append(_recommendation_from_card(
+            card,
+            match_score=rec.get('match_score', 0.5),
+            why_match=rec.get('why_match', 'AI-powered match based on your interests'),
+            name=rec.get('name'),
+            bio=rec.get('bio')
+        ))
     
     return recommendations
 
@@ -431,7 +563,7 @@ async def build_user_recommendation_cards_from_search(
 async def get_recommended_users(
     user_id: int,
     context: str,
-    db: Session,
+    db: AsyncSession,
     limit: int = 10
 ) -> List[int]:
     """
@@ -447,18 +579,19 @@ async def get_recommended_users(
         List of recommended user IDs
     """
     # Simple fallback - get random active users excluding current user
-    users = db.query(User.id).filter(
+    user_ids = await db.scalars(select(User.id).where(
         User.id != user_id,
         User.is_active == True
-    ).limit(limit).all()
+    ).limit(limit))
     
-    return [user.id for user in users]
+    return list(user_ids)
 
 
 async def build_user_recommendation_cards(
     user_ids: List[int],
     context_user_id: int,
-    db: Session
+    db: AsyncSession,
+    cards: Optional[Dict[int, Dict[str, Any]]] = None
 ) -> List[UserRecommendation]:
     """
     Build UserRecommendation cards from user IDs (fallback method).
@@ -467,28 +600,23 @@ async def build_user_recommendation_cards(
         user_ids: List of user IDs to build cards for
         context_user_id: Current user ID for context
         db: Database session
+        cards: Profile cards already loaded for these users (e.g. for a whole history page)
         
     Returns:
-        List of UserRecommendation objects
+        List of UserRecommendation objects in user_ids order
     """
     if not user_ids:
         return []
     
-    users = db.query(User).filter(User.id.in_(user_ids)).all()
-    recommendations = []
+    if cards is None:
+        cards = await db.run_sync(profile_card_cache.get_many, user_ids)
     
-    for user in users:
-        recommendation = UserRecommendation(
-            userId=user.id,
-            name=user.name or f"User {user.id}",
-            age=user.age if hasattr(user, 'age') else None,
-            bio=user.bio if hasattr(user, 'bio') else "",
-            profilePicture=user.profile_picture_url if hasattr(user, 'profile_picture_url') else None,
-            matchScore=0.75,  # Default score for fallback recommendations
-            whyMatch="Suggested based on your profile and preferences",
-            isOnline=False,  # TODO: Implement real-time online status
-            mutualConnections=0  # TODO: Calculate actual mutual connections
+    return [
+        _recommendation_from_card(
+            cards[int(user_id)],
+            match_score=0.75,  # Default score for fallback recommendations
+            why_match="Suggested based on your profile and preferences"
         )
-        recommendations.append(recommendation)
-    
-    return recommendations
\ No newline at end of file
+        for user_id in user_ids
+        if int(user_id) in cards
+    ]
@@ -5,14 +5,19 @@ Provides AI-powered interactions with 3 paths: Search, Inquiry, Chat
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import os
 import logging
 
-from dependencies.auth import get_current_user
+from dependencies.auth import CurrentUser, get_current_user_async
+from dependencies.db import get_async_db
 from services.intelligent_search.intelligent_search_agent import SearchAgent
 from services.intelligent_search.tencent_vectordb_adapter import TencentVectorDBAdapter
+from services.model_registry import model_registry
+from services.seen_set_service import seen_set_service
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -154,10 +159,38 @@ def get_search_agent() -> SearchAgent:
     return _search_agent
 
 
+async def _load_seen_exclusions(db: AsyncSession, user_id: int, viewed_user_ids: Optional[List[str]]) -> Dict[str, List[str]]:
+    """
+    Merge client-reported viewed IDs into the user's server-side seen set
+
+    Args:
+        db: Async database session
+        user_id: Current user ID
+        viewed_user_ids: Viewed IDs sent by the client (optional)
+
+    Returns:
+        Dict with viewed_user_ids and swiped_user_ids to exclude from search
+    """
+    try:
+        if viewed_user_ids:
+            await db.run_sync(lambda session: seen_set_service.record_views(session, user_id, viewed_user_ids))
+            await db.commit()
+        seen_set = await db.run_sync(seen_set_service.get, user_id)
+        return {
+            "viewed_user_ids": seen_set.viewed_only_ids(),
+            "swiped_user_ids": seen_set.swiped_ids()
+        }
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to load seen set for user {user_id}: {e}")
+        await db.rollback()
+        return {"viewed_user_ids": viewed_user_ids or [], "swiped_user_ids": []}
+
+
 @router.post("/conversation", response_model=Dict[str, Any])
 async def intelligent_conversation(
     request: IntelligentConversationRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Main entry point for intelligent agent interaction
@@ -178,12 +211,15 @@ async def intelligent_conversation(
     try:
         agent = get_search_agent()
         
+        exclusions = await _load_seen_exclusions(db, int(current_user.id), request.viewed_user_ids)
+        
         # Call the unified intelligent_conversation method
         result = await agent.intelligent_conversation(
             user_input=request.user_input,
-            user_id=str(current_user.get("id")),
+            user_id=str(current_user.id),
             referenced_ids=request.referenced_ids,
-            viewed_user_ids=request.viewed_user_ids
+            viewed_user_ids=exclusions["viewed_user_ids"],
+            swiped_user_ids=exclusions["swiped_user_ids"]
         )
         
         return result
@@ -199,7 +235,8 @@ async def intelligent_conversation(
 @router.post("/search", response_model=Dict[str, Any])
 async def intelligent_search(
     request: IntelligentConversationRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Direct search endpoint (bypasses intent detection)
@@ -218,34 +255,29 @@ async def intelligent_search(
         agent = get_search_agent()
         
         # Fetch current user details
-        from sqlalchemy.orm import Session
-        from dependencies.db import get_db
-        from models.users import User, UserProfile
+        from models.user_profiles import UserProfile
         
-        db: Session = next(get_db())
-        try:
-            user = db.query(User).filter(User.id == int(current_user.get("id"))).first()
-            current_user_info = None
-            if user and user.profile:
-                current_user_info = {
-                    "id": str(user.id),
-                    "name": user.profile.name or "Unknown",
-                    "role": user.profile.role,
-                    "skills": user.profile.skills or [],
-                    "interests": user.profile.interests or [],
-                    "bio": user.profile.bio or "",
-                    "demands": user.profile.demands or "",
-                    "goals": user.profile.goals or ""
-                }
-        finally:
-            db.close()
+        profile = await db.scalar(select(UserProfile).where(UserProfile.user_id == int(current_user.id)))
+        current_user_info = None
+        if profile:
+            current_user_info = {
+                "id": str(profile.user_id),
+                "name": profile.name or "Unknown",
+                "skills": profile.skills or [],
+                "interests": profile.hobbies or [],
+                "bio": profile.one_sentence_intro or "",
+                "demands": profile.demands or "",
+                "goals": profile.goals or ""
+            }
+        exclusions = await _load_seen_exclusions(db, int(current_user.id), request.viewed_user_ids)
         
         # Call intelligent_search directly
         result = await agent.intelligent_search(
             user_query=request.user_input,
             current_user=current_user_info,
             referenced_users=None,
-            viewed_user_ids=request.viewed_user_ids
+            viewed_user_ids=exclusions["viewed_user_ids"],
+            swiped_user_ids=exclusions["swiped_user_ids"]
         )
         
         return result
@@ -261,7 +293,8 @@ async def intelligent_search(
 @router.post("/analyze-intent", response_model=IntentAnalysisResponse)
 async def analyze_intent(
     request: IntelligentConversationRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Analyze user input to determine intent without executing the action
@@ -279,32 +312,25 @@ async def analyze_intent(
         # Fetch referenced users if provided
         referenced_users = None
         if request.referenced_ids:
-            from sqlalchemy.orm import Session
-            from dependencies.db import get_db
-            from models.users import User, UserProfile
+            from models.user_profiles import UserProfile
             
-            db: Session = next(get_db())
-            try:
-                users = db.query(User).join(UserProfile).filter(
-                    User.id.in_([int(uid) for uid in request.referenced_ids])
-                ).all()
-                
-                referenced_users = []
-                for user in users:
-                    if user.profile:
-                        referenced_users.append({
-                            "id": str(user.id),
-                            "name": user.profile.name or "Unknown",
-                            "role": user.profile.role,
-                            "skills": user.profile.skills or [],
-                            "interests": user.profile.interests or [],
-                            "bio": user.profile.bio or ""
-                        })
-            finally:
-                db.close()
+            profiles = (await db.scalars(select(UserProfile).where(
+                UserProfile.user_id.in_([int(uid) for uid in request.referenced_ids])
+            ))).all()
+            
+            referenced_users = [
+                {
+                    "id": str(profile.user_id),
+                    "name": profile.name or "Unknown",
+                    "skills": profile.skills or [],
+                    "interests": profile.hobbies or [],
+                    "bio": profile.one_sentence_intro or ""
+                }
+                for profile in profiles
+            ]
         
         # Analyze intent
-        intent_result = agent.analyze_user_intent(
+        intent_result = await agent.async_analyze_user_intent(
             user_input=request.user_input,
             referenced_user=referenced_users[0] if referenced_users else None,
             current_user=None  # Not needed for intent analysis
@@ -321,7 +347,7 @@ async def analyze_intent(
 
 
 @router.get("/stats")
-async def get_agent_stats(current_user: dict = Depends(get_current_user)):
+async def get_agent_stats(current_user: CurrentUser = Depends(get_current_user_async)):
     """
     Get search agent statistics
     
@@ -333,6 +359,7 @@ async def get_agent_stats(current_user: dict = Depends(get_current_user)):
         
         return {
             "stats": stats,
+            "models": model_registry.get_memory_report(),
             "timestamp": datetime.now().isoformat()
         }
         
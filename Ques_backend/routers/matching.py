@@ -6,16 +6,18 @@ Implements all matching and search endpoints as defined in the frontend API docu
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func, desc
+from sqlalchemy.dialects.postgresql import array
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
+import asyncio
 import logging
 import json
 
 from dependencies.db import get_db
 from dependencies.auth import get_current_user
 from models.users import User
-from models.swipes import AIRecommendationSwipe
-from models.agent_cards import AgentCardSwipe
+from models.user_profiles import UserProfile
+from services.match_scoring import match_scoring_engine, normalize_skill
 from pydantic import BaseModel, Field
 
 router = APIRouter(prefix="/matching", tags=["Matching"])
@@ -63,6 +65,7 @@ class MatchScore(BaseModel):
     networkOverlap: float
     availabilityMatch: float
     experienceMatch: float
+    demandsMatch: float = 0.0
 
 class MatchExplanation(BaseModel):
     reasons: List[str]
@@ -113,17 +116,16 @@ async def search_users(
     try:
         user_id = current_user["id"]
         
-        # Build base query
-        query = db.query(User).filter(User.id != user_id)
+        # Build base query (profile text filters are served by the trigram/GIN indexes)
+        query = db.query(UserProfile).join(User, User.id == UserProfile.user_id).filter(User.id != user_id)
         
         # Apply text search if query provided
         if params.query:
             search_term = f"%{params.query}%"
             query = query.filter(
                 or_(
-                    User.username.ilike(search_term),
-                    User.display_name.ilike(search_term),
-                    User.bio.ilike(search_term)
+                    UserProfile.name.ilike(search_term),
+                    UserProfile.one_sentence_intro.ilike(search_term)
                 )
             )
         
@@ -132,19 +134,16 @@ async def search_users(
             # Location filter
             if params.filters.get('location'):
                 locations = params.filters['location']
-                query = query.filter(User.location.in_(locations))
+                query = query.filter(UserProfile.location.in_(locations))
             
-            # Skills filter (simplified - assumes skills are stored in bio or separate table)
+            # Skills filter: any of the skills (JSONB ?| on the skills GIN index)
             if params.filters.get('skills'):
-                skills = params.filters['skills']
-                skill_conditions = [User.bio.ilike(f"%{skill}%") for skill in skills]
-                query = query.filter(or_(*skill_conditions))
+                query = query.filter(UserProfile.skills.has_any(array(_skill_variants(params.filters['skills']))))
             
             # University filter
             if params.filters.get('university'):
                 universities = params.filters['university']
-                # Assuming university info is in bio or separate field
-                uni_conditions = [User.bio.ilike(f"%{uni}%") for uni in universities]
+                uni_conditions = [UserProfile.current_university.ilike(f"%{uni}%") for uni in universities]
                 query = query.filter(or_(*uni_conditions))
         
         # Exclude contacts if specified
@@ -154,21 +153,24 @@ async def search_users(
         
         # Apply pagination
         total_count = query.count()
-        users = query.offset(params.offset).limit(params.limit).all()
+        profiles = query.offset(params.offset).limit(params.limit).all()
+        
+        # Score the whole page in one batch
+        scores = await _score_profiles(db, user_id, profiles)
         
         # Convert to UserRecommendation format
         results = []
-        for user in users:
+        for profile, score in zip(profiles, scores):
             results.append(UserRecommendation(
-                id=str(user.id),
-                username=user.username or f"user_{user.id}",
-                displayName=user.display_name,
-                avatarUrl=user.avatar_url,
-                bio=user.bio,
-                skills=[], # TODO: Extract from user data
-                location=user.location,
-                matchScore=75.0, # Placeholder
-                whyMatch="Similar interests and location",
+                id=str(profile.user_id),
+                username=profile.name or f"user_{profile.user_id}",
+                displayName=profile.name,
+                avatarUrl=profile.profile_photo,
+                bio=profile.one_sentence_intro,
+                skills=_skill_names(profile.skills),
+                location=profile.location,
+                matchScore=score["overall"] if score else None,
+                whyMatch=_why_match(score),
                 isOnline=False, # TODO: Get from online status
                 mutualConnections=0, # TODO: Calculate
                 responseRate=0.8 # Placeholder
@@ -202,54 +204,33 @@ async def get_match_score(
     """
     try:
         user_id = current_user["id"]
+        target_id = int(targetUserId)
         
-        # Get current user and target user
-        current_user_obj = db.query(User).filter(User.id == user_id).first()
-        target_user = db.query(User).filter(User.id == int(targetUserId)).first()
+        # Get current user and target user profiles (one query)
+        profiles = match_scoring_engine.load_profiles(db, [user_id, target_id])
         
-        if not target_user:
+        if target_id not in profiles:
             raise HTTPException(status_code=404, detail="Target user not found")
+        if user_id not in profiles:
+            raise HTTPException(status_code=404, detail="Complete your profile to get match scores")
         
-        # Calculate match scores (simplified algorithm)
-        # In a real implementation, this would use ML models and comprehensive analysis
-        
-        # Location match
-        location_match = 80.0 if (current_user_obj.location and target_user.location and 
-                                 current_user_obj.location.lower() in target_user.location.lower()) else 30.0
+        # Skills/goals/demands from normalized skill sets and cached embeddings
+        score = (await asyncio.to_thread(match_scoring_engine.score, profiles[user_id], [profiles[target_id]]))[0]
         
-        # Skills match (placeholder - would need proper skill extraction)
-        skills_match = 70.0  # Placeholder
-        
-        # Goals alignment (placeholder)
-        goals_alignment = 65.0
-        
-        # Network overlap (placeholder)
+        # Not derived from profile data yet; reported but not weighted into overall
         network_overlap = 25.0
-        
-        # Availability match (placeholder)
         availability_match = 85.0
-        
-        # Experience match (placeholder)
         experience_match = 60.0
         
-        # Overall score (weighted average)
-        overall = (
-            location_match * 0.2 +
-            skills_match * 0.25 +
-            goals_alignment * 0.2 +
-            network_overlap * 0.1 +
-            availability_match * 0.15 +
-            experience_match * 0.1
-        )
-        
         match_score = MatchScore(
-            overall=round(overall, 1),
-            skillsMatch=skills_match,
-            goalsAlignment=goals_alignment,
-            locationMatch=location_match,
+            overall=score["overall"],
+            skillsMatch=score["skillsMatch"],
+            goalsAlignment=score["goalsAlignment"],
+            locationMatch=score["locationMatch"],
             networkOverlap=network_overlap,
             availabilityMatch=availability_match,
-            experienceMatch=experience_match
+            experienceMatch=experience_match,
+            demandsMatch=score["demandsMatch"]
         )
         
         return {
@@ -395,43 +376,40 @@ async def advanced_search(
         user_id = current_user["id"]
         
         # Build complex query based on advanced filters
-        query = db.query(User).filter(User.id != user_id)
+        query = db.query(UserProfile).join(User, User.id == UserProfile.user_id).filter(User.id != user_id)
         
-        # Location filters
+        # Location filters (substring matches use the location trigram index)
         if request.location:
             if request.location.get('countries'):
-                # Assuming country info is in location field
                 countries = request.location['countries']
-                country_conditions = [User.location.ilike(f"%{country}%") for country in countries]
+                country_conditions = [UserProfile.location.ilike(f"%{country}%") for country in countries]
                 query = query.filter(or_(*country_conditions))
             
             if request.location.get('cities'):
                 cities = request.location['cities']
-                city_conditions = [User.location.ilike(f"%{city}%") for city in cities]
+                city_conditions = [UserProfile.location.ilike(f"%{city}%") for city in cities]
                 query = query.filter(or_(*city_conditions))
         
         # Demographics filters
         if request.demographics:
             if request.demographics.get('ageRange'):
                 age_min, age_max = request.demographics['ageRange']
-                query = query.filter(User.age.between(age_min, age_max))
+                query = query.filter(UserProfile.age.between(age_min, age_max))
             
             if request.demographics.get('genders'):
                 genders = request.demographics['genders']
-                query = query.filter(User.gender.in_(genders))
+                query = query.filter(UserProfile.gender.in_(genders))
         
-        # Skills filters
+        # Skills filters (JSONB containment on the skills GIN index)
         if request.skills:
             if request.skills.get('required'):
-                required_skills = request.skills['required']
-                for skill in required_skills:
-                    query = query.filter(User.bio.ilike(f"%{skill}%"))
+                for skill in request.skills['required']:
+                    query = query.filter(UserProfile.skills.has_any(array(_skill_variants([skill]))))
             
             if request.skills.get('preferred'):
                 preferred_skills = request.skills['preferred']
                 if preferred_skills:
-                    pref_conditions = [User.bio.ilike(f"%{skill}%") for skill in preferred_skills]
-                    query = query.filter(or_(*pref_conditions))
+                    query = query.filter(UserProfile.skills.has_any(array(_skill_variants(preferred_skills))))
         
         # Other filters
         if request.other:
@@ -456,22 +434,29 @@ async def advanced_search(
         offset = (page - 1) * limit
         
         total_count = query.count()
-        users = query.offset(offset).limit(limit).all()
+        profiles = query.offset(offset).limit(limit).all()
+        
+        # Score the whole page in one batch
+        scores = await _score_profiles(db, user_id, profiles)
         
         # Convert to results
         results = []
-        for user in users:
+        for profile, score in zip(profiles, scores):
             results.append({
-                "id": str(user.id),
-                "username": user.username or f"user_{user.id}",
-                "displayName": user.display_name,
-                "avatarUrl": user.avatar_url,
-                "bio": user.bio,
-                "location": user.location,
-                "matchScore": 75.0, # Placeholder
+                "id": str(profile.user_id),
+                "username": profile.name or f"user_{profile.user_id}",
+                "displayName": profile.name,
+                "avatarUrl": profile.profile_photo,
+                "bio": profile.one_sentence_intro,
+                "location": profile.location,
+                "matchScore": score["overall"] if score else None,
                 "isOnline": False # Placeholder
             })
         
+        # Relevance ordering within the page
+        if not request.sorting or request.sorting.get('by', 'relevance') == 'relevance':
+            results.sort(key=lambda result: result["matchScore"] or 0.0, reverse=True)
+        
         return {
             "success": True,
             "data": {
@@ -745,3 +730,44 @@ async def get_search_analytics_by_id(
     except Exception as e:
         logger.error(f"Get specific search analytics failed: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get analytics for search {searchId}: {str(e)}")
+
+# Helper Functions
+def _skill_variants(skills: List[str]) -> List[str]:
+    """Spellings to look up in the skills JSONB array (as given, normalized, title case)"""
+    variants = []
+    for skill in skills:
+        for variant in (skill.strip(), normalize_skill(skill), normalize_skill(skill).title()):
+            if variant and variant not in variants:
+                variants.append(variant)
+    return variants
+
+def _skill_names(skills: Any) -> List[str]:
+    """Display names of a skills JSON value"""
+    if not skills:
+        return []
+    if isinstance(skills, dict):
+        skills = list(skills.values())
+    if isinstance(skills, str):
+        return [skills]
+    return [str(skill.get("name", "")) if isinstance(skill, dict) else str(skill) for skill in skills]
+
+async def _score_profiles(db: Session, user_id: int, profiles: List[UserProfile]) -> List[Optional[Dict[str, float]]]:
+    """Batch match scores of the current user against result profiles (None without own profile)"""
+    viewer = match_scoring_engine.load_profiles(db, [user_id]).get(int(user_id))
+    if viewer is None or not profiles:
+        return [None] * len(profiles)
+    # Encoding and scoring are CPU-bound: keep them off the event loop
+    return await asyncio.to_thread(match_scoring_engine.score, viewer, profiles)
+
+def _why_match(score: Optional[Dict[str, float]]) -> Optional[str]:
+    """Short explanation from the strongest score component"""
+    if not score:
+        return None
+    labels = {
+        "skillsMatch": "Similar skills",
+        "goalsAlignment": "Aligned goals",
+        "demandsMatch": "Complementary needs and resources",
+        "locationMatch": "Similar location"
+    }
+    component = max(labels, key=lambda key: score[key])
+    return labels[component]
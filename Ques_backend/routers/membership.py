@@ -11,8 +11,7 @@ import logging
 from datetime import datetime, timedelta
 
 from dependencies.db import get_db
-from dependencies.auth import get_current_user, get_current_active_user
-from models.users import User
+from dependencies.auth import CurrentUser, get_current_user, get_current_active_user
 from models.memberships import Membership, MembershipPlan
 from models.payments import Payment
 from services.auth_service import AuthService
@@ -30,7 +29,7 @@ auth_service = AuthService()
 
 @router.get("/membership/current", response_model=MembershipResponse)
 async def get_current_membership(
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -167,7 +166,7 @@ async def get_membership_plans(
 @router.post("/membership/upgrade", response_model=MembershipResponse)
 async def upgrade_membership(
     upgrade_request: MembershipUpgradeRequest,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -253,7 +252,7 @@ async def upgrade_membership(
 
 @router.post("/membership/cancel")
 async def cancel_membership(
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -301,7 +300,7 @@ async def cancel_membership(
 
 @router.get("/membership/benefits")
 async def get_membership_benefits(
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
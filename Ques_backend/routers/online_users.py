@@ -6,9 +6,8 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
 from dependencies.db import get_db
-from dependencies.auth import get_current_user
+from dependencies.auth import CurrentUser, get_current_user
 from services.online_users_service import OnlineUsersService
-from models.users import User
 import logging
 
 logger = logging.getLogger(__name__)
@@ -43,7 +42,7 @@ async def get_online_user_count(
 async def get_online_users(
     active_threshold: int = Query(15, description="Minutes to consider a user as online", ge=1, le=60),
     limit: int = Query(50, description="Maximum number of users to return", ge=1, le=200),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -70,7 +69,7 @@ async def get_online_users(
 
 @router.get("/stats")
 async def get_online_stats(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -94,7 +93,7 @@ async def get_online_stats(
 @router.get("/user/{user_id}")
 async def get_user_online_status(
     user_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -115,7 +114,7 @@ async def get_user_online_status(
 
 @router.get("/sessions")
 async def get_my_sessions(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -137,7 +136,7 @@ async def get_my_sessions(
 
 @router.post("/cleanup")
 async def cleanup_expired_sessions(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -12,7 +12,7 @@ import uuid
 import logging
 
 from dependencies.db import get_db
-from dependencies.auth import get_current_user
+from dependencies.auth import CurrentUser, get_current_user
 from models import (
     User, Membership, MembershipTransaction, PaymentMethod, PaymentSession,
     PaymentStatus, PaymentType, PaymentMethodType
@@ -125,7 +125,7 @@ class PaymentService:
 @router.post("/receives", response_model=PurchaseReceivesResponse)
 async def purchase_receives(
     request: PurchaseReceivesRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -194,7 +194,7 @@ async def purchase_receives(
 @router.post("/plan", response_model=ChangePlanResponse) 
 async def change_plan(
     request: ChangePlanRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -256,7 +256,7 @@ async def change_plan(
             payment_url = PaymentService.create_payment_url(str(transaction.id), request.payment_method or PaymentMethodEnum.WECHAT_PAY, cost)
         
         # Update membership plan
-        new_plan = PaymentService.update_user_plan(db, current_user, request.new_plan)
+        new_plan = PaymentService.update_user_plan(db, current_user.user, request.new_plan)
         
         return ChangePlanResponse(
             transaction_id=transaction_id,
@@ -282,7 +282,7 @@ async def get_transaction_history(
     status: Optional[TransactionStatusEnum] = Query(None, description="Filter by status"),
     start_date: Optional[datetime] = Query(None, description="Start date filter"),
     end_date: Optional[datetime] = Query(None, description="End date filter"),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -342,7 +342,7 @@ async def get_transaction_history(
 
 @router.get("/methods", response_model=PaymentMethodsResponse)
 async def get_payment_methods(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -387,7 +387,7 @@ async def get_payment_methods(
 @router.post("/sessions", response_model=PaymentSessionResponse)
 async def create_payment_session(
     request: CreatePaymentSessionRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -437,7 +437,7 @@ async def create_payment_session(
 @router.get("/sessions/{session_id}", response_model=PaymentSessionDetailsResponse)
 async def get_payment_session_details(
     session_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -480,7 +480,7 @@ async def get_payment_session_details(
 async def cancel_transaction(
     transaction_id: str = Query(..., description="Transaction ID to cancel"),
     request: CancelTransactionRequest = None,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
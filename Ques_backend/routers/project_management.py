@@ -11,9 +11,9 @@ from datetime import datetime
 import logging
 
 from dependencies.db import get_db
-from dependencies.auth import get_current_user
-from models.users import User
+from dependencies.auth import CurrentUser, get_current_user
 from models.user_projects import UserProject
+from services.profile_card_cache import profile_card_cache
 
 router = APIRouter(prefix="/profile/projects", tags=["Project Management"])
 logger = logging.getLogger(__name__)
@@ -62,7 +62,7 @@ class ProjectUpdateWrapper(BaseModel):
 @router.post("", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def add_project(
     request: ProjectCreateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -91,6 +91,7 @@ async def add_project(
         db.add(new_project)
         db.commit()
         db.refresh(new_project)
+        profile_card_cache.invalidate(current_user.id)
         
         logger.info(f"Added new project '{new_project.title}' for user {current_user.id}")
         
@@ -106,7 +107,7 @@ async def add_project(
 
 @router.get("", response_model=List[ProjectResponse])
 async def get_user_projects(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -130,7 +131,7 @@ async def get_user_projects(
 async def update_project(
     project_id: int,
     request: ProjectUpdateWrapper,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -159,6 +160,7 @@ async def update_project(
         
         db.commit()
         db.refresh(project)
+        profile_card_cache.invalidate(current_user.id)
         
         logger.info(f"Updated project {project_id} for user {current_user.id}")
         
@@ -177,7 +179,7 @@ async def update_project(
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project(
     project_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -199,6 +201,7 @@ async def delete_project(
         
         db.delete(project)
         db.commit()
+        profile_card_cache.invalidate(current_user.id)
         
         logger.info(f"Deleted project {project_id} for user {current_user.id}")
         
@@ -215,7 +218,7 @@ async def delete_project(
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -247,7 +250,7 @@ async def get_project(
 @router.post("/reorder", status_code=status.HTTP_200_OK)
 async def reorder_projects(
     project_orders: Dict[int, int],  # project_id -> new_order
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -269,6 +272,7 @@ async def reorder_projects(
                 project_dict[project_id].updated_at = datetime.utcnow()
         
         db.commit()
+        profile_card_cache.invalidate(current_user.id)
         
         logger.info(f"Reordered projects for user {current_user.id}")
         
@@ -286,7 +290,7 @@ async def reorder_projects(
 async def toggle_featured_project(
     project_id: int,
     is_featured: bool,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -309,6 +313,7 @@ async def toggle_featured_project(
         
         db.commit()
         db.refresh(project)
+        profile_card_cache.invalidate(current_user.id)
         
         logger.info(f"Toggled featured status for project {project_id}: {is_featured}")
         
@@ -326,7 +331,7 @@ async def toggle_featured_project(
 
 @router.get("/featured/list", response_model=List[ProjectResponse])
 async def get_featured_projects(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -10,8 +10,7 @@ from typing import List, Optional
 import logging
 
 from dependencies.db import get_db
-from dependencies.auth import get_current_user, get_current_active_user
-from models.users import User
+from dependencies.auth import CurrentUser, get_current_user, get_current_active_user
 from models.projects import Project, UserLink, ProjectStatus
 from models.institutions import Institution, UserInstitution
 from services.auth_service import AuthService
@@ -34,7 +33,7 @@ auth_service = AuthService()
 @router.post("/profile/projects", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def add_project(
     project_data: ProjectCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -77,7 +76,7 @@ async def add_project(
 
 @router.get("/profile/projects", response_model=List[ProjectResponse])
 async def get_projects(
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -112,7 +111,7 @@ async def get_projects(
 async def update_project(
     project_id: int,
     project_data: ProjectUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -168,7 +167,7 @@ async def update_project(
 @router.delete("/profile/projects/{project_id}")
 async def delete_project(
     project_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -205,7 +204,7 @@ async def delete_project(
 @router.post("/profile/institutions", response_model=InstitutionResponse, status_code=status.HTTP_201_CREATED)
 async def add_institution(
     institution_data: InstitutionCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -247,7 +246,7 @@ async def add_institution(
 
 @router.get("/profile/institutions", response_model=List[InstitutionResponse])
 async def get_institutions(
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -282,7 +281,7 @@ async def get_institutions(
 async def update_institution(
     institution_id: int,
     institution_data: InstitutionUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -338,7 +337,7 @@ async def update_institution(
 @router.delete("/profile/institutions/{institution_id}")
 async def delete_institution(
     institution_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
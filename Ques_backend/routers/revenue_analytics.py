@@ -11,8 +11,7 @@ from datetime import datetime
 import logging
 
 from dependencies.db import get_db
-from dependencies.auth import get_current_user
-from models.users import User
+from dependencies.auth import CurrentUser, get_current_user
 from services.revenue_analytics_service import RevenueAnalyticsService
 
 router = APIRouter(prefix="/api/v1/revenue", tags=["Revenue Analytics"])
@@ -79,7 +78,7 @@ class ChurnRetentionMetrics(BaseModel):
 
 # === AUTHENTICATION HELPER ===
 
-def get_admin_user(current_user: User = Depends(get_current_user)) -> User:
+def get_admin_user(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
     """
     Ensure current user has admin privileges to access revenue data
     For now, we'll allow all authenticated users. In production, add admin check.
@@ -97,7 +96,7 @@ def get_admin_user(current_user: User = Depends(get_current_user)) -> User:
 @router.get("/overview", response_model=RevenueOverviewResponse)
 async def get_revenue_overview(
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
-    current_user: User = Depends(get_admin_user),
+    current_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -116,7 +115,7 @@ async def get_revenue_overview(
 @router.get("/chart/daily", response_model=List[DailyRevenuePoint])
 async def get_daily_revenue_chart(
     days: int = Query(30, ge=1, le=365, description="Number of days for chart"),
-    current_user: User = Depends(get_admin_user),
+    current_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -135,7 +134,7 @@ async def get_daily_revenue_chart(
 @router.get("/chart/monthly", response_model=List[MonthlyRevenuePoint])
 async def get_monthly_revenue_chart(
     months: int = Query(12, ge=1, le=24, description="Number of months for chart"),
-    current_user: User = Depends(get_admin_user),
+    current_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -154,7 +153,7 @@ async def get_monthly_revenue_chart(
 @router.get("/breakdown/membership")
 async def get_revenue_by_membership_type(
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
-    current_user: User = Depends(get_admin_user),
+    current_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -177,7 +176,7 @@ async def get_revenue_by_membership_type(
 @router.get("/breakdown/payment-method")
 async def get_revenue_by_payment_method(
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
-    current_user: User = Depends(get_admin_user),
+    current_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -200,7 +199,7 @@ async def get_revenue_by_payment_method(
 @router.get("/analytics/users", response_model=UserRevenueAnalytics)
 async def get_user_revenue_analytics(
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
-    current_user: User = Depends(get_admin_user),
+    current_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -218,7 +217,7 @@ async def get_user_revenue_analytics(
 
 @router.get("/metrics/recurring", response_model=RecurringRevenueMetrics)
 async def get_recurring_revenue_metrics(
-    current_user: User = Depends(get_admin_user),
+    current_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -236,7 +235,7 @@ async def get_recurring_revenue_metrics(
 
 @router.get("/metrics/churn-retention", response_model=ChurnRetentionMetrics)
 async def get_churn_retention_metrics(
-    current_user: User = Depends(get_admin_user),
+    current_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -255,7 +254,7 @@ async def get_churn_retention_metrics(
 @router.get("/report/comprehensive")
 async def get_comprehensive_revenue_report(
     days: int = Query(30, ge=1, le=365, description="Number of days for overview analysis"),
-    current_user: User = Depends(get_admin_user),
+    current_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -302,7 +301,7 @@ async def revenue_analytics_health():
 @router.get("/export/csv")
 async def export_revenue_data_csv(
     days: int = Query(30, ge=1, le=365, description="Number of days to export"),
-    current_user: User = Depends(get_admin_user),
+    current_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -7,8 +7,7 @@ from sqlalchemy.orm import Session
 from typing import Optional, List
 
 from dependencies.db import get_db
-from dependencies.auth import get_current_user
-from models.users import User
+from dependencies.auth import CurrentUser, get_current_user
 from services.settings_service import SettingsService
 from schemas.settings_schemas import (
     AccountSettingsResponse, UpdateAccountSettingsRequest,
@@ -41,7 +40,7 @@ def get_user_agent(request: Request) -> str:
 
 @router.get("/account", response_model=AccountSettingsResponse)
 async def get_account_settings(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get user account settings"""
@@ -69,7 +68,7 @@ async def get_account_settings(
 async def update_account_settings(
     updates: UpdateAccountSettingsRequest,
     request: Request,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update user account settings"""
@@ -103,7 +102,7 @@ async def update_account_settings(
 
 @router.get("/privacy", response_model=AccountSettingsResponse)
 async def get_privacy_settings(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get privacy settings (alias for account settings)"""
@@ -114,7 +113,7 @@ async def get_privacy_settings(
 async def update_privacy_settings(
     updates: UpdateAccountSettingsRequest,
     request: Request,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update privacy settings (alias for account settings update)"""
@@ -123,7 +122,7 @@ async def update_privacy_settings(
 
 @router.get("/security", response_model=dict)
 async def get_security_settings(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get security settings and security score"""
@@ -157,7 +156,7 @@ async def get_security_settings(
 async def update_security_settings(
     updates: UpdateAccountSettingsRequest,
     request: Request,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update security settings"""
@@ -197,7 +196,7 @@ async def update_security_settings(
 async def record_privacy_consent(
     consent_request: PrivacyConsentRequest,
     request: Request,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Record privacy consent for GDPR compliance"""
@@ -230,7 +229,7 @@ async def record_privacy_consent(
 @router.post("/data-privacy/export")
 async def request_data_export(
     export_request: DataExportRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Request data export for GDPR compliance"""
@@ -267,7 +266,7 @@ async def request_data_export(
 async def deactivate_account(
     deactivate_request: DeactivateAccountRequest,
     request: Request,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Deactivate user account"""
@@ -305,7 +304,7 @@ async def deactivate_account(
 async def schedule_account_deletion(
     delete_request: DeleteAccountRequest,
     request: Request,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Schedule account deletion with 30-day grace period"""
@@ -343,7 +342,7 @@ async def schedule_account_deletion(
 
 @router.get("/summary", response_model=SettingsSummaryResponse)
 async def get_settings_summary(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get comprehensive settings summary"""
@@ -385,7 +384,7 @@ async def get_settings_summary(
 
 @router.get("/", response_model=AccountSettingsResponse)
 async def get_user_settings(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get user settings (alias for account settings)"""
@@ -396,7 +395,7 @@ async def get_user_settings(
 async def update_user_settings(
     updates: UpdateAccountSettingsRequest,
     request: Request,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update user settings (alias for account settings update)"""
@@ -9,7 +9,7 @@ from typing import Dict, Any
 import logging
 
 from dependencies.db import get_db
-from dependencies.auth import get_current_user
+from dependencies.auth import CurrentUser, get_current_user
 from services.sms_service import get_sms_service
 from services.auth_service import AuthService
 from schemas.sms_schemas import (
@@ -19,7 +19,6 @@ from schemas.sms_schemas import (
     PhoneRegistrationRequest, PhoneRegistrationResponse,
     ErrorResponse
 )
-from models.users import User
 from models.user_auth import UserAuth, ProviderType
 
 logger = logging.getLogger(__name__)
@@ -292,7 +291,7 @@ async def register_with_phone(
 )
 async def cleanup_expired_codes(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Clean up expired verification codes (Admin functionality)
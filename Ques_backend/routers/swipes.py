@@ -4,16 +4,17 @@ Uses the new SwipeRecord model and provides all endpoints from frontend docs
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, desc, case, extract
-from typing import List, Optional, Dict, Any
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, desc, case, extract, select, delete, insert
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import logging
-from collections import Counter
+import os
 
-from dependencies.db import get_db
-from dependencies.auth import get_current_user
+from dependencies.db import get_async_db
+from dependencies.auth import CurrentUser, get_current_user_async
 from models.swipes import SwipeRecord, SwipeAction, SearchMode
+from services.seen_set_service import seen_set_service
 from schemas.swipes import (
     RecordSwipeRequest, 
     BatchRecordSwipeRequest,
@@ -28,6 +29,9 @@ from schemas.swipes import (
 router = APIRouter(prefix="/swipe", tags=["Card Swiping"])
 logger = logging.getLogger(__name__)
 
+# Maximum number of swipes accepted by /record/batch
+MAX_SWIPE_BATCH_SIZE = int(os.getenv("MAX_SWIPE_BATCH_SIZE", "500"))
+
 # ============================================================================
 # API Endpoints - Matching Frontend Documentation Exactly
 # ============================================================================
@@ -35,15 +39,15 @@ logger = logging.getLogger(__name__)
 @router.post("/record", response_model=SwipeRecordResponse)
 async def record_swipe(
     request: RecordSwipeRequest,
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Record a single swipe action
     Frontend API: POST /swipe/record
     """
     try:
-        user_id = current_user["id"]
+        user_id = current_user.id
         
         # Create new swipe record using the new model
         swipe = SwipeRecord(
@@ -57,8 +61,9 @@ async def record_swipe(
         )
         
         db.add(swipe)
-        db.commit()
-        db.refresh(swipe)
+        await db.flush()
+        await db.run_sync(lambda session: seen_set_service.record_swipes(session, user_id, [request.targetUserId]))
+        await db.commit()
         
         return SwipeRecordResponse(
             id=swipe.id,
@@ -75,69 +80,73 @@ async def record_swipe(
         
     except Exception as e:
         logger.error(f"Failed to record swipe: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to record swipe: {str(e)}")
 
 @router.post("/record/batch")
 async def batch_record_swipes(
     request: BatchRecordSwipeRequest,
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Record multiple swipe actions in batch
     Frontend API: POST /swipe/record/batch
+    
+    The batch is validated up front and written with one multi-row INSERT ... RETURNING.
+    Invalid entries are reported in "failed" (with their index) and do not block the rest.
     """
+    if len(request.swipes) > MAX_SWIPE_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large: {len(request.swipes)} swipes (maximum {MAX_SWIPE_BATCH_SIZE})"
+        )
+    
     try:
-        user_id = current_user["id"]
-        results = []
+        user_id = current_user.id
+        rows, failed = _validate_swipe_batch(user_id, request.swipes)
         
-        for swipe_request in request.swipes:
-            try:
-                swipe = SwipeRecord(
-                    user_id=user_id,
-                    target_user_id=swipe_request.targetUserId,
-                    action=swipe_request.action.value,
-                    search_query=swipe_request.searchQuery,
-                    search_mode=swipe_request.searchMode.value if swipe_request.searchMode else None,
-                    match_score=swipe_request.matchScore,
-                    source_context=swipe_request.sourceContext.dict() if swipe_request.sourceContext else None
+        results = []
+        if rows:
+            # One INSERT for the whole batch; IDs come back in row order
+            inserted_ids = (await db.scalars(
+                insert(SwipeRecord).returning(SwipeRecord.id, sort_by_parameter_order=True),
+                rows
+            )).all()
+            
+            results = [
+                SwipeRecordResponse(
+                    id=swipe_id,
+                    userId=row["user_id"],
+                    targetUserId=row["target_user_id"],
+                    action=SwipeAction(row["action"]),
+                    searchQuery=row["search_query"],
+                    searchMode=SearchMode(row["search_mode"]) if row["search_mode"] else None,
+                    matchScore=row["match_score"],
+                    sourceContext=row["source_context"],
+                    createdAt=row["created_at"],
+                    updatedAt=row["updated_at"]
                 )
-                
-                db.add(swipe)
-                db.flush()  # Get the ID without committing yet
-                
-                results.append(SwipeRecordResponse(
-                    id=swipe.id,
-                    userId=swipe.user_id,
-                    targetUserId=swipe.target_user_id,
-                    action=SwipeAction(swipe.action),
-                    searchQuery=swipe.search_query,
-                    searchMode=SearchMode(swipe.search_mode) if swipe.search_mode else None,
-                    matchScore=float(swipe.match_score) if swipe.match_score else None,
-                    sourceContext=swipe.source_context,
-                    createdAt=swipe.created_at,
-                    updatedAt=swipe.updated_at
-                ))
-                
-            except Exception as e:
-                logger.error(f"Failed to record swipe for user {swipe_request.targetUserId}: {e}")
-                continue
-        
-        db.commit()
+                for swipe_id, row in zip(inserted_ids, rows)
+            ]
+            
+            swiped_ids = [row["target_user_id"] for row in rows]
+            await db.run_sync(lambda session: seen_set_service.record_swipes(session, user_id, swiped_ids))
+            await db.commit()
         
         return {
             "success": True,
             "data": {
                 "processed": len(results),
                 "total": len(request.swipes),
-                "swipes": results
+                "swipes": results,
+                "failed": failed
             }
         }
         
     except Exception as e:
         logger.error(f"Failed to batch record swipes: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to batch record swipes: {str(e)}")
 
 @router.get("/history")
@@ -147,34 +156,36 @@ async def get_swipe_history(
     action: Optional[SwipeAction] = Query(None, description="Filter by action"),
     startDate: Optional[datetime] = Query(None, description="Start date filter"),
     endDate: Optional[datetime] = Query(None, description="End date filter"),
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get user's swipe history with pagination and filters
     Frontend API: GET /swipe/history
     """
     try:
-        user_id = current_user["id"]
+        user_id = current_user.id
         offset = (page - 1) * limit
         
-        # Build query with filters
-        query = db.query(SwipeRecord).filter(SwipeRecord.user_id == user_id)
+        # Build filters
+        filters = [SwipeRecord.user_id == user_id]
         
         if action:
-            query = query.filter(SwipeRecord.action == action.value)
+            filters.append(SwipeRecord.action == action.value)
         
         if startDate:
-            query = query.filter(SwipeRecord.created_at >= startDate)
+            filters.append(SwipeRecord.created_at >= startDate)
             
         if endDate:
-            query = query.filter(SwipeRecord.created_at <= endDate)
+            filters.append(SwipeRecord.created_at <= endDate)
         
         # Get total count for pagination
-        total = query.count()
+        total = await db.scalar(select(func.count(SwipeRecord.id)).where(*filters))
         
         # Get paginated results
-        swipes = query.order_by(desc(SwipeRecord.created_at)).offset(offset).limit(limit).all()
+        swipes = (await db.scalars(
+            select(SwipeRecord).where(*filters).order_by(desc(SwipeRecord.created_at)).offset(offset).limit(limit)
+        )).all()
         
         # Convert to response format
         swipe_records = []
@@ -214,58 +225,58 @@ async def get_swipe_statistics(
     period: Optional[str] = Query("all", description="Period: all, week, month, year"),
     startDate: Optional[datetime] = Query(None, description="Start date filter"),
     endDate: Optional[datetime] = Query(None, description="End date filter"),
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get swipe statistics for user
     Frontend API: GET /swipe/stats
     """
     try:
-        user_id = current_user["id"]
+        user_id = current_user.id
         
-        # Build base query
-        query = db.query(SwipeRecord).filter(SwipeRecord.user_id == user_id)
+        # Build filters
+        filters = [SwipeRecord.user_id == user_id]
         
         # Apply date filters
         if period == "week":
             start_date = datetime.now() - timedelta(days=7)
-            query = query.filter(SwipeRecord.created_at >= start_date)
+            filters.append(SwipeRecord.created_at >= start_date)
         elif period == "month":
             start_date = datetime.now() - timedelta(days=30)
-            query = query.filter(SwipeRecord.created_at >= start_date)
+            filters.append(SwipeRecord.created_at >= start_date)
         elif period == "year":
             start_date = datetime.now() - timedelta(days=365)
-            query = query.filter(SwipeRecord.created_at >= start_date)
+            filters.append(SwipeRecord.created_at >= start_date)
             
         if startDate:
-            query = query.filter(SwipeRecord.created_at >= startDate)
+            filters.append(SwipeRecord.created_at >= startDate)
         if endDate:
-            query = query.filter(SwipeRecord.created_at <= endDate)
-        
-        # Get all swipes for analysis
-        swipes = query.all()
-        
-        # Calculate statistics
-        total_swipes = len(swipes)
-        likes = sum(1 for s in swipes if s.action == SwipeAction.LIKE.value)
-        ignores = sum(1 for s in swipes if s.action == SwipeAction.IGNORE.value)
-        super_likes = sum(1 for s in swipes if s.action == SwipeAction.SUPER_LIKE.value)
+            filters.append(SwipeRecord.created_at <= endDate)
+        
+        # Counts per action and average match score in one aggregate row
+        totals = (await db.execute(
+            select(
+                func.count(SwipeRecord.id),
+                func.count(SwipeRecord.id).filter(SwipeRecord.action == SwipeAction.LIKE.value),
+                func.count(SwipeRecord.id).filter(SwipeRecord.action == SwipeAction.IGNORE.value),
+                func.count(SwipeRecord.id).filter(SwipeRecord.action == SwipeAction.SUPER_LIKE.value),
+                func.avg(SwipeRecord.match_score)
+            ).where(*filters)
+        )).one()
+        total_swipes, likes, ignores, super_likes, avg_match_score = totals
+        avg_match_score = float(avg_match_score) if avg_match_score is not None else 0.0
         
         # Calculate match rate (simplified - would need actual match data)
         match_rate = (likes + super_likes) / total_swipes if total_swipes > 0 else 0.0
         
-        # Calculate average match score
-        match_scores = [float(s.match_score) for s in swipes if s.match_score is not None]
-        avg_match_score = sum(match_scores) / len(match_scores) if match_scores else 0.0
-        
         # Daily swipe count for the period
-        daily_counts = {}
-        for swipe in swipes:
-            date_str = swipe.created_at.date().isoformat()
-            daily_counts[date_str] = daily_counts.get(date_str, 0) + 1
+        day = func.date_trunc("day", SwipeRecord.created_at).label("day")
+        daily_rows = (await db.execute(
+            select(day, func.count(SwipeRecord.id)).where(*filters).group_by(day).order_by(day)
+        )).all()
         
-        daily_swipe_count = [{"date": date, "count": count} for date, count in daily_counts.items()]
+        daily_swipe_count = [{"date": bucket.date().isoformat(), "count": count} for bucket, count in daily_rows]
         
         return SwipeStatistics(
             totalSwipes=total_swipes,
@@ -285,36 +296,38 @@ async def get_swipe_statistics(
 
 @router.get("/stats/preferences", response_model=SwipePreferences)
 async def get_swipe_preferences(
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get user's swipe preferences based on history
     Frontend API: GET /swipe/stats/preferences
     """
     try:
-        user_id = current_user["id"]
+        user_id = current_user.id
         
-        # Get user's swipe history for analysis
-        swipes = db.query(SwipeRecord).filter(
-            and_(
-                SwipeRecord.user_id == user_id,
-                SwipeRecord.action.in_([SwipeAction.LIKE.value, SwipeAction.SUPER_LIKE.value])
-            )
-        ).all()
+        # Positive swipes of the user
+        positive = and_(
+            SwipeRecord.user_id == user_id,
+            SwipeRecord.action.in_([SwipeAction.LIKE.value, SwipeAction.SUPER_LIKE.value])
+        )
         
         # Analyze patterns (simplified - would need more user data integration)
-        avg_match_score = 0.0
-        if swipes:
-            match_scores = [float(s.match_score) for s in swipes if s.match_score is not None]
-            avg_match_score = sum(match_scores) / len(match_scores) if match_scores else 0.0
-        
-        # Get most active hours
-        hour_counts = Counter()
-        for swipe in swipes:
-            hour_counts[swipe.created_at.hour] += 1
-        
-        most_active_hours = [hour for hour, count in hour_counts.most_common(5)]
+        total_positive, avg_match_score = (await db.execute(
+            select(func.count(SwipeRecord.id), func.avg(SwipeRecord.match_score)).where(positive)
+        )).one()
+        avg_match_score = float(avg_match_score) if avg_match_score is not None else 0.0
+        
+        # Get most active hours (at most 24 buckets)
+        hour = extract("hour", SwipeRecord.created_at).label("hour")
+        hour_rows = (await db.execute(
+            select(hour, func.count(SwipeRecord.id).label("count"))
+            .where(positive)
+            .group_by(hour)
+            .order_by(desc("count"), hour)
+        )).all()
+        
+        most_active_hours = [int(bucket) for bucket, count in hour_rows[:5]]
         
         return SwipePreferences(
             preferredSkills=[],  # Would need user profile integration
@@ -323,9 +336,9 @@ async def get_swipe_preferences(
             averageMatchScore=avg_match_score,
             mostActiveHours=most_active_hours,
             swipePatterns={
-                "total_positive_swipes": len(swipes),
+                "total_positive_swipes": total_positive,
                 "avg_match_score": avg_match_score,
-                "most_active_period": max(hour_counts.items(), key=lambda x: x[1])[0] if hour_counts else 0
+                "most_active_period": most_active_hours[0] if most_active_hours else 0
             }
         )
         
@@ -336,24 +349,23 @@ async def get_swipe_preferences(
 @router.get("/stats/suggestions/{targetUserId}", response_model=SwipeSuggestion)
 async def get_swipe_suggestions(
     targetUserId: str = Path(..., description="Target user ID"),
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get AI-generated swipe suggestions for a target user
     Frontend API: GET /swipe/stats/suggestions/{targetUserId}
     """
     try:
-        user_id = current_user["id"]
+        user_id = current_user.id
         
-        # Get user's swipe history to analyze patterns
-        user_swipes = db.query(SwipeRecord).filter(SwipeRecord.user_id == user_id).all()
+        # Average match score of the user's swipe history
+        avg_match_score = await db.scalar(
+            select(func.avg(SwipeRecord.match_score)).where(SwipeRecord.user_id == user_id)
+        )
         
         # Simple AI suggestion based on match scores (would be more sophisticated in production)
-        avg_match_score = 0.0
-        if user_swipes:
-            match_scores = [float(s.match_score) for s in user_swipes if s.match_score is not None]
-            avg_match_score = sum(match_scores) / len(match_scores) if match_scores else 0.0
+        avg_match_score = float(avg_match_score) if avg_match_score is not None else 0.0
         
         # Generate suggestion (simplified logic)
         if avg_match_score > 0.7:
@@ -384,29 +396,41 @@ async def get_swipe_suggestions(
 @router.delete("/record/{swipeId}")
 async def delete_swipe_record(
     swipeId: int = Path(..., description="Swipe record ID"),
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a specific swipe record
     Frontend API: DELETE /swipe/record/{swipeId}
     """
     try:
-        user_id = current_user["id"]
+        user_id = current_user.id
         
         # Find the swipe record
-        swipe = db.query(SwipeRecord).filter(
+        swipe = await db.scalar(select(SwipeRecord).where(
             and_(
                 SwipeRecord.id == swipeId,
                 SwipeRecord.user_id == user_id
             )
-        ).first()
+        ))
         
         if not swipe:
             raise HTTPException(status_code=404, detail="Swipe record not found")
         
-        db.delete(swipe)
-        db.commit()
+        target_user_id = swipe.target_user_id
+        await db.delete(swipe)
+        await db.flush()
+        
+        # Only forget the target once no other swipe on it remains
+        remaining = await db.scalar(select(SwipeRecord.id).where(
+            and_(
+                SwipeRecord.user_id == user_id,
+                SwipeRecord.target_user_id == target_user_id
+            )
+        ).limit(1))
+        if not remaining:
+            await db.run_sync(lambda session: seen_set_service.remove_swipes(session, user_id, [target_user_id]))
+        await db.commit()
         
         return {"success": True, "message": "Swipe record deleted successfully"}
         
@@ -414,37 +438,36 @@ async def delete_swipe_record(
         raise
     except Exception as e:
         logger.error(f"Failed to delete swipe record: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to delete swipe record: {str(e)}")
 
 @router.delete("/record/bulk")
 async def clear_swipe_history(
     request: BulkDeleteRequest,
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Clear swipe history with optional filters
     Frontend API: DELETE /swipe/record/bulk
     """
     try:
-        user_id = current_user["id"]
+        user_id = current_user.id
         
         # Build deletion query
-        query = db.query(SwipeRecord).filter(SwipeRecord.user_id == user_id)
+        query = delete(SwipeRecord).where(SwipeRecord.user_id == user_id)
         
         if request.olderThan:
-            query = query.filter(SwipeRecord.created_at < request.olderThan)
+            query = query.where(SwipeRecord.created_at < request.olderThan)
             
         if request.action:
-            query = query.filter(SwipeRecord.action == request.action.value)
+            query = query.where(SwipeRecord.action == request.action.value)
         
-        # Get count before deletion
-        count = query.count()
-        
-        # Delete records
-        query.delete()
-        db.commit()
+        # Delete records (rowcount is the number deleted)
+        result = await db.execute(query.execution_options(synchronize_session=False))
+        count = result.rowcount
+        await db.run_sync(lambda session: seen_set_service.rebuild(session, user_id))
+        await db.commit()
         
         return {
             "success": True, 
@@ -454,5 +477,47 @@ async def clear_swipe_history(
         
     except Exception as e:
         logger.error(f"Failed to clear swipe history: {e}")
-        db.rollback()
-        raise HTTPException(status_code=500, detail=f"Failed to clear swipe history: {str(e)}")
\ No newline at end of file
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to clear swipe history: {str(e)}")
+
+# ============================================================================
+# Helper Functions
+# ============================================================================
+
+def _validate_swipe_batch(user_id: int, swipes: List[RecordSwipeRequest]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Validate a swipe batch and build its insert rows
+    
+    Args:
+        user_id: Swiping user ID
+        swipes: Swipes from the batch request
+        
+    Returns:
+        (rows to insert, failures as {"index", "targetUserId", "error"})
+    """
+    now = datetime.utcnow()
+    rows = []
+    failed = []
+    
+    for index, swipe_request in enumerate(swipes):
+        target_user_id = (swipe_request.targetUserId or "").strip()
+        if not target_user_id:
+            failed.append({"index": index, "targetUserId": swipe_request.targetUserId, "error": "targetUserId is required"})
+            continue
+        if target_user_id == str(user_id):
+            failed.append({"index": index, "targetUserId": swipe_request.targetUserId, "error": "Cannot swipe on yourself"})
+            continue
+        
+        rows.append({
+            "user_id": user_id,
+            "target_user_id": target_user_id,
+            "action": swipe_request.action.value,
+            "search_query": swipe_request.searchQuery,
+            "search_mode": swipe_request.searchMode.value if swipe_request.searchMode else None,
+            "match_score": swipe_request.matchScore,
+            "source_context": swipe_request.sourceContext.dict() if swipe_request.sourceContext else None,
+            "created_at": now,
+            "updated_at": now
+        })
+    
+    return rows, failed
@@ -8,9 +8,8 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field, EmailStr, validator
 from typing import Optional, Dict, Any
 from dependencies.db import get_db
-from dependencies.auth import get_current_user
+from dependencies.auth import CurrentUser, get_current_user
 from services.university_verification_service import UniversityVerificationService
-from models.users import User
 import logging
 
 logger = logging.getLogger(__name__)
@@ -54,7 +53,7 @@ class UniversityStatusResponse(BaseModel):
 @router.post("/verify", response_model=UniversityVerificationResponse)
 async def initiate_university_verification(
     request: UniversityVerificationRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -143,7 +142,7 @@ async def confirm_university_verification(
 
 @router.get("/status", response_model=UniversityStatusResponse)
 async def get_verification_status(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -172,7 +171,7 @@ async def get_verification_status(
 
 @router.post("/resend", response_model=UniversityVerificationResponse)
 async def resend_verification_email(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
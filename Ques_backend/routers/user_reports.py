@@ -10,8 +10,7 @@ from datetime import datetime
 from enum import Enum
 
 from dependencies.db import get_db
-from dependencies.auth import get_current_user
-from models.users import User
+from dependencies.auth import CurrentUser, get_current_user
 from models.user_reports import UserReport, ReportType, ReportStatus, ReportAction
 from services.user_reports_service import UserReportsService
 
@@ -106,7 +105,7 @@ class ResolveReportRequest(BaseModel):
 @router.post("/create", response_model=ReportResponse)
 async def create_report(
     request: CreateReportRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new user report"""
@@ -145,7 +144,7 @@ async def create_report(
 
 @router.get("/my-reports", response_model=List[ReportResponse])
 async def get_my_reports(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get reports made by the current user"""
@@ -157,7 +156,7 @@ async def get_my_reports(
 
 @router.get("/against-me", response_model=List[ReportResponse])
 async def get_reports_against_me(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get reports made against the current user (limited info)"""
@@ -178,7 +177,7 @@ async def get_reports_against_me(
 async def get_pending_reports(
     urgent_only: bool = Query(False, description="Only return urgent reports"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of reports to return"),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get pending reports for moderation (Admin only)"""
@@ -195,7 +194,7 @@ async def get_pending_reports(
 @router.get("/{report_id}", response_model=ReportDetailResponse)
 async def get_report_details(
     report_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get detailed information about a specific report (Admin only)"""
@@ -216,7 +215,7 @@ async def get_report_details(
 @router.post("/{report_id}/assign", response_model=ReportDetailResponse)
 async def assign_moderator(
     report_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Assign current user as moderator for a report (Admin only)"""
@@ -240,7 +239,7 @@ async def assign_moderator(
 async def resolve_report(
     report_id: int,
     request: ResolveReportRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Resolve a report with specific action (Admin only)"""
@@ -277,7 +276,7 @@ class DismissReportRequest(BaseModel):
 async def dismiss_report(
     report_id: int,
     request: DismissReportRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Dismiss a report as invalid (Admin only)"""
@@ -300,7 +299,7 @@ async def dismiss_report(
 @router.get("/statistics/overview", response_model=ReportStatisticsResponse)
 async def get_report_statistics(
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get reporting statistics for the last N days (Admin only)"""
@@ -317,7 +316,7 @@ async def get_report_statistics(
 @router.get("/user/{user_id}/violations", response_model=List[ReportDetailResponse])
 async def get_user_violations(
     user_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get violation history for a specific user (Admin only)"""
@@ -5,17 +5,18 @@ Handles user profile management, search, and basic operations
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, aliased, selectinload
+from sqlalchemy import and_, or_, exists, func
 from typing import List, Optional
 import logging
 import math
 
 from dependencies.db import get_db
 from models.users import User
-from models.user_swipes import UserSwipe, SwipeDirection
+from models.user_swipes import UserSwipe, POSITIVE_SWIPE_DIRECTIONS
 from services.auth_service import AuthService
 from services.monitoring import log_security_event
+from services.profile_card_cache import profile_card_cache
 from schemas.users import (
     UserProfileResponse, UserCardResponse, LikedUserResponse, 
     LikedUsersResponse, UserSearchResponse, UpdateProfileRequest
@@ -76,6 +77,7 @@ async def update_profile(
     
     db.commit()
     db.refresh(current_user)
+    profile_card_cache.invalidate(current_user.id)
     
     return {"message": "Profile updated successfully"}
 
@@ -180,6 +182,66 @@ async def search_users(
         for user in users
     ]
 
+# === Liked profiles helpers ===
+
+def _liked_back():
+    """EXISTS: the swiped user liked the swiper back (served by the swiper/swiped/direction index)"""
+    reverse = aliased(UserSwipe)
+    return exists().where(
+        reverse.swiper_id == UserSwipe.swiped_user_id,
+        reverse.swiped_user_id == UserSwipe.swiper_id,
+        reverse.swipe_direction.in_(POSITIVE_SWIPE_DIRECTIONS)
+    )
+
+
+def _count_likes(db: Session, user_id: int, mutual_only: bool = False) -> int:
+    """Count the user's likes (optionally only mutual ones) without joining users"""
+    query = db.query(func.count(UserSwipe.id)).filter(
+        UserSwipe.swiper_id == user_id,
+        UserSwipe.swipe_direction.in_(POSITIVE_SWIPE_DIRECTIONS)
+    )
+    if mutual_only:
+        query = query.filter(_liked_back())
+    return query.scalar() or 0
+
+
+def _liked_users_query(db: Session, user_id: int, mutual_only: bool = False):
+    """
+    Page query of (swipe, liked user, is_mutual_like) rows, newest like first
+
+    Mutual status is computed in the same statement and profiles are eager-loaded
+    with one IN query, so a page costs a fixed number of queries.
+    """
+    is_mutual_like = _liked_back().label("is_mutual_like")
+    query = db.query(UserSwipe, User, is_mutual_like).join(
+        User, UserSwipe.swiped_user_id == User.id
+    ).options(
+        selectinload(User.profile)
+    ).filter(
+        UserSwipe.swiper_id == user_id,
+        UserSwipe.swipe_direction.in_(POSITIVE_SWIPE_DIRECTIONS)
+    )
+    if mutual_only:
+        query = query.filter(_liked_back())
+    return query.order_by(UserSwipe.created_at.desc(), UserSwipe.id.desc())
+
+
+def _liked_user_response(swipe: UserSwipe, user: User, is_mutual_like: bool) -> LikedUserResponse:
+    """Build a liked-user card from a swipe and its (profile-loaded) user"""
+    return LikedUserResponse(
+        id=user.id,
+        username=user.username or f"user_{user.id}",
+        display_name=user.display_name,
+        bio=user.bio,
+        age=user.age,
+        location=user.location,
+        avatar_url=user.avatar_url,
+        is_verified=user.is_verified or False,
+        liked_at=swipe.created_at,
+        is_mutual_like=bool(is_mutual_like)
+    )
+
+
 @router.get("/liked", response_model=LikedUsersResponse)
 async def get_liked_profiles(
     page: int = Query(1, ge=1, description="Page number (starts from 1)"),
@@ -202,54 +264,14 @@ async def get_liked_profiles(
         # Calculate offset for pagination
         offset = (page - 1) * per_page
         
-        # Query for users the current user has liked using UserSwipe model
-        # We'll check both UserSwipe and Like tables for comprehensive results
-        
-        # Get likes from UserSwipe table (direction = "like")
-        swipe_likes_query = db.query(UserSwipe, User).join(
-            User, UserSwipe.target_id == User.user_id
-        ).filter(
-            UserSwipe.swiper_id == current_user.user_id,
-            UserSwipe.direction == SwipeDirection.like
-        )
-        
-        # Get likes from Like table (for user-to-user likes)
-        like_likes_query = db.query(Like, User).join(
-            User, Like.liked_item_id == User.user_id
-        ).filter(
-            Like.liker_id == current_user.user_id,
-            Like.liked_item_type == "USER"
-        )
+        # Likes of the current user; mutual status is an EXISTS column of the page query
+        total_likes = _count_likes(db, current_user.id)
+        swipe_results = _liked_users_query(db, current_user.id).offset(offset).limit(per_page).all()
         
-        # For now, let's focus on UserSwipe since it seems to be the primary model
-        total_likes = swipe_likes_query.count()
-        
-        # Get paginated results
-        swipe_results = swipe_likes_query.offset(offset).limit(per_page).all()
-        
-        # Build response with mutual like checking
-        liked_users = []
-        for swipe, user in swipe_results:
-            # Check if it's a mutual like (they also liked the current user)
-            mutual_like = db.query(UserSwipe).filter(
-                UserSwipe.swiper_id == user.user_id,
-                UserSwipe.target_id == current_user.user_id,
-                UserSwipe.direction == SwipeDirection.like
-            ).first() is not None
-            
-            liked_user = LikedUserResponse(
-                id=user.user_id,
-                username=user.username or f"user_{user.user_id}",
-                display_name=user.display_name,
-                bio=user.bio,
-                age=user.age,
-                location=user.location,
-                avatar_url=user.avatar_url,
-                is_verified=user.is_verified or False,
-                liked_at=swipe.timestamp or swipe.timestamp,
-                is_mutual_like=mutual_like
-            )
-            liked_users.append(liked_user)
+        liked_users = [
+            _liked_user_response(swipe, user, is_mutual_like)
+            for swipe, user, is_mutual_like in swipe_results
+        ]
         
         # Calculate pagination info
         total_pages = math.ceil(total_likes / per_page) if total_likes > 0 else 1
@@ -306,40 +328,15 @@ async def get_mutual_likes(
         # Calculate offset for pagination
         offset = (page - 1) * per_page
         
-        # Query for mutual likes - users who liked current user AND current user liked them
-        mutual_likes_query = db.query(UserSwipe, User).join(
-            User, UserSwipe.target_id == User.user_id
-        ).filter(
-            UserSwipe.swiper_id == current_user.user_id,
-            UserSwipe.direction == SwipeDirection.like
-        ).filter(
-            # Check if they also liked the current user back
-            db.query(UserSwipe).filter(
-                UserSwipe.swiper_id == User.user_id,
-                UserSwipe.target_id == current_user.user_id,
-                UserSwipe.direction == SwipeDirection.like
-            ).exists()
-        )
-        
-        total_mutual = mutual_likes_query.count()
-        mutual_results = mutual_likes_query.offset(offset).limit(per_page).all()
+        # Mutual likes - users who liked current user AND current user liked them
+        total_mutual = _count_likes(db, current_user.id, mutual_only=True)
+        mutual_results = _liked_users_query(db, current_user.id, mutual_only=True).offset(offset).limit(per_page).all()
         
-        # Build response
-        mutual_users = []
-        for swipe, user in mutual_results:
-            mutual_user = LikedUserResponse(
-                id=user.user_id,
-                username=user.username or f"user_{user.user_id}",
-                display_name=user.display_name,
-                bio=user.bio,
-                age=user.age,
-                location=user.location,
-                avatar_url=user.avatar_url,
-                is_verified=user.is_verified or False,
-                liked_at=swipe.timestamp,
-                is_mutual_like=True  # All results are mutual by definition
-            )
-            mutual_users.append(mutual_user)
+        # All results are mutual by definition
+        mutual_users = [
+            _liked_user_response(swipe, user, True)
+            for swipe, user, _ in mutual_results
+        ]
         
         # Calculate pagination info
         total_pages = math.ceil(total_mutual / per_page) if total_mutual > 0 else 1
@@ -398,6 +395,8 @@ async def delete_user_account(
                 detail="User account not found or already deleted"
             )
         
+        auth_service.invalidate_user_tokens(current_user.user_id)
+        profile_card_cache.invalidate(current_user.user_id)
         logger.info(f"User account deleted successfully: user_id={current_user.user_id}")
         # Return 204 No Content (successful deletion)
         
@@ -484,6 +483,8 @@ async def deactivate_user_account(
                 detail="User account not found"
             )
         
+        auth_service.invalidate_user_tokens(current_user.user_id)
+        profile_card_cache.invalidate(current_user.user_id)
         logger.info(f"User account deactivated successfully: user_id={current_user.user_id}")
         return {
             "message": "Account deactivated successfully",
@@ -9,8 +9,7 @@ from typing import List, Optional
 import logging
 
 from dependencies.db import get_db
-from dependencies.auth import get_current_user
-from models.users import User
+from dependencies.auth import CurrentUser, get_current_user
 from services.vector_recommendations import VectorRecommendationService
 
 router = APIRouter(prefix="/api/v1/recommendations", tags=["Vector Recommendations"])
@@ -20,7 +19,7 @@ logger = logging.getLogger(__name__)
 async def get_recommended_project_cards(
     limit: int = Query(20, ge=1, le=50, description="Number of cards to return"),
     exclude_own: bool = Query(True, description="Exclude user's own projects"),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -59,7 +58,7 @@ async def get_recommended_project_cards(
 
 @router.post("/update-user-vector")
 async def update_user_vector(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -102,7 +101,7 @@ async def update_user_vector(
 @router.post("/update-project-vector/{project_id}")
 async def update_project_vector(
     project_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
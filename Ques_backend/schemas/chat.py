@@ -174,7 +174,7 @@ class PaginationMeta(BaseModel):
 
 class CreateSessionResponse(BaseModel):
     """Response for creating a new chat session"""
-    sessionId: int = Field(..., description="ID of the created session")
+    sessionId: str = Field(..., description="ID of the created session")
     title: str = Field(..., description="Session title")
     createdAt: datetime = Field(..., description="Session creation timestamp")
     
@@ -184,7 +184,7 @@ class CreateSessionResponse(BaseModel):
 
 class GetSessionResponse(BaseModel):
     """Response for getting session details"""
-    sessionId: int = Field(..., description="Session ID")
+    sessionId: str = Field(..., description="Session ID")
     title: str = Field(..., description="Session title")
     messageCount: int = Field(..., description="Number of messages in session")
     createdAt: datetime = Field(..., description="Session creation timestamp")
@@ -196,11 +196,20 @@ class GetSessionResponse(BaseModel):
 
 class ChatMessageWithRecommendations(BaseModel):
     """Chat message with associated recommendations"""
-    id: int = Field(..., description="Message ID")
+    id: Union[UUID, int] = Field(..., description="Message ID")
     content: str = Field(..., description="Message content")
     isAiResponse: bool = Field(..., description="Whether this is an AI response")
     timestamp: datetime = Field(..., description="Message timestamp")
     recommendations: List[UserRecommendation] = Field(default_factory=list, description="User recommendations for this message")
+    suggestedQueries: List[str] = Field(default_factory=list, description="Suggested follow-up queries (when requested)")
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class ChatHistoryPageResponse(BaseModel):
+    """Keyset-paginated chat history page for GET /chat/session/{session_id}/history"""
+    sessionId: Union[UUID, int] = Field(..., description="Session ID")
+    messages: List[ChatMessageWithRecommendations] = Field(default_factory=list, description="Messages in chronological order")
+    nextCursor: Optional[str] = Field(None, description="Opaque cursor for the next page (null when there are no more messages)")
+    hasMore: bool = Field(..., description="Whether more messages follow this page")
\ No newline at end of file
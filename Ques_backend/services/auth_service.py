@@ -9,6 +9,7 @@ from typing import Optional
 from sqlalchemy.orm import Session
 from models.users import User
 from config.settings import settings
+from services.token_cache import TokenPrincipal, verified_token_cache
 
 
 class AuthService:
@@ -41,23 +42,66 @@ class AuthService:
         except jwt.PyJWTError:
             return None
     
+    def resolve_principal(self, db: Session, token: str) -> Optional[TokenPrincipal]:
+        """
+        Resolve a JWT to the user principal (cached for a short TTL)
+        
+        Args:
+            db: Database session (used on cache misses only)
+            token: Bearer token
+            
+        Returns:
+            TokenPrincipal, or None for invalid/revoked tokens and missing users
+        """
+        principal = verified_token_cache.get(token)
+        if principal is not None:
+            return principal
+        if verified_token_cache.is_revoked(token):
+            return None
+        
+        payload = self.verify_token(token)
+        if payload is None or payload.get("sub") is None:
+            return None
+        
+        from models.user_profiles import UserProfile
+        
+        row = db.query(User.id, User.user_status, UserProfile.university_verified).outerjoin(
+            UserProfile, UserProfile.user_id == User.id
+        ).filter(User.id == int(payload["sub"])).first()
+        if row is None:
+            return None
+        
+        principal = TokenPrincipal(
+            user_id=int(row.id),
+            user_status=row.user_status,
+            is_verified=bool(row.university_verified),
+            token_expires_at=float(payload["exp"]) if payload.get("exp") else None
+        )
+        verified_token_cache.put(token, principal)
+        return principal
+    
     def get_current_user(self, db: Session, token: str) -> Optional[User]:
         """Get current user from JWT token"""
         try:
-            payload = self.verify_token(token)
-            if payload is None:
-                return None
-            
-            user_id: int = payload.get("sub")
-            if user_id is None:
+            principal = self.resolve_principal(db, token)
+            if principal is None:
                 return None
             
-            user = db.query(User).filter(User.id == user_id).first()
-            return user
+            return db.get(User, principal.user_id)
             
         except Exception:
             return None
     
+    def revoke_access_token(self, token: str):
+        """Reject an access token in this process until it expires (logout)"""
+        payload = self.verify_token(token)
+        expires_at = float(payload["exp"]) if payload and payload.get("exp") else None
+        verified_token_cache.revoke(token, expires_at)
+    
+    def invalidate_user_tokens(self, user_id: int):
+        """Drop cached principals of a user (deactivation, deletion, status change)"""
+        verified_token_cache.invalidate_user(user_id)
+    
     def authenticate_user(self, db: Session, username: str, password: str) -> Optional[User]:
         """Authenticate user with username/password"""
         try:
@@ -0,0 +1,380 @@
+"""
+Candidate Feed Service
+Per-user queues of pre-ranked swipe candidates: a background job ranks a pool of
+unseen active users (profile embedding similarity plus recency and activity) into a
+ready-to-serve queue, /top-profiles pops from it and refills it asynchronously when low
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from services.profile_embeddings import ProfileEmbeddingService, profile_embedding_service, profile_text
+
+logger = logging.getLogger(__name__)
+
+
+# Feed configuration (overridable via environment)
+FEED_TARGET_SIZE = int(os.getenv("FEED_TARGET_SIZE", "100"))
+FEED_LOW_WATERMARK = int(os.getenv("FEED_LOW_WATERMARK", "20"))
+FEED_CANDIDATE_POOL_SIZE = int(os.getenv("FEED_CANDIDATE_POOL_SIZE", "300"))
+FEED_TTL_SECONDS = float(os.getenv("FEED_TTL_SECONDS", "900"))
+FEED_MAX_USERS = int(os.getenv("FEED_MAX_USERS", "10000"))
+FEED_MAX_SERVED = int(os.getenv("FEED_MAX_SERVED", "1000"))
+FEED_REFRESH_INTERVAL_SECONDS = float(os.getenv("FEED_REFRESH_INTERVAL_SECONDS", "60"))
+
+# Ranking weights
+FEED_SIMILARITY_WEIGHT = float(os.getenv("FEED_SIMILARITY_WEIGHT", "0.6"))
+FEED_RECENCY_WEIGHT = float(os.getenv("FEED_RECENCY_WEIGHT", "0.25"))
+FEED_ACTIVITY_WEIGHT = float(os.getenv("FEED_ACTIVITY_WEIGHT", "0.15"))
+FEED_HALF_LIFE_DAYS = float(os.getenv("FEED_HALF_LIFE_DAYS", "14"))
+
+
+@dataclass
+class FeedCandidate:
+    """Candidate row used for ranking"""
+    user_id: int
+    text: str
+    created_at: Optional[datetime] = None
+    last_active: Optional[datetime] = None
+
+
+@dataclass
+class _Feed:
+    queue: Deque[Tuple[int, float]] = field(default_factory=deque)
+    served: "OrderedDict[int, None]" = field(default_factory=OrderedDict)
+    built_at: float = 0.0
+    last_access: float = 0.0
+
+
+def _decay(timestamps: Iterable[Optional[datetime]], now: datetime, half_life_days: float) -> np.ndarray:
+    """Exponential decay (1.0 = now, 0.5 after one half-life, 0.0 when unknown)"""
+    ages = np.array([
+        (now - value).total_seconds() / 86400.0 if value is not None else np.inf
+        for value in timestamps
+    ], dtype=np.float64)
+    return np.power(0.5, np.clip(ages, 0.0, None) / half_life_days)
+
+
+def rank_candidates(
+    candidates: List[FeedCandidate],
+    viewer_embedding: Optional[np.ndarray] = None,
+    candidate_embeddings: Optional[np.ndarray] = None,
+    now: Optional[datetime] = None
+) -> List[Tuple[int, float]]:
+    """
+    Rank candidates for a viewer
+
+    Args:
+        candidates: Candidate pool
+        viewer_embedding: L2-normalized embedding of the viewer's profile (or None)
+        candidate_embeddings: L2-normalized embeddings, one row per candidate (or None)
+        now: Reference time for recency/activity decay
+
+    Returns:
+        (user_id, score) pairs, best first
+    """
+    if not candidates:
+        return []
+    now = now or datetime.utcnow()
+
+    similarity = np.zeros(len(candidates))
+    if viewer_embedding is not None and candidate_embeddings is not None:
+        similarity = np.clip(candidate_embeddings @ viewer_embedding, 0.0, 1.0)
+
+    recency = _decay((candidate.created_at for candidate in candidates), now, FEED_HALF_LIFE_DAYS)
+    activity = _decay((candidate.last_active for candidate in candidates), now, FEED_HALF_LIFE_DAYS)
+
+    scores = (
+        FEED_SIMILARITY_WEIGHT * similarity
+        + FEED_RECENCY_WEIGHT * recency
+        + FEED_ACTIVITY_WEIGHT * activity
+    )
+    order = np.argsort(-scores, kind="stable")
+    return [(candidates[index].user_id, round(float(scores[index]), 4)) for index in order]
+
+
+class CandidateFeedService:
+    """
+    Per-user ready-to-serve candidate queues
+
+    pop() only touches the in-memory queue and never waits for a build: on a cold or
+    expired feed it returns nothing (the caller serves its SQL fallback) and starts
+    the build in the background. Builds run on a worker
+    thread with their own session, are de-duplicated per user, and exclude the user's
+    swiped targets (seen set) plus everything already queued or served.
+    """
+
+    def __init__(
+        self,
+        target_size: int = FEED_TARGET_SIZE,
+        low_watermark: int = FEED_LOW_WATERMARK,
+        pool_size: int = FEED_CANDIDATE_POOL_SIZE,
+        ttl_seconds: float = FEED_TTL_SECONDS,
+        max_users: int = FEED_MAX_USERS,
+        session_factory: Optional[Callable[[], Any]] = None,
+        embeddings: Optional[ProfileEmbeddingService] = None
+    ):
+        """
+        Initialize service
+
+        Args:
+            target_size: Queue length a refill aims for
+            low_watermark: Queue length below which pop() schedules a refill
+            pool_size: Number of unseen candidates ranked per refill
+            ttl_seconds: Age after which a feed is rebuilt from scratch
+            max_users: Maximum number of users with an in-memory feed (LRU)
+            session_factory: Callable returning a SQLAlchemy Session (defaults to dependencies.db.SessionLocal)
+            embeddings: Profile embedding service (defaults to the shared instance)
+        """
+        self.target_size = target_size
+        self.low_watermark = low_watermark
+        self.pool_size = pool_size
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._session_factory = session_factory
+
+        self._feeds: "OrderedDict[int, _Feed]" = OrderedDict()
+        self._refills: Dict[int, asyncio.Task] = {}
+        self.embeddings = embeddings or profile_embedding_service
+
+        # Statistics
+        self.served_count = 0
+        self.cold_builds = 0
+        self.background_refills = 0
+        self.failed_refills = 0
+        self.skipped_swiped = 0
+        self.total_build_time = 0.0
+
+    # === Public API ===
+
+    async def pop(
+        self,
+        user_id: int,
+        limit: int,
+        is_excluded: Optional[Callable[[int], bool]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Take the next candidates from a user's feed
+
+        Args:
+            user_id: Viewer user ID
+            limit: Number of candidates to return
+            is_excluded: Predicate for candidates to skip (e.g. swiped since the feed was built)
+
+        Returns:
+            (user_id, score) pairs in ranked order (empty while a cold feed is being built)
+        """
+        feed = self._feed(user_id)
+        if feed.built_at and time.time() - feed.built_at > self.ttl_seconds:
+            self._reset(feed)
+        if not feed.queue:
+            self.cold_builds += 1
+            self.schedule_refill(user_id)
+            return []
+
+        items: List[Tuple[int, float]] = []
+        while feed.queue and len(items) < limit:
+            candidate_id, score = feed.queue.popleft()
+            self._mark_served(feed, candidate_id)
+            if is_excluded is not None and is_excluded(candidate_id):
+                self.skipped_swiped += 1
+                continue
+            items.append((candidate_id, score))
+
+        self.served_count += len(items)
+        if len(feed.queue) < self.low_watermark:
+            self.schedule_refill(user_id)
+        return items
+
+    def mark_served(self, user_id: int, candidate_ids: Iterable[int]):
+        """Record candidates served outside the feed (e.g. the SQL fallback) so it does not queue them"""
+        feed = self._feed(user_id, touch=False)
+        for candidate_id in candidate_ids:
+            self._mark_served(feed, int(candidate_id))
+
+    def schedule_refill(self, user_id: int):
+        """Refill a user's feed in the background (no-op if one is already running)"""
+        if user_id in self._refills:
+            return
+        self.background_refills += 1
+        asyncio.get_running_loop().create_task(self.refill(user_id))
+
+    async def refill(self, user_id: int):
+        """Rank new candidates into a user's feed (concurrent calls share one build)"""
+        task = self._refills.get(user_id)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._refill(user_id))
+            self._refills[user_id] = task
+            task.add_done_callback(lambda _: self._refills.pop(user_id, None))
+        await asyncio.shield(task)
+
+    async def refresh_active_feeds(self):
+        """Refill every cached feed that is below the watermark or about to expire"""
+        now = time.time()
+        for user_id, feed in list(self._feeds.items()):
+            if now - feed.last_access > self.ttl_seconds:
+                # Not used for a whole TTL: drop instead of rebuilding
+                self._feeds.pop(user_id, None)
+                continue
+            if now - feed.built_at > self.ttl_seconds * 0.8:
+                self._reset(feed)
+            if len(feed.queue) < self.low_watermark:
+                await self.refill(user_id)
+
+    def invalidate(self, user_id: int):
+        """Drop a user's feed (e.g. after profile or preference changes)"""
+        self._feeds.pop(int(user_id), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get feed statistics"""
+        return {
+            "feeds": len(self._feeds),
+            "queued_candidates": sum(len(feed.queue) for feed in self._feeds.values()),
+            "refills_in_flight": len(self._refills),
+            "served": self.served_count,
+            "cold_builds": self.cold_builds,
+            "background_refills": self.background_refills,
+            "failed_refills": self.failed_refills,
+            "skipped_swiped": self.skipped_swiped,
+            "total_build_time": round(self.total_build_time, 3)
+        }
+
+    # === Feed state ===
+
+    def _feed(self, user_id: int, touch: bool = True) -> _Feed:
+        """Get or create a feed (LRU over users; background refills do not touch it)"""
+        feed = self._feeds.get(user_id)
+        if feed is None:
+            feed = _Feed(last_access=time.time())
+            self._feeds[user_id] = feed
+            while len(self._feeds) > self.max_users:
+                self._feeds.popitem(last=False)
+        if touch:
+            self._feeds.move_to_end(user_id)
+            feed.last_access = time.time()
+        return feed
+
+    @staticmethod
+    def _reset(feed: _Feed):
+        """Forget queued and served candidates so the next build starts fresh"""
+        feed.queue.clear()
+        feed.served.clear()
+        feed.built_at = 0.0
+
+    @staticmethod
+    def _mark_served(feed: _Feed, candidate_id: int):
+        """Remember a served candidate so refills do not queue it again"""
+        feed.served[candidate_id] = None
+        while len(feed.served) > FEED_MAX_SERVED:
+            feed.served.popitem(last=False)
+
+    async def _refill(self, user_id: int):
+        """Build ranked candidates on a worker thread and append the new ones"""
+        feed = self._feed(user_id, touch=False)
+        exclude = {candidate_id for candidate_id, _ in feed.queue} | set(feed.served)
+        start_time = time.time()
+        try:
+            ranked = await asyncio.to_thread(self._build_ranked, user_id, exclude)
+        except Exception as e:
+            self.failed_refills += 1
+            logger.error(f"Candidate feed refill failed for user {user_id}: {e}")
+            return
+        finally:
+            self.total_build_time += time.time() - start_time
+
+        queued = {candidate_id for candidate_id, _ in feed.queue}
+        for candidate_id, score in ranked:
+            if len(feed.queue) >= self.target_size:
+                break
+            if candidate_id not in queued and candidate_id not in feed.served:
+                feed.queue.append((candidate_id, score))
+                queued.add(candidate_id)
+        if not feed.built_at:
+            feed.built_at = time.time()
+
+    # === Ranking (worker thread) ===
+
+    def _build_ranked(self, user_id: int, exclude: Set[int]) -> List[Tuple[int, float]]:
+        """Load the viewer and a candidate pool, embed and rank them"""
+        if self._session_factory is None:
+            from dependencies.db import SessionLocal
+            self._session_factory = SessionLocal
+
+        db = self._session_factory()
+        try:
+            viewer, candidates = self._load_candidates(db, user_id, exclude)
+        finally:
+            db.close()
+
+        viewer_embedding, candidate_embeddings = None, None
+        if viewer is not None and viewer.text and candidates:
+            embeddings = self._embed([viewer] + candidates)
+            if embeddings is not None:
+                viewer_embedding, candidate_embeddings = embeddings[0], embeddings[1:]
+        return rank_candidates(candidates, viewer_embedding, candidate_embeddings)
+
+    def _load_candidates(self, db, user_id: int, exclude: Set[int]) -> Tuple[Optional[FeedCandidate], List[FeedCandidate]]:
+        """Viewer profile and the most recently active unseen candidates (two queries)"""
+        from sqlalchemy import func
+        from models.users import User
+        from models.user_profiles import UserProfile
+        from services.seen_set_service import seen_set_service
+
+        columns = (
+            User.id, User.created_at, UserProfile.last_active,
+            UserProfile.one_sentence_intro, UserProfile.skills, UserProfile.hobbies,
+            UserProfile.goals, UserProfile.demands, UserProfile.current_university
+        )
+
+        def to_candidate(row) -> FeedCandidate:
+            return FeedCandidate(
+                user_id=int(row[0]),
+                text=profile_text(*row[3:]),
+                created_at=row[1],
+                last_active=row[2]
+            )
+
+        viewer_row = db.query(*columns).join(UserProfile, UserProfile.user_id == User.id).filter(
+            User.id == user_id
+        ).first()
+
+        query = db.query(*columns).join(UserProfile, UserProfile.user_id == User.id).filter(
+            User.id != user_id,
+            User.user_status == 'active',
+            UserProfile.name.isnot(None),
+            seen_set_service.sql_exclusion(db, user_id, User.id)
+        )
+        if exclude:
+            query = query.filter(User.id.notin_(exclude))
+        rows = query.order_by(
+            func.coalesce(UserProfile.last_active, User.created_at).desc()
+        ).limit(self.pool_size).all()
+
+        return (to_candidate(viewer_row) if viewer_row else None), [to_candidate(row) for row in rows]
+
+    def _embed(self, candidates: List[FeedCandidate]) -> Optional[np.ndarray]:
+        """Normalized profile embeddings (None while no model is available)"""
+        vectors = self.embeddings.embed([candidate.text for candidate in candidates])
+        return np.vstack(vectors) if vectors is not None else None
+
+
+# Global feed service instance
+candidate_feed_service = CandidateFeedService()
+
+
+async def candidate_feed_refresh_task(interval_seconds: float = FEED_REFRESH_INTERVAL_SECONDS):
+    """Background task: keep recently used feeds topped up and fresh"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await candidate_feed_service.refresh_active_feeds()
+        except Exception as e:
+            logger.error(f"Candidate feed refresh failed: {e}")
@@ -0,0 +1,495 @@
+"""
+Casual Request Matching Service
+Matches casual requests in one vectorized pass: embeddings of optimized_query are
+stored with each request and kept in an in-memory index, a request is scored against
+every active request in its region (cosine plus location and preference boosts) and
+the true top-k is selected with argpartition
+"""
+
+import asyncio
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.profile_embeddings import ProfileEmbeddingService, profile_embedding_service
+
+logger = logging.getLogger(__name__)
+
+
+# Index configuration (overridable via environment)
+CASUAL_MATCH_REFRESH_SECONDS = float(os.getenv("CASUAL_MATCH_REFRESH_SECONDS", "30"))
+CASUAL_MATCH_FULL_REBUILD_SECONDS = float(os.getenv("CASUAL_MATCH_FULL_REBUILD_SECONDS", "900"))
+CASUAL_MATCH_MAX_REQUESTS = int(os.getenv("CASUAL_MATCH_MAX_REQUESTS", "50000"))
+CASUAL_MATCH_HASH_DIMENSION = int(os.getenv("CASUAL_MATCH_HASH_DIMENSION", "1024"))
+
+# Scoring weights (sum to 1.0 so scores stay in [0, 1])
+CASUAL_MATCH_TEXT_WEIGHT = float(os.getenv("CASUAL_MATCH_TEXT_WEIGHT", "0.6"))
+CASUAL_MATCH_PROVINCE_WEIGHT = float(os.getenv("CASUAL_MATCH_PROVINCE_WEIGHT", "0.1"))
+CASUAL_MATCH_CITY_WEIGHT = float(os.getenv("CASUAL_MATCH_CITY_WEIGHT", "0.15"))
+CASUAL_MATCH_PREFERENCE_WEIGHT = float(os.getenv("CASUAL_MATCH_PREFERENCE_WEIGHT", "0.15"))
+CASUAL_MATCH_MIN_SCORE = float(os.getenv("CASUAL_MATCH_MIN_SCORE", "0.2"))
+CASUAL_MATCH_SIMILAR_TEXT = float(os.getenv("CASUAL_MATCH_SIMILAR_TEXT", "0.5"))
+
+# Timing preferences that can meet each other
+TIMING_COMPATIBILITY = {
+    'weekend': ['weekend', 'flexible'],
+    'weekday': ['weekday', 'flexible'],
+    'evening': ['evening', 'flexible'],
+    'flexible': ['weekend', 'weekday', 'evening', 'flexible']
+}
+
+# Rows changed shortly before the last sync are read again (clock skew between app and DB)
+_SYNC_OVERLAP = timedelta(seconds=5)
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class RequestFeatures:
+    """Matching view of a casual request"""
+    request_id: int
+    user_id: str
+    text: str
+    province_id: Optional[int] = None
+    city_id: Optional[int] = None
+    activity_type: str = ""
+    timing: str = ""
+
+    @classmethod
+    def from_request(cls, request: Any) -> "RequestFeatures":
+        """Build from a CasualRequest (or a row with the same attributes)"""
+        preferences = getattr(request, "preferences", None) or {}
+        return cls(
+            request_id=int(request.id) if request.id is not None else -1,
+            user_id=str(request.user_id),
+            text=request.optimized_query or request.query or "",
+            province_id=request.province_id,
+            city_id=request.city_id,
+            activity_type=_preference(preferences, "activity_type"),
+            timing=_preference(preferences, "timing")
+        )
+
+
+@dataclass
+class MatchIndex:
+    """Column arrays of all indexed requests (rows of matrix are L2-normalized embeddings)"""
+    request_ids: np.ndarray
+    user_ids: np.ndarray
+    province_ids: np.ndarray
+    city_ids: np.ndarray
+    activity_types: np.ndarray
+    timings: np.ndarray
+    matrix: np.ndarray
+
+    @classmethod
+    def build(cls, features: Sequence[RequestFeatures], vectors: Sequence[np.ndarray]) -> "MatchIndex":
+        """Stack per-request features and vectors into arrays"""
+        dimension = len(vectors[0]) if len(vectors) else 1
+        return cls(
+            request_ids=np.array([item.request_id for item in features], dtype=np.int64),
+            user_ids=np.array([item.user_id for item in features], dtype=object),
+            province_ids=np.array([_id_or_missing(item.province_id) for item in features], dtype=np.int64),
+            city_ids=np.array([_id_or_missing(item.city_id) for item in features], dtype=np.int64),
+            activity_types=np.array([item.activity_type for item in features], dtype=object),
+            timings=np.array([item.timing for item in features], dtype=object),
+            matrix=np.vstack(vectors).astype(np.float32) if len(vectors) else np.zeros((0, dimension), dtype=np.float32)
+        )
+
+    def __len__(self) -> int:
+        return len(self.request_ids)
+
+
+def _preference(preferences: Dict[str, Any], key: str) -> str:
+    value = preferences.get(key) if isinstance(preferences, dict) else None
+    return str(value).strip().lower() if value else ""
+
+
+def _id_or_missing(value: Optional[int]) -> int:
+    return int(value) if value is not None else -1
+
+
+def encode_embedding(vector: np.ndarray) -> bytes:
+    """Serialize an embedding for the query_embedding column (float32)"""
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def decode_embedding(blob: Optional[bytes]) -> Optional[np.ndarray]:
+    """Deserialize a stored embedding (None for missing/empty values)"""
+    if not blob:
+        return None
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def hashed_embeddings(texts: Sequence[str], dimension: int = CASUAL_MATCH_HASH_DIMENSION) -> np.ndarray:
+    """
+    Normalized hashed bag-of-words vectors
+
+    Fallback when no embedding model is available: cosine on these is word overlap,
+    so matching stays one matrix product. Never persisted.
+    """
+    matrix = np.zeros((len(texts), dimension), dtype=np.float32)
+    for row, text in enumerate(texts):
+        tokens = {token.lower() for token in _WORD_RE.findall(text or "")}
+        if tokens:
+            matrix[row, [zlib.crc32(token.encode()) % dimension for token in tokens]] = 1.0
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def score_candidates(me: RequestFeatures, my_vector: np.ndarray, index: MatchIndex) -> Dict[str, np.ndarray]:
+    """
+    Score one request against every indexed request
+
+    Args:
+        me: Request to match
+        my_vector: Its normalized embedding (same space as index.matrix)
+        index: Candidate index
+
+    Returns:
+        Arrays aligned with the index: score, text, same_province, same_city,
+        same_activity, compatible_timing
+    """
+    text = np.clip(index.matrix @ my_vector, 0.0, 1.0) if len(index) else np.zeros(0)
+
+    same_province = (index.province_ids == me.province_id) if me.province_id is not None else np.zeros(len(index), dtype=bool)
+    same_city = same_province & (index.city_ids == me.city_id) if me.city_id is not None else np.zeros(len(index), dtype=bool)
+
+    same_activity = (index.activity_types == me.activity_type) if me.activity_type else np.zeros(len(index), dtype=bool)
+    compatible = TIMING_COMPATIBILITY.get(me.timing)
+    compatible_timing = np.isin(index.timings, compatible) if compatible else np.zeros(len(index), dtype=bool)
+
+    score = (
+        CASUAL_MATCH_TEXT_WEIGHT * text
+        + CASUAL_MATCH_PROVINCE_WEIGHT * same_province
+        + CASUAL_MATCH_CITY_WEIGHT * same_city
+        + CASUAL_MATCH_PREFERENCE_WEIGHT * (same_activity | compatible_timing)
+    )
+    return {
+        "score": np.clip(score, 0.0, 1.0),
+        "text": text,
+        "same_province": same_province,
+        "same_city": same_city,
+        "same_activity": same_activity,
+        "compatible_timing": compatible_timing
+    }
+
+
+def top_matches(
+    me: RequestFeatures,
+    my_vector: np.ndarray,
+    index: MatchIndex,
+    limit: int,
+    min_score: float = CASUAL_MATCH_MIN_SCORE
+) -> List[Tuple[int, float, List[str]]]:
+    """
+    Best matches for a request among the indexed requests of its region
+
+    Candidates are the requests in the same province (all requests when the province
+    is unknown), excluding the user's own.
+
+    Returns:
+        (request_id, score, match_reasons) tuples, best first
+    """
+    if not len(index) or limit <= 0:
+        return []
+    components = score_candidates(me, my_vector, index)
+    scores = components["score"]
+
+    eligible = (index.user_ids != me.user_id) & (index.request_ids != me.request_id) & (scores >= min_score)
+    if me.province_id is not None:
+        eligible &= components["same_province"]
+    positions = np.flatnonzero(eligible)
+    if len(positions) > limit:
+        positions = positions[np.argpartition(-scores[positions], limit - 1)[:limit]]
+    positions = positions[np.argsort(-scores[positions], kind="stable")]
+
+    results = []
+    for position in positions:
+        reasons = []
+        if components["same_province"][position]:
+            reasons.append("Same province")
+        if components["same_city"][position]:
+            reasons.append("Same city")
+        if components["same_activity"][position]:
+            reasons.append("Similar activity type")
+        if components["compatible_timing"][position]:
+            reasons.append("Compatible timing")
+        if components["text"][position] >= CASUAL_MATCH_SIMILAR_TEXT:
+            reasons.append("Similar interests")
+        results.append((int(index.request_ids[position]), round(float(scores[position]), 4), reasons))
+    return results
+
+
+class CasualMatchEngine:
+    """
+    In-memory index of active casual requests
+
+    The index is refreshed incrementally (rows updated since the last sync) and
+    rebuilt from scratch periodically so deleted requests drop out. Requests whose
+    query_embedding is missing or stale are encoded in one batch during a sync and
+    written back (only if the text was not edited meanwhile), so each optimized_query
+    is embedded once. While no model is available the whole index uses hashed
+    vectors; it is rebuilt with model vectors once the encoder is back.
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: float = CASUAL_MATCH_REFRESH_SECONDS,
+        full_rebuild_seconds: float = CASUAL_MATCH_FULL_REBUILD_SECONDS,
+        max_requests: int = CASUAL_MATCH_MAX_REQUESTS,
+        session_factory: Optional[Callable[[], Any]] = None,
+        embeddings: Optional[ProfileEmbeddingService] = None
+    ):
+        """
+        Initialize engine
+
+        Args:
+            refresh_seconds: Age after which a match query triggers an incremental sync
+            full_rebuild_seconds: Age after which a sync reloads all active requests
+            max_requests: Maximum number of (most recently active) requests indexed
+            session_factory: Callable returning a SQLAlchemy Session (defaults to dependencies.db.SessionLocal)
+            embeddings: Embedding service for the model vectors (defaults to the shared instance)
+        """
+        self.refresh_seconds = refresh_seconds
+        self.full_rebuild_seconds = full_rebuild_seconds
+        self.max_requests = max_requests
+        self._session_factory = session_factory
+
+        self._entries: Dict[int, Tuple[RequestFeatures, np.ndarray]] = {}
+        self._index: Optional[MatchIndex] = None
+        self._synced_at: Optional[datetime] = None
+        self._refreshed_at = 0.0
+        self._rebuilt_at = 0.0
+        self._sync_task: Optional[asyncio.Task] = None
+        self._sync_lock = threading.Lock()
+        self.embeddings = embeddings or profile_embedding_service
+        self._hashed = False
+        self._dimension: Optional[int] = None
+
+        # Statistics
+        self.match_queries = 0
+        self.syncs = 0
+        self.full_rebuilds = 0
+        self.embedded = 0
+        self.total_sync_time = 0.0
+
+    # === Public API ===
+
+    async def find_matches(self, request: Any, limit: int) -> List[Tuple[int, float, List[str]]]:
+        """
+        Best matching active requests for a request
+
+        Args:
+            request: CasualRequest to match
+            limit: Number of matches to return
+
+        Returns:
+            (request_id, score, match_reasons) tuples, best first
+        """
+        await self.refresh()
+        me = RequestFeatures.from_request(request)
+        index, entries, index_hashed = self._index, self._entries, self._hashed
+        entry = entries.get(me.request_id)
+        if entry is not None and entry[0].text == me.text:
+            my_vector = entry[1]
+        elif index_hashed:
+            my_vector = hashed_embeddings([me.text])[0]
+        else:
+            vectors, _, hashed = await asyncio.to_thread(self._vectors, [me], [getattr(request, "query_embedding", None)])
+            # Model lost since the index was built: match on region and preferences until the next sync
+            my_vector = np.zeros(index.matrix.shape[1], dtype=np.float32) if hashed else vectors[0]
+        self.match_queries += 1
+        return top_matches(me, my_vector, index, limit)
+
+    def score_requests(self, request: Any, others: Sequence[Any]) -> np.ndarray:
+        """
+        Scores of one request against others (same scoring as find_matches, no region filter)
+
+        Args:
+            request: CasualRequest
+            others: CasualRequests to compare with
+
+        Returns:
+            Score per other request in [0, 1]
+        """
+        features = [RequestFeatures.from_request(item) for item in [request, *others]]
+        vectors, _, _ = self._vectors(features, [getattr(item, "query_embedding", None) for item in [request, *others]])
+        return score_candidates(features[0], vectors[0], MatchIndex.build(features[1:], vectors[1:]))["score"]
+
+    async def refresh(self, force: bool = False):
+        """Sync the index if it is stale (concurrent callers share one sync)"""
+        if not force and self._index is not None and time.time() - self._refreshed_at < self.refresh_seconds:
+            return
+        task = self._sync_task
+        if task is None:
+            task = asyncio.get_running_loop().create_task(asyncio.to_thread(self._sync))
+            self._sync_task = task
+            task.add_done_callback(lambda _: setattr(self, "_sync_task", None))
+        await asyncio.shield(task)
+
+    def invalidate(self):
+        """Force a full rebuild on the next sync"""
+        self._rebuilt_at = 0.0
+        self._refreshed_at = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get matching statistics"""
+        return {
+            "indexed_requests": len(self._index) if self._index is not None else 0,
+            "match_queries": self.match_queries,
+            "syncs": self.syncs,
+            "full_rebuilds": self.full_rebuilds,
+            "embedded": self.embedded,
+            "embeddings_available": not self._hashed and self.embeddings.available(),
+            "total_sync_time": round(self.total_sync_time, 3)
+        }
+
+    # === Index maintenance (worker thread) ===
+
+    def _sync(self):
+        """Load changed (or all) active requests, embed missing ones and swap in a new index"""
+        with self._sync_lock:
+            start_time = time.time()
+            full = self._index is None or start_time - self._rebuilt_at > self.full_rebuild_seconds
+            try:
+                self._sync_rows(full)
+            finally:
+                self.syncs += 1
+                self.total_sync_time += time.time() - start_time
+
+    def _sync_rows(self, full: bool):
+        from sqlalchemy import bindparam, update
+        from models.casual_requests import CasualRequest
+
+        if self._session_factory is None:
+            from dependencies.db import SessionLocal
+            self._session_factory = SessionLocal
+
+        synced_at = datetime.utcnow()
+        db = self._session_factory()
+        try:
+            query = db.query(
+                CasualRequest.id, CasualRequest.user_id, CasualRequest.query, CasualRequest.optimized_query,
+                CasualRequest.province_id, CasualRequest.city_id, CasualRequest.preferences,
+                CasualRequest.query_embedding, CasualRequest.is_active
+            )
+            if full:
+                query = query.filter(CasualRequest.is_active == True).order_by(
+                    CasualRequest.last_activity_at.desc()
+                ).limit(self.max_requests)
+            else:
+                # Deactivated rows are read too, so they leave the index
+                query = query.filter(CasualRequest.updated_at >= self._synced_at - _SYNC_OVERLAP)
+            rows = query.all()
+
+            active = [row for row in rows if row.is_active]
+            features = [RequestFeatures.from_request(row) for row in active]
+            vectors, encoded, hashed = self._vectors(features, [row.query_embedding for row in active])
+            if encoded:
+                # Only where the text is still the one that was embedded (not edited since the read)
+                table = CasualRequest.__table__
+                db.execute(
+                    update(table).where(
+                        table.c.id == bindparam("request_id"),
+                        table.c.query == bindparam("read_query"),
+                        table.c.optimized_query == bindparam("read_optimized_query")
+                    ).values(query_embedding=bindparam("blob")),
+                    [
+                        {"request_id": row.id, "read_query": row.query,
+                         "read_optimized_query": row.optimized_query, "blob": encoded[int(row.id)]}
+                        for row in active if int(row.id) in encoded
+                    ]
+                )
+                db.commit()
+        finally:
+            db.close()
+
+        if not full and not hashed and self._hashed:
+            # The model is back: replace the hashed index with model vectors
+            return self._sync_rows(True)
+
+        entries = {} if full else dict(self._entries)
+        for row in rows:
+            if not row.is_active:
+                entries.pop(int(row.id), None)
+        for item, vector in zip(features, vectors):
+            entries[item.request_id] = (item, vector)
+        if hashed and not full and not self._hashed:
+            # The model became unavailable since the last sync: move every entry to hashed vectors
+            items = [item for item, _ in entries.values()]
+            entries = {
+                item.request_id: (item, vector)
+                for item, vector in zip(items, hashed_embeddings([item.text for item in items]))
+            }
+
+        self._entries = entries
+        self._hashed = hashed
+        self._index = MatchIndex.build(
+            [item for item, _ in entries.values()],
+            [vector for _, vector in entries.values()]
+        )
+        self._synced_at = synced_at
+        self._refreshed_at = time.time()
+        if full:
+            self._rebuilt_at = self._refreshed_at
+            self.full_rebuilds += 1
+
+    def _vectors(
+        self,
+        features: Sequence[RequestFeatures],
+        blobs: Sequence[Optional[bytes]]
+    ) -> Tuple[List[np.ndarray], Dict[int, bytes], bool]:
+        """
+        Embedding per request: the stored one when valid, otherwise encoded in one batch
+
+        Returns:
+            (vectors, newly encoded blobs by request ID, hashed) - the blobs to persist;
+            hashed is True when the model was unavailable and every vector is hashed
+        """
+        if not self.embeddings.available():
+            return list(hashed_embeddings([item.text for item in features])), {}, True
+
+        vectors: List[Optional[np.ndarray]] = [decode_embedding(blob) for blob in blobs]
+        if self._dimension is None:
+            self._dimension = next((len(vector) for vector in vectors if vector is not None), None)
+        missing = [
+            position for position, vector in enumerate(vectors)
+            if vector is None or len(vector) != self._dimension
+        ]
+        if not missing:
+            return vectors, {}, False
+
+        encoded = self.embeddings.encode([features[position].text for position in missing])
+        if encoded is None:
+            # Model unavailable: hashed vectors for everything (one vector space)
+            return list(hashed_embeddings([item.text for item in features])), {}, True
+
+        self._dimension = encoded.shape[1]
+        self.embedded += len(missing)
+        new_blobs: Dict[int, bytes] = {}
+        for position, vector in zip(missing, encoded):
+            vectors[position] = vector
+            if features[position].request_id >= 0:
+                new_blobs[features[position].request_id] = encode_embedding(vector)
+        return vectors, new_blobs, False
+
+
+# Global casual matching engine instance
+casual_match_engine = CasualMatchEngine()
+
+
+async def casual_match_refresh_task(interval_seconds: float = CASUAL_MATCH_REFRESH_SECONDS):
+    """Background task: keep the casual request index (and stored embeddings) current"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await casual_match_engine.refresh(force=True)
+        except Exception as e:
+            logger.error(f"Casual match index refresh failed: {e}")
@@ -13,6 +13,7 @@ from sentence_transformers import SentenceTransformer
 
 from services.casual_request_classifier import CasualRequestClassifier
 from services.casual_request_optimizer import CasualRequestOptimizer
+from services.embedding_batcher import get_embedding_batcher
 
 
 async def process_and_store_casual_request(
@@ -41,7 +42,7 @@ async def process_and_store_casual_request(
     optimized_query = optimization_result.get("optimized_query", user_input)
     
     # 3. Generate vector embedding
-    vector = embedding_model.encode(optimized_query, normalize_embeddings=True).tolist()
+    vector = (await get_embedding_batcher(embedding_model).encode(optimized_query)).tolist()
     current_timestamp = time.time()
     
     # 4. Update or insert into vector database
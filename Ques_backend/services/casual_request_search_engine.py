@@ -8,6 +8,8 @@ import time
 from typing import List, Dict, Any
 from sentence_transformers import SentenceTransformer
 from services.glm4_client import GLM4Client
+from services.embedding_batcher import get_embedding_batcher
+from services.model_registry import model_registry, DENSE_MODEL_NAME
 
 
 class CasualRequestSearchEngine:
@@ -32,13 +34,13 @@ class CasualRequestSearchEngine:
         self.api_base_url = api_base_url.rstrip('/')
         
         # Use shared embedding model
-        self.embedding_model = embedding_model or SentenceTransformer('BAAI/bge-m3')
+        self.embedding_model = embedding_model or model_registry.get_sentence_transformer(DENSE_MODEL_NAME)
     
     async def search_casual_requests(self, query_text: str, limit: int = 10) -> List[Dict]:
         """Search for similar casual requests"""
         try:
             # Generate query vector (consider moving this step to the vector database side to reduce server load)
-            query_vector = self.embedding_model.encode(query_text, normalize_embeddings=True).tolist()
+            query_vector = (await get_embedding_batcher(self.embedding_model).encode(query_text)).tolist()
             
             # Execute vector search - note this only uses dense vector search, no sparse vectors and no search strategy expansion
             search_results = self.qdrant_client.search(
@@ -0,0 +1,232 @@
+"""
+Compact Bitmap
+Roaring-style compressed bitmap of unsigned 32-bit integers (pure Python)
+
+Values are split into a 16-bit high key and a 16-bit low part. Each high key owns a
+container that is a sorted uint16 array while it holds at most 4096 values and a
+65536-bit bitset (stored as a Python int) once it grows beyond that.
+"""
+
+import struct
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, Union
+
+# Containers switch from array to bitset above this many values (same threshold as Roaring)
+ARRAY_CONTAINER_MAX = 4096
+
+_MAGIC = b"CBM1"
+_BITSET_BYTES = 65536 // 8
+_ARRAY_CONTAINER = 0
+_BITSET_CONTAINER = 1
+
+Container = Union[array, int]
+
+
+def _popcount(value: int) -> int:
+    """Number of set bits"""
+    return bin(value).count("1")
+
+
+def _new_array(values: Iterable[int] = ()) -> array:
+    """Sorted uint16 array container"""
+    return array("H", values)
+
+
+class CompactBitmap:
+    """Set of unsigned 32-bit integers with Roaring-style array/bitset containers"""
+
+    def __init__(self, values: Iterable[int] = None):
+        self._containers: Dict[int, Container] = {}
+        if values is not None:
+            self.update(values)
+
+    # === Mutation ===
+
+    def add(self, value: int) -> bool:
+        """
+        Add a value
+
+        Args:
+            value: Integer in [0, 2**32)
+
+        Returns:
+            True if the value was not present before
+        """
+        if not 0 <= value <= 0xFFFFFFFF:
+            raise ValueError(f"CompactBitmap values must be unsigned 32-bit integers, got {value}")
+
+        high, low = value >> 16, value & 0xFFFF
+        container = self._containers.get(high)
+
+        if container is None:
+            self._containers[high] = _new_array([low])
+            return True
+
+        if isinstance(container, int):
+            bit = 1 << low
+            if container & bit:
+                return False
+            self._containers[high] = container | bit
+            return True
+
+        position = bisect_left(container, low)
+        if position < len(container) and container[position] == low:
+            return False
+        container.insert(position, low)
+
+        if len(container) > ARRAY_CONTAINER_MAX:
+            bitset = 0
+            for item in container:
+                bitset |= 1 << item
+            self._containers[high] = bitset
+        return True
+
+    def update(self, values: Iterable[int]):
+        """Add several values"""
+        for value in values:
+            self.add(value)
+
+    def discard(self, value: int) -> bool:
+        """
+        Remove a value if present
+
+        Returns:
+            True if the value was present
+        """
+        if not 0 <= value <= 0xFFFFFFFF:
+            return False
+
+        high, low = value >> 16, value & 0xFFFF
+        container = self._containers.get(high)
+        if container is None:
+            return False
+
+        if isinstance(container, int):
+            bit = 1 << low
+            if not container & bit:
+                return False
+            container &= ~bit
+            if _popcount(container) <= ARRAY_CONTAINER_MAX:
+                self._containers[high] = _new_array(self._bitset_values(container))
+            else:
+                self._containers[high] = container
+        else:
+            position = bisect_left(container, low)
+            if position >= len(container) or container[position] != low:
+                return False
+            del container[position]
+            if not container:
+                del self._containers[high]
+        return True
+
+    def clear(self):
+        """Remove all values"""
+        self._containers.clear()
+
+    # === Queries ===
+
+    def __contains__(self, value: int) -> bool:
+        if not isinstance(value, int) or not 0 <= value <= 0xFFFFFFFF:
+            return False
+        container = self._containers.get(value >> 16)
+        if container is None:
+            return False
+        low = value & 0xFFFF
+        if isinstance(container, int):
+            return bool((container >> low) & 1)
+        position = bisect_left(container, low)
+        return position < len(container) and container[position] == low
+
+    def __len__(self) -> int:
+        return sum(
+            _popcount(container) if isinstance(container, int) else len(container)
+            for container in self._containers.values()
+        )
+
+    def __iter__(self) -> Iterator[int]:
+        for high in sorted(self._containers):
+            container = self._containers[high]
+            base = high << 16
+            lows = self._bitset_values(container) if isinstance(container, int) else container
+            for low in lows:
+                yield base | low
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, CompactBitmap) and list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"<CompactBitmap(size={len(self)}, containers={len(self._containers)})>"
+
+    @staticmethod
+    def _bitset_values(bitset: int) -> Iterator[int]:
+        """Set bit positions of a bitset container in ascending order"""
+        while bitset:
+            lowest = bitset & -bitset
+            yield lowest.bit_length() - 1
+            bitset ^= lowest
+
+    # === Serialization ===
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize to a compact binary form
+
+        Layout: magic, container count, then per container (sorted by high key) the high key,
+        container type and payload length followed by the payload (little-endian uint16 array
+        or a 8 KiB bitset).
+        """
+        parts = [_MAGIC, struct.pack("<I", len(self._containers))]
+        for high in sorted(self._containers):
+            container = self._containers[high]
+            if isinstance(container, int):
+                payload = container.to_bytes(_BITSET_BYTES, "little")
+                container_type = _BITSET_CONTAINER
+            else:
+                values = array("H", container)
+                if values.itemsize != 2:
+                    raise ValueError("Platform uint16 array item size must be 2 bytes")
+                if struct.pack("=H", 1) != struct.pack("<H", 1):
+                    values.byteswap()
+                payload = values.tobytes()
+                container_type = _ARRAY_CONTAINER
+            parts.append(struct.pack("<HBI", high, container_type, len(payload)))
+            parts.append(payload)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CompactBitmap":
+        """
+        Deserialize from to_bytes output
+
+        Args:
+            data: Serialized bitmap (empty or None yields an empty bitmap)
+
+        Returns:
+            CompactBitmap instance
+        """
+        bitmap = cls()
+        if not data:
+            return bitmap
+
+        data = bytes(data)
+        if data[:4] != _MAGIC:
+            raise ValueError("Not a serialized CompactBitmap")
+
+        (count,) = struct.unpack_from("<I", data, 4)
+        offset = 8
+        for _ in range(count):
+            high, container_type, length = struct.unpack_from("<HBI", data, offset)
+            offset += struct.calcsize("<HBI")
+            payload = data[offset:offset + length]
+            offset += length
+
+            if container_type == _BITSET_CONTAINER:
+                bitmap._containers[high] = int.from_bytes(payload, "little")
+            else:
+                values = array("H")
+                values.frombytes(payload)
+                if struct.pack("=H", 1) != struct.pack("<H", 1):
+                    values.byteswap()
+                bitmap._containers[high] = values
+        return bitmap
@@ -0,0 +1,245 @@
+"""
+Embedding Micro-Batcher
+Collects concurrent encode requests for a few milliseconds and runs one batched
+forward pass on a worker thread, resolving a future per request
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Batching configuration (overridable via environment)
+EMBEDDING_BATCH_MAX_SIZE = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "32"))
+EMBEDDING_BATCH_MAX_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "5"))
+
+
+class EmbeddingBatcher:
+    """
+    In-process micro-batcher for sentence-transformers style models
+
+    Requests are queued on the event loop; a single worker coroutine waits up to
+    max_wait_ms (or until max_batch_size requests are queued), encodes the batch
+    in one model.encode call on a dedicated worker thread and resolves each
+    request's future. Requests arriving while a batch is running are grouped
+    into the next batch. Embeddings are L2-normalised.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        max_batch_size: int = EMBEDDING_BATCH_MAX_SIZE,
+        max_wait_ms: float = EMBEDDING_BATCH_MAX_WAIT_MS
+    ):
+        """
+        Initialize batcher
+
+        Args:
+            model: Model exposing encode(texts, normalize_embeddings=..., batch_size=...)
+            max_batch_size: Maximum number of texts per forward pass
+            max_wait_ms: Maximum time to wait for more requests before encoding (milliseconds)
+        """
+        self.model = model
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        # One worker thread: forward passes are serialised, batching provides the throughput
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-batcher")
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker_task: Optional[asyncio.Task] = None
+        self._has_items: Optional[asyncio.Event] = None
+        self._batch_full: Optional[asyncio.Event] = None
+
+        # Statistics
+        self.batch_count = 0
+        self.request_count = 0
+        self.encoded_count = 0
+        self.max_observed_batch = 0
+        self.total_encode_time = 0.0
+
+    # === Public API ===
+
+    async def encode(self, text: str) -> np.ndarray:
+        """
+        Encode a single text (batched with concurrent callers)
+
+        Args:
+            text: Input text
+
+        Returns:
+            Normalised embedding vector
+        """
+        loop = asyncio.get_running_loop()
+        self._ensure_worker(loop)
+
+        future = loop.create_future()
+        self._pending.append((text, future))
+        self.request_count += 1
+
+        self._has_items.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._batch_full.set()
+
+        return await future
+
+    async def encode_many(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Encode several texts (each joins the shared batch queue)
+
+        Args:
+            texts: Input texts
+
+        Returns:
+            Normalised embedding vectors in input order
+        """
+        return list(await asyncio.gather(*(self.encode(text) for text in texts)))
+
+    def encode_sync(self, text: str) -> np.ndarray:
+        """
+        Encode a single text synchronously (for non-async callers, not batched)
+
+        Args:
+            text: Input text
+
+        Returns:
+            Normalised embedding vector
+        """
+        return self.model.encode(text, normalize_embeddings=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics"""
+        return {
+            "requests": self.request_count,
+            "batches": self.batch_count,
+            "encoded_texts": self.encoded_count,
+            "average_batch_size": round(self.encoded_count / self.batch_count, 2) if self.batch_count else 0.0,
+            "max_batch_size_observed": self.max_observed_batch,
+            "total_encode_time": round(self.total_encode_time, 3),
+            "pending": len(self._pending),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0
+        }
+
+    def close(self):
+        """Stop the worker and release the worker thread"""
+        if self._worker_task is not None and not self._worker_task.done():
+            self._worker_task.cancel()
+        self._worker_task = None
+        self._executor.shutdown(wait=False)
+
+    # === Internal ===
+
+    def _ensure_worker(self, loop: asyncio.AbstractEventLoop):
+        """Start (or restart, if the event loop changed) the batching worker"""
+        if self._loop is loop and self._worker_task is not None and not self._worker_task.done():
+            return
+
+        self._loop = loop
+        self._pending = []
+        self._has_items = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._worker_task = loop.create_task(self._worker())
+
+    async def _worker(self):
+        """Collect pending requests into batches and encode them"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            await self._has_items.wait()
+
+            # Wait for the batch window to close or the batch to fill up
+            if len(self._pending) < self.max_batch_size and self.max_wait > 0:
+                self._batch_full.clear()
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self.max_wait)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            if not self._pending:
+                self._has_items.clear()
+            self._batch_full.clear()
+
+            # Skip requests whose callers have gone away
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            # Identical texts in one batch are encoded once
+            unique_texts = list(dict.fromkeys(text for text, _ in batch))
+
+            try:
+                vectors = await loop.run_in_executor(self._executor, self._encode_batch, unique_texts)
+            except Exception as e:
+                logger.error(f"[EmbeddingBatcher] Batch encode failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            by_text = dict(zip(unique_texts, vectors))
+            for text, future in batch:
+                if not future.done():
+                    future.set_result(by_text[text])
+
+    def _encode_batch(self, texts: List[str]) -> List[np.ndarray]:
+        """Run one batched forward pass (worker thread)"""
+        start_time = time.time()
+        vectors = self.model.encode(
+            texts,
+            normalize_embeddings=True,
+            batch_size=len(texts)
+        )
+
+        self.batch_count += 1
+        self.encoded_count += len(texts)
+        self.max_observed_batch = max(self.max_observed_batch, len(texts))
+        self.total_encode_time += time.time() - start_time
+
+        return [np.asarray(vector) for vector in vectors]
+
+
+# === Shared Batchers ===
+
+_batchers: Dict[int, EmbeddingBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_embedding_batcher(model: Any) -> EmbeddingBatcher:
+    """
+    Get the process-wide batcher for a model instance
+
+    Every search path that encodes with the same model shares one batcher, so
+    concurrent requests from different paths are grouped into the same batch.
+
+    Args:
+        model: Loaded embedding model
+
+    Returns:
+        EmbeddingBatcher for that model
+    """
+    with _batchers_lock:
+        batcher = _batchers.get(id(model))
+        if batcher is None or batcher.model is not model:
+            batcher = EmbeddingBatcher(model)
+            _batchers[id(model)] = batcher
+        return batcher
+
+
+def get_batcher_stats() -> Dict[str, Dict[str, Any]]:
+    """Get statistics of all shared batchers, keyed by model class name"""
+    with _batchers_lock:
+        return {
+            f"{type(batcher.model).__name__}@{model_id:x}": batcher.get_stats()
+            for model_id, batcher in _batchers.items()
+        }
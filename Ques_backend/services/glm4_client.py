@@ -7,14 +7,63 @@ API Documentation: https://open.bigmodel.cn/dev/api/normal-model/glm-4
 
 import os
 import json
+import random
 import requests
+import httpx
 import asyncio
 import time
 from datetime import datetime
-from typing import Dict, List, Optional, Union, Any
+from typing import AsyncIterator, Dict, List, Optional, Union, Any
 from enum import Enum
 
 
+# Async connection pool settings (shared by every GLM4Client in the process)
+ASYNC_MAX_CONNECTIONS = int(os.getenv("GLM4_MAX_CONNECTIONS", "100"))
+ASYNC_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("GLM4_MAX_KEEPALIVE_CONNECTIONS", "20"))
+ASYNC_KEEPALIVE_EXPIRY = float(os.getenv("GLM4_KEEPALIVE_EXPIRY", "30"))
+
+# HTTP status codes worth retrying on the async path (rate limit / transient server errors)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_async_http_client: Optional[httpx.AsyncClient] = None
+_async_http_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide keep-alive HTTP pool used for async GLM-4 calls
+    
+    httpx connections are bound to the event loop that opened them, so a new
+    pool is created if the running loop has changed (e.g. between test runs).
+    
+    Returns:
+        Shared httpx.AsyncClient instance
+    """
+    global _async_http_client, _async_http_loop
+    
+    loop = asyncio.get_running_loop()
+    if _async_http_client is None or _async_http_client.is_closed or _async_http_loop is not loop:
+        _async_http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=ASYNC_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=ASYNC_KEEPALIVE_EXPIRY
+            )
+        )
+        _async_http_loop = loop
+    return _async_http_client
+
+
+async def close_async_http_client():
+    """Close the shared async HTTP pool (call on application shutdown)"""
+    global _async_http_client, _async_http_loop
+    
+    if _async_http_client is not None and not _async_http_client.is_closed:
+        await _async_http_client.aclose()
+    _async_http_client = None
+    _async_http_loop = None
+
+
 class GLM4Model(Enum):
     """GLM-4 model series enumeration"""
     GLM_4_PLUS = "glm-4-plus"          # Most powerful version, complex reasoning
@@ -46,7 +95,7 @@ class GLM4Client:
     GLM-4 API Client
     
     Supported features:
-    - Synchronous/asynchronous calls
+    - Synchronous/asynchronous calls (async calls share one keep-alive connection pool)
     - Streaming output
     - JSON format control
     - Function Calling
@@ -98,6 +147,26 @@ class GLM4Client:
             "User-Agent": "GLM4Client/1.0"
         }
     
+    def _get_backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff delay with jitter for the given retry attempt"""
+        return self.retry_delay * (2 ** attempt) * random.uniform(0.5, 1.5)
+    
+    def _build_error(self, status_code: int, response_text: str) -> GLM4Exception:
+        """Build GLM4Exception from a non-200 response body"""
+        try:
+            error_data = json.loads(response_text)
+            error_message = error_data.get('error', {}).get('message', f'HTTP {status_code}')
+            error_code = error_data.get('error', {}).get('code', 'unknown')
+        except Exception:
+            error_message = f"HTTP {status_code}: {response_text}"
+            error_code = str(status_code)
+        
+        return GLM4Exception(
+            error_message,
+            error_code=error_code,
+            status_code=status_code
+        )
+    
     def _make_request(
         self,
         endpoint: str,
@@ -139,32 +208,72 @@ class GLM4Client:
                     return response.json()
                 else:
                     # Parse error information
-                    try:
-                        error_data = response.json()
-                        error_message = error_data.get('error', {}).get('message', f'HTTP {response.status_code}')
-                        error_code = error_data.get('error', {}).get('code', 'unknown')
-                    except:
-                        error_message = f"HTTP {response.status_code}: {response.text}"
-                        error_code = str(response.status_code)
-                    
-                    raise GLM4Exception(
-                        error_message,
-                        error_code=error_code,
-                        status_code=response.status_code
-                    )
+                    raise self._build_error(response.status_code, response.text)
                     
             except requests.RequestException as e:
                 last_exception = GLM4Exception(f"Network request failed: {str(e)}")
                 
                 if attempt < self.max_retries:
-                    time.sleep(self.retry_delay * (2 ** attempt))  # Exponential backoff
+                    time.sleep(self._get_backoff_delay(attempt))  # Exponential backoff with jitter
                     continue
                 break
         
         # All retries failed
         raise last_exception or GLM4Exception("Request failed")
     
-    def chat_completion(
+    async def _async_make_request(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any]
+    ) -> Dict:
+        """
+        Send non-blocking HTTP request to GLM-4 API over the shared connection pool
+        
+        Retries network errors and retryable status codes (429/5xx) with
+        jittered exponential backoff, without blocking the event loop.
+        
+        Args:
+            endpoint: API endpoint
+            payload: Request data
+        
+        Returns:
+            API response
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        headers = self._get_headers()
+        client = get_async_http_client()
+        
+        last_exception = None
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.request_count += 1
+                
+                response = await client.post(
+                    url,
+                    headers=headers,
+                    json=payload,
+                    timeout=self.timeout
+                )
+                
+                if response.status_code == 200:
+                    return response.json()
+                
+                error = self._build_error(response.status_code, response.text)
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    raise error
+                last_exception = error
+                
+            except httpx.HTTPError as e:
+                last_exception = GLM4Exception(f"Network request failed: {str(e)}")
+            
+            if attempt < self.max_retries:
+                await asyncio.sleep(self._get_backoff_delay(attempt))
+        
+        # All retries failed
+        raise last_exception or GLM4Exception("Request failed")
+    
+    def _build_chat_payload(
         self,
         messages: List[Dict[str, str]],
         model: str = None,
@@ -179,28 +288,8 @@ class GLM4Client:
         user_id: str = None,
         request_id: str = None,
         do_sample: bool = True
-    ) -> Union[Dict, requests.Response]:
-        """
-        Chat completion API call
-        
-        Args:
-            messages: Conversation message list, format: [{"role": "user", "content": "hello"}]
-            model: Model name, use default model if not specified
-            temperature: Sampling temperature (0.0-1.0)
-            top_p: Nucleus sampling parameter (0.0-1.0)
-            max_tokens: Maximum output token count
-            stream: Whether to enable streaming output
-            stop: Stop words list
-            response_format: Response format, "text" or "json_object"
-            tools: Tool list (function calling)
-            tool_choice: Tool selection strategy
-            user_id: User ID (6-128 characters)
-            request_id: Request ID (for idempotency)
-            do_sample: Whether to enable sampling
-        
-        Returns:
-            API response result or streaming response object
-        """
+    ) -> Dict[str, Any]:
+        """Build chat completion request payload (shared by sync and async calls)"""
         payload = {
             "model": model or self.default_model,
             "messages": messages,
@@ -225,6 +314,102 @@ class GLM4Client:
         if request_id:
             payload["request_id"] = request_id
         
+        return payload
+    
+    @staticmethod
+    def _build_simple_messages(content: str, system_prompt: str = None) -> List[Dict[str, str]]:
+        """Build message list for single-turn chat"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": content})
+        return messages
+    
+    @staticmethod
+    def _build_json_system_prompt(system_prompt: str = None) -> str:
+        """Build system prompt that requests JSON output"""
+        if not system_prompt:
+            return "You are a professional assistant, please always reply in JSON format."
+        return system_prompt + "\n\nPlease reply in JSON format."
+    
+    @staticmethod
+    def _parse_stream_line(line_text: str) -> Optional[str]:
+        """
+        Parse one server-sent event line of a streaming response
+        
+        Returns:
+            Delta content, "" for lines without content, None when the stream is done
+        """
+        if not line_text.startswith('data: '):
+            return ""
+        
+        data_text = line_text[6:]  # Remove 'data: ' prefix
+        if data_text.strip() == '[DONE]':
+            return None
+        
+        try:
+            chunk = json.loads(data_text)
+        except json.JSONDecodeError:
+            return ""
+        
+        if "choices" in chunk and chunk["choices"]:
+            delta = chunk["choices"][0].get("delta", {})
+            return delta.get("content", "") or ""
+        return ""
+    
+    def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = None,
+        temperature: float = 0.95,
+        top_p: float = 0.7,
+        max_tokens: int = 1024,
+        stream: bool = False,
+        stop: List[str] = None,
+        response_format: Union[str, ResponseFormat] = None,
+        tools: List[Dict] = None,
+        tool_choice: str = "auto",
+        user_id: str = None,
+        request_id: str = None,
+        do_sample: bool = True
+    ) -> Union[Dict, requests.Response]:
+        """
+        Chat completion API call
+        
+        Args:
+            messages: Conversation message list, format: [{"role": "user", "content": "hello"}]
+            model: Model name, use default model if not specified
+            temperature: Sampling temperature (0.0-1.0)
+            top_p: Nucleus sampling parameter (0.0-1.0)
+            max_tokens: Maximum output token count
+            stream: Whether to enable streaming output
+            stop: Stop words list
+            response_format: Response format, "text" or "json_object"
+            tools: Tool list (function calling)
+            tool_choice: Tool selection strategy
+            user_id: User ID (6-128 characters)
+            request_id: Request ID (for idempotency)
+            do_sample: Whether to enable sampling
+        
+        Returns:
+            API response result or streaming response object
+        """
+        payload = self._build_chat_payload(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            top_p=top_p,
+            max_tokens=max_tokens,
+            stream=stream,
+            stop=stop,
+            response_format=response_format,
+            tools=tools,
+            tool_choice=tool_choice,
+            user_id=user_id,
+            request_id=request_id,
+            do_sample=do_sample
+        )
+        
         return self._make_request("chat/completions", payload, stream=stream)
     
     def simple_chat(
@@ -248,10 +433,7 @@ class GLM4Client:
         Returns:
             Model reply content
         """
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": content})
+        messages = self._build_simple_messages(content, system_prompt)
         
         response = self.chat_completion(
             messages=messages,
@@ -285,14 +467,9 @@ class GLM4Client:
         Returns:
             Parsed JSON object
         """
-        if not system_prompt:
-            system_prompt = "You are a professional assistant, please always reply in JSON format."
-        else:
-            system_prompt += "\n\nPlease reply in JSON format."
-        
         response_text = self.simple_chat(
             content=content,
-            system_prompt=system_prompt,
+            system_prompt=self._build_json_system_prompt(system_prompt),
             temperature=temperature,
             max_tokens=max_tokens,
             response_format=ResponseFormat.JSON_OBJECT
@@ -335,21 +512,11 @@ class GLM4Client:
         
         for line in response.iter_lines():
             if line:
-                line_text = line.decode('utf-8')
-                if line_text.startswith('data: '):
-                    data_text = line_text[6:]  # Remove 'data: ' prefix
-                    
-                    if data_text.strip() == '[DONE]':
-                        break
-                    
-                    try:
-                        chunk = json.loads(data_text)
-                        if "choices" in chunk and chunk["choices"]:
-                            delta = chunk["choices"][0].get("delta", {})
-                            if "content" in delta:
-                                yield delta["content"]
-                    except json.JSONDecodeError:
-                        continue
+                content = self._parse_stream_line(line.decode('utf-8'))
+                if content is None:
+                    break
+                if content:
+                    yield content
     
     async def async_chat_completion(
         self,
@@ -357,16 +524,157 @@ class GLM4Client:
         **kwargs
     ) -> Dict:
         """
-        Asynchronous chat completion
+        Asynchronous chat completion (native non-blocking HTTP, shared connection pool)
         
         Args:
             messages: Conversation message list
-            **kwargs: Other parameters
+            **kwargs: Other parameters (same as chat_completion, except stream)
         
         Returns:
             API response result
         """
-        return await asyncio.to_thread(self.chat_completion, messages, **kwargs)
+        kwargs.pop("stream", None)
+        payload = self._build_chat_payload(messages=messages, stream=False, **kwargs)
+        return await self._async_make_request("chat/completions", payload)
+    
+    async def async_simple_chat(
+        self,
+        content: str,
+        system_prompt: str = None,
+        temperature: float = 0.95,
+        max_tokens: int = 1024,
+        response_format: Union[str, ResponseFormat] = None
+    ) -> str:
+        """
+        Asynchronous simple chat interface
+        
+        Args:
+            content: User input content
+            system_prompt: System prompt
+            temperature: Sampling temperature
+            max_tokens: Maximum output tokens
+            response_format: Response format
+        
+        Returns:
+            Model reply content
+        """
+        response = await self.async_chat_completion(
+            messages=self._build_simple_messages(content, system_prompt),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_format
+        )
+        
+        # Update statistics
+        if "usage" in response:
+            self.total_tokens += response["usage"].get("total_tokens", 0)
+        
+        return response["choices"][0]["message"]["content"]
+    
+    async def async_json_chat(
+        self,
+        content: str,
+        system_prompt: str = None,
+        temperature: float = 0.1,
+        max_tokens: int = 1024
+    ) -> Dict:
+        """
+        Asynchronous JSON format chat interface
+        
+        Args:
+            content: User input content
+            system_prompt: System prompt
+            temperature: Sampling temperature (lower recommended for JSON output)
+            max_tokens: Maximum output tokens
+        
+        Returns:
+            Parsed JSON object
+        """
+        response_text = await self.async_simple_chat(
+            content=content,
+            system_prompt=self._build_json_system_prompt(system_prompt),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=ResponseFormat.JSON_OBJECT
+        )
+        
+        try:
+            return json.loads(response_text)
+        except json.JSONDecodeError as e:
+            raise GLM4Exception(f"JSON parsing failed: {e}\nOriginal reply: {response_text}")
+    
+    async def async_stream_chat(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = None,
+        temperature: float = 0.95,
+        max_tokens: int = 1024,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Asynchronous streaming chat interface
+        
+        Connection failures before the first chunk are retried with jittered backoff;
+        once content has been yielded the stream is not restarted.
+        
+        Args:
+            messages: Conversation message list
+            model: Model name
+            temperature: Sampling temperature
+            max_tokens: Maximum output tokens
+            **kwargs: Other parameters
+        
+        Yields:
+            Content of each data chunk
+        """
+        payload = self._build_chat_payload(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            **kwargs
+        )
+        url = f"{self.base_url}/chat/completions"
+        headers = self._get_headers()
+        client = get_async_http_client()
+        
+        last_exception = None
+        yielded = False
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.request_count += 1
+                
+                async with client.stream("POST", url, headers=headers, json=payload, timeout=self.timeout) as response:
+                    if response.status_code != 200:
+                        body = (await response.aread()).decode('utf-8', errors='replace')
+                        error = self._build_error(response.status_code, body)
+                        if response.status_code not in RETRYABLE_STATUS_CODES:
+                            raise error
+                        last_exception = error
+                    else:
+                        async for line in response.aiter_lines():
+                            if not line:
+                                continue
+                            content = self._parse_stream_line(line)
+                            if content is None:
+                                break
+                            if content:
+                                yielded = True
+                                yield content
+                        return
+                    
+            except httpx.HTTPError as e:
+                if yielded:
+                    raise GLM4Exception(f"Stream interrupted: {str(e)}")
+                last_exception = GLM4Exception(f"Network request failed: {str(e)}")
+            
+            if attempt < self.max_retries:
+                await asyncio.sleep(self._get_backoff_delay(attempt))
+        
+        # All retries failed
+        raise last_exception or GLM4Exception("Request failed")
     
     def function_call(
         self,
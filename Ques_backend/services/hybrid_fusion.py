@@ -0,0 +1,130 @@
+"""
+Hybrid Retrieval Fusion
+Score fusion for dense + sparse retrieval arms (DBSF and RRF) and sparse-vector helpers
+shared by the vector database adapter and the search agent
+"""
+
+import zlib
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+
+# Reciprocal Rank Fusion smoothing constant
+RRF_K = 60
+
+
+def sparse_token_id(token: str) -> int:
+    """
+    Stable integer id for a sparse-vector term
+
+    Vector database sparse indexes take integer term ids; SPLADE vectors are keyed by
+    token text, so documents and queries are mapped through the same stable hash.
+
+    Args:
+        token: Term text
+
+    Returns:
+        Non-negative 31-bit term id
+    """
+    return zlib.crc32(token.encode("utf-8")) & 0x7FFFFFFF
+
+
+def to_sparse_pairs(sparse_vector: Dict[str, float]) -> List[List[float]]:
+    """
+    Convert a token -> weight dict into [[term_id, weight], ...] pairs
+
+    Args:
+        sparse_vector: Sparse vector keyed by token
+
+    Returns:
+        Term id / weight pairs (weights of colliding ids are summed)
+    """
+    pairs: Dict[int, float] = {}
+    for token, weight in (sparse_vector or {}).items():
+        if weight:
+            term_id = sparse_token_id(token)
+            pairs[term_id] = pairs.get(term_id, 0.0) + float(weight)
+    return [[term_id, weight] for term_id, weight in pairs.items()]
+
+
+def sparse_dot(query: Dict[str, float], document: Optional[Dict[str, float]]) -> float:
+    """
+    Dot product of two token-keyed sparse vectors
+
+    Args:
+        query: Query sparse vector
+        document: Document sparse vector
+
+    Returns:
+        Similarity score (0.0 when either side is empty)
+    """
+    if not query or not document:
+        return 0.0
+    if len(document) < len(query):
+        query, document = document, query
+    return float(sum(weight * document.get(token, 0.0) for token, weight in query.items()))
+
+
+def fuse_dbsf(
+    arms: Dict[str, Dict[Hashable, float]],
+    weights: Optional[Dict[str, float]] = None
+) -> List[Tuple[Hashable, float]]:
+    """
+    Distribution-Based Score Fusion
+
+    Each arm's scores are min-max normalised against mean +/- 3 standard deviations of
+    that arm (clipped to [0, 1]) and the weighted normalised scores are summed. A document
+    missing from an arm contributes 0 for that arm.
+
+    Args:
+        arms: Arm name -> {doc_id: raw score}
+        weights: Arm name -> weight (default 1.0 per arm)
+
+    Returns:
+        (doc_id, fused score) sorted by score descending
+    """
+    fused: Dict[Hashable, float] = {}
+    for arm, scores in arms.items():
+        if not scores:
+            continue
+        doc_ids = list(scores.keys())
+        values = np.fromiter((scores[doc_id] for doc_id in doc_ids), dtype=float, count=len(doc_ids))
+        mean, std = values.mean(), values.std()
+        low, high = mean - 3 * std, mean + 3 * std
+        if high - low > 1e-9:
+            normalised = np.clip((values - low) / (high - low), 0.0, 1.0)
+        else:
+            normalised = np.full(len(values), 0.5)
+
+        weight = (weights or {}).get(arm, 1.0)
+        for doc_id, value in zip(doc_ids, normalised):
+            fused[doc_id] = fused.get(doc_id, 0.0) + weight * float(value)
+
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+def fuse_rrf(
+    arms: Dict[str, Dict[Hashable, float]],
+    weights: Optional[Dict[str, float]] = None,
+    k: int = RRF_K
+) -> List[Tuple[Hashable, float]]:
+    """
+    Reciprocal Rank Fusion
+
+    Args:
+        arms: Arm name -> {doc_id: raw score} (only the ranking within each arm is used)
+        weights: Arm name -> weight (default 1.0 per arm)
+        k: Smoothing constant
+
+    Returns:
+        (doc_id, fused score) sorted by score descending
+    """
+    fused: Dict[Hashable, float] = {}
+    for arm, scores in arms.items():
+        weight = (weights or {}).get(arm, 1.0)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        for rank, (doc_id, _) in enumerate(ranked, 1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + weight / (k + rank)
+
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
@@ -8,16 +8,32 @@ Reference documentation: docs/search_agent_design_new.md
 
 import asyncio
 import json
+import os
 import re
 import time
-import httpx
 import logging
 from typing import Dict, List, Optional, Union, Any, Tuple
 from datetime import datetime
 
+from services.embedding_batcher import get_embedding_batcher
+from services.model_registry import model_registry, DENSE_MODEL_NAME
+from services.profile_loader import profile_loader
+from services.profile_card_cache import profile_card_cache
+
 logger = logging.getLogger(__name__)
 
 
+# SPLADE sparse vector construction
+SPLADE_SCORE_THRESHOLD = 0.1  # Minimum term weight kept in a sparse vector
+SPLADE_MAX_TERMS = int(os.getenv("SPLADE_MAX_TERMS", "256"))  # Strongest terms kept per text (0 = unlimited)
+
+# Candidates fetched once per search and shared by all strategies (largest strategy prefetch)
+SEARCH_PREFETCH_K = 150
+
+# Run search strategies concurrently and cancel the rest once one is accepted (opt-in)
+SPECULATIVE_SEARCH = os.getenv("SPECULATIVE_SEARCH", "false").lower() == "true"
+
+
 class SearchAgent:
     """Intelligent Search Agent Core Class"""
     
@@ -60,6 +76,10 @@ class SearchAgent:
         self._initialize_embedding_models()
         print("[info] Embedding models loaded successfully")
         
+        # LLM response cache (query optimisation, tag extraction, intent analysis)
+        from services.llm_cache import LLMResponseCache
+        self.llm_cache = LLMResponseCache()
+        
         # Statistics
         self.stats = {
             "search_count": 0,
@@ -77,67 +97,25 @@ class SearchAgent:
         self.casual_collection_name = "casual_requests"
     
     def _initialize_embedding_models(self):
-        """Initialize embedding models"""
+        """Initialize embedding models (shared process-wide via the model registry)"""
         try:
             # Initialize BGE-M3 dense vector model
-            from sentence_transformers import SentenceTransformer
             print("  [info] Loading BGE-M3 dense vector model...")
-            self._dense_model = SentenceTransformer('BAAI/bge-m3')
+            self._dense_model = model_registry.get_sentence_transformer(DENSE_MODEL_NAME)
             
             # Initialize SPLADE sparse vector model
-            from transformers import AutoModelForMaskedLM, AutoTokenizer
-            import torch
             print("  [info] Loading SPLADE sparse vector model...")
-            
-            try:
-                # Try publicly available SPLADE models first
-                splade_models = [
-                    "naver/splade_v2_max",           # SPLADE v2 Max (publicly accessible)
-                    "naver/splade_v2_distil",        # SPLADE v2 Distilled (publicly accessible)
-                    "naver/splade-cocondenser-ensembledistil",  # Another public SPLADE model
-                    "naver/splade-v3"                # Latest but gated (fallback if user has access)
-                ]
-                
-                model_loaded = False
-                for model_name in splade_models:
-                    try:
-                        print(f"  [info] Trying SPLADE model: {model_name}...")
-                        self._splade_tokenizer = AutoTokenizer.from_pretrained(model_name)
-                        self._splade_model = AutoModelForMaskedLM.from_pretrained(model_name)
-                        
-                        # Set device
-                        self._device = 'mps' if torch.backends.mps.is_available() else ('cuda' if torch.cuda.is_available() else 'cpu')
-                        self._splade_model = self._splade_model.to(self._device)
-                        print(f"  [info] Using device: {self._device}")
-                        print(f"  [info] ✅ SPLADE model loaded successfully: {model_name}")
-                        model_loaded = True
-                        break
-                        
-                    except Exception as model_error:
-                        if "gated repo" in str(model_error).lower() or "restricted" in str(model_error).lower():
-                            print(f"  [warn] {model_name} is gated/restricted, trying next model...")
-                        else:
-                            print(f"  [warn] Failed to load {model_name}: {str(model_error)[:100]}...")
-                        continue
-                
-                if not model_loaded:
-                    raise Exception("All SPLADE models failed to load")
-                
-            except Exception as splade_error:
-                print(f"  [warn] SPLADE model loading failed: {splade_error}")
-                if "gated repo" in str(splade_error).lower() or "restricted" in str(splade_error).lower():
-                    print("  [info] SPLADE-v3 is a gated repository requiring authentication")
-                    print("  [info] To use SPLADE-v3:")
-                    print("    1. Create Hugging Face account: https://huggingface.co/join")
-                    print("    2. Request access to naver/splade-v3")
-                    print("    3. Login: huggingface-cli login")
+            self._splade_tokenizer, self._splade_model, self._device = model_registry.get_splade()
+            print(f"  [info] Using device: {self._device}")
+            
+            if self._splade_model is None:
+                print("  [warn] SPLADE model loading failed")
+                print("  [info] SPLADE-v3 is a gated repository requiring authentication")
+                print("  [info] To use SPLADE-v3:")
+                print("    1. Create Hugging Face account: https://huggingface.co/join")
+                print("    2. Request access to naver/splade-v3")
+                print("    3. Login: huggingface-cli login")
                 print("  [warn] Falling back to TF-IDF for sparse vectors...")
-                self._splade_tokenizer = None
-                self._splade_model = None
-                
-                # Set device anyway for dense model
-                self._device = 'mps' if torch.backends.mps.is_available() else ('cuda' if torch.cuda.is_available() else 'cpu')
-                print(f"  [info] Using device: {self._device}")
             
         except Exception as e:
             print(f"[error] Embedding model loading failed: {e}")
@@ -147,6 +125,81 @@ class SearchAgent:
             self._splade_model = None
             self._splade_tokenizer = None
     
+    # ===== LLM Response Cache =====
+    
+    def _llm_cache_keys(
+        self,
+        namespace: str,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        query: str
+    ) -> Tuple[str, str]:
+        """
+        Build (exact key, semantic scope) for a prompt
+        
+        The semantic scope is the prompt with the free-text query removed, so
+        near-duplicate hits never cross different referenced/current users.
+        """
+        model = self.glm_client.default_model
+        cache_key = self.llm_cache.make_key(namespace, f"{system_prompt}\n{user_prompt}", model, temperature)
+        context = f"{system_prompt}\n{user_prompt.replace(query, '')}"
+        cache_scope = self.llm_cache.make_scope(namespace, model, temperature, context)
+        return cache_key, cache_scope
+    
+    def _embed_for_cache(self, text: str):
+        """Normalised BGE-M3 embedding for near-duplicate cache lookup (None if unavailable)"""
+        if not self.llm_cache.semantic_enabled or self._dense_model is None:
+            return None
+        try:
+            return self._dense_model.encode(text, normalize_embeddings=True)
+        except Exception as e:
+            print(f"[warn] Cache embedding failed: {e}")
+            return None
+    
+    async def _async_embed_for_cache(self, text: str):
+        """Async variant of _embed_for_cache (batched with concurrent encodes)"""
+        if not self.llm_cache.semantic_enabled or self._dense_model is None:
+            return None
+        try:
+            return await get_embedding_batcher(self._dense_model).encode(text)
+        except Exception as e:
+            print(f"[warn] Cache embedding failed: {e}")
+            return None
+    
+    def _llm_cache_lookup(self, cache_key: str, cache_scope: str, query: str) -> Tuple[Any, Any]:
+        """
+        Look up cached LLM result: exact match first, then near-duplicate
+        
+        Returns:
+            (cached value or None, query embedding to store with the new entry)
+        """
+        cached = self.llm_cache.get(cache_key)
+        embedding = None
+        if cached is None and self.llm_cache.semantic_enabled:
+            embedding = self._embed_for_cache(query)
+            cached = self.llm_cache.get_similar(cache_scope, embedding)
+        
+        if cached is None:
+            self.llm_cache.record_miss()
+        else:
+            self.stats["cache_hits"] += 1
+        return cached, embedding
+    
+    async def _async_llm_cache_lookup(self, cache_key: str, cache_scope: str, query: str) -> Tuple[Any, Any]:
+        """Async variant of _llm_cache_lookup (embedding runs off the event loop)"""
+        cached = self.llm_cache.get(cache_key)
+        embedding = None
+        if cached is None and self.llm_cache.semantic_enabled:
+            embedding = await self._async_embed_for_cache(query)
+            cached = self.llm_cache.get_similar(cache_scope, embedding)
+        
+        if cached is None:
+            self.llm_cache.record_miss()
+        else:
+            self.stats["cache_hits"] += 1
+        return cached, embedding
+    
     # ===== 3.0 Intent Recognition System =====
     
     def analyze_user_intent(
@@ -172,8 +225,76 @@ class SearchAgent:
                 "uncertainty_reason": str (if clarification needed)
             }
         """
+        system_prompt, user_prompt = self._build_intent_prompts(user_input, referenced_user, current_user)
+        cache_key, cache_scope = self._llm_cache_keys("intent", system_prompt, user_prompt, 0.1, user_input)
+        cached, embedding = self._llm_cache_lookup(cache_key, cache_scope, user_input)
+        if cached is not None:
+            return dict(cached)
+        
         self.stats["llm_calls"] += 1
         
+        try:
+            result = self.glm_client.json_chat(
+                content=user_prompt,
+                system_prompt=system_prompt,
+                temperature=0.1,
+                max_tokens=500
+            )
+            intent_result = self._normalize_intent_result(result)
+            self.llm_cache.put(cache_key, dict(intent_result), scope=cache_scope, embedding=embedding)
+            return intent_result
+            
+        except Exception as e:
+            print(f"Intent analysis failed: {e}")
+            return self._default_intent_result()
+    
+    async def async_analyze_user_intent(
+        self, 
+        user_input: str, 
+        referenced_user: Dict = None, 
+        current_user: Dict = None
+    ) -> Dict:
+        """
+        Analyze user intent without blocking the event loop (see analyze_user_intent)
+        
+        Args:
+            user_input: User input text
+            referenced_user: Referenced user information (if any)
+            current_user: Current user information (if any)
+            
+        Returns:
+            Intent analysis result
+        """
+        system_prompt, user_prompt = self._build_intent_prompts(user_input, referenced_user, current_user)
+        cache_key, cache_scope = self._llm_cache_keys("intent", system_prompt, user_prompt, 0.1, user_input)
+        cached, embedding = await self._async_llm_cache_lookup(cache_key, cache_scope, user_input)
+        if cached is not None:
+            return dict(cached)
+        
+        self.stats["llm_calls"] += 1
+        
+        try:
+            result = await self.glm_client.async_json_chat(
+                content=user_prompt,
+                system_prompt=system_prompt,
+                temperature=0.1,
+                max_tokens=500
+            )
+            intent_result = self._normalize_intent_result(result)
+            self.llm_cache.put(cache_key, dict(intent_result), scope=cache_scope, embedding=embedding)
+            return intent_result
+            
+        except Exception as e:
+            print(f"Intent analysis failed: {e}")
+            return self._default_intent_result()
+    
+    def _build_intent_prompts(
+        self, 
+        user_input: str, 
+        referenced_user: Dict = None, 
+        current_user: Dict = None
+    ) -> Tuple[str, str]:
+        """Build (system_prompt, user_prompt) for intent analysis"""
         # Build referenced user information
         referenced_info = ""
         if referenced_user:
@@ -244,41 +365,34 @@ Please analyze the user's intent type. Pay special attention to:
 
 Please provide detailed intent analysis.
 """
+        return system_prompt, user_prompt
+    
+    def _normalize_intent_result(self, result: Dict) -> Dict:
+        """Validate and standardize LLM intent analysis result"""
+        intent = result.get("intent", "chat").lower()
+        if intent not in ["search", "inquiry", "chat", "casual"]:
+            intent = "chat"
         
-        try:
-            result = self.glm_client.json_chat(
-                content=user_prompt,
-                system_prompt=system_prompt,
-                temperature=0.1,
-                max_tokens=500
-            )
-            
-            # Validate and standardize result
-            intent = result.get("intent", "chat").lower()
-            if intent not in ["search", "inquiry", "chat", "casual"]:
-                intent = "chat"
-            
-            confidence = float(result.get("confidence", 0.5))
-            confidence = max(0.0, min(1.0, confidence))  # Ensure in 0-1 range
-            
-            return {
-                "intent": intent,
-                "confidence": confidence,
-                "reasoning": result.get("reasoning", "Unable to get analysis reasoning"),
-                "clarification_needed": result.get("clarification_needed", False),
-                "uncertainty_reason": result.get("uncertainty_reason", "")
-            }
-            
-        except Exception as e:
-            print(f"Intent analysis failed: {e}")
-            # Return default conservative analysis
-            return {
-                "intent": "chat",
-                "confidence": 0.3,
-                "reasoning": "LLM analysis failed, returning default chat intent",
-                "clarification_needed": True,
-                "uncertainty_reason": "System analysis failed, suggest user clarify requirements"
-            }
+        confidence = float(result.get("confidence", 0.5))
+        confidence = max(0.0, min(1.0, confidence))  # Ensure in 0-1 range
+        
+        return {
+            "intent": intent,
+            "confidence": confidence,
+            "reasoning": result.get("reasoning", "Unable to get analysis reasoning"),
+            "clarification_needed": result.get("clarification_needed", False),
+            "uncertainty_reason": result.get("uncertainty_reason", "")
+        }
+    
+    def _default_intent_result(self) -> Dict:
+        """Default conservative intent analysis used when the LLM call fails"""
+        return {
+            "intent": "chat",
+            "confidence": 0.3,
+            "reasoning": "LLM analysis failed, returning default chat intent",
+            "clarification_needed": True,
+            "uncertainty_reason": "System analysis failed, suggest user clarify requirements"
+        }
     
     # ===== 3.1 Language Detector =====
     
@@ -737,8 +851,67 @@ Please provide detailed analysis and response.
         Returns:
             Optimized query text
         """
+        system_prompt, user_prompt = self._build_dense_query_prompts(text, referenced_users)
+        cache_key, cache_scope = self._llm_cache_keys("dense_query", system_prompt, user_prompt, 0.3, text)
+        cached, embedding = self._llm_cache_lookup(cache_key, cache_scope, text)
+        if cached is not None:
+            return cached
+        
+        self.stats["llm_calls"] += 1
+        
+        try:
+            optimized_query = self.glm_client.simple_chat(
+                content=user_prompt,
+                system_prompt=system_prompt,
+                temperature=0.3,
+                max_tokens=150
+            )
+            optimized_query = optimized_query.strip()
+            self.llm_cache.put(cache_key, optimized_query, scope=cache_scope, embedding=embedding)
+            return optimized_query
+        except Exception as e:
+            print(f"Query optimization failed: {e}")
+            return text  # Return original query as fallback
+    
+    async def async_optimize_query_for_dense_vector(
+        self, 
+        text: str, 
+        referenced_users: List[Dict] = None
+    ) -> str:
+        """
+        Optimize query text for dense vector search without blocking the event loop
+        
+        Args:
+            text: Original query text
+            referenced_users: Referenced user list
+            
+        Returns:
+            Optimized query text
+        """
+        system_prompt, user_prompt = self._build_dense_query_prompts(text, referenced_users)
+        cache_key, cache_scope = self._llm_cache_keys("dense_query", system_prompt, user_prompt, 0.3, text)
+        cached, embedding = await self._async_llm_cache_lookup(cache_key, cache_scope, text)
+        if cached is not None:
+            return cached
+        
         self.stats["llm_calls"] += 1
         
+        try:
+            optimized_query = await self.glm_client.async_simple_chat(
+                content=user_prompt,
+                system_prompt=system_prompt,
+                temperature=0.3,
+                max_tokens=150
+            )
+            optimized_query = optimized_query.strip()
+            self.llm_cache.put(cache_key, optimized_query, scope=cache_scope, embedding=embedding)
+            return optimized_query
+        except Exception as e:
+            print(f"Query optimization failed: {e}")
+            return text  # Return original query as fallback
+    
+    def _build_dense_query_prompts(self, text: str, referenced_users: List[Dict] = None) -> Tuple[str, str]:
+        """Build (system_prompt, user_prompt) for dense query optimization"""
         # Build referenced user information
         referenced_info = ""
         if referenced_users:
@@ -768,18 +941,7 @@ Please provide detailed analysis and response.
         
         Create a simple, optimized description:
         """
-        
-        try:
-            optimized_query = self.glm_client.simple_chat(
-                content=user_prompt,
-                system_prompt=system_prompt,
-                temperature=0.3,
-                max_tokens=150
-            )
-            return optimized_query.strip()
-        except Exception as e:
-            print(f"Query optimization failed: {e}")
-            return text  # Return original query as fallback
+        return system_prompt, user_prompt
     
     # ===== 3.5 Hybrid Vector Search Engine =====
     
@@ -791,7 +953,8 @@ Please provide detailed analysis and response.
         limit: int = 10,
         viewed_user_ids: List[str] = None,
         swiped_user_ids: List[str] = None,
-        fetch_db_details: bool = True
+        fetch_db_details: bool = True,
+        search_context: Dict[str, Any] = None
     ) -> List[Dict]:
         """
         Execute hybrid vector search with proper fallback mechanism
@@ -804,38 +967,48 @@ Please provide detailed analysis and response.
             viewed_user_ids: List of viewed user IDs (exclude from initial search)
             swiped_user_ids: List of swiped user IDs (filter after getting 50 candidates)
             fetch_db_details: Whether to fetch detailed information from database
+            search_context: Query vectors and prefetched candidates shared across strategies
+                (from prepare_search_context; built on demand if omitted)
             
         Returns:
             Search result list (including database detailed information)
             
         Fallback Mechanism:
-            1. Get closest 50 candidates from vector search (exclude viewed users only)
-            2. Filter out users who have been swiped (left/right)  
+            1. Get closest 50 candidates from vector search; viewed and swiped users are excluded
+               by the vector database filter (the adapter grows top_k if filtering empties the page)
+            2. Drop any swiped users that got through (set lookup)
             3. Return top {limit} from remaining candidates
         """
         try:
-            # STEP 1: Get 50 candidates (exclude only viewed users, not swiped users)
+            # STEP 1: Get 50 candidates (viewed and swiped users excluded in the vector database)
             fallback_limit = max(50, limit * 5)  # Get at least 50 or 5x the requested limit
             
+            excluded_ids = list(dict.fromkeys(
+                str(uid) for uid in (viewed_user_ids or []) + (swiped_user_ids or [])
+            ))
             filter_conditions = {}
-            if viewed_user_ids:
-                filter_conditions["user_id"] = {"$nin": viewed_user_ids}
+            if excluded_ids:
+                filter_conditions["user_id"] = {"$nin": excluded_ids}
 
             print(f"[info] Executing {search_strategy} search for {fallback_limit} candidates...")
             
+            # Query vectors are computed once and reused by every strategy
+            if search_context is None:
+                search_context = await self.prepare_search_context(dense_query, sparse_query)
+            
             # Execute vector search using the vectordb adapter
             if search_strategy == "standard":
-                vector_results = await self._standard_search(dense_query, sparse_query, filter_conditions, fallback_limit)
+                vector_results = await self._standard_search(search_context, filter_conditions, fallback_limit)
             elif search_strategy == "expanded":
-                vector_results = await self._expanded_search(dense_query, sparse_query, filter_conditions, fallback_limit)
+                vector_results = await self._expanded_search(search_context, filter_conditions, fallback_limit)
             elif search_strategy == "custom":
-                vector_results = await self._custom_search(dense_query, sparse_query, filter_conditions, fallback_limit)
+                vector_results = await self._custom_search(search_context, filter_conditions, fallback_limit)
             else:
                 raise ValueError(f"Unsupported search strategy: {search_strategy}")
             
             print(f"[info] Initial vector search found {len(vector_results)} candidates")
             
-            # STEP 2: Filter out swiped users (post-search filtering)
+            # STEP 2: Filter out swiped users (safety net for the pushed-down filter)
             if swiped_user_ids and vector_results:
                 swiped_set = set(str(uid) for uid in swiped_user_ids)
                 filtered_results = []
@@ -888,33 +1061,99 @@ Please provide detailed analysis and response.
             print(f"Hybrid search failed: {e}")
             return []
     
+    async def _encode_dense(self, text: str) -> List[float]:
+        """Encode dense vector through the shared embedding micro-batcher"""
+        # Ensure dense model is loaded
+        if self._dense_model is None:
+            self._dense_model = model_registry.get_sentence_transformer(DENSE_MODEL_NAME)
+        
+        vector = await get_embedding_batcher(self._dense_model).encode(text)
+        return vector.tolist()
+    
+    async def prepare_search_context(self, dense_query: str, sparse_query: str) -> Dict[str, Any]:
+        """
+        Compute query vectors once for all search strategies of a request
+        
+        Args:
+            dense_query: Dense vector query text
+            sparse_query: Sparse vector query text
+            
+        Returns:
+            Search context holding the dense/sparse query vectors and the prefetched candidate pool
+        """
+        # Dense encoding goes through the batcher; SPLADE runs off the event loop in parallel
+        dense_vector, sparse_vector = await asyncio.gather(
+            self._encode_dense(dense_query),
+            asyncio.to_thread(self._build_splade_sparse_vector, sparse_query)
+        )
+        
+        return {
+            "dense_vector": dense_vector,
+            "sparse_vector": sparse_vector or None,
+            "prefetch_filter": None,
+            "prefetch_k": 0,
+            "prefetch_results": None,
+            "prefetch_lock": asyncio.Lock(),
+            "vectordb_calls": 0,
+            "prefetch_reuses": 0
+        }
+    
+    async def _fetch_vector_candidates(
+        self,
+        search_context: Dict[str, Any],
+        filter_conditions: Dict[str, Any],
+        top_k: int
+    ) -> List[Dict]:
+        """
+        Fetch top_k raw hybrid results, served from the prefetched pool when possible
+        
+        The first call fetches max(top_k, SEARCH_PREFETCH_K) candidates; later strategies with
+        the same filter and a smaller top_k are answered from that pool in memory (results are
+        ranked, so the top_k prefix is the same candidate set a smaller query would return).
+        
+        Args:
+            search_context: Context from prepare_search_context
+            filter_conditions: Vector DB filter conditions
+            top_k: Number of ranked results needed
+            
+        Returns:
+            Adapter results (ranked by hybrid score)
+        """
+        filter_key = json.dumps(filter_conditions or {}, sort_keys=True, default=str)
+        
+        async with search_context["prefetch_lock"]:
+            pool = search_context["prefetch_results"]
+            if (pool is not None and
+                    search_context["prefetch_filter"] == filter_key and
+                    search_context["prefetch_k"] >= top_k):
+                search_context["prefetch_reuses"] += 1
+                return pool[:top_k]
+            
+            fetch_k = max(top_k, SEARCH_PREFETCH_K)
+            results = await self.vectordb_adapter.hybrid_search(
+                query_vector=search_context["dense_vector"],
+                sparse_vector=search_context["sparse_vector"],
+                top_k=fetch_k,
+                filter_conditions=filter_conditions
+            )
+            search_context["vectordb_calls"] += 1
+            
+            search_context["prefetch_filter"] = filter_key
+            search_context["prefetch_k"] = fetch_k
+            search_context["prefetch_results"] = results
+            return results[:top_k]
+    
     async def _standard_search(
         self, 
-        dense_query: str, 
-        sparse_query: str, 
+        search_context: Dict[str, Any], 
         filter_conditions: Dict[str, Any], 
         limit: int
     ) -> List[Dict]:
         """Standard search strategy - uses vectordb hybrid search with modest prefetch"""
         try:
-            # Ensure dense model is loaded
-            if self._dense_model is None:
-                from sentence_transformers import SentenceTransformer
-                self._dense_model = SentenceTransformer('BAAI/bge-m3')
-
-            dense_vec = self._dense_model.encode(dense_query, normalize_embeddings=True).tolist()
-
-            # Generate sparse dict
-            sparse_dict = self._build_splade_sparse_vector(sparse_query)
-
             # Use the vectordb adapter to perform hybrid search
             prefetch_k = max(limit, 50)
-            results = await self.vectordb_adapter.hybrid_search(
-                query_vector=dense_vec,
-                sparse_vector=sparse_dict if sparse_dict else None,
-                top_k=prefetch_k,
-                filter_conditions=filter_conditions
-            )
+            results = await self._fetch_vector_candidates(search_context, filter_conditions, prefetch_k)
 
             # Map adapter results to expected format and slice to limit
             mapped = [
@@ -932,27 +1171,14 @@ Please provide detailed analysis and response.
     
     async def _expanded_search(
         self, 
-        dense_query: str, 
-        sparse_query: str, 
+        search_context: Dict[str, Any], 
         filter_conditions: Dict[str, Any], 
         limit: int
     ) -> List[Dict]:
         """Expanded search strategy - larger prefetch and broader recall"""
         try:
-            if self._dense_model is None:
-                from sentence_transformers import SentenceTransformer
-                self._dense_model = SentenceTransformer('BAAI/bge-m3')
-
-            dense_vec = self._dense_model.encode(dense_query, normalize_embeddings=True).tolist()
-            sparse_dict = self._build_splade_sparse_vector(sparse_query)
-
             prefetch_k = max(limit, 150)
-            results = await self.vectordb_adapter.hybrid_search(
-                query_vector=dense_vec,
-                sparse_vector=sparse_dict if sparse_dict else None,
-                top_k=prefetch_k,
-                filter_conditions=filter_conditions
-            )
+            results = await self._fetch_vector_candidates(search_context, filter_conditions, prefetch_k)
 
             mapped = [
                 {
@@ -969,27 +1195,18 @@ Please provide detailed analysis and response.
     
     async def _custom_search(
         self, 
-        dense_query: str, 
-        sparse_query: str, 
+        search_context: Dict[str, Any], 
         filter_conditions: Dict[str, Any], 
         limit: int
     ) -> List[Dict]:
         """Custom search strategy - use adapter results and perform custom fusion on dense/sparse scores"""
         try:
-            if self._dense_model is None:
-                from sentence_transformers import SentenceTransformer
-                self._dense_model = SentenceTransformer('BAAI/bge-m3')
-
-            dense_vec = self._dense_model.encode(dense_query, normalize_embeddings=True).tolist()
-            sparse_dict = self._build_splade_sparse_vector(sparse_query)
-
             # Request a moderate number of candidates from vectordb
-            results = await self.vectordb_adapter.hybrid_search(
-                query_vector=dense_vec,
-                sparse_vector=sparse_dict if sparse_dict else None,
-                top_k=120,
-                filter_conditions=filter_conditions
-            )
+            results = await self._fetch_vector_candidates(search_context, filter_conditions, 120)
+
+            # Adapter-ranked results: dense-only search or server-side fusion leave an arm empty (None)
+            if any(r.get('dense_score') is None or r.get('sparse_score') is None for r in results):
+                return self._adapter_ranked(results, limit)
 
             # Perform custom DBSF-style fusion using returned dense_score and sparse_score
             try:
@@ -1029,25 +1246,75 @@ Please provide detailed analysis and response.
                 return fused_list
             except Exception:
                 # Fallback: return top-k by adapter score
-                mapped = [
-                    {"user_id": r.get('user_id'), "score": r.get('score', 0.0), **(r.get('metadata') or {})}
-                    for r in results
-                ]
-                return mapped[:limit]
+                return self._adapter_ranked(results, limit)
 
         except Exception as e:
             print(f"Custom search failed: {e}")
             return []
     
+    @staticmethod
+    def _adapter_ranked(results: List[Dict], limit: int) -> List[Dict]:
+        """Top-k in adapter order with the adapter score"""
+        mapped = [
+            {"user_id": r.get('user_id'), "score": r.get('score', 0.0), **(r.get('metadata') or {})}
+            for r in results
+        ]
+        return mapped[:limit]
+    
+    def _get_splade_vocab_table(self) -> Tuple[List[str], Any]:
+        """
+        Inverse SPLADE vocabulary, built once per tokenizer
+        
+        Returns:
+            (id_to_token list, boolean mask of token ids eligible for sparse vectors)
+        """
+        if getattr(self, "_splade_vocab_owner", None) is not self._splade_tokenizer:
+            import torch
+            
+            vocab = self._splade_tokenizer.get_vocab()
+            vocab_size = max(len(vocab), max(vocab.values()) + 1)
+            id_to_token = [f"[UNK_{token_id}]" for token_id in range(vocab_size)]
+            for token, token_id in vocab.items():
+                id_to_token[token_id] = token
+            
+            # Skip special tokens and single characters
+            keep_mask = torch.tensor(
+                [not token.startswith("[") and len(token) > 1 for token in id_to_token],
+                dtype=torch.bool
+            )
+            
+            self._splade_id_to_token = id_to_token
+            self._splade_keep_mask = keep_mask
+            self._splade_vocab_owner = self._splade_tokenizer
+        
+        return self._splade_id_to_token, self._splade_keep_mask
+    
     def _build_splade_sparse_vector(self, text: str) -> Dict[str, float]:
         """Generate sparse vector using SPLADE-v3 model or TF-IDF fallback"""
+        return self._build_splade_sparse_vectors([text])[0]
+    
+    def _build_splade_sparse_vectors(self, texts: List[str]) -> List[Dict[str, float]]:
+        """
+        Generate sparse vectors for several texts in one SPLADE forward pass
+        
+        Args:
+            texts: Input texts
+            
+        Returns:
+            Sparse vectors (token -> weight, max-normalised) in input order
+        """
+        if not texts:
+            return []
+        
         try:
             # Try SPLADE-v3 model first
             if self._splade_model is not None and self._splade_tokenizer is not None:
                 import torch
                 
-                # Tokenize input
-                inputs = self._splade_tokenizer(text, return_tensors="pt", max_length=512, truncation=True)
+                # Tokenize input (padded batch)
+                inputs = self._splade_tokenizer(
+                    texts, return_tensors="pt", max_length=512, truncation=True, padding=True
+                )
                 inputs = {k: v.to(self._device) for k, v in inputs.items()}
                 
                 # Generate SPLADE embeddings
@@ -1057,36 +1324,48 @@ Please provide detailed analysis and response.
                     
                     # Apply ReLU and log to get sparse representation
                     sparse_embeddings = torch.relu(logits) * torch.log(1 + torch.relu(logits))
-                    sparse_embeddings = sparse_embeddings.squeeze(0)  # Remove batch dimension
                     
-                    # Convert to dictionary format
-                    vocab = self._splade_tokenizer.get_vocab()
-                    id_to_token = {v: k for k, v in vocab.items()}
+                    # Ignore padding positions, then max-pool over the sequence
+                    attention_mask = inputs["attention_mask"].unsqueeze(-1).to(sparse_embeddings.dtype)
+                    term_scores = (sparse_embeddings * attention_mask).max(dim=1).values.cpu()
+                
+                id_to_token, keep_mask = self._get_splade_vocab_table()
+                vocab_size = min(term_scores.shape[1], keep_mask.shape[0])
+                term_scores = term_scores[:, :vocab_size]
+                eligible = keep_mask[:vocab_size]
+                
+                sparse_dicts = []
+                for row in term_scores:
+                    # Only include tokens with meaningful scores
+                    token_ids = torch.nonzero((row > SPLADE_SCORE_THRESHOLD) & eligible, as_tuple=True)[0]
+                    scores = row[token_ids]
+                    
+                    # Keep the strongest terms only
+                    if SPLADE_MAX_TERMS > 0 and scores.numel() > SPLADE_MAX_TERMS:
+                        scores, top_positions = torch.topk(scores, SPLADE_MAX_TERMS)
+                        token_ids = token_ids[top_positions]
                     
-                    sparse_dict = {}
-                    for token_id, score in enumerate(sparse_embeddings.max(dim=0)[0]):
-                        if score > 0.1:  # Only include tokens with meaningful scores
-                            token = id_to_token.get(token_id, f"[UNK_{token_id}]")
-                            # Skip special tokens
-                            if not token.startswith("[") and len(token) > 1:
-                                sparse_dict[token] = float(score.cpu())
+                    if scores.numel() == 0:
+                        sparse_dicts.append({})
+                        continue
                     
                     # Normalize scores
-                    if sparse_dict:
-                        max_score = max(sparse_dict.values())
-                        if max_score > 0:
-                            sparse_dict = {k: v / max_score for k, v in sparse_dict.items()}
-                    
-                    return sparse_dict
+                    scores = scores / scores.max()
+                    sparse_dicts.append({
+                        id_to_token[token_id]: score
+                        for token_id, score in zip(token_ids.tolist(), scores.tolist())
+                    })
+                
+                return sparse_dicts
             
             # Fallback to TF-IDF if SPLADE is not available
             print(f"  [warn] SPLADE model not available, using TF-IDF fallback")
-            return self._build_tfidf_sparse_vector(text)
+            return [self._build_tfidf_sparse_vector(text) for text in texts]
             
         except Exception as e:
             print(f"SPLADE sparse vector generation failed: {e}")
             print(f"  [warn] Falling back to TF-IDF")
-            return self._build_tfidf_sparse_vector(text)
+            return [self._build_tfidf_sparse_vector(text) for text in texts]
     
     def _build_tfidf_sparse_vector(self, text: str) -> Dict[str, float]:
         """Generate sparse vector using TF-IDF fallback"""
@@ -1208,7 +1487,7 @@ Please provide detailed analysis and response.
     
     async def _fetch_user_details_from_db(self, user_ids: List[str]) -> Dict[str, Dict]:
         """
-        Fetch user detailed information from database API
+        Fetch user detailed information from the database (batched in-process loader)
         
         Args:
             user_ids: List of user IDs
@@ -1222,35 +1501,20 @@ Please provide detailed analysis and response.
             return user_details
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # Concurrent requests for multiple users' detailed information
-                tasks = []
-                for user_id in user_ids:
-                    task = self._fetch_single_user_detail(client, user_id)
-                    tasks.append(task)
-                
-                # Wait for all requests to complete
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                # Process results
-                for user_id, result in zip(user_ids, results):
-                    if isinstance(result, Exception):
-                        print(f"Failed to fetch user {user_id} details: {result}")
-                        # Use empty user information as fallback
-                        user_details[str(user_id)] = {
-                            "id": user_id,
-                            "name": "Unknown user",
-                            "error": str(result)
-                        }
-                    elif result:
-                        user_details[str(user_id)] = result
-                    else:
-                        print(f"User {user_id} details are empty")
-                        user_details[str(user_id)] = {
-                            "id": user_id,
-                            "name": "Unknown user",
-                            "error": "User does not exist"
-                        }
+            # One IN (...) query for all IDs, shared with concurrent callers
+            results = await profile_loader.load_many(user_ids)
+            
+            for user_id in user_ids:
+                result = results.get(str(user_id))
+                if result:
+                    user_details[str(user_id)] = result
+                else:
+                    print(f"User {user_id} details are empty")
+                    user_details[str(user_id)] = {
+                        "id": user_id,
+                        "name": "Unknown user",
+                        "error": "User does not exist"
+                    }
                         
         except Exception as e:
             print(f"Batch fetch user details failed: {e}")
@@ -1264,34 +1528,6 @@ Please provide detailed analysis and response.
         
         return user_details
     
-    async def _fetch_single_user_detail(self, client: httpx.AsyncClient, user_id: str) -> Optional[Dict]:
-        """
-        Fetch detailed information for a single user
-        
-        Args:
-            client: HTTP client
-            user_id: User ID
-            
-        Returns:
-            User detailed information or None
-        """
-        try:
-            url = f"{self.api_base_url}/users/{user_id}"
-            response = await client.get(url)
-            
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 404:
-                print(f"User {user_id} does not exist")
-                return None
-            else:
-                print(f"Failed to fetch user {user_id} details, status code: {response.status_code}")
-                return None
-                
-        except Exception as e:
-            print(f"Exception occurred while requesting user {user_id} details: {e}")
-            return None
-    
     def _merge_vector_and_db_results(
         self, 
         vector_results: List[Dict], 
@@ -1363,34 +1599,115 @@ Please provide detailed analysis and response.
         Returns:
             Analysis result, including quality assessment, candidate details (with match reasons) and guiding response
         """
+        if not candidates:
+            self.stats["llm_calls"] += 1
+            return self._poor_candidates_analysis(user_query, current_user_info, language_code)
+        
+        system_prompt, user_content = self._build_candidate_analysis_prompts(
+            user_query, candidates, search_attempt, current_user_info,
+            language_code, referenced_users, total_found
+        )
         self.stats["llm_calls"] += 1
         
+        try:
+            result = self.glm_client.json_chat(
+                content=user_content,
+                system_prompt=system_prompt,
+                temperature=0.2,
+                max_tokens=2000  # Increase token limit to accommodate more content
+            )
+            return self._process_candidate_analysis(result, candidates)
+            
+        except Exception as e:
+            print(f"Candidate analysis failed: {e}")
+            return self._default_candidate_analysis(candidates, language_code)
+    
+    async def async_analyze_candidates_quality(
+        self,
+        user_query: str,
+        candidates: List[Dict],
+        search_attempt: int = 1,
+        current_user_info: Dict = None,
+        language_code: str = "zh",
+        referenced_users: List[Dict] = None,
+        total_found: int = 0
+    ) -> Dict:
+        """
+        Analyze candidate quality without blocking the event loop (see analyze_candidates_quality)
+        
+        Args:
+            user_query: User query
+            candidates: Candidate list
+            search_attempt: Search attempt count
+            current_user_info: Current user's complete information (including demands and goals)
+            language_code: Language code
+            referenced_users: Referenced user list
+            total_found: Total found candidates count
+            
+        Returns:
+            Analysis result, including quality assessment, candidate details (with match reasons) and guiding response
+        """
         if not candidates:
-            # Determine reasons for poor search quality
-            poor_quality_intro = ""
-            if language_code == "zh":
-                if len(user_query.strip()) < 10:
-                    poor_quality_intro = "Your search query is too vague or short. Please provide more detailed criteria like skills, experience level, location, etc."
-                elif not current_user_info or current_user_info.get('error'):
-                    poor_quality_intro = "Your profile information is incomplete. Please complete your skills, demands, and goals for more accurate recommendations."
-                else:
-                    poor_quality_intro = "No suitable candidates found. Please try expanding your search criteria or adjusting search conditions."
+            self.stats["llm_calls"] += 1
+            return self._poor_candidates_analysis(user_query, current_user_info, language_code)
+        
+        system_prompt, user_content = self._build_candidate_analysis_prompts(
+            user_query, candidates, search_attempt, current_user_info,
+            language_code, referenced_users, total_found
+        )
+        self.stats["llm_calls"] += 1
+        
+        try:
+            result = await self.glm_client.async_json_chat(
+                content=user_content,
+                system_prompt=system_prompt,
+                temperature=0.2,
+                max_tokens=2000  # Increase token limit to accommodate more content
+            )
+            return self._process_candidate_analysis(result, candidates)
+            
+        except Exception as e:
+            print(f"Candidate analysis failed: {e}")
+            return self._default_candidate_analysis(candidates, language_code)
+    
+    def _poor_candidates_analysis(self, user_query: str, current_user_info: Dict, language_code: str) -> Dict:
+        """Analysis result when no candidates were found"""
+        # Determine reasons for poor search quality
+        poor_quality_intro = ""
+        if language_code == "zh":
+            if len(user_query.strip()) < 10:
+                poor_quality_intro = "Your search query is too vague or short. Please provide more detailed criteria like skills, experience level, location, etc."
+            elif not current_user_info or current_user_info.get('error'):
+                poor_quality_intro = "Your profile information is incomplete. Please complete your skills, demands, and goals for more accurate recommendations."
             else:
-                if len(user_query.strip()) < 10:
-                    poor_quality_intro = "Your search query is too vague or short. Please provide more detailed criteria like skills, experience level, location, etc."
-                elif not current_user_info or current_user_info.get('error'):
-                    poor_quality_intro = "Your profile information is incomplete. Please complete your skills, demands, and goals for more accurate recommendations."
-                else:
-                    poor_quality_intro = "No suitable candidates found. Consider expanding search criteria or adjusting requirements."
-                    
-            return {
-                "overall_quality": "poor",
-                "candidate_count": 0,
-                "should_continue": True,
-                "analysis": "No suitable candidates found, suggest expanding search criteria",
-                "intro": poor_quality_intro
-            }
-
+                poor_quality_intro = "No suitable candidates found. Please try expanding your search criteria or adjusting search conditions."
+        else:
+            if len(user_query.strip()) < 10:
+                poor_quality_intro = "Your search query is too vague or short. Please provide more detailed criteria like skills, experience level, location, etc."
+            elif not current_user_info or current_user_info.get('error'):
+                poor_quality_intro = "Your profile information is incomplete. Please complete your skills, demands, and goals for more accurate recommendations."
+            else:
+                poor_quality_intro = "No suitable candidates found. Consider expanding search criteria or adjusting requirements."
+                
+        return {
+            "overall_quality": "poor",
+            "candidate_count": 0,
+            "should_continue": True,
+            "analysis": "No suitable candidates found, suggest expanding search criteria",
+            "intro": poor_quality_intro
+        }
+    
+    def _build_candidate_analysis_prompts(
+        self,
+        user_query: str,
+        candidates: List[Dict],
+        search_attempt: int,
+        current_user_info: Dict,
+        language_code: str,
+        referenced_users: List[Dict],
+        total_found: int
+    ) -> Tuple[str, str]:
+        """Build (system_prompt, user_content) for candidate quality analysis"""
         system_prompt = f"""
         You are a professional candidate matching analyst with expertise in mutual compatibility assessment, match reasoning, and user guidance. Your task is to analyze candidate profiles using BIDIRECTIONAL MATCHING criteria, generate natural match reasons, and create engaging introductions.
 
@@ -1536,86 +1853,82 @@ Please provide detailed analysis and response.
         IMPORTANT: If quality is "poor", do NOT include selected_candidates field and provide suggestions in the intro field.
         """
         
-        try:
-            result = self.glm_client.json_chat(
-                content=user_content,
-                system_prompt=system_prompt,
-                temperature=0.2,
-                max_tokens=2000  # Increase token limit to accommodate more content
-            )
-            
-            # Process quality assessment results
-            overall_quality = result.get("overall_quality", "fair")
-            
-            if overall_quality == "poor":
-                # For poor quality results, do not include selected_candidates
-                return {
-                    "overall_quality": "poor",
-                    "candidate_count": result.get("candidate_count", len(candidates)),
-                    "should_continue": result.get("should_continue", True),
-                    "analysis": result.get("analysis", "Candidate quality does not meet requirements"),
-                    "intro": result.get("intro", "No suitable candidates found, suggest adjusting search criteria")
-                }
-            else:
-                # For qualified results, process selected_candidates
-                selected_candidates = result.get("selected_candidates", [])[:3]  # Limit to maximum 3
-                
-                # Add complete original information for each selected candidate
-                enhanced_candidates = []
-                for selected in selected_candidates:
-                    # Find original candidate data by user_id
-                    original_candidate = None
-                    for candidate in candidates:
-                        if candidate.get("user_id") == selected.get("user_id"):
-                            original_candidate = candidate
-                            break
-                    
-                    if original_candidate:
-                        # Merge LLM analysis results and original candidate data
-                        enhanced_candidate = original_candidate.copy()
-                        enhanced_candidate.update({
-                            "match_score": selected.get("match_score", 6),
-                            "key_strengths": selected.get("key_strengths", []),
-                            "match_reason": selected.get("match_reason", "Comprehensive background match")
-                        })
-                        enhanced_candidates.append(enhanced_candidate)
-                    else:
-                        # If original data not found, keep LLM analysis results
-                        enhanced_candidates.append(selected)
+        return system_prompt, user_content
+    
+    def _process_candidate_analysis(self, result: Dict, candidates: List[Dict]) -> Dict:
+        """Turn the LLM analysis into the result format (attach original candidate data)"""
+        # Process quality assessment results
+        overall_quality = result.get("overall_quality", "fair")
+        
+        if overall_quality == "poor":
+            # For poor quality results, do not include selected_candidates
+            return {
+                "overall_quality": "poor",
+                "candidate_count": result.get("candidate_count", len(candidates)),
+                "should_continue": result.get("should_continue", True),
+                "analysis": result.get("analysis", "Candidate quality does not meet requirements"),
+                "intro": result.get("intro", "No suitable candidates found, suggest adjusting search criteria")
+            }
+        else:
+            # For qualified results, process selected_candidates
+            selected_candidates = result.get("selected_candidates", [])[:3]  # Limit to maximum 3
+            
+            # Add complete original information for each selected candidate
+            enhanced_candidates = []
+            for selected in selected_candidates:
+                # Find original candidate data by user_id
+                original_candidate = None
+                for candidate in candidates:
+                    if candidate.get("user_id") == selected.get("user_id"):
+                        original_candidate = candidate
+                        break
                 
-                return {
-                    "overall_quality": overall_quality,
-                    "candidate_count": result.get("candidate_count", len(candidates)),
-                    "should_continue": result.get("should_continue", len(candidates) < 5),
-                    "selected_candidates": enhanced_candidates,
-                    "analysis": result.get("analysis", ""),
-                    "intro": result.get("intro", "Found quality candidates for you, suggest further understanding.")
-                }
-            
-        except Exception as e:
-            print(f"Candidate analysis failed: {e}")
-            # Return default analysis results, including complete candidate information
-            selected_candidates = []
-            for candidate in candidates[:3]:
-                enhanced_candidate = candidate.copy()
-                enhanced_candidate.update({
-                    "match_score": 6,
-                    "key_strengths": ["Has relevant skills"],
-                    "match_reason": self._generate_default_match_reason(candidate, language_code)
-                })
-                selected_candidates.append(enhanced_candidate)
-            
-            default_intro = "Found candidates for you, recommend further review." if language_code == "zh" else "Found candidates for your review."
+                if original_candidate:
+                    # Merge LLM analysis results and original candidate data
+                    enhanced_candidate = original_candidate.copy()
+                    enhanced_candidate.update({
+                        "match_score": selected.get("match_score", 6),
+                        "key_strengths": selected.get("key_strengths", []),
+                        "match_reason": selected.get("match_reason", "Comprehensive background match")
+                    })
+                    enhanced_candidates.append(enhanced_candidate)
+                else:
+                    # If original data not found, keep LLM analysis results
+                    enhanced_candidates.append(selected)
             
             return {
-                "overall_quality": "fair",
-                "candidate_count": len(candidates),
-                "should_continue": len(candidates) < 5,
-                "selected_candidates": selected_candidates,
-                "analysis": "LLM analysis failed, returning default result",
-                "intro": default_intro
+                "overall_quality": overall_quality,
+                "candidate_count": result.get("candidate_count", len(candidates)),
+                "should_continue": result.get("should_continue", len(candidates) < 5),
+                "selected_candidates": enhanced_candidates,
+                "analysis": result.get("analysis", ""),
+                "intro": result.get("intro", "Found quality candidates for you, suggest further understanding.")
             }
     
+    def _default_candidate_analysis(self, candidates: List[Dict], language_code: str) -> Dict:
+        """Default analysis result when the LLM call fails"""
+        # Return default analysis results, including complete candidate information
+        selected_candidates = []
+        for candidate in candidates[:3]:
+            enhanced_candidate = candidate.copy()
+            enhanced_candidate.update({
+                "match_score": 6,
+                "key_strengths": ["Has relevant skills"],
+                "match_reason": self._generate_default_match_reason(candidate, language_code)
+            })
+            selected_candidates.append(enhanced_candidate)
+        
+        default_intro = "Found candidates for you, recommend further review." if language_code == "zh" else "Found candidates for your review."
+        
+        return {
+            "overall_quality": "fair",
+            "candidate_count": len(candidates),
+            "should_continue": len(candidates) < 5,
+            "selected_candidates": selected_candidates,
+            "analysis": "LLM analysis failed, returning default result",
+            "intro": default_intro
+        }
+
     def _generate_default_match_reason(self, candidate: Dict, language_code: str = "zh") -> str:
         """Generate default match reason"""
         default_parts = []
@@ -1664,8 +1977,67 @@ Please provide detailed analysis and response.
         Returns:
             Keyword text for sparse search
         """
+        system_prompt, user_prompt = self._build_sparse_tags_prompts(user_query, referenced_users)
+        cache_key, cache_scope = self._llm_cache_keys("sparse_tags", system_prompt, user_prompt, 0.1, user_query)
+        cached, embedding = self._llm_cache_lookup(cache_key, cache_scope, user_query)
+        if cached is not None:
+            return cached
+        
+        self.stats["llm_calls"] += 1
+        
+        try:
+            keywords = self.glm_client.simple_chat(
+                content=user_prompt,
+                system_prompt=system_prompt,
+                temperature=0.1,
+                max_tokens=150
+            )
+            keywords = keywords.strip()
+            self.llm_cache.put(cache_key, keywords, scope=cache_scope, embedding=embedding)
+            return keywords
+        except Exception as e:
+            print(f"Keyword extraction failed: {e}")
+            return user_query  # Return original query as fallback
+    
+    async def async_extract_tags_for_sparse_search(
+        self,
+        user_query: str,
+        referenced_users: List[Dict] = None
+    ) -> str:
+        """
+        Extract keywords for sparse vector search without blocking the event loop
+        
+        Args:
+            user_query: User query
+            referenced_users: Referenced user list
+            
+        Returns:
+            Keyword text for sparse search
+        """
+        system_prompt, user_prompt = self._build_sparse_tags_prompts(user_query, referenced_users)
+        cache_key, cache_scope = self._llm_cache_keys("sparse_tags", system_prompt, user_prompt, 0.1, user_query)
+        cached, embedding = await self._async_llm_cache_lookup(cache_key, cache_scope, user_query)
+        if cached is not None:
+            return cached
+        
         self.stats["llm_calls"] += 1
         
+        try:
+            keywords = await self.glm_client.async_simple_chat(
+                content=user_prompt,
+                system_prompt=system_prompt,
+                temperature=0.1,
+                max_tokens=150
+            )
+            keywords = keywords.strip()
+            self.llm_cache.put(cache_key, keywords, scope=cache_scope, embedding=embedding)
+            return keywords
+        except Exception as e:
+            print(f"Keyword extraction failed: {e}")
+            return user_query  # Return original query as fallback
+    
+    def _build_sparse_tags_prompts(self, user_query: str, referenced_users: List[Dict] = None) -> Tuple[str, str]:
+        """Build (system_prompt, user_prompt) for sparse keyword extraction"""
         # Build referenced user information
         referenced_info = ""
         if referenced_users:
@@ -1695,18 +2067,7 @@ Please provide detailed analysis and response.
         
         Extract precise keywords for exact matching:
         """
-        
-        try:
-            keywords = self.glm_client.simple_chat(
-                content=user_prompt,
-                system_prompt=system_prompt,
-                temperature=0.1,
-                max_tokens=150
-            )
-            return keywords.strip()
-        except Exception as e:
-            print(f"Keyword extraction failed: {e}")
-            return user_query  # Return original query as fallback
+        return system_prompt, user_prompt
     
     async def intelligent_search(
         self,
@@ -1714,7 +2075,8 @@ Please provide detailed analysis and response.
         current_user: dict = None,
         referenced_users: List[Dict] = None,
         viewed_user_ids: List[str] = None,
-        swiped_user_ids: List[str] = None
+        swiped_user_ids: List[str] = None,
+        speculative: bool = None
     ) -> Dict:
         """
         Complete intelligent search method - includes language detection, search scheduling and result generation
@@ -1725,6 +2087,8 @@ Please provide detailed analysis and response.
             referenced_users: Referenced user list
             viewed_user_ids: Viewed user ID list (excluded from initial search)
             swiped_user_ids: Swiped user ID list (filtered after getting 50 candidates)
+            speculative: Run all strategies concurrently and cancel the rest once one is accepted
+                (defaults to SPECULATIVE_SEARCH)
             
         Returns:
             Complete formatted search results
@@ -1736,6 +2100,7 @@ Please provide detailed analysis and response.
         performance_stats = {
             "language_detection": 0.0,
             "preprocessing": 0.0,
+            "vector_encoding": 0.0,
             "vector_searches": {},
             "candidate_analysis": {},
             "result_generation": 0.0,
@@ -1769,11 +2134,36 @@ Please provide detailed analysis and response.
             
             print(f"[info] Preprocessing completed - Dense: {len(dense_query)}, Sparse: {len(sparse_query)} - Time: {performance_stats['preprocessing']:.3f}s")
             
+            # Encode query vectors once; every search attempt reuses them
+            step_start = time.time()
+            search_context = await self.prepare_search_context(dense_query, sparse_query)
+            performance_stats["vector_encoding"] = time.time() - step_start
+            print(f"[info] Query vectors encoded - Time: {performance_stats['vector_encoding']:.3f}s")
+            
             # Step 4: Three-phase search loop
             search_strategies = ["standard", "expanded", "custom"]
             all_candidates = []
             best_analysis = None
             
+            if speculative is None:
+                speculative = SPECULATIVE_SEARCH
+            
+            if speculative:
+                all_candidates, best_analysis, attempt = await self._speculative_strategy_search(
+                    search_strategies=search_strategies,
+                    user_query=user_query,
+                    dense_query=dense_query,
+                    sparse_query=sparse_query,
+                    search_context=search_context,
+                    current_user_info=current_user_info,
+                    language_code=language_code,
+                    referenced_users=referenced_users,
+                    viewed_user_ids=viewed_user_ids or [],
+                    swiped_user_ids=swiped_user_ids or [],
+                    performance_stats=performance_stats
+                )
+                search_strategies = []  # Attempts already evaluated
+            
             for attempt, strategy in enumerate(search_strategies, 1):
                 print(f"[info] Search attempt {attempt}/3: {strategy} strategy")
                 
@@ -1786,7 +2176,8 @@ Please provide detailed analysis and response.
                     limit=10,
                     viewed_user_ids=viewed_user_ids or [],
                     swiped_user_ids=swiped_user_ids or [],
-                    fetch_db_details=False  # Use VectorDB data only (no PostgreSQL API call)
+                    fetch_db_details=False,  # Use VectorDB data only (no PostgreSQL API call)
+                    search_context=search_context
                 )
                 search_time = time.time() - search_start
                 performance_stats["vector_searches"][f"attempt_{attempt}_{strategy}"] = search_time
@@ -1796,7 +2187,7 @@ Please provide detailed analysis and response.
                     
                     # LLM analyze candidate quality
                     analysis_start = time.time()
-                    analysis = self.analyze_candidates_quality(
+                    analysis = await self.async_analyze_candidates_quality(
                         user_query=user_query,
                         candidates=candidates,
                         search_attempt=attempt,
@@ -1870,6 +2261,7 @@ Please provide detailed analysis and response.
             print(f"\n[info] Performance Statistics Summary:")
             print(f"  Language detection: {performance_stats['language_detection']:.3f}s")
             print(f"  Preprocessing phase: {performance_stats['preprocessing']:.3f}s")
+            print(f"  Vector encoding: {performance_stats['vector_encoding']:.3f}s")
             for search_key, search_time in performance_stats['vector_searches'].items():
                 print(f"  Vector search {search_key}: {search_time:.3f}s")
             for analysis_key, analysis_time in performance_stats['candidate_analysis'].items():
@@ -1890,6 +2282,7 @@ Please provide detailed analysis and response.
                 "search_quality": best_analysis.get("overall_quality", "unknown"),
                 "analysis": best_analysis.get("analysis", ""),
                 "search_attempts": attempt,
+                "vectordb_calls": search_context["vectordb_calls"],
                 "performance_stats": performance_stats,  # Add performance statistics
                 "stats": self.get_search_stats()
             }
@@ -1909,13 +2302,118 @@ Please provide detailed analysis and response.
                 "performance_stats": performance_stats
             }
     
+    async def _speculative_strategy_search(
+        self,
+        search_strategies: List[str],
+        user_query: str,
+        dense_query: str,
+        sparse_query: str,
+        search_context: Dict[str, Any],
+        current_user_info: Dict,
+        language_code: str,
+        referenced_users: List[Dict],
+        viewed_user_ids: List[str],
+        swiped_user_ids: List[str],
+        performance_stats: Dict
+    ) -> Tuple[List[Dict], Optional[Dict], int]:
+        """
+        Run all search strategies concurrently with pipelined LLM analysis
+        
+        Every strategy's vector search starts immediately and each attempt's analysis starts as
+        soon as its candidates are ready. Results are still accepted in strategy order with the
+        same rules as the sequential loop; once an attempt is accepted, remaining searches and
+        analyses are cancelled. Trades extra LLM calls for lower latency.
+        
+        Returns:
+            (all candidates of evaluated attempts, accepted analysis or None, last evaluated attempt)
+        """
+        async def run_search(attempt: int, strategy: str) -> List[Dict]:
+            search_start = time.time()
+            candidates = await self.hybrid_search(
+                dense_query=dense_query,
+                sparse_query=sparse_query,
+                search_strategy=strategy,
+                limit=10,
+                viewed_user_ids=viewed_user_ids,
+                swiped_user_ids=swiped_user_ids,
+                fetch_db_details=False,
+                search_context=search_context
+            )
+            performance_stats["vector_searches"][f"attempt_{attempt}_{strategy}"] = time.time() - search_start
+            return candidates
+        
+        search_tasks = [
+            asyncio.create_task(run_search(attempt, strategy))
+            for attempt, strategy in enumerate(search_strategies, 1)
+        ]
+        
+        async def run_analysis(attempt: int) -> Tuple[List[Dict], Optional[Dict]]:
+            candidates = await search_tasks[attempt - 1]
+            if not candidates:
+                return candidates, None
+            
+            # Same running total the sequential loop reports
+            earlier_results = await asyncio.gather(*search_tasks[:attempt - 1])
+            total_found = sum(len(result) for result in earlier_results) + len(candidates)
+            
+            analysis_start = time.time()
+            analysis = await self.async_analyze_candidates_quality(
+                user_query=user_query,
+                candidates=candidates,
+                search_attempt=attempt,
+                current_user_info=current_user_info,
+                language_code=language_code,
+                referenced_users=referenced_users,
+                total_found=total_found
+            )
+            performance_stats["candidate_analysis"][f"attempt_{attempt}"] = time.time() - analysis_start
+            return candidates, analysis
+        
+        analysis_tasks = [
+            asyncio.create_task(run_analysis(attempt))
+            for attempt in range(1, len(search_strategies) + 1)
+        ]
+        
+        all_candidates = []
+        best_analysis = None
+        attempt = 0
+        
+        try:
+            for attempt, strategy in enumerate(search_strategies, 1):
+                print(f"[info] Speculative attempt {attempt}/{len(search_strategies)}: {strategy} strategy")
+                candidates, analysis = await analysis_tasks[attempt - 1]
+                
+                if not candidates:
+                    print(f"    No candidates")
+                    continue
+                
+                all_candidates.extend(candidates)
+                print(f"[info] Analysis result: {analysis.get('overall_quality', 'unknown')} - {analysis.get('candidate_count', 0)} candidates")
+                
+                # If quality is good or this is the last attempt, stop searching
+                if (analysis.get("overall_quality") in ["excellent", "good"] or 
+                    not analysis.get("should_continue", True) or 
+                    attempt == len(search_strategies)):
+                    best_analysis = analysis
+                    break
+        finally:
+            # Cancel speculative work that is no longer needed
+            pending = [task for task in analysis_tasks + search_tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                print(f"[info] Cancelled {len(pending)} speculative search tasks")
+        
+        return all_candidates, best_analysis, attempt
+    
     async def _async_optimize_dense_query(self, query: str, referenced_users: List[Dict]) -> str:
         """Asynchronously optimize dense query"""
-        return self.optimize_query_for_dense_vector(query, referenced_users)
+        return await self.async_optimize_query_for_dense_vector(query, referenced_users)
     
     async def _async_extract_sparse_tags(self, query: str, referenced_users: List[Dict]) -> str:
         """Asynchronously extract sparse tags"""
-        return self.extract_tags_for_sparse_search(query, referenced_users)
+        return await self.async_extract_tags_for_sparse_search(query, referenced_users)
     
     # ===== Utility Methods =====
     
@@ -1931,7 +2429,12 @@ Please provide detailed analysis and response.
             "total_llm_calls": self.stats["llm_calls"],
             "total_search_time": round(self.stats["total_search_time"], 2),
             "average_search_time": round(avg_search_time, 2),
-            "cache_hits": self.stats["cache_hits"]
+            "cache_hits": self.stats["cache_hits"],
+            "llm_cache": self.llm_cache.get_stats(),
+            "embedding_batcher": get_embedding_batcher(self._dense_model).get_stats() if self._dense_model is not None else None,
+            "vectordb": self.vectordb_adapter.get_latency_stats() if hasattr(self.vectordb_adapter, "get_latency_stats") else None,
+            "profile_loader": profile_loader.get_stats(),
+            "profile_card_cache": profile_card_cache.get_stats()
         }
     
     # ===== Intelligent Routing Scheduler =====
@@ -2067,22 +2570,27 @@ Please provide detailed analysis and response.
             language_code, confidence = self.detect_language(user_input)
             print(f"[info] Detected language: {language_code} (confidence: {confidence:.2f})")
             
-            # Step 2: Get current user information (if user_id provided)
-            current_user = None
+            # Step 2-3: Get current user and referenced user information concurrently
+            fetch_tasks = {}
             if user_id:
                 print(f"[info] Getting current user information: {user_id}")
-                user_details = await self._fetch_user_details_from_db([user_id])
-                current_user = user_details.get(str(user_id))
+                fetch_tasks["current"] = self._fetch_user_details_from_db([user_id])
+            if referenced_ids:
+                print(f"[info] Getting referenced user information: {referenced_ids}")
+                fetch_tasks["referenced"] = self._fetch_user_details_from_db(referenced_ids)
+            fetched = dict(zip(fetch_tasks.keys(), await asyncio.gather(*fetch_tasks.values())))
+            
+            current_user = None
+            if user_id:
+                current_user = fetched["current"].get(str(user_id))
                 if current_user and not current_user.get('error'):
                     print(f"[info] Successfully retrieved user information")
                 else:
                     print(f"[warn] Unable to retrieve user information or user does not exist")
             
-            # Step 3: Get referenced user information (if referenced_ids provided)
             referenced_users = None
             if referenced_ids:
-                print(f"[info] Getting referenced user information: {referenced_ids}")
-                referenced_details = await self._fetch_user_details_from_db(referenced_ids)
+                referenced_details = fetched["referenced"]
                 referenced_users = []
                 for ref_id in referenced_ids:
                     user_data = referenced_details.get(str(ref_id))
@@ -2091,7 +2599,7 @@ Please provide detailed analysis and response.
                 print(f"[info] Successfully retrieved {len(referenced_users)} referenced user information")
             
             # Step 4: Intent recognition
-            intent_result = self.analyze_user_intent(
+            intent_result = await self.async_analyze_user_intent(
                 user_input=user_input,
                 referenced_user=referenced_users[0] if referenced_users else None,
                 current_user=current_user
@@ -5,15 +5,51 @@ Uses the official tcvectordb SDK
 """
 
 import asyncio
+import functools
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Any, Optional, Tuple
 import numpy as np
 from tcvectordb import VectorDBClient
+from tcvectordb.exceptions import ParamError, ServerInternalError
+from tcvectordb.model.document import Filter
 from tcvectordb.model.enum import ReadConsistency
 
+from services.hybrid_fusion import fuse_dbsf, fuse_rrf, sparse_dot, to_sparse_pairs
+
 logger = logging.getLogger(__name__)
 
 
+# SDK call execution limits (overridable via environment)
+VECTORDB_MAX_WORKERS = int(os.getenv("VECTORDB_MAX_WORKERS", "8"))
+VECTORDB_MAX_CONCURRENCY = int(os.getenv("VECTORDB_MAX_CONCURRENCY", str(VECTORDB_MAX_WORKERS)))
+VECTORDB_CALL_TIMEOUT = float(os.getenv("VECTORDB_CALL_TIMEOUT", "10"))
+# Number of recent latencies kept per operation for percentile stats
+VECTORDB_LATENCY_WINDOW = 1000
+
+# Hybrid (dense + sparse) retrieval
+VECTORDB_HYBRID_MODE = os.getenv("VECTORDB_HYBRID_MODE", "client")
+VECTORDB_FUSION = os.getenv("VECTORDB_FUSION", "dbsf")
+VECTORDB_SPARSE_FIELD = os.getenv("VECTORDB_SPARSE_FIELD", "")
+HYBRID_DENSE_WEIGHT = float(os.getenv("VECTORDB_HYBRID_DENSE_WEIGHT", "0.5"))
+HYBRID_PREFETCH_FACTOR = 2  # Each arm fetches top_k * factor candidates before fusion
+
+# Filter pushdown and adaptive over-fetch
+VECTORDB_MAX_FILTER_IDS = int(os.getenv("VECTORDB_MAX_FILTER_IDS", "2000"))  # Longest "not in" list sent to the server
+VECTORDB_MAX_TOP_K = int(os.getenv("VECTORDB_MAX_TOP_K", "1000"))  # Upper bound when growing top_k
+VECTORDB_FILTER_RETRY_SECONDS = float(os.getenv("VECTORDB_FILTER_RETRY_SECONDS", "600"))  # Pushdown retry delay after a rejection
+
+# Server error codes of a rejected request parameter; with "filter" in the message they mean the
+# filter expression itself was rejected (bad syntax, field without a filter index)
+VECTORDB_FILTER_ERROR_CODES = frozenset(
+    int(code) for code in os.getenv("VECTORDB_FILTER_ERROR_CODES", "15000").split(",") if code.strip()
+)
+
+
 class TencentVectorDBAdapter:
     """Adapter for Tencent Vector Database with hybrid search capabilities using official SDK"""
     
@@ -24,8 +60,32 @@ class TencentVectorDBAdapter:
         key: str,
         database_name: str = "intelligent_search",
         collection_name: str = "user_vectors_1024",
-        timeout: int = 30
+        timeout: int = 30,
+        call_timeout: float = VECTORDB_CALL_TIMEOUT,
+        max_workers: int = VECTORDB_MAX_WORKERS,
+        max_concurrency: int = VECTORDB_MAX_CONCURRENCY,
+        hybrid_mode: str = VECTORDB_HYBRID_MODE,
+        fusion_method: str = VECTORDB_FUSION,
+        sparse_field: str = VECTORDB_SPARSE_FIELD
     ):
+        """
+        Initialize adapter
+        
+        Args:
+            url: Vector database endpoint
+            username: Account name
+            key: API key
+            database_name: Database name
+            collection_name: Collection name
+            timeout: SDK (HTTP) timeout in seconds
+            call_timeout: Per-call timeout applied by the adapter in seconds (0 disables)
+            max_workers: Size of the thread pool running blocking SDK calls
+            max_concurrency: Maximum number of in-flight SDK calls per event loop
+            hybrid_mode: "client" (parallel dense/sparse arms fused client-side), "server"
+                (server-side weighted rerank) or "dense" (ignore sparse vectors)
+            fusion_method: Client-side fusion ("dbsf" or "rrf")
+            sparse_field: Sparse vector index field (empty = auto-detect)
+        """
         self.url = url.rstrip('/')
         self.username = username
         self.key = key
@@ -42,26 +102,133 @@ class TencentVectorDBAdapter:
         )
         self.database = None
         self.collection = None
+        self._connection_lock = threading.Lock()
+        
+        # Blocking SDK calls run on a bounded thread pool, never on the event loop
+        self.call_timeout = call_timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="vectordb")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        
+        # Hybrid retrieval configuration
+        self.hybrid_mode = hybrid_mode if hybrid_mode in ("client", "server", "dense") else "client"
+        self.fusion_method = fusion_method if fusion_method in ("dbsf", "rrf") else "dbsf"
+        self.sparse_field = sparse_field
+        self._sparse_index_field: Optional[str] = None
+        self._sparse_field_checked = False
+        self._server_hybrid_available = True
+        self._filter_pushdown_retry_at = 0.0  # Monotonic time until which filters are applied client-side only
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Per-operation latency statistics
+        self._latencies: Dict[str, deque] = {}
+        self._op_stats: Dict[str, Dict[str, Any]] = {}
+        self._stats_lock = threading.Lock()
         
         logger.info(f"TencentVectorDB SDK initialized: {self.url}/{self.database_name}/{self.collection_name}")
     
     def _ensure_connection(self):
         """Ensure database and collection connections are established"""
-        if self.database is None:
-            self.database = self.client.database(self.database_name)
-            logger.info(f"[VectorDB] Connected to database: {self.database_name}")
-        
-        if self.collection is None:
-            self.collection = self.database.collection(self.collection_name)
-            logger.info(f"[VectorDB] Connected to collection: {self.collection_name}")
+        with self._connection_lock:
+            if self.database is None:
+                self.database = self.client.database(self.database_name)
+                logger.info(f"[VectorDB] Connected to database: {self.database_name}")
+            
+            if self.collection is None:
+                self.collection = self.database.collection(self.collection_name)
+                logger.info(f"[VectorDB] Connected to collection: {self.collection_name}")
     
     def close(self):
         """Clean up resources"""
+        self._executor.shutdown(wait=False)
         self.database = None
         self.collection = None
         self.client = None
         logger.info("[VectorDB] Connection closed")
     
+    # === Non-blocking SDK execution ===
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limiter for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+    
+    async def _run_sdk_call(self, operation: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking SDK call on the adapter's thread pool
+        
+        Args:
+            operation: Operation name used for latency stats
+            func: Blocking callable
+            
+        Returns:
+            Callable result
+            
+        Raises:
+            asyncio.TimeoutError: If the call exceeds call_timeout (the worker thread finishes in the background)
+        """
+        loop = asyncio.get_running_loop()
+        start_time = time.perf_counter()
+        status = "ok"
+        
+        try:
+            async with self._get_semaphore():
+                future = loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+                if self.call_timeout and self.call_timeout > 0:
+                    return await asyncio.wait_for(future, self.call_timeout)
+                return await future
+        except asyncio.TimeoutError:
+            status = "timeout"
+            logger.error(f"[VectorDB] {operation} timed out after {self.call_timeout}s")
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            self._record_latency(operation, time.perf_counter() - start_time, status)
+    
+    def _record_latency(self, operation: str, latency: float, status: str):
+        """Record one call's latency and outcome"""
+        with self._stats_lock:
+            stats = self._op_stats.setdefault(operation, {"calls": 0, "errors": 0, "timeouts": 0, "total_time": 0.0})
+            stats["calls"] += 1
+            stats["total_time"] += latency
+            if status == "error":
+                stats["errors"] += 1
+            elif status == "timeout":
+                stats["timeouts"] += 1
+            self._latencies.setdefault(operation, deque(maxlen=VECTORDB_LATENCY_WINDOW)).append(latency)
+    
+    def get_latency_stats(self) -> Dict[str, Any]:
+        """
+        Get per-operation latency statistics
+        
+        Returns:
+            Dictionary keyed by operation with call counts and average/p50/p95/max latency (ms)
+        """
+        with self._stats_lock:
+            operations = {}
+            for operation, stats in self._op_stats.items():
+                recent = np.array(self._latencies.get(operation, ()), dtype=float) * 1000.0
+                operations[operation] = {
+                    "calls": stats["calls"],
+                    "errors": stats["errors"],
+                    "timeouts": stats["timeouts"],
+                    "avg_ms": round(stats["total_time"] * 1000.0 / stats["calls"], 2) if stats["calls"] else 0.0,
+                    "p50_ms": round(float(np.percentile(recent, 50)), 2) if len(recent) else 0.0,
+                    "p95_ms": round(float(np.percentile(recent, 95)), 2) if len(recent) else 0.0,
+                    "max_ms": round(float(recent.max()), 2) if len(recent) else 0.0
+                }
+            
+            return {
+                "operations": operations,
+                "max_concurrency": self.max_concurrency,
+                "call_timeout": self.call_timeout
+            }
+    
     async def hybrid_search(
         self,
         query_vector: List[float],
@@ -84,46 +251,31 @@ class TencentVectorDBAdapter:
             List of search results with scores and metadata
         """
         try:
-            self._ensure_connection()
+            logger.info(f"[VectorDB] Searching: vector_dim={len(query_vector)}, top_k={top_k}, sparse={bool(sparse_vector)}, mode={self.hybrid_mode}")
             
-            logger.info(f"[VectorDB] Searching: vector_dim={len(query_vector)}, top_k={top_k}, sparse={bool(sparse_vector)}")
+            # An empty "$in" matches nothing; do not send "field in ()" to the server
+            if self._has_empty_in(filter_conditions):
+                return []
             
-            # Perform search using SDK
-            # Note: tcvectordb SDK's search() method uses dense vectors by default
-            # Sparse vectors in the collection are automatically used if the collection supports hybrid search
-            # The sparse_vector parameter here is for logging/analysis, not direct SDK usage
-            results = self.collection.search(
-                vectors=[query_vector],
-                limit=top_k,
-                retrieve_vector=False,  # Don't return vectors to save bandwidth
-                # params={"ef": min(top_k * 4, 200)}  # HNSW search quality parameter
-            )
+            # Client-side check of the same conditions (safety net and fallback when pushdown is unavailable)
+            matches = self._compile_client_filter(filter_conditions, exclude_ids)
             
-            # Parse results
-            search_results = []
-            if results and len(results) > 0:
-                for item in results[0]:  # Results come as nested list
-                    # Extract document data
-                    doc = {
-                        "user_id": item.get("user_id"),
-                        "score": float(item.get("score", 0)),
-                        "name": item.get("name", ""),
-                        "bio": item.get("bio", ""),
-                        "skills": item.get("skills", []),
-                        "hobbies": item.get("hobbies", []),
-                        "location": item.get("location", ""),
-                        "university": item.get("university", ""),
-                        "major": item.get("major", ""),
-                        "year": item.get("year"),
-                        # Include all other fields
-                        **{k: v for k, v in item.items() if k not in ["user_id", "score", "vector", "sparse_vector_data"]}
-                    }
-                    
-                    # Apply exclusion filter
-                    if exclude_ids and str(doc["user_id"]) in [str(x) for x in exclude_ids]:
-                        continue
-                    
-                    search_results.append(doc)
+            # Over-fetch adaptively: grow top_k only when filtering leaves the page short
+            fetch_k = top_k
+            while True:
+                filter_expr = None
+                if time.monotonic() >= self._filter_pushdown_retry_at:
+                    filter_expr = self._build_filter_expression(filter_conditions, exclude_ids)
+                
+                docs = await self._retrieve(query_vector, sparse_vector, fetch_k, filter_expr)
+                search_results = [doc for doc in docs if matches(doc)]
+                
+                exhausted = len(docs) < fetch_k
+                if len(search_results) >= top_k or exhausted or fetch_k >= VECTORDB_MAX_TOP_K:
+                    break
+                
+                fetch_k = min(fetch_k * 2, VECTORDB_MAX_TOP_K)
+                logger.info(f"[VectorDB] {len(search_results)}/{top_k} results after filtering, retrying with top_k={fetch_k}")
             
             logger.info(f"[VectorDB] Found {len(search_results)} results")
             return search_results[:top_k]
@@ -134,6 +286,369 @@ class TencentVectorDBAdapter:
             logger.error(traceback.format_exc())
             return []
     
+    async def _retrieve(
+        self,
+        query_vector: List[float],
+        sparse_vector: Optional[Dict[str, float]],
+        top_k: int,
+        filter_expr: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        One retrieval round, falling back to client-side filtering if the server rejects the filter
+        
+        Returns:
+            Parsed result documents
+        """
+        try:
+            return await self._retrieve_once(query_vector, sparse_vector, top_k, filter_expr)
+        except asyncio.TimeoutError:
+            raise
+        except Exception as e:
+            if not filter_expr or not self._is_filter_rejection(e):
+                # Network errors, 5xx etc. must not turn pushdown off
+                raise
+            # e.g. user_id is not a filter-indexed field on this collection; retry pushdown later
+            self._filter_pushdown_retry_at = time.monotonic() + VECTORDB_FILTER_RETRY_SECONDS
+            logger.warning(
+                f"[VectorDB] Filter pushdown rejected, filtering client-side for {VECTORDB_FILTER_RETRY_SECONDS:.0f}s: {e}"
+            )
+            return await self._retrieve_once(query_vector, sparse_vector, top_k, None)
+    
+    @staticmethod
+    def _is_filter_rejection(error: Exception) -> bool:
+        """
+        Whether an error is the filter expression being rejected (not a transient failure)
+        
+        Only the SDK's parameter errors count: a client-side ParamError, or a server error
+        with a VECTORDB_FILTER_ERROR_CODES code, whose message is about the filter.
+        Connection, timeout, HTTP status and Python errors never do.
+        """
+        if isinstance(error, ServerInternalError):
+            if error.code not in VECTORDB_FILTER_ERROR_CODES:
+                return False
+        elif not isinstance(error, ParamError):
+            return False
+        return "filter" in str(error.message or "").lower()
+    
+    async def _retrieve_once(
+        self,
+        query_vector: List[float],
+        sparse_vector: Optional[Dict[str, float]],
+        top_k: int,
+        filter_expr: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Dense or hybrid retrieval with an optional server-side filter"""
+        # Perform search using SDK (dense-only when there is no sparse query)
+        if sparse_vector and self.hybrid_mode != "dense":
+            return await self._hybrid_retrieve(query_vector, sparse_vector, top_k, filter_expr)
+        
+        results = await self._run_sdk_call("search", self._search_sync, query_vector, top_k, filter_expr)
+        docs = []
+        for item in (results[0] if results else []):  # Results come as nested list
+            doc = self._parse_hit(item)
+            doc["dense_score"] = doc["score"]
+            doc["sparse_score"] = None  # No sparse arm; consumers must not fuse on it
+            docs.append(doc)
+        return docs
+    
+    # === Filters ===
+    
+    @staticmethod
+    def _filter_literal(value: Any) -> str:
+        """Format a value for a filter expression"""
+        if isinstance(value, bool):
+            return "1" if value else "0"
+        if isinstance(value, (int, float)):
+            return str(value)
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        return f'"{escaped}"'
+    
+    @staticmethod
+    def _has_empty_in(filter_conditions: Optional[Dict[str, Any]]) -> bool:
+        """Whether any condition is an empty "$in" list (no document can match)"""
+        return any(
+            isinstance(condition, dict) and "$in" in condition and not list(condition["$in"])
+            for condition in (filter_conditions or {}).values()
+        )
+    
+    def _build_filter_expression(
+        self,
+        filter_conditions: Optional[Dict[str, Any]],
+        exclude_ids: Optional[List[str]] = None
+    ) -> Optional[str]:
+        """
+        Translate filter conditions into a server-side filter expression
+        
+        Supports {field: value}, {field: {"$eq"|"$ne"|"$in"|"$nin": ...}}; exclude_ids is merged
+        into a user_id "not in" clause. Exclusion lists longer than VECTORDB_MAX_FILTER_IDS are
+        truncated here (the rest is removed client-side).
+        
+        Args:
+            filter_conditions: Filter conditions
+            exclude_ids: User IDs to exclude
+            
+        Returns:
+            Filter expression, or None if there is nothing to push down
+        """
+        conditions = dict(filter_conditions or {})
+        if exclude_ids:
+            user_condition = conditions.get("user_id")
+            if isinstance(user_condition, dict) and "$nin" in user_condition:
+                merged = list(user_condition["$nin"]) + list(exclude_ids)
+                conditions["user_id"] = {**user_condition, "$nin": merged}
+            elif user_condition is None:
+                conditions["user_id"] = {"$nin": list(exclude_ids)}
+        
+        clauses = []
+        for field, condition in conditions.items():
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            for operator, value in condition.items():
+                if operator == "$eq":
+                    clauses.append(f"{field} = {self._filter_literal(value)}")
+                elif operator == "$ne":
+                    clauses.append(f"{field} != {self._filter_literal(value)}")
+                elif operator in ("$in", "$nin"):
+                    values = list(dict.fromkeys(str(v) if field == "user_id" else v for v in value))
+                    if operator == "$nin":
+                        values = values[:VECTORDB_MAX_FILTER_IDS]
+                    if not values:
+                        # Empty "$nin" excludes nothing; empty "$in" is short-circuited in search()
+                        continue
+                    keyword = "in" if operator == "$in" else "not in"
+                    clauses.append(f"{field} {keyword} ({', '.join(self._filter_literal(v) for v in values)})")
+                else:
+                    logger.warning(f"[VectorDB] Unsupported filter operator {operator} on {field}, applied client-side only")
+        
+        return " and ".join(clauses) if clauses else None
+    
+    def _compile_client_filter(
+        self,
+        filter_conditions: Optional[Dict[str, Any]],
+        exclude_ids: Optional[List[str]] = None
+    ) -> Callable[[Dict[str, Any]], bool]:
+        """
+        Build a set-based predicate equivalent to the filter conditions
+        
+        Returns:
+            Function returning True for documents that pass the filter
+        """
+        checks = []
+        excluded = set(str(x) for x in exclude_ids or [])
+        
+        for field, condition in (filter_conditions or {}).items():
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            for operator, value in condition.items():
+                if field == "user_id" and operator == "$nin":
+                    excluded.update(str(x) for x in value)
+                elif operator == "$eq":
+                    checks.append(lambda doc, f=field, v=value: doc.get(f) == v)
+                elif operator == "$ne":
+                    checks.append(lambda doc, f=field, v=value: doc.get(f) != v)
+                elif operator == "$in":
+                    allowed = set(str(x) for x in value)
+                    checks.append(lambda doc, f=field, a=allowed: str(doc.get(f)) in a)
+                elif operator == "$nin":
+                    blocked = set(str(x) for x in value)
+                    checks.append(lambda doc, f=field, b=blocked: str(doc.get(f)) not in b)
+        
+        def matches(doc: Dict[str, Any]) -> bool:
+            if excluded and str(doc.get("user_id")) in excluded:
+                return False
+            return all(check(doc) for check in checks)
+        
+        return matches
+    
+    def _parse_hit(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert an SDK hit into a result document"""
+        return {
+            "user_id": item.get("user_id"),
+            "score": float(item.get("score", 0)),
+            "name": item.get("name", ""),
+            "bio": item.get("bio", ""),
+            "skills": item.get("skills", []),
+            "hobbies": item.get("hobbies", []),
+            "location": item.get("location", ""),
+            "university": item.get("university", ""),
+            "major": item.get("major", ""),
+            "year": item.get("year"),
+            # Include all other fields
+            **{k: v for k, v in item.items() if k not in ["user_id", "score", "vector", "sparse_vector_data", self._sparse_index_field]}
+        }
+    
+    # === Hybrid retrieval ===
+    
+    async def _get_sparse_field(self) -> Optional[str]:
+        """Name of the collection's sparse vector index (detected once; None if absent)"""
+        if not self._sparse_field_checked:
+            try:
+                detected = await self._run_sdk_call("describe", self._detect_sparse_field_sync)
+                self._sparse_index_field = detected
+                self._sparse_field_checked = True
+                logger.info(f"[VectorDB] Sparse vector index: {detected or 'not available'}")
+            except Exception as e:
+                logger.warning(f"[VectorDB] Could not inspect collection indexes: {e}")
+                return None
+        return self._sparse_index_field
+    
+    def _detect_sparse_field_sync(self) -> Optional[str]:
+        """Find a sparse vector index on the collection (runs on the adapter's thread pool)"""
+        self._ensure_connection()
+        for index in getattr(self.collection, "indexes", None) or []:
+            field_type = getattr(index, "field_type", None) or getattr(index, "fieldType", None)
+            name = getattr(index, "name", None)
+            if "sparse" in str(field_type).lower() and (not self.sparse_field or name == self.sparse_field):
+                return name
+        return None
+    
+    async def _hybrid_retrieve(
+        self,
+        query_vector: List[float],
+        sparse_vector: Dict[str, float],
+        top_k: int,
+        filter_expr: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Dense + sparse retrieval with per-arm scores
+        
+        - "server" mode on a collection with a sparse index: one server-side hybrid query
+          (weighted rerank); only the fused score is available
+        - otherwise, with a sparse index: dense ANN and sparse keyword searches run in parallel
+          and are fused client-side (DBSF or RRF)
+        - without a sparse index: the dense candidate pool is rescored against the stored
+          sparse_vector_data and fused client-side
+        
+        Returns:
+            Documents with fused "score" plus "dense_score" / "sparse_score"
+            (None for arms the server fused without reporting separately)
+        """
+        sparse_field = await self._get_sparse_field()
+        arm_k = max(top_k, int(top_k * HYBRID_PREFETCH_FACTOR))
+        
+        if sparse_field and self._server_hybrid_available:
+            try:
+                if self.hybrid_mode == "server":
+                    results = await self._run_sdk_call(
+                        "hybrid_search", self._server_hybrid_sync, query_vector, sparse_vector, sparse_field, top_k, filter_expr
+                    )
+                    docs = []
+                    for item in (results[0] if results else []):
+                        doc = self._parse_hit(item)
+                        doc["dense_score"] = None
+                        doc["sparse_score"] = None
+                        docs.append(doc)
+                    return docs
+                
+                dense_results, sparse_results = await asyncio.gather(
+                    self._run_sdk_call("search", self._search_sync, query_vector, arm_k, filter_expr),
+                    self._run_sdk_call("sparse_search", self._sparse_search_sync, sparse_vector, sparse_field, arm_k, filter_expr)
+                )
+                dense_hits = dense_results[0] if dense_results else []
+                sparse_hits = sparse_results[0] if sparse_results else []
+                return self._fuse_arms(dense_hits, sparse_hits, top_k)
+                
+            except (ImportError, AttributeError) as e:
+                # SDK without hybrid search support
+                self._server_hybrid_available = False
+                logger.warning(f"[VectorDB] Server-side hybrid search unavailable, using client-side sparse scoring: {e}")
+        
+        # No sparse index: rescore the dense pool with the stored sparse vectors
+        dense_results = await self._run_sdk_call("search", self._search_sync, query_vector, arm_k, filter_expr)
+        dense_hits = dense_results[0] if dense_results else []
+        sparse_hits = []
+        for item in dense_hits:
+            stored = item.get("sparse_vector_data")
+            if isinstance(stored, dict) and stored:
+                score = sparse_dot(sparse_vector, stored)
+                if score > 0:
+                    sparse_hits.append({**item, "score": score})
+        return self._fuse_arms(dense_hits, sparse_hits, top_k)
+    
+    def _fuse_arms(self, dense_hits: List[Dict], sparse_hits: List[Dict], top_k: int) -> List[Dict[str, Any]]:
+        """Fuse dense and sparse hits client-side and attach per-arm scores"""
+        items: Dict[str, Dict[str, Any]] = {}
+        dense_scores: Dict[str, float] = {}
+        sparse_scores: Dict[str, float] = {}
+        
+        for item in dense_hits:
+            key = str(item.get("user_id"))
+            items.setdefault(key, item)
+            dense_scores[key] = float(item.get("score", 0))
+        for item in sparse_hits:
+            key = str(item.get("user_id"))
+            items.setdefault(key, item)
+            sparse_scores[key] = float(item.get("score", 0))
+        
+        arms = {"dense": dense_scores, "sparse": sparse_scores}
+        weights = {"dense": HYBRID_DENSE_WEIGHT, "sparse": 1.0 - HYBRID_DENSE_WEIGHT}
+        if self.fusion_method == "rrf":
+            fused = fuse_rrf(arms, weights=weights)
+        else:
+            fused = fuse_dbsf(arms, weights=weights)
+        
+        docs = []
+        for key, score in fused[:top_k]:
+            doc = self._parse_hit(items[key])
+            doc["score"] = float(score)
+            doc["dense_score"] = dense_scores.get(key, 0.0)
+            doc["sparse_score"] = sparse_scores.get(key, 0.0)
+            docs.append(doc)
+        return docs
+    
+    def _sparse_search_sync(
+        self,
+        sparse_vector: Dict[str, float],
+        sparse_field: str,
+        top_k: int,
+        filter_expr: Optional[str] = None
+    ):
+        """Blocking sparse keyword search (runs on the adapter's thread pool)"""
+        from tcvectordb.model.document import KeywordSearch
+        
+        self._ensure_connection()
+        return self.collection.hybrid_search(
+            match=[KeywordSearch(field_name=sparse_field, data=to_sparse_pairs(sparse_vector))],
+            filter=Filter(filter_expr) if filter_expr else None,
+            limit=top_k,
+            retrieve_vector=False
+        )
+    
+    def _server_hybrid_sync(
+        self,
+        query_vector: List[float],
+        sparse_vector: Dict[str, float],
+        sparse_field: str,
+        top_k: int,
+        filter_expr: Optional[str] = None
+    ):
+        """Blocking server-side hybrid search with weighted rerank (runs on the adapter's thread pool)"""
+        from tcvectordb.model.document import AnnSearch, KeywordSearch, WeightedRerank
+        
+        self._ensure_connection()
+        return self.collection.hybrid_search(
+            ann=[AnnSearch(field_name="vector", data=query_vector)],
+            match=[KeywordSearch(field_name=sparse_field, data=to_sparse_pairs(sparse_vector))],
+            rerank=WeightedRerank(
+                field_list=["vector", sparse_field],
+                weight=[HYBRID_DENSE_WEIGHT, 1.0 - HYBRID_DENSE_WEIGHT]
+            ),
+            filter=Filter(filter_expr) if filter_expr else None,
+            limit=top_k,
+            retrieve_vector=False
+        )
+    
+    def _search_sync(self, query_vector: List[float], top_k: int, filter_expr: Optional[str] = None):
+        """Blocking dense search (runs on the adapter's thread pool)"""
+        self._ensure_connection()
+        return self.collection.search(
+            vectors=[query_vector],
+            filter=Filter(filter_expr) if filter_expr else None,
+            limit=top_k,
+            retrieve_vector=False,  # Don't return vectors to save bandwidth
+            # params={"ef": min(top_k * 4, 200)}  # HNSW search quality parameter
+        )
+    
     async def insert_user_vector(
         self,
         user_id: str,
@@ -154,8 +669,6 @@ class TencentVectorDBAdapter:
             True if successful
         """
         try:
-            self._ensure_connection()
-            
             # Prepare document
             document = {
                 "id": f"user_{user_id}",
@@ -164,12 +677,15 @@ class TencentVectorDBAdapter:
                 **metadata
             }
             
-            # Add sparse vector if provided
+            # Add sparse vector if provided (raw terms, plus the sparse index field when the collection has one)
             if sparse_vector:
                 document["sparse_vector_data"] = sparse_vector
+                sparse_field = await self._get_sparse_field()
+                if sparse_field:
+                    document[sparse_field] = to_sparse_pairs(sparse_vector)
             
             # Upsert document
-            self.collection.upsert([document])
+            await self._run_sdk_call("upsert", self._upsert_sync, [document])
             
             logger.info(f"[VectorDB] Inserted/updated vector for user {user_id}")
             return True
@@ -189,10 +705,8 @@ class TencentVectorDBAdapter:
             True if successful
         """
         try:
-            self._ensure_connection()
-            
             # Delete by filter
-            self.collection.delete(ids=[f"user_{user_id}"])
+            await self._run_sdk_call("delete", self._delete_sync, [f"user_{user_id}"])
             
             logger.info(f"[VectorDB] Deleted vector for user {user_id}")
             return True
@@ -201,6 +715,16 @@ class TencentVectorDBAdapter:
             logger.error(f"[VectorDB] Failed to delete vector for user {user_id}: {e}")
             return False
     
+    def _upsert_sync(self, documents: List[Dict[str, Any]]):
+        """Blocking upsert (runs on the adapter's thread pool)"""
+        self._ensure_connection()
+        return self.collection.upsert(documents)
+    
+    def _delete_sync(self, document_ids: List[str]):
+        """Blocking delete by document id (runs on the adapter's thread pool)"""
+        self._ensure_connection()
+        return self.collection.delete(ids=document_ids)
+    
     async def get_collection_stats(self) -> Dict[str, Any]:
         """
         Get collection statistics
@@ -209,10 +733,8 @@ class TencentVectorDBAdapter:
             Dictionary with collection stats
         """
         try:
-            self._ensure_connection()
-            
             # Try to get a sample document to verify collection has data
-            results = self.collection.query(limit=1, retrieve_vector=False)
+            results = await self._run_sdk_call("query", self._sample_query_sync)
             
             stats = {
                 "database": self.database_name,
@@ -234,6 +756,11 @@ class TencentVectorDBAdapter:
                 "error": str(e)
             }
     
+    def _sample_query_sync(self):
+        """Blocking single-document query (runs on the adapter's thread pool)"""
+        self._ensure_connection()
+        return self.collection.query(limit=1, retrieve_vector=False)
+    
     def _create_sparse_vector(self, text: str, keywords: List[str]) -> Dict[str, float]:
         """
         Create sparse vector from text and keywords (TF-IDF style)
@@ -285,13 +812,16 @@ class TencentVectorDBAdapter:
             True if healthy, False otherwise
         """
         try:
-            self._ensure_connection()
-            
             # Try to list collections as health check
-            collections = self.database.list_collections()
+            collections = await self._run_sdk_call("list_collections", self._list_collections_sync)
             logger.info(f"[VectorDB] Health check passed: {len(collections)} collections")
             return True
             
         except Exception as e:
             logger.error(f"[VectorDB] Health check failed: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    def _list_collections_sync(self):
+        """Blocking collection listing (runs on the adapter's thread pool)"""
+        self._ensure_connection()
+        return self.database.list_collections()
@@ -196,8 +196,7 @@ Return ONLY the keywords, no explanation."""
         """Perform hybrid vector search (dense + sparse)"""
         try:
             # Generate dense vector
-            dense_model = self.search_agent._dense_model
-            dense_vector = dense_model.encode(optimized_query, normalize_embeddings=True).tolist()
+            dense_vector = await self.search_agent._encode_dense(optimized_query)
             
             # Generate sparse vector
             sparse_terms = keywords.lower().split()
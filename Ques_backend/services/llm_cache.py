@@ -0,0 +1,245 @@
+"""
+LLM Response Cache
+Bounded LRU + TTL cache for GLM-4 responses, keyed on normalised prompt, model and temperature,
+with optional near-duplicate lookup using query embeddings
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+# Cache configuration (overridable via environment)
+LLM_CACHE_MAX_SIZE = int(os.getenv("LLM_CACHE_MAX_SIZE", "1024"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600"))
+# Cosine similarity required for a near-duplicate hit; 0 disables semantic lookup
+LLM_CACHE_SEMANTIC_THRESHOLD = float(os.getenv("LLM_CACHE_SEMANTIC_THRESHOLD", "0"))
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    expires_at: float
+    scope: Optional[str] = None
+    embedding: Optional[np.ndarray] = None
+
+
+class LLMResponseCache:
+    """
+    Thread-safe LRU cache with per-entry TTL for LLM responses
+
+    Exact lookups use a hash of the normalised prompt, model and temperature.
+    Near-duplicate lookups compare a normalised query embedding against entries
+    stored in the same semantic scope (same prompt type, model, temperature and
+    surrounding context), so only the free-text query is allowed to differ.
+    """
+
+    def __init__(
+        self,
+        max_size: int = LLM_CACHE_MAX_SIZE,
+        ttl_seconds: float = LLM_CACHE_TTL_SECONDS,
+        semantic_threshold: float = LLM_CACHE_SEMANTIC_THRESHOLD
+    ):
+        """
+        Initialize cache
+
+        Args:
+            max_size: Maximum number of cached responses
+            ttl_seconds: Time-to-live of each entry (seconds)
+            semantic_threshold: Minimum cosine similarity for a near-duplicate hit (0 disables)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.semantic_threshold = semantic_threshold
+
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def semantic_enabled(self) -> bool:
+        """Whether near-duplicate lookup is enabled"""
+        return self.semantic_threshold > 0
+
+    # === Keys ===
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalise prompt text (case and whitespace insensitive)"""
+        return _WHITESPACE_RE.sub(" ", (text or "").strip().lower())
+
+    @classmethod
+    def _hash(cls, *parts: Any) -> str:
+        """Stable hash of the given key parts"""
+        joined = "\x1f".join(str(part) for part in parts)
+        return hashlib.sha256(joined.encode("utf-8")).hexdigest()
+
+    def make_key(self, namespace: str, prompt: str, model: str, temperature: float) -> str:
+        """
+        Build exact-match cache key
+
+        Args:
+            namespace: Prompt type (e.g. "dense_query", "sparse_tags", "intent")
+            prompt: Full prompt text (system + user)
+            model: Model name
+            temperature: Sampling temperature
+
+        Returns:
+            Cache key
+        """
+        return self._hash(namespace, model, f"{float(temperature):.3f}", self.normalize(prompt))
+
+    def make_scope(self, namespace: str, model: str, temperature: float, context: str = "") -> str:
+        """
+        Build semantic scope; near-duplicate hits only match entries in the same scope
+
+        Args:
+            namespace: Prompt type
+            model: Model name
+            temperature: Sampling temperature
+            context: Prompt content other than the query (e.g. referenced users)
+
+        Returns:
+            Scope identifier
+        """
+        return self._hash(namespace, model, f"{float(temperature):.3f}", self.normalize(context))
+
+    # === Lookup / Store ===
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Exact lookup
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached value or None (misses are counted by the caller via record_miss)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            if entry.expires_at <= time.time():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def get_similar(self, scope: str, embedding: Optional[np.ndarray]) -> Optional[Any]:
+        """
+        Near-duplicate lookup within a semantic scope
+
+        Args:
+            scope: Scope from make_scope
+            embedding: L2-normalised query embedding
+
+        Returns:
+            Value of the most similar entry above threshold, or None
+        """
+        if not self.semantic_enabled or embedding is None:
+            return None
+
+        with self._lock:
+            now = time.time()
+            keys = []
+            vectors = []
+            for key, entry in self._entries.items():
+                if entry.scope == scope and entry.embedding is not None and entry.expires_at > now:
+                    keys.append(key)
+                    vectors.append(entry.embedding)
+
+            if not keys:
+                return None
+
+            similarities = np.stack(vectors) @ np.asarray(embedding, dtype=np.float32)
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.semantic_threshold:
+                return None
+
+            best_key = keys[best]
+            self._entries.move_to_end(best_key)
+            self.semantic_hits += 1
+            return self._entries[best_key].value
+
+    def record_miss(self):
+        """Record a lookup that had to fall through to the LLM"""
+        with self._lock:
+            self.misses += 1
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        scope: Optional[str] = None,
+        embedding: Optional[np.ndarray] = None
+    ):
+        """
+        Store value, evicting least recently used entries when full
+
+        Args:
+            key: Cache key from make_key
+            value: Value to cache
+            scope: Semantic scope (needed for near-duplicate lookup)
+            embedding: L2-normalised query embedding (needed for near-duplicate lookup)
+        """
+        if self.max_size <= 0:
+            return
+
+        if embedding is not None:
+            embedding = np.asarray(embedding, dtype=np.float32)
+
+        with self._lock:
+            self._entries[key] = _CacheEntry(
+                value=value,
+                expires_at=time.time() + self.ttl_seconds,
+                scope=scope,
+                embedding=embedding
+            )
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            total_hits = self.hits + self.semantic_hits
+            lookups = total_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(total_hits / lookups, 4) if lookups else 0.0,
+                "semantic_enabled": self.semantic_enabled
+            }
@@ -0,0 +1,279 @@
+"""
+Match Scoring Service
+Scores how well profiles fit each other: skills overlap (normalized skill sets, Jaccard)
+plus skills/goals/demands alignment from cached per-user embeddings (cosine), computed
+for a whole batch of targets at once with NumPy
+"""
+
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from services.profile_embeddings import ProfileEmbeddingService, profile_embedding_service, profile_text
+
+logger = logging.getLogger(__name__)
+
+
+# Overall score weights (components without data, e.g. network overlap, are not weighted)
+MATCH_SKILLS_WEIGHT = float(os.getenv("MATCH_SKILLS_WEIGHT", "0.35"))
+MATCH_GOALS_WEIGHT = float(os.getenv("MATCH_GOALS_WEIGHT", "0.25"))
+MATCH_DEMANDS_WEIGHT = float(os.getenv("MATCH_DEMANDS_WEIGHT", "0.25"))
+MATCH_LOCATION_WEIGHT = float(os.getenv("MATCH_LOCATION_WEIGHT", "0.15"))
+
+# Share of the skills score taken from the exact skill-set overlap (rest: embedding similarity)
+MATCH_SKILLS_JACCARD_SHARE = float(os.getenv("MATCH_SKILLS_JACCARD_SHARE", "0.5"))
+
+# Embedded profile aspects
+ASPECTS = ("skills", "goals", "demands", "offers")
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_skill(value: Any) -> str:
+    """Canonical form of a skill: lowercase, single spaces ("  Machine   Learning" -> "machine learning")"""
+    if isinstance(value, dict):
+        value = value.get("name") or value.get("skill") or ""
+    return " ".join(str(value).lower().split())
+
+
+def normalize_skills(values: Any) -> FrozenSet[str]:
+    """Normalized skill set from a JSON list/dict/string of skills"""
+    if not values:
+        return frozenset()
+    if isinstance(values, str):
+        values = re.split(r"[,;/|]", values)
+    elif isinstance(values, dict):
+        values = list(values.values())
+    return frozenset(skill for skill in (normalize_skill(value) for value in values) if skill)
+
+
+def text_tokens(text: str) -> FrozenSet[str]:
+    """Lowercase word set of a text (fallback comparison when no embedding model is available)"""
+    return frozenset(token.lower() for token in _WORD_RE.findall(text or ""))
+
+
+@dataclass
+class MatchProfile:
+    """Scoring view of a user profile"""
+    user_id: int
+    skills: FrozenSet[str] = field(default_factory=frozenset)
+    texts: Dict[str, str] = field(default_factory=dict)
+    location: Optional[str] = None
+
+    @classmethod
+    def from_profile(cls, profile: Any) -> "MatchProfile":
+        """
+        Build from a UserProfile (or any object with the same attributes)
+
+        "offers" is what a user brings (skills and resources) and is compared against
+        the other side's demands.
+        """
+        skills = getattr(profile, "skills", None)
+        return cls(
+            user_id=int(profile.user_id),
+            skills=normalize_skills(skills),
+            texts={
+                "skills": profile_text(skills),
+                "goals": profile_text(getattr(profile, "goals", None), getattr(profile, "one_sentence_intro", None)),
+                "demands": profile_text(getattr(profile, "demands", None)),
+                "offers": profile_text(skills, getattr(profile, "resources", None)),
+            },
+            location=getattr(profile, "location", None)
+        )
+
+
+def jaccard_scores(source: FrozenSet[str], targets: Sequence[FrozenSet[str]]) -> np.ndarray:
+    """
+    Jaccard similarity of one set against many, vectorized
+
+    Sets are encoded as rows of a binary matrix over their joint vocabulary, so the
+    intersections are a single matrix-vector product.
+
+    Args:
+        source: Source set
+        targets: Target sets
+
+    Returns:
+        Similarity per target in [0, 1] (0 when either set is empty)
+    """
+    if not targets:
+        return np.zeros(0)
+    vocabulary = {token: index for index, token in enumerate(source.union(*targets))}
+    if not vocabulary:
+        return np.zeros(len(targets))
+
+    source_vector = np.zeros(len(vocabulary), dtype=np.float32)
+    source_vector[[vocabulary[token] for token in source]] = 1.0
+    matrix = np.zeros((len(targets), len(vocabulary)), dtype=np.float32)
+    for row, target in enumerate(targets):
+        matrix[row, [vocabulary[token] for token in target]] = 1.0
+
+    intersection = matrix @ source_vector
+    union = source_vector.sum() + matrix.sum(axis=1) - intersection
+    scores = np.divide(intersection, union, out=np.zeros_like(union), where=union > 0)
+    scores[(matrix.sum(axis=1) == 0) | (source_vector.sum() == 0)] = 0.0
+    return scores
+
+
+def cosine_scores(source: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of one vector against the rows of a matrix, clipped to [0, 1]
+
+    Zero rows (no text to embed) score 0.
+    """
+    norms = np.linalg.norm(targets, axis=1) * np.linalg.norm(source)
+    dots = targets @ source
+    return np.clip(np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0), 0.0, 1.0)
+
+
+def location_scores(source: Optional[str], targets: Sequence[Optional[str]]) -> np.ndarray:
+    """Location match per target: 80 when one location contains the other, 30 otherwise"""
+    source = (source or "").strip().lower()
+    return np.array([
+        80.0 if source and target and (source in target.lower() or target.lower().strip() in source) else 30.0
+        for target in targets
+    ])
+
+
+class MatchScoringEngine:
+    """
+    Batch profile match scoring
+
+    score() embeds every aspect text of the viewer and all targets in one encoder call
+    (only the texts not already cached) and computes each component for all targets
+    with one matrix operation. Without an embedding model the text
+    components fall back to word-set Jaccard.
+    """
+
+    def __init__(self, embeddings: Optional[ProfileEmbeddingService] = None):
+        """
+        Initialize engine
+
+        Args:
+            embeddings: Profile embedding service (defaults to the shared instance)
+        """
+        self.embeddings = embeddings or profile_embedding_service
+
+        # Statistics
+        self.scored_pairs = 0
+
+    # === Public API ===
+
+    def score(self, user: Any, targets: Iterable[Any]) -> List[Dict[str, float]]:
+        """
+        Score a user against many targets
+
+        Args:
+            user: Viewer UserProfile or MatchProfile
+            targets: Target UserProfiles or MatchProfiles
+
+        Returns:
+            One dict per target (same order) with overall, skillsMatch, goalsAlignment,
+            demandsMatch and locationMatch on a 0-100 scale
+        """
+        viewer = self._as_match_profile(user)
+        targets = [self._as_match_profile(target) for target in targets]
+        if not targets:
+            return []
+
+        skills = jaccard_scores(viewer.skills, [target.skills for target in targets])
+        embeddings = self._embed([viewer] + targets)
+        if embeddings is not None:
+            def similarity(viewer_aspect: str, target_aspect: str) -> np.ndarray:
+                return cosine_scores(embeddings[viewer_aspect][0], embeddings[target_aspect][1:])
+
+            share = MATCH_SKILLS_JACCARD_SHARE
+            skills = share * skills + (1.0 - share) * similarity("skills", "skills")
+        else:
+            def similarity(viewer_aspect: str, target_aspect: str) -> np.ndarray:
+                return jaccard_scores(
+                    text_tokens(viewer.texts[viewer_aspect]),
+                    [text_tokens(target.texts[target_aspect]) for target in targets]
+                )
+
+        goals = similarity("goals", "goals")
+        # Demands fit both ways: what the target offers for my demands and vice versa
+        demands = (similarity("demands", "offers") + similarity("offers", "demands")) / 2.0
+        location = location_scores(viewer.location, [target.location for target in targets]) / 100.0
+
+        overall = (
+            MATCH_SKILLS_WEIGHT * skills
+            + MATCH_GOALS_WEIGHT * goals
+            + MATCH_DEMANDS_WEIGHT * demands
+            + MATCH_LOCATION_WEIGHT * location
+        )
+
+        self.scored_pairs += len(targets)
+        return [
+            {
+                "overall": round(float(overall[index]) * 100, 1),
+                "skillsMatch": round(float(skills[index]) * 100, 1),
+                "goalsAlignment": round(float(goals[index]) * 100, 1),
+                "demandsMatch": round(float(demands[index]) * 100, 1),
+                "locationMatch": round(float(location[index]) * 100, 1),
+            }
+            for index in range(len(targets))
+        ]
+
+    def load_profiles(self, db, user_ids: Iterable[int]) -> Dict[int, Any]:
+        """
+        Load UserProfiles for scoring in one query
+
+        Args:
+            db: Database session
+            user_ids: User IDs
+
+        Returns:
+            Mapping of user ID to UserProfile (users without a profile are absent)
+        """
+        from models.user_profiles import UserProfile
+
+        user_ids = {int(user_id) for user_id in user_ids}
+        if not user_ids:
+            return {}
+        profiles = db.query(UserProfile).filter(UserProfile.user_id.in_(user_ids)).all()
+        return {int(profile.user_id): profile for profile in profiles}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get engine statistics"""
+        return {
+            "scored_pairs": self.scored_pairs,
+            "embeddings": self.embeddings.get_stats()
+        }
+
+    # === Embeddings ===
+
+    @staticmethod
+    def _as_match_profile(profile: Any) -> MatchProfile:
+        return profile if isinstance(profile, MatchProfile) else MatchProfile.from_profile(profile)
+
+    def _embed(self, profiles: List[MatchProfile]) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Embedding matrix per aspect (one row per profile, zero rows for empty texts)
+
+        All aspect texts go through one embed call (cached, missing ones encoded in one
+        batch). Returns None if no embedding model is available.
+        """
+        slots = [
+            (aspect, index, profile.texts.get(aspect, ""))
+            for index, profile in enumerate(profiles) for aspect in ASPECTS
+        ]
+        slots = [slot for slot in slots if slot[2]]
+        vectors = self.embeddings.embed([text for _, _, text in slots])
+        if vectors is None:
+            return None
+
+        # Nothing to embed: every text component scores 0
+        dimension = len(vectors[0]) if vectors else 1
+        matrices = {aspect: np.zeros((len(profiles), dimension), dtype=np.float32) for aspect in ASPECTS}
+        for (aspect, index, _), vector in zip(slots, vectors):
+            matrices[aspect][index] = vector
+        return matrices
+
+
+# Global match scoring engine instance
+match_scoring_engine = MatchScoringEngine()
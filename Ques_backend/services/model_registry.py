@@ -0,0 +1,221 @@
+"""
+Model Registry
+Process-wide registry that loads each embedding model once (lazily or at warm-up)
+and hands out shared references, with per-model memory reporting
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+DENSE_MODEL_NAME = "BAAI/bge-m3"
+
+# SPLADE checkpoints in preference order (first one that loads wins)
+SPLADE_MODEL_CANDIDATES = [
+    "naver/splade_v2_max",                      # SPLADE v2 Max (publicly accessible)
+    "naver/splade_v2_distil",                   # SPLADE v2 Distilled (publicly accessible)
+    "naver/splade-cocondenser-ensembledistil",  # Another public SPLADE model
+    "naver/splade-v3"                           # Latest but gated (fallback if user has access)
+]
+
+# Comma-separated sentence-transformers models to load at startup when PRELOAD_MODELS=true
+PRELOAD_MODEL_NAMES = [
+    name.strip() for name in os.getenv("PRELOAD_MODEL_NAMES", DENSE_MODEL_NAME).split(",") if name.strip()
+]
+
+
+def _get_rss_bytes() -> Optional[int]:
+    """Current process resident set size (None if psutil is not installed)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+def _get_module_bytes(module: Any) -> Optional[int]:
+    """Size of a torch module's parameters and buffers (None for non-torch objects)"""
+    try:
+        total = sum(p.numel() * p.element_size() for p in module.parameters())
+        total += sum(b.numel() * b.element_size() for b in module.buffers())
+        return total
+    except Exception:
+        return None
+
+
+def get_torch_device() -> str:
+    """Best available torch device"""
+    import torch
+    if torch.backends.mps.is_available():
+        return 'mps'
+    if torch.cuda.is_available():
+        return 'cuda'
+    return 'cpu'
+
+
+class ModelRegistry:
+    """
+    Loads models once per process and shares them
+
+    Loads are guarded by a per-model lock so concurrent first requests wait for
+    a single load instead of loading duplicate copies. Failed SPLADE loading is
+    remembered so later callers fall back immediately.
+    """
+
+    def __init__(self):
+        self._models: Dict[str, Any] = {}
+        self._info: Dict[str, Dict[str, Any]] = {}
+        self._failed: Dict[str, str] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+
+    def _get_lock(self, key: str) -> threading.Lock:
+        """Per-model load lock"""
+        with self._registry_lock:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    def _record(self, key: str, rss_before: Optional[int], load_time: float, modules: List[Any]):
+        """Record load statistics for a model"""
+        rss_after = _get_rss_bytes()
+        module_sizes = [_get_module_bytes(module) for module in modules]
+        self._info[key] = {
+            "parameter_bytes": sum(size for size in module_sizes if size) if any(module_sizes) else None,
+            "rss_delta_bytes": (rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+            "load_time": round(load_time, 3),
+            "loaded_at": time.time()
+        }
+        logger.info(f"[ModelRegistry] Loaded {key} in {load_time:.2f}s")
+
+    # === Sentence Transformers ===
+
+    def get_sentence_transformer(self, model_name: str = DENSE_MODEL_NAME) -> Any:
+        """
+        Get shared SentenceTransformer instance (loaded on first use)
+
+        Args:
+            model_name: Hugging Face model name
+
+        Returns:
+            SentenceTransformer instance
+        """
+        key = f"sentence_transformer:{model_name}"
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._get_lock(key):
+            model = self._models.get(key)
+            if model is None:
+                from sentence_transformers import SentenceTransformer
+
+                rss_before = _get_rss_bytes()
+                start_time = time.time()
+                model = SentenceTransformer(model_name)
+                self._models[key] = model
+                self._record(key, rss_before, time.time() - start_time, [model])
+            return model
+
+    # === SPLADE ===
+
+    def get_splade(self, candidates: List[str] = None) -> Tuple[Any, Any, str]:
+        """
+        Get shared SPLADE (tokenizer, model, device), trying checkpoints in order
+
+        Args:
+            candidates: Checkpoint names in preference order
+
+        Returns:
+            (tokenizer, model, device); tokenizer and model are None if no checkpoint loads
+        """
+        key = "splade"
+        loaded = self._models.get(key)
+        if loaded is not None:
+            return loaded
+
+        with self._get_lock(key):
+            loaded = self._models.get(key)
+            if loaded is not None:
+                return loaded
+
+            device = get_torch_device()
+            if key in self._failed:
+                return None, None, device
+
+            try:
+                from transformers import AutoModelForMaskedLM, AutoTokenizer
+            except ImportError as e:
+                self._failed[key] = str(e)
+                return None, None, device
+
+            errors = []
+            for model_name in candidates or SPLADE_MODEL_CANDIDATES:
+                try:
+                    print(f"  [info] Trying SPLADE model: {model_name}...")
+                    rss_before = _get_rss_bytes()
+                    start_time = time.time()
+                    tokenizer = AutoTokenizer.from_pretrained(model_name)
+                    model = AutoModelForMaskedLM.from_pretrained(model_name).to(device)
+                    model.eval()
+
+                    loaded = (tokenizer, model, device)
+                    self._models[key] = loaded
+                    self._record(f"{key}:{model_name}", rss_before, time.time() - start_time, [model])
+                    print(f"  [info] ✅ SPLADE model loaded successfully: {model_name}")
+                    return loaded
+
+                except Exception as model_error:
+                    if "gated repo" in str(model_error).lower() or "restricted" in str(model_error).lower():
+                        print(f"  [warn] {model_name} is gated/restricted, trying next model...")
+                    else:
+                        print(f"  [warn] Failed to load {model_name}: {str(model_error)[:100]}...")
+                    errors.append(f"{model_name}: {str(model_error)[:100]}")
+
+            self._failed[key] = "; ".join(errors)
+            return None, None, device
+
+    # === Warm-up / Reporting ===
+
+    def warm_up(self, model_names: List[str] = None, include_splade: bool = True):
+        """
+        Load models ahead of the first request
+
+        Args:
+            model_names: SentenceTransformer models to load
+            include_splade: Whether to load SPLADE as well
+        """
+        for model_name in model_names or PRELOAD_MODEL_NAMES:
+            try:
+                self.get_sentence_transformer(model_name)
+            except Exception as e:
+                logger.error(f"[ModelRegistry] Failed to warm up {model_name}: {e}")
+
+        if include_splade:
+            try:
+                self.get_splade()
+            except Exception as e:
+                logger.error(f"[ModelRegistry] Failed to warm up SPLADE: {e}")
+
+    def get_memory_report(self) -> Dict[str, Any]:
+        """
+        Memory used by each loaded model
+
+        parameter_bytes is the size of weights and buffers; rss_delta_bytes is the
+        growth of process RSS observed while loading (requires psutil).
+        """
+        return {
+            "models": {key: dict(info) for key, info in self._info.items()},
+            "failed": dict(self._failed),
+            "total_parameter_bytes": sum(info["parameter_bytes"] or 0 for info in self._info.values()),
+            "process_rss_bytes": _get_rss_bytes()
+        }
+
+
+# Global registry instance
+model_registry = ModelRegistry()
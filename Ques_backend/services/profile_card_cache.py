@@ -0,0 +1,302 @@
+"""
+Profile Card Cache
+Read-through cache of serialized user profile cards keyed by user ID and profile updated_at,
+with an in-process LRU tier and an optional Redis tier shared between workers
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Cache configuration (overridable via environment)
+PROFILE_CARD_CACHE_SIZE = int(os.getenv("PROFILE_CARD_CACHE_SIZE", "5000"))
+PROFILE_CARD_CACHE_TTL_SECONDS = float(os.getenv("PROFILE_CARD_CACHE_TTL_SECONDS", "300"))
+PROFILE_CARD_REDIS_TTL_SECONDS = int(os.getenv("PROFILE_CARD_REDIS_TTL_SECONDS", "3600"))
+PROFILE_CARD_REDIS_PREFIX = "profile_card:"
+REDIS_URL = os.getenv("REDIS_URL")  # Optional shared tier, e.g. redis://redis:6379/0
+
+# Profile columns never exposed in cards (cards reach recommendation payloads and LLM prompts)
+PRIVATE_PROFILE_FIELDS = {"university_email", "wechat_id"}
+
+# Version used for users without a profile row
+NO_PROFILE_VERSION = "none"
+
+
+def _json_safe(value: Any) -> Any:
+    """Convert column values to JSON-serializable types"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def profile_version(updated_at: Optional[datetime]) -> str:
+    """Cache version token for a profile updated_at value"""
+    return updated_at.isoformat() if updated_at else NO_PROFILE_VERSION
+
+
+def build_profile_card(user) -> Dict[str, Any]:
+    """
+    Serialize a user and their profile into a card
+
+    Args:
+        user: User ORM object (with profile loaded)
+
+    Returns:
+        JSON-serializable dict with the user's ID, status, public profile fields and
+        the User compatibility properties (display_name, bio, avatar_url, is_verified)
+    """
+    profile = user.profile
+    card: Dict[str, Any] = {
+        "id": str(user.id),
+        "user_id": str(user.id),
+        "user_status": user.user_status,
+        "created_at": _json_safe(user.created_at)
+    }
+
+    if profile is not None:
+        for column in profile.__table__.columns:
+            if column.name in ("id", "user_id") or column.name in PRIVATE_PROFILE_FIELDS:
+                continue
+            card[column.name] = _json_safe(getattr(profile, column.key))
+
+    card.update({
+        "name": card.get("name") or "Unknown user",
+        "display_name": user.display_name,
+        "bio": user.bio,
+        "avatar_url": user.avatar_url,
+        "is_verified": bool(user.is_verified),
+        "is_active": user.is_active,
+        "profile_version": profile_version(profile.updated_at if profile is not None else None)
+    })
+    return card
+
+
+def create_redis_tier() -> Optional[Any]:
+    """Connect the optional Redis tier (None when REDIS_URL or the redis package is missing)"""
+    if not REDIS_URL:
+        return None
+    try:
+        import redis
+    except ImportError:
+        logger.warning("REDIS_URL is set but the redis package is not installed; profile card cache is in-process only")
+        return None
+    return redis.Redis.from_url(REDIS_URL, socket_timeout=0.2, decode_responses=True)
+
+
+class ProfileCardCache:
+    """
+    Two-tier read-through cache of profile cards
+
+    Each lookup first reads the current profile updated_at values with one narrow
+    IN query; cached cards are only served when their version still matches, so
+    profile edits are picked up immediately. Misses are loaded with one IN query
+    (selectinload(User.profile)) and written to both tiers. Writes that do not bump
+    the profile's updated_at (e.g. project changes) call invalidate().
+    """
+
+    def __init__(
+        self,
+        max_size: int = PROFILE_CARD_CACHE_SIZE,
+        ttl_seconds: float = PROFILE_CARD_CACHE_TTL_SECONDS,
+        remote: Any = None,
+        remote_ttl_seconds: int = PROFILE_CARD_REDIS_TTL_SECONDS
+    ):
+        """
+        Initialize cache
+
+        Args:
+            max_size: Maximum number of cards kept in process
+            ttl_seconds: Time-to-live of in-process entries (seconds)
+            remote: Redis-compatible client (get/mget/set(ex=)/delete) or None
+            remote_ttl_seconds: Time-to-live of Redis entries (seconds)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.remote = remote
+        self.remote_ttl_seconds = remote_ttl_seconds
+
+        self._entries: "OrderedDict[int, Tuple[str, float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.local_hits = 0
+        self.remote_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.remote_errors = 0
+
+    # === Public API ===
+
+    def get_many(self, db, user_ids: Iterable[Any]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get cards for several users
+
+        Args:
+            db: Database session
+            user_ids: User IDs
+
+        Returns:
+            Mapping from user ID to card (users that do not exist are omitted)
+        """
+        ids = list(dict.fromkeys(int(user_id) for user_id in user_ids))
+        if not ids:
+            return {}
+
+        versions = self._load_versions(db, ids)
+        cards: Dict[int, Dict[str, Any]] = {}
+
+        missing = []
+        now = time.time()
+        with self._lock:
+            for user_id in ids:
+                entry = self._entries.get(user_id)
+                if entry and entry[0] == versions.get(user_id, NO_PROFILE_VERSION) and entry[1] > now:
+                    self._entries.move_to_end(user_id)
+                    cards[user_id] = entry[2]
+                    self.local_hits += 1
+                else:
+                    missing.append(user_id)
+
+        if missing and self.remote is not None:
+            for user_id, card in self._remote_get(missing, versions).items():
+                cards[user_id] = card
+                self._local_put(user_id, card["profile_version"], card)
+            missing = [user_id for user_id in missing if user_id not in cards]
+
+        if missing:
+            self.misses += len(missing)
+            loaded = self._load_cards(db, missing)
+            for user_id, card in loaded.items():
+                cards[user_id] = card
+                self._local_put(user_id, card["profile_version"], card)
+            if self.remote is not None and loaded:
+                self._remote_set(loaded)
+
+        # Callers get their own copies
+        return {user_id: dict(cards[user_id]) for user_id in ids if user_id in cards}
+
+    def get(self, db, user_id: Any) -> Optional[Dict[str, Any]]:
+        """
+        Get one user's card
+
+        Args:
+            db: Database session
+            user_id: User ID
+
+        Returns:
+            Card or None if the user does not exist
+        """
+        return self.get_many(db, [user_id]).get(int(user_id))
+
+    def invalidate(self, user_id: Any):
+        """Drop a user's card from both tiers (call after profile, project or account status writes)"""
+        user_id = int(user_id)
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self.invalidations += 1
+        if self.remote is not None:
+            try:
+                self.remote.delete(f"{PROFILE_CARD_REDIS_PREFIX}{user_id}")
+            except Exception as e:
+                self.remote_errors += 1
+                logger.warning(f"Profile card cache: Redis delete failed: {e}")
+
+    def clear(self):
+        """Remove all in-process entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.local_hits + self.remote_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "local_hits": self.local_hits,
+                "remote_hits": self.remote_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.local_hits + self.remote_hits) / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "remote_enabled": self.remote is not None,
+                "remote_errors": self.remote_errors
+            }
+
+    # === Database ===
+
+    def _load_versions(self, db, ids: List[int]) -> Dict[int, str]:
+        """Current profile versions (one narrow IN query)"""
+        from models.user_profiles import UserProfile
+
+        rows = db.query(UserProfile.user_id, UserProfile.updated_at).filter(UserProfile.user_id.in_(ids)).all()
+        return {int(user_id): profile_version(updated_at) for user_id, updated_at in rows}
+
+    def _load_cards(self, db, ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Build cards for users and profiles loaded with one IN query"""
+        from sqlalchemy.orm import selectinload
+        from models.users import User
+
+        users = db.query(User).options(selectinload(User.profile)).filter(User.id.in_(ids)).all()
+        return {int(user.id): build_profile_card(user) for user in users}
+
+    # === Tiers ===
+
+    def _local_put(self, user_id: int, version: str, card: Dict[str, Any]):
+        """Store in the in-process LRU"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (version, time.time() + self.ttl_seconds, card)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _remote_get(self, ids: List[int], versions: Dict[int, str]) -> Dict[int, Dict[str, Any]]:
+        """Read matching-version cards from Redis"""
+        try:
+            values = self.remote.mget([f"{PROFILE_CARD_REDIS_PREFIX}{user_id}" for user_id in ids])
+        except Exception as e:
+            self.remote_errors += 1
+            logger.warning(f"Profile card cache: Redis read failed: {e}")
+            return {}
+
+        cards = {}
+        for user_id, value in zip(ids, values):
+            if not value:
+                continue
+            card = json.loads(value)
+            if card.get("profile_version") == versions.get(user_id, NO_PROFILE_VERSION):
+                cards[user_id] = card
+        self.remote_hits += len(cards)
+        return cards
+
+    def _remote_set(self, cards: Dict[int, Dict[str, Any]]):
+        """Write cards to Redis"""
+        try:
+            for user_id, card in cards.items():
+                self.remote.set(
+                    f"{PROFILE_CARD_REDIS_PREFIX}{user_id}",
+                    json.dumps(card, ensure_ascii=False),
+                    ex=self.remote_ttl_seconds
+                )
+        except Exception as e:
+            self.remote_errors += 1
+            logger.warning(f"Profile card cache: Redis write failed: {e}")
+
+
+# Global cache instance
+profile_card_cache = ProfileCardCache(remote=create_redis_tier())
@@ -0,0 +1,179 @@
+"""
+Profile Embedding Service
+Shared dense embeddings for profile and request matching: an LRU cache keyed by text
+hash in front of one batched encoder call. When the model cannot be loaded, callers
+get None and fall back to their non-embedding scoring until a retry cooldown has
+passed, then the model is tried again
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Service configuration (overridable via environment)
+PROFILE_EMBEDDING_CACHE_SIZE = int(os.getenv("PROFILE_EMBEDDING_CACHE_SIZE", "30000"))
+PROFILE_EMBEDDING_RETRY_SECONDS = float(os.getenv("PROFILE_EMBEDDING_RETRY_SECONDS", "60"))
+
+
+def profile_text(*values: Any) -> str:
+    """Flatten profile fields (strings, JSON lists/dicts) into one text for embedding"""
+    parts: List[str] = []
+
+    def collect(value: Any):
+        if value is None:
+            return
+        if isinstance(value, str):
+            if value.strip():
+                parts.append(value.strip())
+        elif isinstance(value, dict):
+            for item in value.values():
+                collect(item)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                collect(item)
+        else:
+            parts.append(str(value))
+
+    for value in values:
+        collect(value)
+    return " | ".join(parts)
+
+
+def text_digest(text: str) -> str:
+    """Cache key of a text"""
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+class ProfileEmbeddingService:
+    """
+    Cached, batched text embeddings with failure recovery
+
+    embed() returns the cached vector for every text seen before and encodes the rest
+    (each distinct text once) in a single model call. Because entries are keyed by the
+    text itself, an edited profile simply misses the cache; stale vectors age out of
+    the LRU. A failed encode disables embeddings for retry_seconds only.
+    """
+
+    def __init__(
+        self,
+        cache_size: int = PROFILE_EMBEDDING_CACHE_SIZE,
+        retry_seconds: float = PROFILE_EMBEDDING_RETRY_SECONDS
+    ):
+        """
+        Initialize service
+
+        Args:
+            cache_size: Maximum number of cached embeddings (LRU)
+            retry_seconds: Time after an encoder failure before the model is tried again
+        """
+        self.cache_size = cache_size
+        self.retry_seconds = retry_seconds
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._retry_at = 0.0
+
+        # Statistics
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.encoded_count = 0
+        self.encoder_failures = 0
+
+    # === Public API ===
+
+    def available(self) -> bool:
+        """Whether the encoder may be used (False while in the retry cooldown)"""
+        return time.monotonic() >= self._retry_at
+
+    def embed(self, texts: Sequence[str]) -> Optional[List[np.ndarray]]:
+        """
+        Normalized embedding per text, cached
+
+        Args:
+            texts: Texts to embed (duplicates are encoded once)
+
+        Returns:
+            One vector per text, or None if the encoder is unavailable
+        """
+        if not self.available():
+            return None
+
+        digests = [text_digest(text) for text in texts]
+        vectors: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for digest in digests:
+                vector = self._cache.get(digest)
+                if vector is not None:
+                    self._cache.move_to_end(digest)
+                    self.cache_hits += 1
+                vectors.append(vector)
+
+        missing = list(dict.fromkeys(
+            (digest, text) for digest, text, vector in zip(digests, texts, vectors) if vector is None
+        ))
+        if missing:
+            self.cache_misses += len(missing)
+            encoded = self.encode([text for _, text in missing])
+            if encoded is None:
+                return None
+            by_digest = {digest: vector for (digest, _), vector in zip(missing, encoded)}
+            with self._lock:
+                for digest, vector in by_digest.items():
+                    self._cache[digest] = vector
+                    self._cache.move_to_end(digest)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            vectors = [vector if vector is not None else by_digest[digest] for digest, vector in zip(digests, vectors)]
+
+        return vectors
+
+    def encode(self, texts: List[str]) -> Optional[np.ndarray]:
+        """
+        Encode texts in one batch, uncached
+
+        Returns:
+            Matrix of normalized embeddings (one row per text), or None if the encoder
+            is unavailable
+        """
+        if not self.available():
+            return None
+        try:
+            encoded = self._model_encode(texts)
+        except Exception as e:
+            self.encoder_failures += 1
+            self._retry_at = time.monotonic() + self.retry_seconds
+            logger.warning(f"Profile embeddings unavailable, retrying in {self.retry_seconds:.0f}s: {e}")
+            return None
+        self.encoded_count += len(texts)
+        return encoded
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get embedding statistics"""
+        return {
+            "cached_embeddings": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "encoded": self.encoded_count,
+            "encoder_failures": self.encoder_failures,
+            "available": self.available()
+        }
+
+    # === Model ===
+
+    def _model_encode(self, texts: List[str]) -> np.ndarray:
+        """Encode with the shared dense model (raises if it cannot be loaded)"""
+        from services.model_registry import model_registry
+        model = model_registry.get_sentence_transformer()
+        return np.asarray(model.encode(texts, normalize_embeddings=True, show_progress_bar=False), dtype=np.float32)
+
+
+# Global profile embedding service instance
+profile_embedding_service = ProfileEmbeddingService()
@@ -0,0 +1,150 @@
+"""
+Profile Loader
+DataLoader-style batched loader of user profile dicts: all IDs requested during one
+event loop tick are fetched together (one IN (...) query through the profile card
+cache) on a worker thread, and concurrent requests for the same ID share one in-flight future
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from services.profile_card_cache import profile_card_cache
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileLoader:
+    """Batched, de-duplicating loader of user profile dicts"""
+
+    def __init__(self, session_factory=None):
+        """
+        Initialize loader
+
+        Args:
+            session_factory: Callable returning a SQLAlchemy Session (defaults to dependencies.db.SessionLocal)
+        """
+        self._session_factory = session_factory
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queued: Dict[str, asyncio.Future] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+        # Statistics
+        self.request_count = 0
+        self.deduplicated_count = 0
+        self.batch_count = 0
+        self.loaded_count = 0
+        self.total_query_time = 0.0
+
+    # === Public API ===
+
+    async def load(self, user_id: Any) -> Optional[Dict[str, Any]]:
+        """
+        Load one user's details (batched with concurrent callers)
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            User detail dict, or None if the user does not exist
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queued = {}
+            self._in_flight = {}
+
+        key = str(user_id)
+        self.request_count += 1
+
+        future = self._queued.get(key) or self._in_flight.get(key)
+        if future is not None:
+            self.deduplicated_count += 1
+        else:
+            future = loop.create_future()
+            if not self._queued:
+                loop.call_soon(self._dispatch)
+            self._queued[key] = future
+
+        # Shield so one cancelled caller does not cancel the shared future
+        return await asyncio.shield(future)
+
+    async def load_many(self, user_ids: Iterable[Any]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Load several users' details
+
+        Args:
+            user_ids: User IDs
+
+        Returns:
+            Mapping from user ID (string) to detail dict or None
+        """
+        keys = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+        results = await asyncio.gather(*(self.load(key) for key in keys))
+        return dict(zip(keys, results))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get loader statistics"""
+        return {
+            "requests": self.request_count,
+            "deduplicated": self.deduplicated_count,
+            "batches": self.batch_count,
+            "loaded_users": self.loaded_count,
+            "average_batch_size": round(self.loaded_count / self.batch_count, 2) if self.batch_count else 0.0,
+            "total_query_time": round(self.total_query_time, 3)
+        }
+
+    # === Internal ===
+
+    def _dispatch(self):
+        """Move queued IDs in flight and start one batched query"""
+        batch, self._queued = self._queued, {}
+        if batch:
+            self._in_flight.update(batch)
+            self._loop.create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch: Dict[str, asyncio.Future]):
+        """Query a batch on a worker thread and resolve its futures"""
+        try:
+            rows = await asyncio.to_thread(self._load_sync, list(batch))
+        except Exception as e:
+            logger.error(f"[ProfileLoader] Batch load of {len(batch)} users failed: {e}")
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(rows.get(key))
+        finally:
+            for key, future in batch.items():
+                if self._in_flight.get(key) is future:
+                    del self._in_flight[key]
+
+    def _load_sync(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch profile cards for a batch through the card cache (worker thread)"""
+        ids = [int(key) for key in keys if key.isdigit()]
+        if not ids:
+            return {}
+
+        if self._session_factory is None:
+            from dependencies.db import SessionLocal
+            self._session_factory = SessionLocal
+
+        start_time = time.time()
+        db = self._session_factory()
+        try:
+            cards = profile_card_cache.get_many(db, ids)
+            rows = {str(user_id): card for user_id, card in cards.items()}
+        finally:
+            db.close()
+
+        self.batch_count += 1
+        self.loaded_count += len(ids)
+        self.total_query_time += time.time() - start_time
+        return rows
+
+
+# Global loader instance
+profile_loader = ProfileLoader()
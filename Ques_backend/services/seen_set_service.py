@@ -0,0 +1,352 @@
+"""
+Seen Set Service
+Per-user sets of already seen and swiped profile IDs, kept as compact bitmaps,
+updated incrementally on every swipe and shared by the SQL and vector search exclusion paths
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import String, and_, cast, exists
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.swipes import SwipeRecord
+from models.user_swipes import UserSwipe
+from models.user_seen_sets import UserSeenSet
+from services.compact_bitmap import CompactBitmap
+
+logger = logging.getLogger(__name__)
+
+
+# In-process cache of loaded seen sets (overridable via environment)
+SEEN_SET_CACHE_SIZE = int(os.getenv("SEEN_SET_CACHE_SIZE", "10000"))
+SEEN_SET_CACHE_TTL_SECONDS = float(os.getenv("SEEN_SET_CACHE_TTL_SECONDS", "30"))
+
+# Most viewed-only IDs inlined into a SQL exclusion (swiped IDs use anti-joins instead)
+SEEN_SET_SQL_MAX_VIEWED = int(os.getenv("SEEN_SET_SQL_MAX_VIEWED", "1000"))
+
+
+def _split_ids(ids: Iterable[Any]) -> Tuple[List[int], List[str]]:
+    """Split IDs into bitmap-compatible integers and overflow strings"""
+    integers, others = [], []
+    for raw in ids:
+        if raw is None:
+            continue
+        text = str(raw).strip()
+        if text.isdigit() and int(text) <= 0xFFFFFFFF:
+            integers.append(int(text))
+        elif text:
+            others.append(text)
+    return integers, others
+
+
+class SeenSet:
+    """Seen and swiped target IDs of one user (swiped IDs are always also seen)"""
+
+    def __init__(
+        self,
+        seen: CompactBitmap = None,
+        swiped: CompactBitmap = None,
+        seen_overflow: Iterable[str] = None,
+        swiped_overflow: Iterable[str] = None
+    ):
+        self.seen = seen or CompactBitmap()
+        self.swiped = swiped or CompactBitmap()
+        self.seen_overflow: Set[str] = set(seen_overflow or [])
+        self.swiped_overflow: Set[str] = set(swiped_overflow or [])
+
+    # === Updates ===
+
+    def add_seen(self, ids: Iterable[Any]):
+        """Mark IDs as seen (shown to the user)"""
+        integers, others = _split_ids(ids)
+        self.seen.update(integers)
+        self.seen_overflow.update(others)
+
+    def add_swiped(self, ids: Iterable[Any]):
+        """Mark IDs as swiped (and seen)"""
+        integers, others = _split_ids(ids)
+        self.swiped.update(integers)
+        self.seen.update(integers)
+        self.swiped_overflow.update(others)
+        self.seen_overflow.update(others)
+
+    def remove_swiped(self, ids: Iterable[Any]):
+        """Forget swipes (the profiles become eligible again)"""
+        integers, others = _split_ids(ids)
+        for value in integers:
+            self.swiped.discard(value)
+            self.seen.discard(value)
+        self.swiped_overflow.difference_update(others)
+        self.seen_overflow.difference_update(others)
+
+    # === Queries ===
+
+    def is_seen(self, target_id: Any) -> bool:
+        """Whether the target was seen or swiped"""
+        integers, others = _split_ids([target_id])
+        return any(value in self.seen for value in integers) or any(value in self.seen_overflow for value in others)
+
+    def is_swiped(self, target_id: Any) -> bool:
+        """Whether the target was swiped"""
+        integers, others = _split_ids([target_id])
+        return any(value in self.swiped for value in integers) or any(value in self.swiped_overflow for value in others)
+
+    def seen_ids(self) -> List[str]:
+        """All seen IDs as strings (vector database exclusion)"""
+        return [str(value) for value in self.seen] + sorted(self.seen_overflow)
+
+    def swiped_ids(self) -> List[str]:
+        """All swiped IDs as strings"""
+        return [str(value) for value in self.swiped] + sorted(self.swiped_overflow)
+
+    def viewed_only_ids(self) -> List[str]:
+        """IDs seen but not swiped"""
+        return [str(value) for value in self.seen if value not in self.swiped] + sorted(
+            self.seen_overflow - self.swiped_overflow
+        )
+
+    # === Persistence ===
+
+    @classmethod
+    def from_row(cls, row: Optional[UserSeenSet]) -> "SeenSet":
+        """Load from a user_seen_sets row"""
+        if row is None:
+            return cls()
+        return cls(
+            seen=CompactBitmap.from_bytes(row.seen_bitmap),
+            swiped=CompactBitmap.from_bytes(row.swiped_bitmap),
+            seen_overflow=row.seen_overflow,
+            swiped_overflow=row.swiped_overflow
+        )
+
+    def apply_to_row(self, row: UserSeenSet):
+        """Write into a user_seen_sets row (new objects so the ORM detects the change)"""
+        row.seen_bitmap = self.seen.to_bytes()
+        row.swiped_bitmap = self.swiped.to_bytes()
+        row.seen_overflow = sorted(self.seen_overflow)
+        row.swiped_overflow = sorted(self.swiped_overflow)
+
+
+class SeenSetService:
+    """
+    Loads, caches and updates per-user seen sets
+
+    Reads are served from a bounded in-process cache with a short TTL, so other workers'
+    updates become visible within SEEN_SET_CACHE_TTL_SECONDS. Updates lock the user's row,
+    run inside a savepoint of the caller's transaction (the caller commits together with
+    the swipe itself) and never fail the surrounding request.
+    """
+
+    def __init__(
+        self,
+        cache_size: int = SEEN_SET_CACHE_SIZE,
+        ttl_seconds: float = SEEN_SET_CACHE_TTL_SECONDS
+    ):
+        self.cache_size = cache_size
+        self.ttl_seconds = ttl_seconds
+        self._cache: "OrderedDict[int, Tuple[float, SeenSet]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.bootstraps = 0
+
+    # === Reads ===
+
+    def get(self, db: Session, user_id: int) -> SeenSet:
+        """
+        Get a user's seen set
+
+        Args:
+            db: Database session
+            user_id: User ID
+
+        Returns:
+            SeenSet (treat as read-only)
+        """
+        user_id = int(user_id)
+        with self._lock:
+            cached = self._cache.get(user_id)
+            if cached and cached[0] > time.time():
+                self._cache.move_to_end(user_id)
+                self.cache_hits += 1
+                return cached[1]
+            self.cache_misses += 1
+
+        row = db.query(UserSeenSet).filter(UserSeenSet.user_id == user_id).first()
+        if row is not None:
+            seen_set = SeenSet.from_row(row)
+        else:
+            seen_set = self._load_from_history(db, user_id)
+            self._persist_bootstrap(db, user_id, seen_set)
+        self._cache_put(user_id, seen_set)
+        return seen_set
+
+    def get_excluded_ids(self, db: Session, user_id: int, include_viewed: bool = True) -> List[str]:
+        """
+        IDs to exclude from recommendations/search
+
+        Args:
+            db: Database session
+            user_id: User ID
+            include_viewed: Also exclude profiles that were shown but not swiped
+
+        Returns:
+            Target user IDs as strings
+        """
+        seen_set = self.get(db, user_id)
+        return seen_set.seen_ids() if include_viewed else seen_set.swiped_ids()
+
+    def sql_exclusion(self, db: Session, user_id: int, column, include_viewed: bool = False):
+        """
+        SQL condition excluding the user's swiped (or seen) targets
+
+        Swiped targets are excluded with NOT EXISTS anti-joins on user_swipes and
+        swipe_records (index lookups, no ID list however long the history is).
+        Viewed-only targets exist only in the seen set; at most SEEN_SET_SQL_MAX_VIEWED
+        of them are inlined, callers needing all of them also check is_seen().
+
+        Args:
+            db: Database session
+            user_id: User ID
+            column: Integer user ID column to filter (e.g. User.id)
+            include_viewed: Also exclude profiles that were shown but not swiped
+
+        Returns:
+            SQLAlchemy boolean expression
+        """
+        user_id = int(user_id)
+        condition = and_(
+            ~exists().where(UserSwipe.swiper_id == user_id, UserSwipe.swiped_user_id == column),
+            ~exists().where(SwipeRecord.user_id == user_id, SwipeRecord.target_user_id == cast(column, String))
+        )
+        if include_viewed:
+            viewed = [int(value) for value in self.get(db, user_id).viewed_only_ids() if value.isdigit()]
+            if viewed:
+                condition = and_(condition, column.notin_(viewed[:SEEN_SET_SQL_MAX_VIEWED]))
+        return condition
+
+    # === Updates ===
+
+    def record_swipes(self, db: Session, user_id: int, target_ids: Iterable[Any]):
+        """Add swiped targets (call before committing the swipe)"""
+        self._update(db, user_id, lambda seen_set: seen_set.add_swiped(target_ids))
+
+    def record_views(self, db: Session, user_id: int, target_ids: Iterable[Any]):
+        """Add targets that were shown to the user"""
+        self._update(db, user_id, lambda seen_set: seen_set.add_seen(target_ids))
+
+    def remove_swipes(self, db: Session, user_id: int, target_ids: Iterable[Any]):
+        """Remove targets whose swipe records were deleted"""
+        self._update(db, user_id, lambda seen_set: seen_set.remove_swiped(target_ids))
+
+    def rebuild(self, db: Session, user_id: int):
+        """Recompute swiped targets from swipe history (keeps viewed-only targets)"""
+        def apply(seen_set: SeenSet):
+            viewed_only = seen_set.viewed_only_ids()
+            history = self._load_from_history(db, user_id)
+            history.add_seen(viewed_only)
+            seen_set.seen, seen_set.swiped = history.seen, history.swiped
+            seen_set.seen_overflow, seen_set.swiped_overflow = history.seen_overflow, history.swiped_overflow
+
+        self._update(db, user_id, apply)
+
+    def invalidate(self, user_id: int):
+        """Drop a user's cached seen set"""
+        with self._lock:
+            self._cache.pop(int(user_id), None)
+
+    def get_stats(self) -> dict:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.cache_hits + self.cache_misses
+            return {
+                "cached_users": len(self._cache),
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+                "hit_rate": round(self.cache_hits / lookups, 4) if lookups else 0.0,
+                "bootstraps": self.bootstraps
+            }
+
+    # === Internal ===
+
+    def _update(self, db: Session, user_id: int, mutate):
+        """Lock the user's row, apply a change and write it back (inside a savepoint)"""
+        user_id = int(user_id)
+        try:
+            with db.begin_nested():
+                row = self._lock_row(db, user_id)
+                seen_set = SeenSet.from_row(row)
+                mutate(seen_set)
+                seen_set.apply_to_row(row)
+            self._cache_put(user_id, seen_set)
+        except Exception as e:
+            logger.error(f"Failed to update seen set for user {user_id}: {e}")
+            self.invalidate(user_id)
+
+    def _lock_row(self, db: Session, user_id: int) -> UserSeenSet:
+        """Get the user's row FOR UPDATE, creating it from swipe history if missing"""
+        row = db.query(UserSeenSet).filter(UserSeenSet.user_id == user_id).with_for_update().first()
+        if row is not None:
+            return row
+
+        row = UserSeenSet(user_id=user_id)
+        self._load_from_history(db, user_id).apply_to_row(row)
+        try:
+            with db.begin_nested():
+                db.add(row)
+        except IntegrityError:
+            # Created concurrently by another worker
+            row = db.query(UserSeenSet).filter(UserSeenSet.user_id == user_id).with_for_update().first()
+        return row
+
+    def _load_from_history(self, db: Session, user_id: int) -> SeenSet:
+        """Build a seen set from the user's swipes in both swipe tables (one-off bootstrap)"""
+        self.bootstraps += 1
+        records = db.query(SwipeRecord.target_user_id).filter(SwipeRecord.user_id == user_id)
+        legacy = db.query(cast(UserSwipe.swiped_user_id, String)).filter(UserSwipe.swiper_id == user_id)
+        targets = records.union(legacy).all()
+
+        seen_set = SeenSet()
+        seen_set.add_swiped(target for (target,) in targets)
+        return seen_set
+
+    def _persist_bootstrap(self, db: Session, user_id: int, seen_set: SeenSet):
+        """
+        Store a bootstrapped seen set so later cache misses read one row
+
+        Added in a savepoint of the caller's session (no second connection, no commit
+        here): the row is kept when the caller commits, otherwise the next cache miss
+        bootstraps again.
+        """
+        row = UserSeenSet(user_id=user_id)
+        seen_set.apply_to_row(row)
+        try:
+            with db.begin_nested():
+                db.add(row)
+        except IntegrityError:
+            # Created concurrently (e.g. by a swipe); that row wins
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to persist bootstrapped seen set for user {user_id}: {e}")
+
+    def _cache_put(self, user_id: int, seen_set: SeenSet):
+        """Store in the LRU cache"""
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[user_id] = (time.time() + self.ttl_seconds, seen_set)
+            self._cache.move_to_end(user_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+# Global service instance
+seen_set_service = SeenSetService()
@@ -0,0 +1,215 @@
+"""
+Session Activity Buffer
+Write-behind tracking of user session activity: requests only record the latest
+last-seen time per (user, token) in memory, and a background task flushes all
+pending entries with one bulk UPSERT every few seconds
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Buffer configuration (overridable via environment)
+SESSION_ACTIVITY_FLUSH_INTERVAL_SECONDS = float(os.getenv("SESSION_ACTIVITY_FLUSH_INTERVAL_SECONDS", "5"))
+SESSION_ACTIVITY_MAX_PENDING = int(os.getenv("SESSION_ACTIVITY_MAX_PENDING", "50000"))
+SESSION_LIFETIME_HOURS = 24
+
+
+def hash_session_token(token: str) -> str:
+    """Stored session key for a bearer token (raw tokens are not persisted)"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+@dataclass
+class _Activity:
+    last_activity: datetime
+    ip_address: Optional[str]
+    user_agent: Optional[str]
+
+
+class SessionActivityBuffer:
+    """
+    Coalescing in-memory buffer of session activity
+
+    record() is O(1) and never touches the database; repeated requests with the
+    same (user, token) only overwrite the pending entry. flush() swaps the buffer
+    out and writes every entry with a single INSERT ... ON CONFLICT (session_token)
+    DO UPDATE. Activity tracking is best-effort: a failed flush is logged and dropped.
+    """
+
+    def __init__(self, max_pending: int = SESSION_ACTIVITY_MAX_PENDING):
+        """
+        Initialize buffer
+
+        Args:
+            max_pending: Maximum number of distinct (user, token) entries held between flushes
+        """
+        self.max_pending = max_pending
+        self._pending: Dict[Tuple[int, str], _Activity] = {}
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.recorded = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.failed_flushes = 0
+        self.last_flush_seconds = 0.0
+
+    # === Recording ===
+
+    def record(self, user_id: int, token: str, ip_address: Optional[str] = None, user_agent: Optional[str] = None):
+        """
+        Record activity for a session (request path, no I/O)
+
+        Args:
+            user_id: Authenticated user ID
+            token: Bearer token of the request
+            ip_address: Client IP address
+            user_agent: Client user agent
+        """
+        key = (int(user_id), hash_session_token(token))
+        activity = _Activity(datetime.utcnow(), ip_address, (user_agent or "")[:500] or None)
+        with self._lock:
+            if key not in self._pending and len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return
+            self._pending[key] = activity
+            self.recorded += 1
+
+    def pending_count(self) -> int:
+        """Number of entries waiting for the next flush"""
+        with self._lock:
+            return len(self._pending)
+
+    # === Flushing ===
+
+    def flush(self, db_factory=None) -> int:
+        """
+        Write all pending entries with one bulk UPSERT (blocking; run off the event loop)
+
+        Args:
+            db_factory: Callable returning a SQLAlchemy Session (defaults to dependencies.db.SessionLocal)
+
+        Returns:
+            Number of rows written
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        if db_factory is None:
+            from dependencies.db import SessionLocal
+            db_factory = SessionLocal
+
+        start_time = time.time()
+        db = db_factory()
+        try:
+            rows = self._build_rows(db, pending)
+            if rows:
+                db.execute(self._upsert_statement(rows))
+            db.commit()
+            self.flushes += 1
+            self.flushed_rows += len(rows)
+            return len(rows)
+        except Exception as e:
+            db.rollback()
+            self.failed_flushes += 1
+            logger.error(f"Failed to flush {len(pending)} session activity entries: {e}")
+            return 0
+        finally:
+            db.close()
+            self.last_flush_seconds = time.time() - start_time
+
+    async def flush_async(self) -> int:
+        """Flush on a worker thread"""
+        return await asyncio.to_thread(self.flush)
+
+    def get_stats(self) -> dict:
+        """Get buffer statistics"""
+        return {
+            "pending": self.pending_count(),
+            "recorded": self.recorded,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "flushed_rows": self.flushed_rows,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_seconds": round(self.last_flush_seconds, 4)
+        }
+
+    def _build_rows(self, db, pending: Dict[Tuple[int, str], _Activity]) -> List[dict]:
+        """Rows for existing, active users (one IN query)"""
+        from models.users import User
+
+        user_ids = {user_id for user_id, _ in pending}
+        existing = {
+            user_id for (user_id,) in db.query(User.id).filter(
+                User.id.in_(user_ids),
+                User.user_status == 'active'
+            ).all()
+        }
+
+        return [
+            {
+                "user_id": user_id,
+                "session_token": token_hash,
+                "ip_address": activity.ip_address,
+                "user_agent": activity.user_agent,
+                "last_activity": activity.last_activity,
+                "expires_at": activity.last_activity + timedelta(hours=SESSION_LIFETIME_HOURS),
+                "is_active": True
+            }
+            for (user_id, token_hash), activity in pending.items()
+            if user_id in existing
+        ]
+
+    @staticmethod
+    def _upsert_statement(rows: List[dict]):
+        """Multi-row INSERT ... ON CONFLICT (session_token) DO UPDATE"""
+        from sqlalchemy import column, func, table
+        from sqlalchemy.dialects.postgresql import insert
+
+        user_sessions = table(
+            "user_sessions",
+            column("user_id"),
+            column("session_token"),
+            column("ip_address"),
+            column("user_agent"),
+            column("last_activity"),
+            column("expires_at"),
+            column("is_active")
+        )
+        statement = insert(user_sessions).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=["session_token"],
+            set_={
+                "last_activity": func.greatest(user_sessions.c.last_activity, statement.excluded.last_activity),
+                "ip_address": statement.excluded.ip_address,
+                "user_agent": statement.excluded.user_agent
+            }
+        )
+
+
+# Global buffer instance
+session_activity_buffer = SessionActivityBuffer()
+
+
+async def session_activity_flush_task(interval_seconds: float = SESSION_ACTIVITY_FLUSH_INTERVAL_SECONDS):
+    """Background task: flush the session activity buffer periodically (and once more on shutdown)"""
+    try:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await session_activity_buffer.flush_async()
+    except asyncio.CancelledError:
+        await session_activity_buffer.flush_async()
+        raise
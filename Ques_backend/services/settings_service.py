@@ -9,6 +9,8 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 
 from models.users import User
+from services.profile_card_cache import profile_card_cache
+from services.token_cache import verified_token_cache
 
 logger = logging.getLogger(__name__)
 
@@ -121,6 +123,8 @@ class SettingsService:
                 return False
             
             # Mock deactivation
+            verified_token_cache.invalidate_user(user_id)
+            profile_card_cache.invalidate(user_id)
             logger.info(f"Account deactivated for user {user_id}: {reason}")
             return True
             
@@ -136,6 +140,8 @@ class SettingsService:
                 return False
             
             # Mock deletion - in reality you'd need to handle data cleanup
+            verified_token_cache.invalidate_user(user_id)
+            profile_card_cache.invalidate(user_id)
             logger.info(f"Account deletion initiated for user {user_id}")
             return True
             
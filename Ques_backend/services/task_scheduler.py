@@ -108,6 +108,18 @@ async def start_background_tasks():
     # Add casual requests cleanup task as specified in integration guide
     _scheduler.add_task(cleanup_expired_casual_requests_task, "casual_requests_cleanup")
     
+    # Flush buffered session activity (write-behind from SessionTrackingMiddleware)
+    from services.session_activity import session_activity_flush_task
+    _scheduler.add_task(session_activity_flush_task, "session_activity_flush")
+    
+    # Keep precomputed /top-profiles candidate feeds topped up
+    from services.candidate_feed import candidate_feed_refresh_task
+    _scheduler.add_task(candidate_feed_refresh_task, "candidate_feed_refresh")
+    
+    # Keep the casual request matching index (and stored embeddings) current
+    from services.casual_matching import casual_match_refresh_task
+    _scheduler.add_task(casual_match_refresh_task, "casual_match_refresh")
+    
     logger.info("Background tasks started")
 
 
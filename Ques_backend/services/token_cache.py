@@ -0,0 +1,195 @@
+"""
+Verified Token Cache
+Short-TTL, bounded cache of verified JWTs -> user principal shared by the auth
+dependency and SessionTrackingMiddleware, with per-user invalidation and
+per-process revocation of logged-out tokens
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+
+# Cache configuration (overridable via environment)
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "60"))
+TOKEN_REVOCATION_MAX_SIZE = int(os.getenv("TOKEN_REVOCATION_MAX_SIZE", "100000"))
+
+
+def _token_key(token: str) -> str:
+    """Cache key for a bearer token (raw tokens are not kept in memory)"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class TokenPrincipal:
+    """Authenticated user as resolved from a verified token"""
+    user_id: int
+    user_status: str
+    is_verified: bool = False
+    token_expires_at: Optional[float] = None  # JWT exp claim (epoch seconds)
+
+    @property
+    def is_active(self) -> bool:
+        """Whether user status is active"""
+        return self.user_status == 'active'
+
+
+class VerifiedTokenCache:
+    """
+    Thread-safe LRU of verified tokens
+
+    Entries live for at most ttl_seconds and never beyond the token's own exp claim.
+    invalidate_user() drops every cached token of a user (deactivation, deletion,
+    status changes); revoke() additionally rejects a token until it expires (logout).
+    """
+
+    def __init__(
+        self,
+        max_size: int = TOKEN_CACHE_MAX_SIZE,
+        ttl_seconds: float = TOKEN_CACHE_TTL_SECONDS,
+        max_revoked: int = TOKEN_REVOCATION_MAX_SIZE
+    ):
+        """
+        Initialize cache
+
+        Args:
+            max_size: Maximum number of cached tokens
+            ttl_seconds: Time-to-live of each entry (seconds)
+            max_revoked: Maximum number of remembered revoked tokens
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.max_revoked = max_revoked
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, principal)
+        self._user_tokens: Dict[int, Set[str]] = {}
+        self._revoked: "OrderedDict[str, float]" = OrderedDict()  # key -> token expiry
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.revocations = 0
+
+    def get(self, token: str) -> Optional[TokenPrincipal]:
+        """
+        Get the cached principal of a token
+
+        Returns:
+            TokenPrincipal or None (not cached, expired or revoked)
+        """
+        key = _token_key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= now:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, token: str, principal: TokenPrincipal):
+        """Cache a verified token's principal"""
+        if self.max_size <= 0:
+            return
+        key = _token_key(token)
+        expires_at = time.time() + self.ttl_seconds
+        if principal.token_expires_at is not None:
+            expires_at = min(expires_at, principal.token_expires_at)
+
+        with self._lock:
+            if key in self._revoked:
+                return
+            self._remove(key)
+            self._entries[key] = (expires_at, principal)
+            self._user_tokens.setdefault(principal.user_id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def is_revoked(self, token: str) -> bool:
+        """Whether the token was revoked by this process (and has not expired yet)"""
+        key = _token_key(token)
+        with self._lock:
+            expires_at = self._revoked.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= time.time():
+                del self._revoked[key]
+                return False
+            return True
+
+    def revoke(self, token: str, token_expires_at: Optional[float] = None):
+        """
+        Drop a token and reject it until it expires (logout)
+
+        Args:
+            token: Bearer token
+            token_expires_at: JWT exp claim (defaults to now + ttl_seconds)
+        """
+        key = _token_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if token_expires_at is None and entry is not None:
+                token_expires_at = entry[1].token_expires_at
+            self._remove(key)
+            self._revoked[key] = token_expires_at or time.time() + self.ttl_seconds
+            self._revoked.move_to_end(key)
+            while len(self._revoked) > self.max_revoked:
+                self._revoked.popitem(last=False)
+            self.revocations += 1
+
+    def invalidate_user(self, user_id: int):
+        """Drop all cached tokens of a user (deactivation, deletion, status change)"""
+        with self._lock:
+            for key in list(self._user_tokens.get(int(user_id), ())):
+                self._remove(key)
+            self._user_tokens.pop(int(user_id), None)
+            self.invalidations += 1
+
+    def clear(self):
+        """Remove all entries and revocations"""
+        with self._lock:
+            self._entries.clear()
+            self._user_tokens.clear()
+            self._revoked.clear()
+
+    def get_stats(self) -> dict:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "revoked": len(self._revoked),
+                "revocations": self.revocations
+            }
+
+    def _remove(self, key: str):
+        """Remove an entry and its user index (lock held)"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._user_tokens.get(entry[1].user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._user_tokens[entry[1].user_id]
+
+
+# Global cache instance
+verified_token_cache = VerifiedTokenCache()
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_
 from models.user_profiles import UserProfile
 from models.user_auth import VerificationCode
+from services.profile_card_cache import profile_card_cache
 
 
 class UniversityVerificationService:
@@ -89,6 +90,7 @@ class UniversityVerificationService:
         user_profile.university_verified_at = datetime.utcnow()
         
         db.commit()
+        profile_card_cache.invalidate(user_id)
         
         return {
             'status': 'verified',
@@ -0,0 +1,87 @@
+"""
+Unit tests for the precomputed candidate feed
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from services.candidate_feed import CandidateFeedService, FeedCandidate, profile_text, rank_candidates
+
+
+class StaticFeedService(CandidateFeedService):
+    """Replaces the database/embedding build with a fixed ranking and records builds"""
+
+    def __init__(self, ranking, **kwargs):
+        super().__init__(**kwargs)
+        self.ranking = ranking
+        self.builds = []
+
+    def _build_ranked(self, user_id, exclude):
+        self.builds.append(set(exclude))
+        return [(candidate_id, score) for candidate_id, score in self.ranking if candidate_id not in exclude]
+
+
+class TestRankCandidates:
+    """Test cases for candidate scoring"""
+
+    def test_similarity_then_recency(self):
+        """Similar profiles rank first; recency breaks ties between equally similar ones"""
+        now = datetime(2026, 1, 1)
+        candidates = [
+            FeedCandidate(1, "a", created_at=now - timedelta(days=1)),
+            FeedCandidate(2, "b", created_at=now - timedelta(days=60)),
+            FeedCandidate(3, "c", created_at=now - timedelta(days=1), last_active=now),
+        ]
+        viewer = np.array([1.0, 0.0])
+        embeddings = np.array([[0.0, 1.0], [1.0, 0.0], [0.0, 1.0]])
+
+        ranked = rank_candidates(candidates, viewer, embeddings, now=now)
+
+        assert [user_id for user_id, _ in ranked] == [2, 3, 1]
+        assert rank_candidates([]) == []
+
+    def test_profile_text_flattens_json_fields(self):
+        """Lists and dicts are flattened, empty values skipped"""
+        assert profile_text("Builder", ["python", {"name": "go"}], None, "  ") == "Builder | python | go"
+
+
+class TestCandidateFeedService:
+    """Test cases for popping and refilling feeds"""
+
+    @pytest.mark.asyncio
+    async def test_pop_skips_swiped_and_refills_in_background(self):
+        """Cold pop returns at once and builds in the background; low queues refill without re-serving candidates"""
+        service = StaticFeedService([(i, 1.0 - i / 100) for i in range(1, 11)], target_size=6, low_watermark=3)
+
+        assert await service.pop(7, 3) == []
+        await asyncio.sleep(0.05)
+
+        first = await service.pop(7, 3, is_excluded=lambda candidate_id: candidate_id == 2)
+        assert [candidate_id for candidate_id, _ in first] == [1, 3, 4]
+        assert len(service.builds) == 1
+
+        second = await service.pop(7, 2)
+        assert [candidate_id for candidate_id, _ in second] == [5, 6]
+
+        # Queue fell below the watermark: a background refill excludes served candidates
+        await asyncio.sleep(0.05)
+        assert len(service.builds) == 2
+        assert {1, 3, 4, 5, 6} <= service.builds[1]
+
+        third = await service.pop(7, 10)
+        assert [candidate_id for candidate_id, _ in third] == [7, 8, 9, 10]
+        assert service.get_stats()["cold_builds"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fallback_candidates_are_not_queued(self):
+        """Candidates served by the caller's fallback are left out of the background build"""
+        service = StaticFeedService([(i, 1.0) for i in range(1, 6)], target_size=10, low_watermark=1)
+
+        assert await service.pop(7, 2) == []
+        service.mark_served(7, [1, 2])
+        await asyncio.sleep(0.05)
+
+        assert [candidate_id for candidate_id, _ in await service.pop(7, 10)] == [3, 4, 5]
@@ -0,0 +1,133 @@
+"""
+Unit tests for vectorized casual request matching
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from services.casual_matching import (
+    CasualMatchEngine,
+    MatchIndex,
+    RequestFeatures,
+    decode_embedding,
+    encode_embedding,
+    hashed_embeddings,
+    top_matches,
+)
+from services.profile_embeddings import ProfileEmbeddingService
+
+
+def make_request(request_id, user_id, text, province_id=None, city_id=None, preferences=None, query_embedding=None):
+    return SimpleNamespace(
+        id=request_id, user_id=user_id, query=text, optimized_query=text, province_id=province_id,
+        city_id=city_id, preferences=preferences, query_embedding=query_embedding, is_active=True
+    )
+
+
+def build_index(requests):
+    features = [RequestFeatures.from_request(request) for request in requests]
+    return features, MatchIndex.build(features, list(hashed_embeddings([item.text for item in features])))
+
+
+class CountingEmbeddings(ProfileEmbeddingService):
+    """Hashed vectors as the "model" embeddings; records encoded texts"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.encoded = []
+
+    def _model_encode(self, texts):
+        self.encoded.extend(texts)
+        return hashed_embeddings(texts)
+
+
+class TestTopMatches:
+    """Test cases for scoring and top-k selection"""
+
+    def test_region_boosts_and_true_top_k(self):
+        """Only same-province requests of other users; the best match is found even past the first N rows"""
+        requests = [make_request(1, "me", "hiking on the weekend", 1, 10, {"activity_type": "Hiking"})]
+        requests += [make_request(100 + i, f"u{i}", f"board games night {i}", 1, 11) for i in range(50)]
+        requests += [
+            make_request(2, "me", "hiking on the weekend", 1, 10),
+            make_request(3, "far", "hiking on the weekend", 2, 20, {"activity_type": "hiking"}),
+            make_request(4, "best", "weekend hiking trip", 1, 10, {"activity_type": "hiking", "timing": "weekend"}),
+        ]
+        features, index = build_index(requests)
+
+        matches = top_matches(features[0], index.matrix[0], index, limit=3, min_score=0.0)
+
+        assert [request_id for request_id, _, _ in matches][0] == 4
+        assert all(request_id not in (1, 2, 3) for request_id, _, _ in matches)
+        assert len(matches) == 3
+        assert matches[0][2] == ["Same province", "Same city", "Similar activity type", "Similar interests"]
+        scores = [score for _, score, _ in matches]
+        assert scores == sorted(scores, reverse=True) and all(0.0 <= score <= 1.0 for score in scores)
+
+    def test_min_score_and_unknown_province(self):
+        """Without a province every region is a candidate; low scores are cut off"""
+        features, index = build_index([
+            make_request(1, "me", "coffee chat"),
+            make_request(2, "a", "coffee chat downtown", 5),
+            make_request(3, "b", "rock climbing", 6),
+        ])
+
+        matches = top_matches(features[0], index.matrix[0], index, limit=10, min_score=0.2)
+
+        assert [request_id for request_id, _, _ in matches] == [2]
+        assert top_matches(features[0], index.matrix[0], index, limit=0) == []
+
+
+class TestCasualMatchEngine:
+    """Test cases for stored embeddings and pairwise scoring"""
+
+    def test_embedding_round_trip(self):
+        """Stored bytes decode to the same float32 vector"""
+        vector = np.array([0.5, -0.25, 1.0], dtype=np.float32)
+        np.testing.assert_array_equal(decode_embedding(encode_embedding(vector)), vector)
+        assert decode_embedding(None) is None
+
+    def test_stored_embeddings_are_reused(self):
+        """Only requests without a valid stored embedding are encoded, and are returned for persisting"""
+        embeddings = CountingEmbeddings()
+        engine = CasualMatchEngine(embeddings=embeddings)
+        stored = encode_embedding(hashed_embeddings(["coffee"])[0])
+        features = [
+            RequestFeatures.from_request(make_request(1, "a", "coffee")),
+            RequestFeatures.from_request(make_request(2, "b", "tea")),
+        ]
+
+        vectors, new_blobs, hashed = engine._vectors(features, [stored, None])
+
+        assert embeddings.encoded == ["tea"]
+        assert list(new_blobs) == [2]
+        assert len(vectors) == 2
+        assert hashed is False
+
+    def test_encoder_failure_is_not_permanent(self):
+        """Without a model every vector is hashed and nothing is persisted; the model is retried later"""
+        embeddings = CountingEmbeddings(retry_seconds=60)
+        engine = CasualMatchEngine(embeddings=embeddings)
+        features = [RequestFeatures.from_request(make_request(1, "a", "coffee"))]
+        embeddings._retry_at = float("inf")
+
+        _, new_blobs, hashed = engine._vectors(features, [None])
+        assert (new_blobs, hashed) == ({}, True)
+
+        embeddings._retry_at = 0.0
+        _, new_blobs, hashed = engine._vectors(features, [None])
+        assert (list(new_blobs), hashed) == ([1], False)
+
+    def test_score_requests_matches_model_method_semantics(self):
+        """Pairwise scores use the same components; the model method delegates to this"""
+        engine = CasualMatchEngine(embeddings=CountingEmbeddings())
+        me = make_request(1, "a", "weekend hiking", 1, 10, {"timing": "weekend"})
+        scores = engine.score_requests(me, [
+            make_request(2, "b", "weekend hiking", 1, 10, {"timing": "flexible"}),
+            make_request(3, "c", "chess", 2),
+        ])
+
+        assert scores[0] == pytest.approx(1.0)
+        assert scores[1] == pytest.approx(0.0)
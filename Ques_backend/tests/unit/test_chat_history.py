@@ -0,0 +1,100 @@
+"""
+Unit tests for keyset-paginated chat history
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+
+import models  # noqa: F401  (registers every mapped class so relationships configure)
+from models.chat import ChatMessage, ChatSession
+from routers.chat import create_session, delete_session, get_chat_history, get_session_details
+from schemas.chat import CreateSessionRequest
+
+
+@compiles(ARRAY, "sqlite")
+def _array_as_text(type_, compiler, **kw):
+    """SQLite has no ARRAY type; the test leaves these columns NULL"""
+    return "TEXT"
+
+
+@pytest_asyncio.fixture
+async def chat_db():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            ChatSession.metadata.create_all,
+            tables=[ChatSession.__table__, ChatMessage.__table__]
+        )
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+class TestChatHistoryPagination:
+    """Test cases for cursor-based chat history pages"""
+
+    @pytest.mark.asyncio
+    async def test_pages_through_history_with_cursor(self, chat_db):
+        """Two pages cover every message once, in order; only the first page has a cursor"""
+        session = ChatSession(id=uuid.uuid4(), user_id=1, title="History", created_at=datetime(2026, 1, 1))
+        chat_db.add(session)
+        start = datetime(2026, 1, 1, 12, 0)
+        messages = [
+            ChatMessage(
+                id=uuid.uuid4(),
+                session_id=session.id,
+                message_text=f"message {index}",
+                message_type="ai" if index % 2 else "user",
+                created_at=start + timedelta(minutes=index)
+            )
+            for index in range(5)
+        ]
+        chat_db.add_all(messages)
+        await chat_db.commit()
+
+        history = dict(
+            session_id=session.id,
+            limit=3,
+            include_recommendations=False,
+            include_suggested_queries=False,
+            current_user=SimpleNamespace(id=1),
+            db=chat_db
+        )
+
+        first = await get_chat_history(cursor=None, **history)
+        assert [message.content for message in first.messages] == ["message 0", "message 1", "message 2"]
+        assert first.hasMore is True
+        assert first.nextCursor
+
+        second = await get_chat_history(cursor=first.nextCursor, **history)
+        assert [message.content for message in second.messages] == ["message 3", "message 4"]
+        assert second.hasMore is False
+        assert second.nextCursor is None
+        assert second.messages[0].isAiResponse is True
+
+
+class TestChatSessionEndpoints:
+    """Test cases for session create, details and delete"""
+
+    @pytest.mark.asyncio
+    async def test_session_lifecycle_with_uuid_ids(self, chat_db):
+        """A created session is found by its UUID, reports its creation as last activity, and can be deleted"""
+        user = SimpleNamespace(id=1)
+
+        created = await create_session(request=CreateSessionRequest(title="Ideas"), current_user=user, db=chat_db)
+        session_id = uuid.UUID(created.sessionId)
+
+        details = await get_session_details(session_id=session_id, current_user=user, db=chat_db)
+        assert details.title == "Ideas"
+        assert details.messageCount == 0
+        assert details.lastActivity == details.createdAt
+
+        await delete_session(session_id=session_id, current_user=user, db=chat_db)
+        assert await chat_db.get(ChatSession, session_id) is None
@@ -0,0 +1,53 @@
+"""
+Unit tests for the Roaring-style compact bitmap
+"""
+
+import random
+
+import pytest
+
+from services.compact_bitmap import ARRAY_CONTAINER_MAX, CompactBitmap
+
+
+class TestCompactBitmap:
+    """Test cases for set semantics, container conversion and serialization"""
+
+    def test_set_semantics(self):
+        """add/discard/contains/len/iter behave like a set"""
+        bitmap = CompactBitmap([5, 70000, 5, 1])
+
+        assert len(bitmap) == 3
+        assert list(bitmap) == [1, 5, 70000]
+        assert 70000 in bitmap and 6 not in bitmap and "5" not in bitmap
+        assert bitmap.add(6) is True and bitmap.add(6) is False
+        assert bitmap.discard(6) is True and bitmap.discard(6) is False
+
+        with pytest.raises(ValueError):
+            bitmap.add(-1)
+
+    def test_array_bitset_conversion_matches_set(self):
+        """Dense containers switch to bitsets and back without losing values"""
+        rng = random.Random(7)
+        values = set(rng.sample(range(0, 65536), ARRAY_CONTAINER_MAX + 500))
+        bitmap = CompactBitmap(values)
+
+        assert isinstance(bitmap._containers[0], int)
+        assert set(bitmap) == values
+
+        for value in list(values)[:600]:
+            bitmap.discard(value)
+            values.discard(value)
+
+        assert not isinstance(bitmap._containers[0], int)
+        assert set(bitmap) == values
+
+    def test_round_trip_serialization(self):
+        """to_bytes/from_bytes preserve both container types"""
+        values = list(range(0, 3 * ARRAY_CONTAINER_MAX, 2)) + [1 << 20, 0xFFFFFFFF]
+        bitmap = CompactBitmap(values)
+
+        restored = CompactBitmap.from_bytes(bitmap.to_bytes())
+
+        assert restored == bitmap
+        assert len(restored) == len(values)
+        assert len(CompactBitmap.from_bytes(None)) == 0
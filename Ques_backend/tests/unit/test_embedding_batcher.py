@@ -0,0 +1,76 @@
+"""
+Unit tests for the embedding micro-batcher
+"""
+
+import asyncio
+import numpy as np
+import pytest
+
+from services.embedding_batcher import EmbeddingBatcher
+
+
+class FakeModel:
+    """Records encode calls and returns one-hot style vectors"""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, normalize_embeddings=True, batch_size=32):
+        if isinstance(texts, str):
+            return np.array([float(len(texts)), 1.0])
+        self.calls.append(list(texts))
+        return np.array([[float(len(text)), 1.0] for text in texts])
+
+
+class TestEmbeddingBatcher:
+    """Test cases for request batching"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_batch(self):
+        """Concurrent encodes are grouped into a single forward pass"""
+        model = FakeModel()
+        batcher = EmbeddingBatcher(model, max_batch_size=16, max_wait_ms=20)
+
+        vectors = await asyncio.gather(*(batcher.encode("x" * i) for i in range(1, 6)))
+
+        assert len(model.calls) == 1
+        assert [v[0] for v in vectors] == [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert batcher.get_stats()["average_batch_size"] == 5.0
+        batcher.close()
+
+    @pytest.mark.asyncio
+    async def test_max_batch_size_splits_batches(self):
+        """Batches never exceed max_batch_size"""
+        model = FakeModel()
+        batcher = EmbeddingBatcher(model, max_batch_size=2, max_wait_ms=20)
+
+        await batcher.encode_many(["a", "bb", "ccc", "dddd", "eeeee"])
+
+        assert all(len(call) <= 2 for call in model.calls)
+        assert sum(len(call) for call in model.calls) == 5
+        batcher.close()
+
+    @pytest.mark.asyncio
+    async def test_duplicate_texts_encoded_once(self):
+        """Identical texts in a batch are encoded once and fanned out"""
+        model = FakeModel()
+        batcher = EmbeddingBatcher(model, max_batch_size=16, max_wait_ms=20)
+
+        first, second = await asyncio.gather(batcher.encode("same"), batcher.encode("same"))
+
+        assert model.calls == [["same"]]
+        assert np.array_equal(first, second)
+        batcher.close()
+
+    @pytest.mark.asyncio
+    async def test_encode_error_propagates_to_callers(self):
+        """A failed forward pass fails every request in the batch"""
+        class BrokenModel:
+            def encode(self, texts, **kwargs):
+                raise RuntimeError("out of memory")
+
+        batcher = EmbeddingBatcher(BrokenModel(), max_wait_ms=5)
+
+        with pytest.raises(RuntimeError):
+            await batcher.encode("text")
+        batcher.close()
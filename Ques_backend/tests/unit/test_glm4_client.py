@@ -0,0 +1,101 @@
+"""
+Unit tests for the async GLM-4 client path
+"""
+
+import json
+import httpx
+import pytest
+
+import services.glm4_client as glm4_module
+from services.glm4_client import GLM4Client, GLM4Exception
+
+
+def _chat_response(content: str) -> httpx.Response:
+    """Build a minimal chat completion response"""
+    return httpx.Response(200, json={
+        "choices": [{"message": {"content": content}}],
+        "usage": {"total_tokens": 7}
+    })
+
+
+def _install_transport(monkeypatch, handler):
+    """Route the shared async pool through a mock transport"""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(glm4_module, "get_async_http_client", lambda: client)
+    return client
+
+
+class TestAsyncGLM4Client:
+    """Test cases for native async GLM-4 calls"""
+
+    @pytest.mark.asyncio
+    async def test_async_simple_chat(self, monkeypatch):
+        """Async simple chat returns content and updates statistics"""
+        def handler(request):
+            payload = json.loads(request.content)
+            assert payload["messages"][0]["role"] == "system"
+            assert payload["stream"] is False
+            return _chat_response("hello")
+
+        _install_transport(monkeypatch, handler)
+        client = GLM4Client(api_key="test_key")
+
+        result = await client.async_simple_chat("hi", system_prompt="be brief")
+
+        assert result == "hello"
+        assert client.total_tokens == 7
+        assert client.request_count == 1
+
+    @pytest.mark.asyncio
+    async def test_async_retries_transient_errors(self, monkeypatch):
+        """429/5xx responses are retried with backoff"""
+        calls = {"count": 0}
+
+        def handler(request):
+            calls["count"] += 1
+            if calls["count"] < 3:
+                return httpx.Response(503, json={"error": {"message": "busy", "code": "1302"}})
+            return _chat_response('{"intent": "search"}')
+
+        _install_transport(monkeypatch, handler)
+        client = GLM4Client(api_key="test_key", retry_delay=0.0)
+
+        result = await client.async_json_chat("classify")
+
+        assert result == {"intent": "search"}
+        assert calls["count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_async_does_not_retry_client_errors(self, monkeypatch):
+        """Non-retryable status codes raise immediately"""
+        calls = {"count": 0}
+
+        def handler(request):
+            calls["count"] += 1
+            return httpx.Response(401, json={"error": {"message": "bad key", "code": "1000"}})
+
+        _install_transport(monkeypatch, handler)
+        client = GLM4Client(api_key="test_key", retry_delay=0.0)
+
+        with pytest.raises(GLM4Exception) as exc_info:
+            await client.async_simple_chat("hi")
+
+        assert exc_info.value.status_code == 401
+        assert calls["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_async_stream_chat(self, monkeypatch):
+        """Streaming chunks are yielded until [DONE]"""
+        body = "\n".join([
+            'data: {"choices": [{"delta": {"content": "Hel"}}]}',
+            'data: {"choices": [{"delta": {"content": "lo"}}]}',
+            'data: [DONE]',
+            ''
+        ])
+
+        _install_transport(monkeypatch, lambda request: httpx.Response(200, text=body))
+        client = GLM4Client(api_key="test_key")
+
+        chunks = [chunk async for chunk in client.async_stream_chat([{"role": "user", "content": "hi"}])]
+
+        assert chunks == ["Hel", "lo"]
@@ -0,0 +1,41 @@
+"""
+Unit tests for dense + sparse score fusion
+"""
+
+from services.hybrid_fusion import fuse_dbsf, fuse_rrf, sparse_dot, sparse_token_id, to_sparse_pairs
+
+
+class TestHybridFusion:
+    """Test cases for DBSF/RRF fusion and sparse helpers"""
+
+    def test_dbsf_rewards_documents_found_by_both_arms(self):
+        """A document strong in both arms outranks single-arm documents"""
+        arms = {
+            "dense": {"a": 0.90, "b": 0.85, "c": 0.40},
+            "sparse": {"b": 12.0, "d": 11.0, "c": 1.0}
+        }
+        fused = fuse_dbsf(arms)
+
+        assert fused[0][0] == "b"
+        assert {doc_id for doc_id, _ in fused} == {"a", "b", "c", "d"}
+
+    def test_dbsf_weights_and_constant_scores(self):
+        """Weights shift the ranking; constant arms do not divide by zero"""
+        arms = {"dense": {"a": 1.0, "b": 0.0}, "sparse": {"a": 0.0, "b": 1.0}}
+
+        assert fuse_dbsf(arms, weights={"dense": 0.8, "sparse": 0.2})[0][0] == "a"
+        assert fuse_dbsf(arms, weights={"dense": 0.2, "sparse": 0.8})[0][0] == "b"
+        assert fuse_dbsf({"dense": {"x": 0.5, "y": 0.5}})[0][1] == 0.5
+
+    def test_rrf_uses_ranks_only(self):
+        """RRF ignores score scale"""
+        fused = fuse_rrf({"dense": {"a": 0.9, "b": 0.1}, "sparse": {"b": 1000.0, "a": 999.0}}, k=60)
+
+        assert fused[0][1] == fused[1][1]  # a: 1/61 + 1/62, b: 1/62 + 1/61
+
+    def test_sparse_helpers(self):
+        """Sparse dot product and stable term ids"""
+        assert sparse_dot({"python": 1.0, "ai": 0.5}, {"ai": 2.0, "web": 1.0}) == 1.0
+        assert sparse_dot({}, {"ai": 1.0}) == 0.0
+        assert sparse_token_id("python") == sparse_token_id("python")
+        assert to_sparse_pairs({"python": 0.7, "zero": 0.0}) == [[sparse_token_id("python"), 0.7]]
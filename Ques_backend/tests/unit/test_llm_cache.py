@@ -0,0 +1,71 @@
+"""
+Unit tests for the LLM response cache
+"""
+
+import time
+import numpy as np
+
+from services.llm_cache import LLMResponseCache
+
+
+def _unit(vector):
+    """L2-normalise a vector"""
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class TestLLMResponseCache:
+    """Test cases for LRU + TTL + near-duplicate lookup"""
+
+    def test_key_is_normalised(self):
+        """Case and whitespace differences map to the same key"""
+        cache = LLMResponseCache()
+        key_a = cache.make_key("dense_query", "Find AI  students in Shenzhen", "glm-4-flash", 0.3)
+        key_b = cache.make_key("dense_query", " find ai students\nin shenzhen ", "glm-4-flash", 0.3)
+        key_c = cache.make_key("dense_query", "find ai students in shenzhen", "glm-4-flash", 0.1)
+
+        assert key_a == key_b
+        assert key_a != key_c
+
+    def test_hit_miss_and_lru_eviction(self):
+        """Least recently used entry is evicted when full"""
+        cache = LLMResponseCache(max_size=2, ttl_seconds=60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1  # "a" becomes most recently used
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+        stats = cache.get_stats()
+        assert stats["evictions"] == 1
+        assert stats["size"] == 2
+
+    def test_ttl_expiry(self):
+        """Expired entries are not returned"""
+        cache = LLMResponseCache(ttl_seconds=0.01)
+        cache.put("a", 1)
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        assert cache.get_stats()["expirations"] == 1
+
+    def test_semantic_lookup_respects_threshold_and_scope(self):
+        """Near-duplicates hit only above threshold and within the same scope"""
+        cache = LLMResponseCache(semantic_threshold=0.95)
+        scope = cache.make_scope("sparse_tags", "glm-4-flash", 0.1, "no referenced users")
+        other_scope = cache.make_scope("sparse_tags", "glm-4-flash", 0.1, "referenced user 42")
+        cache.put("k1", "ai students shenzhen", scope=scope, embedding=_unit([1.0, 0.0, 0.0]))
+
+        assert cache.get_similar(scope, _unit([0.99, 0.05, 0.0])) == "ai students shenzhen"
+        assert cache.get_similar(scope, _unit([0.5, 0.5, 0.0])) is None
+        assert cache.get_similar(other_scope, _unit([1.0, 0.0, 0.0])) is None
+        assert cache.get_stats()["semantic_hits"] == 1
+
+    def test_semantic_lookup_disabled_by_default(self):
+        """Near-duplicate lookup is opt-in"""
+        cache = LLMResponseCache(semantic_threshold=0)
+        scope = cache.make_scope("intent", "glm-4-flash", 0.1)
+        cache.put("k1", {"intent": "search"}, scope=scope, embedding=_unit([1.0, 0.0]))
+
+        assert cache.get_similar(scope, _unit([1.0, 0.0])) is None
@@ -0,0 +1,100 @@
+"""
+Unit tests for batch match scoring
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from services.match_scoring import MatchScoringEngine, jaccard_scores, normalize_skills
+from services.profile_embeddings import ProfileEmbeddingService
+
+
+def make_profile(user_id, skills=None, goals=None, demands=None, resources=None, location=None):
+    return SimpleNamespace(
+        user_id=user_id, skills=skills, goals=goals, one_sentence_intro=None,
+        demands=demands, resources=resources, location=location
+    )
+
+
+class WordVectorEmbeddings(ProfileEmbeddingService):
+    """Encodes texts as normalized bag-of-words vectors over a fixed vocabulary and counts encoded texts"""
+
+    VOCABULARY = ["python", "ml", "design", "startup", "funding", "mentor", "research"]
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.encoded = []
+
+    def _model_encode(self, texts):
+        self.encoded.extend(texts)
+        vectors = np.array([
+            [float(word in text.lower()) for word in self.VOCABULARY] for text in texts
+        ], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class TestSetSimilarity:
+    """Test cases for skill normalization and vectorized Jaccard"""
+
+    def test_normalize_skills(self):
+        """Case, whitespace and dict entries are normalized; empty entries dropped"""
+        assert normalize_skills(["  Machine   Learning", {"name": "PYTHON"}, ""]) == {"machine learning", "python"}
+        assert normalize_skills("Python, Go") == {"python", "go"}
+        assert normalize_skills(None) == frozenset()
+
+    def test_jaccard_against_many(self):
+        """One score per target; empty sets score 0"""
+        scores = jaccard_scores(frozenset({"a", "b"}), [frozenset({"a", "b"}), frozenset({"b", "c"}), frozenset()])
+        np.testing.assert_allclose(scores, [1.0, 1 / 3, 0.0])
+        np.testing.assert_allclose(jaccard_scores(frozenset(), [frozenset({"a"})]), [0.0])
+
+
+class TestMatchScoringEngine:
+    """Test cases for batch scoring"""
+
+    def test_batch_scores_rank_aligned_profiles_first(self):
+        """Shared skills, goals and a demand/resource fit outrank an unrelated profile"""
+        engine = MatchScoringEngine(embeddings=WordVectorEmbeddings())
+        viewer = make_profile(1, ["Python", "ML"], "startup", "funding", "python mentor", "Beijing")
+        aligned = make_profile(2, ["python", "ml"], "startup", "mentor", "funding", "Beijing")
+        unrelated = make_profile(3, ["Design"], "research", None, None, "Shanghai")
+
+        scores = engine.score(viewer, [aligned, unrelated])
+
+        assert len(scores) == 2
+        assert scores[0]["skillsMatch"] == 100.0
+        assert scores[0]["goalsAlignment"] == 100.0
+        assert scores[0]["demandsMatch"] > 50.0
+        assert scores[1]["skillsMatch"] == 0.0
+        assert scores[1]["demandsMatch"] == 0.0
+        assert scores[0]["locationMatch"] > scores[1]["locationMatch"]
+        assert scores[0]["overall"] > scores[1]["overall"]
+        assert engine.score(viewer, []) == []
+
+    def test_embeddings_cached_per_user_and_text(self):
+        """Repeated scoring only encodes texts that changed"""
+        embeddings = WordVectorEmbeddings()
+        engine = MatchScoringEngine(embeddings=embeddings)
+        viewer = make_profile(1, ["Python"], "startup")
+        target = make_profile(2, ["ML"], "research")
+
+        engine.score(viewer, [target])
+        first_batch = len(embeddings.encoded)
+        engine.score(viewer, [target])
+        assert len(embeddings.encoded) == first_batch
+
+        engine.score(viewer, [make_profile(2, ["ML"], "startup funding")])
+        assert embeddings.encoded[first_batch:] == ["startup funding"]
+        assert engine.get_stats()["embeddings"]["cache_hits"] > 0
+
+    def test_word_overlap_fallback_without_model(self):
+        """Text components fall back to word-set overlap when no encoder is available"""
+        engine = MatchScoringEngine(embeddings=ProfileEmbeddingService())
+        engine.embeddings.encode = lambda texts: None
+
+        scores = engine.score(make_profile(1, ["python"], "build a startup"), [make_profile(2, ["python"], "startup")])
+
+        assert scores[0]["skillsMatch"] == 100.0
+        assert 0.0 < scores[0]["goalsAlignment"] < 100.0
@@ -0,0 +1,84 @@
+"""
+Unit tests for the profile card cache
+"""
+
+from services.profile_card_cache import ProfileCardCache
+
+
+class FakeRedis:
+    """Local stand-in for the Redis tier"""
+
+    def __init__(self):
+        self.data = {}
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+class RecordingCache(ProfileCardCache):
+    """Serves versions and cards from memory and records database loads"""
+
+    def __init__(self, profiles, **kwargs):
+        super().__init__(**kwargs)
+        self.profiles = profiles
+        self.loads = []
+
+    def _load_versions(self, db, ids):
+        return {user_id: self.profiles[user_id]["profile_version"] for user_id in ids if user_id in self.profiles}
+
+    def _load_cards(self, db, ids):
+        self.loads.append(sorted(ids))
+        return {user_id: dict(self.profiles[user_id]) for user_id in ids if user_id in self.profiles}
+
+
+def _profile(user_id, version="v1"):
+    return {"id": str(user_id), "name": f"user {user_id}", "profile_version": version}
+
+
+class TestProfileCardCache:
+    """Test cases for read-through, versioning, invalidation and the shared tier"""
+
+    def test_read_through_and_version_change(self):
+        """Second lookup is a hit; a newer updated_at forces a reload"""
+        cache = RecordingCache({1: _profile(1), 2: _profile(2)})
+
+        assert set(cache.get_many(None, [1, 2, 404])) == {1, 2}
+        assert cache.get(None, 1)["name"] == "user 1"
+        assert cache.loads == [[1, 2, 404]]
+
+        cache.profiles[1] = _profile(1, "v2")
+        assert cache.get(None, 1)["profile_version"] == "v2"
+        assert cache.loads[-1] == [1]
+
+        stats = cache.get_stats()
+        assert stats["local_hits"] == 1 and stats["misses"] == 4
+
+    def test_invalidate_and_shared_tier(self):
+        """Invalidation drops both tiers; a second worker reads from the shared tier"""
+        redis = FakeRedis()
+        profiles = {1: _profile(1)}
+        first = RecordingCache(profiles, remote=redis)
+        second = RecordingCache(profiles, remote=redis)
+
+        first.get(None, 1)
+        assert second.get(None, 1)["name"] == "user 1"
+        assert second.loads == [] and second.get_stats()["remote_hits"] == 1
+
+        first.invalidate(1)
+        assert redis.data == {}
+        first.get(None, 1)
+        assert first.loads == [[1], [1]]
+
+    def test_returned_cards_are_copies(self):
+        """Mutating a returned card does not change the cached one"""
+        cache = RecordingCache({1: _profile(1)})
+
+        cache.get(None, 1)["name"] = "changed"
+
+        assert cache.get(None, 1)["name"] == "user 1"
@@ -0,0 +1,52 @@
+"""
+Unit tests for the shared profile embedding service
+"""
+
+import numpy as np
+
+from services.profile_embeddings import ProfileEmbeddingService
+
+
+class FlakyEmbeddings(ProfileEmbeddingService):
+    """Fails the first model call, then encodes texts as one-hot vectors by length"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = []
+
+    def _model_encode(self, texts):
+        self.calls.append(list(texts))
+        if len(self.calls) == 1:
+            raise RuntimeError("model download failed")
+        return np.eye(8, dtype=np.float32)[[len(text) % 8 for text in texts]]
+
+
+class TestProfileEmbeddingService:
+    """Test cases for caching and failure recovery"""
+
+    def test_recovers_after_retry_cooldown(self):
+        """A failed load disables embeddings for the cooldown only, not until restart"""
+        service = FlakyEmbeddings(retry_seconds=60)
+
+        assert service.embed(["python"]) is None
+        assert service.embed(["python"]) is None
+        assert len(service.calls) == 1
+        assert service.get_stats()["available"] is False
+
+        service._retry_at = 0.0
+        vectors = service.embed(["python", "go", "python"])
+        assert len(vectors) == 3
+        assert service.calls[-1] == ["python", "go"]
+        np.testing.assert_array_equal(vectors[0], vectors[2])
+
+    def test_cached_by_text(self):
+        """Texts seen before are not encoded again; LRU size is bounded"""
+        service = FlakyEmbeddings(cache_size=2, retry_seconds=0)
+        service.embed(["warmup"])
+
+        service.embed(["a", "bb"])
+        service.embed(["bb", "ccc"])
+
+        assert service.calls[1:] == [["a", "bb"], ["ccc"]]
+        assert service.get_stats()["cached_embeddings"] == 2
+        assert service.cache_hits == 1
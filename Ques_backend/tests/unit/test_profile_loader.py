@@ -0,0 +1,56 @@
+"""
+Unit tests for the batched profile loader
+"""
+
+import asyncio
+import pytest
+
+from services.profile_loader import ProfileLoader
+
+
+class RecordingLoader(ProfileLoader):
+    """Replaces the database query with an in-memory lookup and records batches"""
+
+    def __init__(self, existing):
+        super().__init__()
+        self.existing = existing
+        self.batches = []
+
+    def _load_sync(self, keys):
+        self.batches.append(sorted(keys))
+        return {key: {"id": key, "name": f"user {key}"} for key in keys if key in self.existing}
+
+
+class TestProfileLoader:
+    """Test cases for batching and de-duplication"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_loads_share_one_query(self):
+        """IDs requested in the same tick are fetched in one batch, duplicates once"""
+        loader = RecordingLoader({"1", "2", "3"})
+
+        current, referenced = await asyncio.gather(
+            loader.load_many(["1"]),
+            loader.load_many(["2", "1", 3, "404"])
+        )
+
+        assert loader.batches == [["1", "2", "3", "404"]]
+        assert current == {"1": {"id": "1", "name": "user 1"}}
+        assert referenced["3"]["name"] == "user 3"
+        assert referenced["404"] is None
+        assert loader.get_stats()["deduplicated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_propagates_to_callers(self):
+        """A failing query raises for every caller and is not left in flight"""
+        loader = RecordingLoader(set())
+
+        def fail(keys):
+            raise RuntimeError("database unavailable")
+
+        loader._load_sync = fail
+        with pytest.raises(RuntimeError):
+            await loader.load("7")
+
+        loader._load_sync = RecordingLoader._load_sync.__get__(loader)
+        assert await loader.load("7") is None
@@ -0,0 +1,88 @@
+"""
+Unit tests for the seen set service
+"""
+
+import pytest
+from sqlalchemy import Integer, create_engine, literal, select
+from sqlalchemy.orm import sessionmaker
+
+import models  # noqa: F401  (registers every mapped class so relationships configure)
+from models.swipes import SwipeRecord
+from models.user_seen_sets import UserSeenSet
+from models.user_swipes import UserSwipe
+from services.seen_set_service import SeenSetService
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    UserSeenSet.metadata.create_all(
+        engine, tables=[UserSeenSet.__table__, SwipeRecord.__table__, UserSwipe.__table__]
+    )
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def add_history(db):
+    """User 1 swiped 2 and 3 in swipe_records and 4 in the legacy user_swipes table"""
+    db.add_all([
+        SwipeRecord(user_id=1, target_user_id="2", action="like"),
+        SwipeRecord(user_id=1, target_user_id="3", action="ignore"),
+        UserSwipe(swiper_id=1, swiped_user_id=4, swipe_direction="right"),
+        UserSwipe(swiper_id=9, swiped_user_id=5, swipe_direction="left"),
+    ])
+    db.commit()
+
+
+class TestSeenSetService:
+    """Test cases for bootstrap, persistence, updates and SQL exclusion"""
+
+    def test_bootstrap_from_both_tables_persists_on_caller_session(self, db):
+        """A cache miss without a row unions both swipe tables and adds the row to the caller's transaction"""
+        add_history(db)
+        service = SeenSetService()
+
+        seen_set = service.get(db, 1)
+
+        assert sorted(seen_set.swiped_ids()) == ["2", "3", "4"]
+        assert seen_set.is_swiped(4) and not seen_set.is_swiped(5)
+        db.commit()
+        row = db.get(UserSeenSet, 1)
+        assert row is not None and sorted(service.get(db, 1).swiped_ids()) == ["2", "3", "4"]
+
+        service.invalidate(1)
+        service.get(db, 1)
+        assert service.get_stats()["bootstraps"] == 1
+
+    def test_updates_are_cached_and_written_to_the_row(self, db):
+        """Swipes, views and removals update the row and the cached set"""
+        service = SeenSetService()
+
+        service.record_swipes(db, 1, [7, "ext-1"])
+        service.record_views(db, 1, [8])
+        service.remove_swipes(db, 1, [7])
+        db.commit()
+
+        seen_set = service.get(db, 1)
+        assert seen_set.swiped_ids() == ["ext-1"]
+        assert seen_set.is_seen(8) and not seen_set.is_seen(7)
+        service.invalidate(1)
+        assert service.get(db, 1).viewed_only_ids() == ["8"]
+
+    def test_sql_exclusion_uses_both_swipe_tables(self, db):
+        """Swiped targets from either table are excluded; viewed-only IDs only with include_viewed"""
+        add_history(db)
+        service = SeenSetService()
+        service.record_views(db, 1, [6])
+        db.commit()
+
+        def remaining(include_viewed):
+            return [
+                target for target in [2, 3, 4, 5, 6]
+                if db.scalar(select(service.sql_exclusion(db, 1, literal(target, Integer), include_viewed)))
+            ]
+
+        assert remaining(False) == [5, 6]
+        assert remaining(True) == [5]
@@ -0,0 +1,80 @@
+"""
+Unit tests for the write-behind session activity buffer
+"""
+
+from services.session_activity import SessionActivityBuffer, hash_session_token
+
+
+class FakeSession:
+    """Records executed statements and transaction calls"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.executed = []
+        self.committed = self.rolled_back = self.closed = False
+
+    def execute(self, statement):
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        self.executed.append(statement)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        self.closed = True
+
+
+class RecordingBuffer(SessionActivityBuffer):
+    """Skips the user lookup and returns rows as the statement"""
+
+    def _build_rows(self, db, pending):
+        return [
+            {"user_id": user_id, "session_token": token_hash, "ip_address": activity.ip_address}
+            for (user_id, token_hash), activity in pending.items()
+        ]
+
+    @staticmethod
+    def _upsert_statement(rows):
+        return rows
+
+
+class TestSessionActivityBuffer:
+    """Test cases for coalescing, bounding and flushing"""
+
+    def test_coalesces_per_user_and_token(self):
+        """Repeated requests keep one entry with the latest values; one statement per flush"""
+        buffer = RecordingBuffer()
+        buffer.record(1, "token-a", ip_address="10.0.0.1")
+        buffer.record(1, "token-a", ip_address="10.0.0.2")
+        buffer.record(1, "token-b")
+        buffer.record(2, "token-a")
+
+        session = FakeSession()
+        assert buffer.flush(lambda: session) == 3
+
+        (rows,) = session.executed
+        by_key = {(row["user_id"], row["session_token"]): row for row in rows}
+        assert by_key[(1, hash_session_token("token-a"))]["ip_address"] == "10.0.0.2"
+        assert session.committed and session.closed
+        assert buffer.pending_count() == 0
+        assert buffer.flush(lambda: FakeSession()) == 0
+
+    def test_bounded_and_failed_flush_is_dropped(self):
+        """New keys beyond max_pending are dropped; a failed flush rolls back and clears"""
+        buffer = RecordingBuffer(max_pending=2)
+        buffer.record(1, "a")
+        buffer.record(2, "b")
+        buffer.record(3, "c")
+        buffer.record(1, "a")
+
+        session = FakeSession(fail=True)
+        assert buffer.flush(lambda: session) == 0
+
+        stats = buffer.get_stats()
+        assert stats["dropped"] == 1 and stats["failed_flushes"] == 1
+        assert session.rolled_back and session.closed
+        assert buffer.pending_count() == 0
@@ -0,0 +1,74 @@
+"""
+Unit tests for batch swipe recording
+"""
+
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import models  # noqa: F401  (registers every mapped class so relationships configure)
+from models.swipes import SwipeRecord
+from models.user_seen_sets import UserSeenSet
+from models.user_swipes import UserSwipe
+from routers import swipes
+from routers.swipes import batch_record_swipes
+from schemas.swipes import BatchRecordSwipeRequest, RecordSwipeRequest
+from services.seen_set_service import seen_set_service
+
+
+@pytest_asyncio.fixture
+async def swipe_db():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(
+            SwipeRecord.metadata.create_all,
+            tables=[SwipeRecord.__table__, UserSwipe.__table__, UserSeenSet.__table__]
+        )
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+    seen_set_service.invalidate(1)
+
+
+def batch(*targets):
+    return BatchRecordSwipeRequest(swipes=[RecordSwipeRequest(targetUserId=target, action="like") for target in targets])
+
+
+class TestBatchRecordSwipes:
+    """Test cases for the multi-row swipe insert"""
+
+    @pytest.mark.asyncio
+    async def test_ids_follow_input_order_and_invalid_entries_are_indexed(self, swipe_db):
+        """Valid swipes are inserted in request order; empty and self targets are reported by index"""
+        response = await batch_record_swipes(
+            request=batch("30", " ", "10", "1", "20"), current_user=SimpleNamespace(id=1), db=swipe_db
+        )
+
+        data = response["data"]
+        assert (data["processed"], data["total"]) == (3, 5)
+        assert [(item["index"], item["error"]) for item in data["failed"]] == [
+            (1, "targetUserId is required"), (3, "Cannot swipe on yourself")
+        ]
+
+        stored = dict((await swipe_db.execute(select(SwipeRecord.id, SwipeRecord.target_user_id))).all())
+        assert [stored[swipe.id] for swipe in data["swipes"]] == [swipe.targetUserId for swipe in data["swipes"]]
+        assert [swipe.targetUserId for swipe in data["swipes"]] == ["30", "10", "20"]
+        assert [swipe.id for swipe in data["swipes"]] == sorted(swipe.id for swipe in data["swipes"])
+
+        seen_set = await swipe_db.run_sync(lambda session: seen_set_service.get(session, 1))
+        assert sorted(seen_set.swiped_ids()) == ["10", "20", "30"]
+
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_batches(self, swipe_db, monkeypatch):
+        """More than MAX_SWIPE_BATCH_SIZE swipes is a 400 and nothing is written"""
+        monkeypatch.setattr(swipes, "MAX_SWIPE_BATCH_SIZE", 2)
+
+        with pytest.raises(HTTPException) as error:
+            await batch_record_swipes(request=batch("2", "3", "4"), current_user=SimpleNamespace(id=1), db=swipe_db)
+
+        assert error.value.status_code == 400
+        assert (await swipe_db.scalars(select(SwipeRecord.id))).all() == []
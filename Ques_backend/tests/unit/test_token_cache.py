@@ -0,0 +1,45 @@
+"""
+Unit tests for the verified-token cache
+"""
+
+import time
+
+from services.token_cache import TokenPrincipal, VerifiedTokenCache
+
+
+class TestVerifiedTokenCache:
+    """Test cases for expiry, bounding, invalidation and revocation"""
+
+    def test_entry_never_outlives_token_expiry(self):
+        """Entries expire at the earlier of the TTL and the token's exp claim"""
+        cache = VerifiedTokenCache(ttl_seconds=60)
+        cache.put("live", TokenPrincipal(1, "active"))
+        cache.put("expired", TokenPrincipal(1, "active", token_expires_at=time.time() - 1))
+
+        assert cache.get("live").user_id == 1
+        assert cache.get("expired") is None
+        assert cache.get_stats()["hits"] == 1
+
+    def test_bounded_and_invalidate_user(self):
+        """Oldest entries are evicted; invalidate_user drops all of a user's tokens"""
+        cache = VerifiedTokenCache(max_size=2)
+        cache.put("a", TokenPrincipal(1, "active"))
+        cache.put("b", TokenPrincipal(1, "active"))
+        cache.put("c", TokenPrincipal(2, "active"))
+
+        assert cache.get("a") is None
+        cache.invalidate_user(1)
+        assert cache.get("b") is None
+        assert cache.get("c").user_id == 2
+
+    def test_revoked_token_is_not_cached_again(self):
+        """A revoked token is rejected until it expires and cannot be re-cached"""
+        cache = VerifiedTokenCache()
+        cache.put("token", TokenPrincipal(1, "active", token_expires_at=time.time() + 300))
+
+        cache.revoke("token")
+        cache.put("token", TokenPrincipal(1, "active"))
+
+        assert cache.is_revoked("token")
+        assert cache.get("token") is None
+        assert not cache.is_revoked("other")
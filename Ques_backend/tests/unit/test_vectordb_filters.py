@@ -0,0 +1,113 @@
+"""
+Unit tests for vector database filter pushdown and adaptive over-fetch
+"""
+
+import pytest
+from tcvectordb.exceptions import ConnectError, ParamError, ServerInternalError
+
+from services.intelligent_search import tencent_vectordb_adapter
+from services.intelligent_search.tencent_vectordb_adapter import TencentVectorDBAdapter
+
+
+class FakeCorpusAdapter(TencentVectorDBAdapter):
+    """Serves ranked documents from memory (ignoring the server filter) and records each retrieval"""
+
+    def __init__(self, user_ids, error=None):
+        super().__init__("http://127.0.0.1:9", "root", "key")
+        self.docs = [{"user_id": str(user_id), "status": "active", "score": 1.0 - rank / 1000}
+                     for rank, user_id in enumerate(user_ids)]
+        self.error = error
+        self.calls = []
+
+    async def _retrieve_once(self, query_vector, sparse_vector, top_k, filter_expr):
+        self.calls.append((top_k, filter_expr))
+        if filter_expr and self.error is not None:
+            raise self.error
+        return [dict(doc) for doc in self.docs[:top_k]]
+
+
+class TestFilterExpression:
+    """Test cases for translating filter conditions into server expressions"""
+
+    def test_operators_and_exclusions(self):
+        """$eq/$ne/$in/$nin are translated, duplicates dropped, exclude_ids merged into user_id not in"""
+        adapter = FakeCorpusAdapter([])
+
+        expression = adapter._build_filter_expression(
+            {"status": "active", "age": {"$ne": 30}, "city": {"$in": ["bj", "bj", "sh"]},
+             "user_id": {"$nin": [1, 2]}},
+            exclude_ids=["2", "3"]
+        )
+
+        assert expression == (
+            'status = "active" and age != 30 and city in ("bj", "sh") and user_id not in ("1", "2", "3")'
+        )
+        assert adapter._build_filter_expression(None) is None
+        assert adapter._build_filter_expression({"user_id": {"$nin": []}}) is None
+
+    def test_long_exclusion_lists_are_truncated(self, monkeypatch):
+        """Only VECTORDB_MAX_FILTER_IDS IDs are sent; the client-side filter still removes the rest"""
+        monkeypatch.setattr(tencent_vectordb_adapter, "VECTORDB_MAX_FILTER_IDS", 2)
+        adapter = FakeCorpusAdapter([])
+
+        assert adapter._build_filter_expression(None, exclude_ids=["1", "2", "3"]) == 'user_id not in ("1", "2")'
+        matches = adapter._compile_client_filter(None, exclude_ids=["1", "2", "3"])
+        assert not matches({"user_id": "3"}) and matches({"user_id": "4"})
+
+    @pytest.mark.asyncio
+    async def test_empty_in_matches_nothing_without_a_query(self):
+        """An empty $in short-circuits instead of sending "in ()" """
+        adapter = FakeCorpusAdapter(range(10))
+
+        assert await adapter.hybrid_search([0.1], top_k=5, filter_conditions={"user_id": {"$in": []}}) == []
+        assert adapter.calls == []
+
+
+class TestAdaptiveOverFetch:
+    """Test cases for growing top_k and falling back to client-side filtering"""
+
+    @pytest.mark.asyncio
+    async def test_grows_top_k_until_the_page_is_full(self):
+        """top_k doubles while filtering leaves the page short, and stops when the corpus is exhausted"""
+        adapter = FakeCorpusAdapter(range(1, 31))
+
+        results = await adapter.hybrid_search([0.1], top_k=5, exclude_ids=[str(i) for i in range(1, 13)])
+
+        assert [doc["user_id"] for doc in results] == ["13", "14", "15", "16", "17"]
+        assert [top_k for top_k, _ in adapter.calls] == [5, 10, 20]
+
+        exhausted = FakeCorpusAdapter(range(1, 8))
+        results = await exhausted.hybrid_search([0.1], top_k=5, exclude_ids=["1", "2", "3"])
+        assert [doc["user_id"] for doc in results] == ["4", "5", "6", "7"]
+        assert [top_k for top_k, _ in exhausted.calls] == [5, 10]
+
+    @pytest.mark.asyncio
+    async def test_filter_rejection_falls_back_to_client_side(self):
+        """A rejected filter is retried without pushdown, and pushdown stays off for the retry delay"""
+        adapter = FakeCorpusAdapter(range(1, 11), error=ServerInternalError(code=15000, message="invalid filter: user_id"))
+
+        results = await adapter.hybrid_search([0.1], top_k=3, exclude_ids=["1"])
+        assert [doc["user_id"] for doc in results] == ["2", "3", "4"]
+        assert adapter.calls == [(3, 'user_id not in ("1")'), (3, None), (6, None)]
+
+        await adapter.hybrid_search([0.1], top_k=3, exclude_ids=["1"])
+        assert adapter.calls[-1][1] is None
+
+    @pytest.mark.asyncio
+    async def test_unrelated_errors_keep_pushdown(self):
+        """Errors that merely mention an index or field do not disable pushdown"""
+        adapter = FakeCorpusAdapter(range(1, 11), error=IndexError("list index out of range"))
+
+        assert await adapter.hybrid_search([0.1], top_k=3, exclude_ids=["1"]) == []
+        assert adapter._filter_pushdown_retry_at == 0.0
+
+    def test_is_filter_rejection(self):
+        """Only SDK parameter errors about the filter count"""
+        rejected = TencentVectorDBAdapter._is_filter_rejection
+
+        assert rejected(ServerInternalError(code=15000, message="Invalid filter expression"))
+        assert rejected(ParamError(message="filter must be a string"))
+        assert not rejected(ServerInternalError(code=15000, message="field vector dimension mismatch"))
+        assert not rejected(ServerInternalError(code=504, message="Gateway Timeout: filter search on index"))
+        assert not rejected(ConnectError(message="filter request failed: connection refused"))
+        assert not rejected(TimeoutError("timed out waiting for index"))